@@ -1,8 +1,13 @@
 # backend/config.py
 import os
-from dotenv import load_dotenv
+import tempfile
+from dotenv import find_dotenv, load_dotenv
 
-load_dotenv()
+# The settings below are read once, at import, so the env files are loaded here
+# (and only here: db and everything else import config). .env.local wins over
+# .env; neither overrides variables already set (Railway).
+load_dotenv(find_dotenv(".env.local"), override=False)
+load_dotenv(find_dotenv(".env"), override=False)
 
 # --- OpenAI (existing) ---
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -26,3 +31,150 @@ def require_jwt_secret() -> str:
     if not JWT_SECRET_KEY:
         raise RuntimeError("JWT_SECRET_KEY is not set")
     return JWT_SECRET_KEY
+
+
+# --- Experiment events ingestion ---
+# Ring buffer capacity (events held in memory per worker before backpressure kicks in).
+EXPERIMENT_EVENTS_BUFFER_SIZE = int(os.getenv("EXPERIMENT_EVENTS_BUFFER_SIZE", "50000"))
+# Flush when this many events are buffered...
+EXPERIMENT_EVENTS_FLUSH_SIZE = int(os.getenv("EXPERIMENT_EVENTS_FLUSH_SIZE", "1000"))
+# ...or at least this often (seconds).
+EXPERIMENT_EVENTS_FLUSH_INTERVAL = float(os.getenv("EXPERIMENT_EVENTS_FLUSH_INTERVAL", "1.0"))
+# Failed writes of a batch retried whole before it is split to find (and drop) the rows that fail.
+EXPERIMENT_EVENTS_FLUSH_RETRIES = int(os.getenv("EXPERIMENT_EVENTS_FLUSH_RETRIES", "3"))
+# How often each worker folds new events into the results counters (see experiment_stats.py); 0 disables.
+EXPERIMENT_COMPACT_INTERVAL_SECONDS = float(os.getenv("EXPERIMENT_COMPACT_INTERVAL_SECONDS", "60"))
+
+
+# --- Lead delivery (MailerLite) ---
+MAILERLITE_API_KEY = os.getenv("MAILERLITE_API_KEY")
+MAILERLITE_API_BASE_URL = os.getenv("MAILERLITE_API_BASE_URL", "https://connect.mailerlite.com/api")
+MAILERLITE_PINTEREST_FIT_GROUP_ID = os.getenv("MAILERLITE_PINTEREST_FIT_GROUP_ID", "187545365081229029")
+
+LEAD_DELIVERY_BATCH_SIZE = int(os.getenv("LEAD_DELIVERY_BATCH_SIZE", "50"))
+LEAD_DELIVERY_MAX_ATTEMPTS = int(os.getenv("LEAD_DELIVERY_MAX_ATTEMPTS", "8"))
+# Backoff: base * 2**(attempt-1), capped, with equal jitter: half fixed, half random (seconds).
+LEAD_DELIVERY_BACKOFF_BASE = float(os.getenv("LEAD_DELIVERY_BACKOFF_BASE", "2"))
+LEAD_DELIVERY_BACKOFF_MAX = float(os.getenv("LEAD_DELIVERY_BACKOFF_MAX", "900"))
+# How long a claimed row stays invisible to other workers before it is retried.
+LEAD_DELIVERY_LEASE_SECONDS = float(os.getenv("LEAD_DELIVERY_LEASE_SECONDS", "60"))
+LEAD_DELIVERY_POLL_INTERVAL = float(os.getenv("LEAD_DELIVERY_POLL_INTERVAL", "1.0"))
+
+
+# --- Metrics ---
+# When set, GET /metrics requires "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# --- Query budgets (see query_budget.py) ---
+# "off" | "log" | "raise" (tests set "raise" so new N+1 patterns fail the suite)
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "log")
+# Same statement shape more than this many times in one request is flagged.
+QUERY_BUDGET_MAX_REPEATS = int(os.getenv("QUERY_BUDGET_MAX_REPEATS", "5"))
+
+# --- Profiling (see profiling.py) ---
+# Upper bound for one sampling run started from /admin/profile/sample.
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "30"))
+# Lifetime of the token that enables per-request cProfile via the X-Profile header.
+PROFILER_TOKEN_EXPIRE_MINUTES = int(os.getenv("PROFILER_TOKEN_EXPIRE_MINUTES", "10"))
+
+# --- Migrations (see migration_helpers.py; `alembic -x key=value` overrides) ---
+# Rows per primary-key range in backfill_in_batches, and the sleep between ranges.
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "10000"))
+MIGRATION_BATCH_PAUSE_SECONDS = float(os.getenv("MIGRATION_BATCH_PAUSE_SECONDS", "0.1"))
+# Postgres lock_timeout for migration DDL, so it fails fast instead of queueing writes behind it.
+MIGRATION_LOCK_TIMEOUT_MS = int(os.getenv("MIGRATION_LOCK_TIMEOUT_MS", "5000"))
+
+# --- Serving (see serving.py) ---
+# Worker processes; 0 = auto (usable CPUs, capped by the DB connection budget below).
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+# Server-side max_connections, and how many of them to leave for migrations/scripts/psql.
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "100"))
+DB_RESERVED_CONNECTIONS = int(os.getenv("DB_RESERVED_CONNECTIONS", "10"))
+# Per-process SQLAlchemy pool (ignored for SQLite).
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Connections each worker opens during startup so first requests skip the connect; 0 = off.
+DB_POOL_PREWARM = int(os.getenv("DB_POOL_PREWARM", "2"))
+# SQL statement logging (on for local dev; `python -m serving` turns it off unless set).
+DB_ECHO = os.getenv("DB_ECHO", "true").lower() in ("1", "true", "yes")
+# Seconds in-flight requests get to finish after SIGTERM before workers close them.
+SHUTDOWN_GRACE_SECONDS = float(os.getenv("SHUTDOWN_GRACE_SECONDS", "20"))
+SERVER_KEEPALIVE_SECONDS = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "5"))
+
+# --- Session introspection (see principals.py, GET /auth/session) ---
+# How long a worker reuses a looked-up principal, and how long the middleware (or an edge
+# cache) may reuse a /auth/session response.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+SESSION_MAX_AGE_SECONDS = int(os.getenv("SESSION_MAX_AGE_SECONDS", "30"))
+
+# --- Fruitful Control batch QA (see tools/fruitful_control/batch.py) ---
+# Pool processes per API worker; 0 = min(4, usable CPUs).
+FRUITFUL_CONTROL_WORKERS = int(os.getenv("FRUITFUL_CONTROL_WORKERS", "0"))
+FRUITFUL_CONTROL_CHUNK_SIZE = int(os.getenv("FRUITFUL_CONTROL_CHUNK_SIZE", "100"))
+# Batches with at most this many new texts skip the process pool.
+FRUITFUL_CONTROL_INLINE_MAX = int(os.getenv("FRUITFUL_CONTROL_INLINE_MAX", "200"))
+FRUITFUL_CONTROL_RESULT_CACHE_ENTRIES = int(os.getenv("FRUITFUL_CONTROL_RESULT_CACHE_ENTRIES", "50000"))
+
+# --- LLM gateway (see llm_gateway.py) ---
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+LLM_DEFAULT_MODEL = os.getenv("LLM_DEFAULT_MODEL", "gpt-4o-mini")
+# Provider calls in flight per worker; cache hits never wait on this.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_REQUEST_TIMEOUT_SECONDS = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "60"))
+# Persistent cache budget (llm_responses table); least recently used rows go first.
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "100000"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Per-worker in-memory front of the table.
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "2000"))
+
+# --- Fruitful Control design QA (see tools/fruitful_control/images.py) ---
+FRUITFUL_CONTROL_IMAGE_MAX_BYTES = int(os.getenv("FRUITFUL_CONTROL_IMAGE_MAX_BYTES", str(20 * 1024 * 1024)))
+# Decoded size guard (decompression bombs); a 1000x1500 pin is 1.5M.
+FRUITFUL_CONTROL_IMAGE_MAX_PIXELS = int(os.getenv("FRUITFUL_CONTROL_IMAGE_MAX_PIXELS", "40000000"))
+# Long side of the grid pixel checks run on.
+FRUITFUL_CONTROL_IMAGE_ANALYSIS_SIDE = int(os.getenv("FRUITFUL_CONTROL_IMAGE_ANALYSIS_SIDE", "256"))
+FRUITFUL_CONTROL_IMAGE_CACHE_ENTRIES = int(os.getenv("FRUITFUL_CONTROL_IMAGE_CACHE_ENTRIES", "2000"))
+
+# --- Fruitful Control rule storage (see tools/fruitful_control/repository.py) ---
+# "files" (tools/fruitful_control/data, changed via PRs) or "db" (versioned rows, /admin/fruitful-control/rules).
+FRUITFUL_CONTROL_RULES_SOURCE = os.getenv("FRUITFUL_CONTROL_RULES_SOURCE", "files")
+# How often each worker checks the source revision; 0 disables the background reload.
+FRUITFUL_CONTROL_RULES_POLL_SECONDS = float(os.getenv("FRUITFUL_CONTROL_RULES_POLL_SECONDS", "5"))
+
+# --- Background jobs (see jobs.py) ---
+# Jobs each API worker process runs at once (threads; CSV ingestion is mostly DB-bound). 0 disables the worker.
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "2"))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1.0"))
+# A running job whose worker stops reporting progress for this long is claimed again.
+JOBS_LEASE_SECONDS = float(os.getenv("JOBS_LEASE_SECONDS", "120"))
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "3"))
+JOBS_BACKOFF_BASE = float(os.getenv("JOBS_BACKOFF_BASE", "5"))
+JOBS_BACKOFF_MAX = float(os.getenv("JOBS_BACKOFF_MAX", "300"))
+# GET /admin/jobs/{id}/events: DB poll interval and keep-alive comment interval.
+JOBS_EVENTS_POLL_SECONDS = float(os.getenv("JOBS_EVENTS_POLL_SECONDS", "0.5"))
+JOBS_EVENTS_KEEPALIVE_SECONDS = float(os.getenv("JOBS_EVENTS_KEEPALIVE_SECONDS", "15"))
+
+# --- Chunked uploads (see upload_spool.py) ---
+# Shared by every API worker on the host; use shared storage when running several hosts.
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "fruitful-upload-spool"))
+# Suggested to clients; stays under typical proxy body limits (e.g. 4.5 MB on Vercel functions).
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(4 * 1024 * 1024)))
+UPLOAD_CHUNK_MAX_BYTES = int(os.getenv("UPLOAD_CHUNK_MAX_BYTES", str(8 * 1024 * 1024)))
+# 4096 x 4 MB = 16 GB: effectively "no limit" for monthly exports, but bounded.
+UPLOAD_MAX_CHUNKS = int(os.getenv("UPLOAD_MAX_CHUNKS", "4096"))
+# Sessions idle this long are deleted; finalized ones wait this long for their ingestion job.
+UPLOAD_SESSION_TTL_SECONDS = float(os.getenv("UPLOAD_SESSION_TTL_SECONDS", str(24 * 3600)))
+UPLOAD_FINALIZED_TTL_SECONDS = float(os.getenv("UPLOAD_FINALIZED_TTL_SECONDS", str(7 * 24 * 3600)))
+UPLOAD_SWEEP_INTERVAL_SECONDS = float(os.getenv("UPLOAD_SWEEP_INTERVAL_SECONDS", "600"))
+
+# --- Compression (see content_encoding.py) ---
+# Decompression-bomb guard for .csv.gz / .csv.zst uploads: absolute size and expansion ratio.
+UPLOAD_MAX_DECOMPRESSED_BYTES = int(os.getenv("UPLOAD_MAX_DECOMPRESSED_BYTES", str(2 * 1024 ** 3)))
+UPLOAD_MAX_COMPRESSION_RATIO = float(os.getenv("UPLOAD_MAX_COMPRESSION_RATIO", "200"))
+# Smaller response bodies go out uncompressed; gzip/zstd don't pay off on a few hundred bytes.
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "5"))
+RESPONSE_ZSTD_LEVEL = int(os.getenv("RESPONSE_ZSTD_LEVEL", "3"))
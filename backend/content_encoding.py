@@ -0,0 +1,364 @@
+# backend/content_encoding.py
+"""
+gzip / zstd on both sides of the API.
+
+Uploads: a stats export may arrive compressed (".csv.gz" / ".csv.zst", a
+Content-Encoding on the file part, or just the magic bytes). `upload_encoding`
+works out which, and `open_decoded` wraps the stored bytes in a stream that
+decompresses as the CSV reader pulls from it, so the plain file never sits in
+memory or on disk. The compressed bytes are what gets stored (job input or
+spool chunks). Decompression is capped at UPLOAD_MAX_DECOMPRESSED_BYTES and
+UPLOAD_MAX_COMPRESSION_RATIO: a small file that expands without bound is a
+decompression bomb and fails with DecompressionBomb instead of exhausting
+memory or disk.
+
+Responses: `CompressionMiddleware` (a plain ASGI middleware, like
+metrics.MetricsMiddleware) compresses text/JSON bodies with whichever of
+zstd / gzip the client prefers in Accept-Encoding. Bodies under
+RESPONSE_COMPRESSION_MIN_BYTES go out as they are (not worth the CPU or the
+framing), as do event streams, which must reach the client unbuffered.
+
+zstd needs the optional `zstandard` package (`uv sync --extra zstd`); without
+it zstd uploads are refused with a clear error and responses use gzip.
+"""
+
+import asyncio
+import gzip
+import io
+import zlib
+from typing import IO, Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+
+import config
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip covers every browser
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+_MAGIC = ((b"\x1f\x8b", GZIP), (b"\x28\xb5\x2f\xfd", ZSTD))
+_SUFFIXES = ((".gz", GZIP), (".gzip", GZIP), (".zst", ZSTD), (".zstd", ZSTD))
+_HEADER_NAMES = {"gzip": GZIP, "x-gzip": GZIP, "zstd": ZSTD}
+
+_READ_CHUNK = 1024 * 1024
+_IN_CHUNK = 64 * 1024
+# Below this much output the ratio isn't checked: tiny, very repetitive files are fine.
+_RATIO_FLOOR = 8 * 1024 * 1024
+
+
+class UnsupportedEncoding(ValueError):
+    """A compression we can't read."""
+
+
+class DecompressionError(ValueError):
+    """Corrupt or truncated compressed data."""
+
+
+class DecompressionBomb(DecompressionError):
+    """Compressed data that expands past the configured limits."""
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Encodings this process can read and write, most preferred first."""
+    return (ZSTD, GZIP) if zstandard is not None else (GZIP,)
+
+
+# -----------------------------
+# Uploads
+# -----------------------------
+
+
+def upload_encoding(
+        *,
+        filename: str | None = None,
+        content_encoding: str | None = None,
+        head: bytes = b"",
+) -> str | None:
+    """
+    How an uploaded file is compressed: GZIP, ZSTD, or None for a plain file.
+
+    An explicit Content-Encoding wins, then the file name's suffix, then the
+    first bytes (`head`, 4 are enough). Raises UnsupportedEncoding otherwise.
+    """
+    encoding = None
+    if content_encoding and content_encoding.strip().lower() != "identity":
+        encoding = _HEADER_NAMES.get(content_encoding.strip().lower())
+        if encoding is None:
+            raise UnsupportedEncoding(f"Unsupported Content-Encoding: {content_encoding}")
+    if encoding is None and filename:
+        encoding = next((enc for suffix, enc in _SUFFIXES if filename.lower().endswith(suffix)), None)
+    if encoding is None:
+        encoding = next((enc for magic, enc in _MAGIC if head.startswith(magic)), None)
+    if encoding == ZSTD and zstandard is None:
+        raise UnsupportedEncoding("zstd-compressed uploads aren't supported here; send the CSV or a .csv.gz")
+    return encoding
+
+
+class _RawSource:
+    """The compressed input, counted (for the ratio check) and optionally tapped."""
+
+    def __init__(self, fp: IO[bytes], on_read: Callable[[bytes], None] | None):
+        self._fp = fp
+        self._on_read = on_read
+        self.count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._fp.read(size)
+        self.count += len(data)
+        if data and self._on_read is not None:
+            self._on_read(data)
+        return data
+
+
+class _DecodingReader(io.RawIOBase):
+    """Decompresses `fp` as it is read. Doesn't close `fp`; its owner does."""
+
+    def __init__(self, fp: IO[bytes], encoding: str, *, max_size: int, max_ratio: float, on_raw):
+        self._raw = _RawSource(fp, on_raw)
+        self._encoding = encoding
+        self._max_size = max_size
+        self._max_ratio = max_ratio
+        self._out = 0
+        if encoding == GZIP:
+            self._gz = zlib.decompressobj(wbits=31)
+            self._tail = b""
+        else:
+            self._zst = zstandard.ZstdDecompressor().stream_reader(
+                self._raw, read_size=_IN_CHUNK, read_across_frames=True, closefd=False
+            )
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._encoding == GZIP:
+            out = self._read_gzip(len(buffer))
+        else:
+            try:
+                out = self._zst.read(len(buffer))
+            except zstandard.ZstdError as exc:
+                raise DecompressionError(f"Not valid zstd data: {exc}") from exc
+        n = len(out)
+        if n:
+            buffer[:n] = out
+            self._check(n)
+        return n
+
+    def _read_gzip(self, size: int) -> bytes:
+        while True:
+            if not self._tail:
+                self._tail = self._raw.read(_IN_CHUNK)
+                if not self._tail:
+                    if not self._gz.eof:
+                        raise DecompressionError("The compressed file is truncated")
+                    return b""
+            if self._gz.eof:  # a multi-member gzip: another member follows
+                if not self._tail.strip(b"\0"):  # ...or just padding
+                    self._tail = b""
+                    continue
+                self._gz = zlib.decompressobj(wbits=31)
+            try:
+                # max_length bounds what one small input can expand to per call.
+                out = self._gz.decompress(self._tail, size)
+            except zlib.error as exc:
+                raise DecompressionError(f"Not valid gzip data: {exc}") from exc
+            self._tail = self._gz.unused_data if self._gz.eof else self._gz.unconsumed_tail
+            if out:
+                return out
+
+    def _check(self, n: int) -> None:
+        self._out += n
+        if self._out > self._max_size:
+            raise DecompressionBomb(f"The file is larger than {self._max_size} bytes once decompressed")
+        if self._out > _RATIO_FLOOR and self._out > self._max_ratio * max(self._raw.count, 1):
+            raise DecompressionBomb(f"The file expands more than {self._max_ratio:g}x when decompressed")
+
+
+def open_decoded(
+        fp: IO[bytes],
+        encoding: str | None,
+        *,
+        max_size: int | None = None,
+        max_ratio: float | None = None,
+        on_raw: Callable[[bytes], None] | None = None,
+) -> IO[bytes]:
+    """
+    `fp` decompressed on the fly (or `fp` itself when `encoding` is None).
+
+    `on_raw` sees every compressed chunk read, e.g. to checksum the file as
+    sent in the same pass. Closing the result leaves `fp` open.
+    """
+    if encoding is None:
+        return fp
+    if encoding not in available_encodings():
+        raise UnsupportedEncoding(f"Unsupported encoding: {encoding}")
+    reader = _DecodingReader(
+        fp,
+        encoding,
+        max_size=config.UPLOAD_MAX_DECOMPRESSED_BYTES if max_size is None else max_size,
+        max_ratio=config.UPLOAD_MAX_COMPRESSION_RATIO if max_ratio is None else max_ratio,
+        on_raw=on_raw,
+    )
+    return io.BufferedReader(reader, buffer_size=_READ_CHUNK)
+
+
+# -----------------------------
+# Responses
+# -----------------------------
+
+_COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+# Compressing this much in one go would hold up the event loop; zlib/zstd release the GIL.
+_OFFLOAD_BYTES = 256 * 1024
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """The encoding to answer with: the client's highest q among ours, ties to our preference."""
+    if not accept_encoding:
+        return None
+    q_by_name: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            q_by_name[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = q_by_name.get(encoding, q_by_name.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in _COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+def _compress(encoding: str, body: bytes, level: int) -> bytes:
+    if encoding == ZSTD:
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class _StreamCompressor:
+    """For streamed bodies: each chunk is flushed so the client sees it promptly."""
+
+    def __init__(self, encoding: str, level: int):
+        if encoding == ZSTD:
+            self._c = zstandard.ZstdCompressor(level=level).compressobj()
+            self._sync = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            self._c = zlib.compressobj(level, zlib.DEFLATED, 31)
+            self._sync = zlib.Z_SYNC_FLUSH
+
+    def compress(self, data: bytes, last: bool) -> bytes:
+        out = self._c.compress(data)
+        return out + (self._c.flush() if last else self._c.flush(self._sync))
+
+
+class CompressionMiddleware:
+    def __init__(
+            self,
+            app,
+            *,
+            minimum_size: int = config.RESPONSE_COMPRESSION_MIN_BYTES,
+            gzip_level: int = config.RESPONSE_GZIP_LEVEL,
+            zstd_level: int = config.RESPONSE_ZSTD_LEVEL,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {GZIP: gzip_level, ZSTD: zstd_level}
+
+    async def __call__(self, scope, receive, send):
+        encoding = None
+        if scope["type"] == "http":
+            encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        level = self.levels[encoding]
+        start: dict | None = None  # held back until we know the body
+        stream: _StreamCompressor | None = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, stream, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                passthrough = True
+                if start is not None:
+                    await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if stream is not None:
+                await send({**message, "body": stream.compress(body, last=not more)})
+                return
+
+            headers = MutableHeaders(scope=start)
+            eligible = (
+                    start["status"] not in (204, 206, 304)
+                    and "content-encoding" not in headers
+                    and "no-transform" not in headers.get("cache-control", "")
+                    and _compressible(headers.get("content-type", ""))
+            )
+            if eligible:
+                headers.add_vary_header("Accept-Encoding")
+            if not eligible or (not more and len(body) < self.minimum_size):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if more:  # streamed: size unknown, compress as it goes
+                stream = _StreamCompressor(encoding, level)
+                del headers["content-length"]
+                headers["Content-Encoding"] = encoding
+                await send(start)
+                await send({**message, "body": stream.compress(body, last=False)})
+                return
+
+            if len(body) >= _OFFLOAD_BYTES:
+                compressed = await asyncio.to_thread(_compress, encoding, body, level)
+            else:
+                compressed = _compress(encoding, body, level)
+            if len(compressed) < len(body):
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(compressed))
+                body = compressed
+            passthrough = True
+            await send(start)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,18 +1,82 @@
 # backend/db.py
+"""
+Engine and session factory, built on first use rather than at import.
+
+Importing this module (and therefore models, routers, main) needs neither
+DATABASE_URL nor the DB driver; the URL is checked and the engine created the
+first time something actually talks to the database. `engine` and
+`DATABASE_URL` are still importable by name for existing callers, but new code
+should call `get_engine()` inside functions so imports stay cheap.
+
+The engine is per process: a forked child drops the inherited one (without
+closing the parent's sockets) and builds its own on first use.
+"""
+
 import os
-from dotenv import load_dotenv, find_dotenv
+from functools import lru_cache
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+
+import config  # loads .env.local / .env
 
-# Load .env.local first, then .env. Do NOT override already-set env vars (Railway).
-load_dotenv(find_dotenv(".env.local"), override=False)
-load_dotenv(find_dotenv(".env"), override=False)
+Base = declarative_base()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise RuntimeError("DATABASE_URL is not set")
 
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_database_url() -> str:
+    url = os.getenv("DATABASE_URL")
+    if not url:
+        raise RuntimeError("DATABASE_URL is not set")
+    return url
 
-Base = declarative_base()
+
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    url = get_database_url()
+    if make_url(url).get_backend_name() == "sqlite":
+        return create_engine(url, echo=config.DB_ECHO)
+    return create_engine(
+        url,
+        echo=config.DB_ECHO,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+    )
+
+
+@lru_cache(maxsize=1)
+def _session_factory() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+def SessionLocal() -> Session:
+    """Drop-in for the former module-level sessionmaker: `db = SessionLocal()`."""
+    return _session_factory()()
+
+
+def reset_engine(*, close: bool = True) -> None:
+    """
+    Dispose of the engine and forget it, so the next use builds a fresh one.
+
+    In a freshly forked child pass close=False: the inherited connections belong
+    to the parent and must be dropped, not closed.
+    """
+    if get_engine.cache_info().currsize:
+        get_engine().dispose(close=close)
+    get_engine.cache_clear()
+    _session_factory.cache_clear()
+
+
+# Covers fork-based servers/pools (gunicorn --preload, multiprocessing "fork").
+os.register_at_fork(after_in_child=lambda: reset_engine(close=False))
+
+
+def __getattr__(name: str):
+    # Lazy module attributes (PEP 562) for `from db import engine / DATABASE_URL`.
+    if name == "engine":
+        return get_engine()
+    if name == "DATABASE_URL":
+        return get_database_url()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,235 @@
+# backend/experiment_events.py
+"""
+In-process buffer for experiment exposure/conversion events.
+
+The request path only appends to a bounded in-memory ring (no DB access); a
+background task flushes to Postgres in multi-row batches when either
+`flush_size` events are waiting or `flush_interval` seconds have passed.
+
+- Backpressure: `offer()` is all-or-nothing and returns False when the ring is
+  full, so the endpoint can answer 503 + Retry-After instead of growing memory.
+- Failed flushes put the batch back at the head of the ring (if it still fits)
+  and are retried on the next tick. After `flush_retries` failures the failed
+  span is retried in halves, down to single events. A single event that fails
+  while the events after it write fine can never be written: it is dropped,
+  logged and counted (`dead_lettered`), so one bad row can't block the rest.
+  When everything fails (the database is down) nothing is dropped.
+- `stop()` (called from the FastAPI lifespan) drains everything before exit.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Callable, Iterable
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from config import (
+    EXPERIMENT_EVENTS_BUFFER_SIZE,
+    EXPERIMENT_EVENTS_FLUSH_INTERVAL,
+    EXPERIMENT_EVENTS_FLUSH_RETRIES,
+    EXPERIMENT_EVENTS_FLUSH_SIZE,
+)
+from db import get_engine
+import models
+
+logger = logging.getLogger(__name__)
+
+EVENT_COLUMNS = (
+    "event_id",
+    "type",
+    "experiment_key",
+    "variant",
+    "event_name",
+    "attributes",
+    "source",
+    "occurred_at",
+)
+
+_COPY_SQL = f"COPY {models.ExperimentEvent.__tablename__} ({', '.join(EVENT_COLUMNS)}) FROM STDIN"
+
+
+def write_events(rows: list[dict], bind: Engine | None = None) -> None:
+    """
+    Persist one batch in a single transaction.
+
+    Uses COPY on psycopg/Postgres, and a multi-row INSERT elsewhere (SQLite in tests).
+    """
+    bind = bind or get_engine()
+    with bind.begin() as conn:
+        if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg":
+            with conn.connection.driver_connection.cursor() as cur:
+                with cur.copy(_COPY_SQL) as copy:
+                    for r in rows:
+                        attrs = r.get("attributes")
+                        copy.write_row(
+                            tuple(
+                                (json.dumps(attrs) if attrs is not None else None)
+                                if col == "attributes"
+                                else r.get(col)
+                                for col in EVENT_COLUMNS
+                            )
+                        )
+        else:
+            conn.execute(
+                insert(models.ExperimentEvent.__table__),
+                [{col: r.get(col) for col in EVENT_COLUMNS} for r in rows],
+            )
+
+
+class ExperimentEventBuffer:
+    def __init__(
+            self,
+            *,
+            capacity: int = EXPERIMENT_EVENTS_BUFFER_SIZE,
+            flush_size: int = EXPERIMENT_EVENTS_FLUSH_SIZE,
+            flush_interval: float = EXPERIMENT_EVENTS_FLUSH_INTERVAL,
+            flush_retries: int = EXPERIMENT_EVENTS_FLUSH_RETRIES,
+            writer: Callable[[list[dict]], None] = write_events,
+    ):
+        if capacity < flush_size or flush_size < 1:
+            raise ValueError("capacity must be >= flush_size >= 1")
+        self.capacity = capacity
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.flush_retries = flush_retries
+        self._writer = writer
+        # Consecutive failures at the head of the ring, and how many events the failed batch covered.
+        self._failures = 0
+        self._failed_span = 0
+
+        self._ring: deque[dict] = deque()
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+        self.accepted = 0
+        self.rejected = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.dead_lettered = 0
+        self.flush_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    # ---- request path ----
+
+    def offer(self, events: Iterable[dict]) -> bool:
+        """Append events, or refuse the whole batch if it does not fit."""
+        events = list(events)
+        if len(self._ring) + len(events) > self.capacity:
+            self.rejected += len(events)
+            return False
+        self._ring.extend(events)
+        self.accepted += len(events)
+        if len(self._ring) >= self.flush_size:
+            self._wake.set()
+        return True
+
+    # ---- background flushing ----
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            # Fresh primitives: the lifespan may run on a different loop than a previous start().
+            self._wake = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run(), name="experiment-events-flusher")
+
+    async def stop(self) -> None:
+        """Stop the flusher and drain whatever is still buffered."""
+        self._stopping = True
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+        if self._ring:
+            logger.error("experiment events: %d event(s) left unflushed at shutdown", len(self._ring))
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def _batch_size(self) -> int:
+        size = self.flush_size
+        if self._failures > self.flush_retries:  # bisecting a span that keeps failing
+            size >>= self._failures - self.flush_retries
+        if self._failed_span:
+            size = min(size, self._failed_span)
+        return max(1, min(size, len(self._ring)))
+
+    async def flush(self) -> int:
+        """Write out everything currently buffered, batch by batch. Returns events written."""
+        written = 0
+        suspect: dict | None = None  # a single event that failed; bad if what follows it writes
+        async with self._flush_lock:
+            while self._ring:
+                n = self._batch_size()
+                batch = [self._ring.popleft() for _ in range(n)]
+                try:
+                    await asyncio.to_thread(self._writer, batch)
+                except Exception:
+                    self.flush_errors += 1
+                    logger.exception("experiment events: flush of %d event(s) failed", len(batch))
+                    self._failures += 1
+                    self._failed_span = self._failed_span or n
+                    if n == 1 and self._failures > self.flush_retries and suspect is None:
+                        suspect = batch[0]
+                        self._failed_span -= 1
+                        continue
+                    self._requeue(batch)
+                    break
+                written += len(batch)
+                self.flushed += len(batch)
+                self._consume_failed_span(n)
+                if suspect is not None:
+                    self._dead_letter(suspect)
+                    suspect = None
+            if suspect is not None:  # nothing after it got through: can't tell, keep it
+                self._requeue([suspect])
+                self._failed_span += 1
+        return written
+
+    def _consume_failed_span(self, n: int) -> None:
+        if self._failed_span:
+            self._failed_span = max(0, self._failed_span - n)
+        if not self._failed_span:
+            self._failures = 0
+
+    def _dead_letter(self, event: dict) -> None:
+        self.dead_lettered += 1
+        logger.error("experiment events: dropping an event that can't be written: %.500r", event)
+
+    def _requeue(self, batch: list[dict]) -> None:
+        room = self.capacity - len(self._ring)
+        if room < len(batch):
+            # Newer events win; the oldest part of the failed batch is dropped.
+            self.dropped += len(batch) - room
+            batch = batch[len(batch) - room:] if room > 0 else []
+        self._ring.extendleft(reversed(batch))
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._ring),
+            "capacity": self.capacity,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "dead_lettered": self.dead_lettered,
+            "flush_errors": self.flush_errors,
+        }
+
+
+# One buffer per worker process; started/drained by main.lifespan.
+event_buffer = ExperimentEventBuffer()
@@ -0,0 +1,339 @@
+# backend/experiment_stats.py
+"""
+Experiment results: daily counters + conversion statistics.
+
+Raw events (experiment_events) are folded into experiment_daily_counters by
+`compact_events()`, which walks new rows by id past a stored high-water mark.
+Results then only read counters (days x variants x events), never raw events.
+
+- Duplicates: an event whose event_id already appeared on an earlier row is
+  skipped, whether that earlier row was compacted in this run or long ago.
+- Out-of-order delivery: counters are keyed by the event's own UTC day, so a
+  late event simply increments an older day.
+- Only events carrying both experiment_key and variant are attributable; others
+  are ignored here.
+
+`counter_compactor` runs compaction every EXPERIMENT_COMPACT_INTERVAL_SECONDS
+in each API worker (started from main.lifespan); concurrent runs are safe.
+POST /admin/experiments/compact and the CLI remain for an immediate run or a
+full rebuild.
+"""
+
+import asyncio
+import logging
+import math
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import Date, and_, case, cast, delete, exists, func, literal, or_, select
+from sqlalchemy.orm import Session
+
+import config
+import models
+from db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+CURSOR_NAME = "experiment_daily_counters"
+EXPOSURE = "exposure"
+
+# Rows younger than this are left for the next run, so ids committed out of
+# order by concurrent flushers are not skipped past.
+DEFAULT_SETTLE_SECONDS = 5.0
+DEFAULT_CHUNK_SIZE = 50_000
+
+Z_95 = 1.959963984540054
+
+
+# -----------------------------
+# Compaction (raw events -> daily counters)
+# -----------------------------
+
+
+def _day_expr(dialect_name: str, col):
+    if dialect_name == "postgresql":
+        return cast(func.timezone("UTC", col), Date)
+    return func.date(col, type_=Date)
+
+
+def _upsert_counters(db: Session, rows: list[dict]) -> None:
+    # Dialect modules are imported here, not at module load: only compaction needs them.
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f"Counter upsert not supported on {dialect_name!r}")
+
+    table = models.ExperimentDailyCounter.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["experiment_key", "variant", "event_name", "day"],
+        set_={"count": table.c.count + stmt.excluded.count, "updated_at": func.now()},
+    )
+    db.execute(stmt, rows)
+
+
+def _lock_cursor(db: Session) -> models.ExperimentAggregationCursor:
+    cursor = db.get(
+        models.ExperimentAggregationCursor,
+        CURSOR_NAME,
+        with_for_update=True,
+        populate_existing=True,
+    )
+    if cursor is None:
+        cursor = models.ExperimentAggregationCursor(name=CURSOR_NAME, last_event_id=0)
+        db.add(cursor)
+        db.flush()
+    return cursor
+
+
+def _aggregate_range(db: Session, lo: int, hi: int) -> list[dict]:
+    events = models.ExperimentEvent.__table__
+    e = events.alias("e")
+    earlier = events.alias("earlier")
+
+    event_label = case(
+        (e.c.type == EXPOSURE, literal(EXPOSURE)),
+        else_=func.coalesce(e.c.event_name, literal("conversion")),
+    )
+    day = _day_expr(db.get_bind().dialect.name, e.c.occurred_at)
+    is_first_delivery = or_(
+        e.c.event_id.is_(None),
+        ~exists().where(and_(earlier.c.event_id == e.c.event_id, earlier.c.id < e.c.id)),
+    )
+
+    stmt = (
+        select(e.c.experiment_key, e.c.variant, event_label, day, func.count())
+        .where(
+            e.c.id > lo,
+            e.c.id <= hi,
+            e.c.experiment_key.is_not(None),
+            e.c.variant.is_not(None),
+            is_first_delivery,
+        )
+        .group_by(e.c.experiment_key, e.c.variant, event_label, day)
+    )
+    return [
+        {"experiment_key": k, "variant": v, "event_name": name, "day": d, "count": n}
+        for k, v, name, d, n in db.execute(stmt)
+    ]
+
+
+def compact_events(
+        db: Session,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+) -> dict:
+    """
+    Fold raw events past the high-water mark into the daily counters.
+
+    Each id chunk is aggregated in SQL, upserted, and committed together with the
+    advanced cursor, so a crash never double-counts. Safe to run concurrently
+    (the cursor row is locked per chunk on Postgres).
+    """
+    events = models.ExperimentEvent.__table__
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settle_seconds)
+    upper = db.scalar(select(func.max(events.c.id)).where(events.c.created_at <= cutoff)) or 0
+
+    processed_ids = 0
+    counters = 0
+    while True:
+        cursor = _lock_cursor(db)
+        lo = cursor.last_event_id
+        if lo >= upper:
+            db.commit()
+            break
+        hi = min(lo + chunk_size, upper)
+
+        rows = _aggregate_range(db, lo, hi)
+        if rows:
+            _upsert_counters(db, rows)
+        cursor.last_event_id = hi
+        db.commit()
+
+        processed_ids += hi - lo
+        counters += len(rows)
+
+    return {"last_event_id": max(upper, 0), "id_span": processed_ids, "counter_rows": counters}
+
+
+class CounterCompactor:
+    """Folds new events into the counters periodically, so results keep up without a cron."""
+
+    def __init__(
+            self,
+            *,
+            interval: float = config.EXPERIMENT_COMPACT_INTERVAL_SECONDS,
+            settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+            session_factory=SessionLocal,
+    ):
+        self.interval = interval
+        self.settle_seconds = settle_seconds
+        self.session_factory = session_factory
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self.runs = 0
+        self.errors = 0
+
+    async def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._stop = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="experiment-counter-compactor")
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.interval)
+            except TimeoutError:
+                pass
+            if self._stop.is_set():
+                break
+            await self.run_once()
+
+    async def run_once(self) -> dict | None:
+        try:
+            result = await asyncio.to_thread(self._compact)
+        except Exception:
+            # The next tick picks up where this one stopped (the cursor only moves on commit).
+            self.errors += 1
+            logger.exception("experiment stats: counter compaction failed")
+            return None
+        self.runs += 1
+        return result
+
+    def _compact(self) -> dict:
+        db = self.session_factory()
+        try:
+            return compact_events(db, settle_seconds=self.settle_seconds)
+        finally:
+            db.close()
+
+
+# One per worker process; started/stopped by main.lifespan.
+counter_compactor = CounterCompactor()
+
+
+def rebuild_counters(db: Session, **kwargs) -> dict:
+    """Drop all counters and recompute them from the raw events (backfill)."""
+    cursor = _lock_cursor(db)
+    db.execute(delete(models.ExperimentDailyCounter))
+    cursor.last_event_id = 0
+    db.commit()
+    return compact_events(db, **kwargs)
+
+
+# -----------------------------
+# Statistics
+# -----------------------------
+
+
+def load_totals(
+        db: Session,
+        experiment_key: str,
+        *,
+        start: date | None = None,
+        end: date | None = None,
+) -> list[tuple[str, str, int]]:
+    """(variant, event_name, count) summed over the day range, straight from counters."""
+    c = models.ExperimentDailyCounter
+    stmt = (
+        select(c.variant, c.event_name, func.sum(c.count))
+        .where(c.experiment_key == experiment_key)
+        .group_by(c.variant, c.event_name)
+    )
+    if start is not None:
+        stmt = stmt.where(c.day >= start)
+    if end is not None:
+        stmt = stmt.where(c.day <= end)
+    return [(v, name, int(n)) for v, name, n in db.execute(stmt)]
+
+
+def _wilson(x: int, n: int, z: float) -> tuple[float | None, float | None]:
+    if n == 0:
+        return None, None
+    p = min(x, n) / n
+    z2 = z * z
+    denom = 1 + z2 / n
+    centre = (p + z2 / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def _compare(x: int, n: int, xc: int, nc: int, z: float) -> dict:
+    """Absolute/relative lift vs control, Wald CI on the difference, pooled two-proportion z-test."""
+    if n == 0 or nc == 0:
+        return {"lift_abs": None, "lift_abs_ci_low": None, "lift_abs_ci_high": None, "lift_rel": None,
+                "p_value": None}
+    p, pc = min(x, n) / n, min(xc, nc) / nc
+    diff = p - pc
+    se = math.sqrt(p * (1 - p) / n + pc * (1 - pc) / nc)
+    pooled = (x + xc) / (n + nc)
+    se0 = math.sqrt(pooled * (1 - pooled) * (1 / n + 1 / nc))
+    p_value = math.erfc(abs(diff / se0) / math.sqrt(2)) if se0 > 0 else 1.0
+    return {
+        "lift_abs": diff,
+        "lift_abs_ci_low": diff - z * se,
+        "lift_abs_ci_high": diff + z * se,
+        "lift_rel": diff / pc if pc > 0 else None,
+        "p_value": p_value,
+    }
+
+
+def summarize(
+        totals: list[tuple[str, str, int]],
+        *,
+        control: str | None = None,
+        z: float = Z_95,
+) -> dict:
+    """
+    Conversion rate per (variant, conversion event) with Wilson CIs and lift vs control.
+
+    Works column-wise: one pass builds exposure/conversion columns over all
+    variants, then each metric is derived for every variant at once.
+    """
+    counts: dict[tuple[str, str], int] = {(v, name): n for v, name, n in totals}
+    variants = sorted({v for v, _, _ in totals})
+    event_names = sorted({name for _, name, _ in totals if name != EXPOSURE})
+    if control is None or control not in variants:
+        control = variants[0] if variants else None
+
+    exposures = [counts.get((v, EXPOSURE), 0) for v in variants]
+    ci = variants.index(control) if control is not None else 0
+
+    metrics_by_variant: list[dict] = [{} for _ in variants]
+    for name in event_names:
+        conversions = [counts.get((v, name), 0) for v in variants]
+        # Exposures and conversions are logged (and flushed) independently, so a variant
+        # can show more conversions than exposures; rates are capped at 1 so the
+        # intervals stay in their domain.
+        rates = [min(x, n) / n if n else None for x, n in zip(conversions, exposures)]
+        intervals = [_wilson(x, n, z) for x, n in zip(conversions, exposures)]
+        comparisons = [
+            _compare(x, n, conversions[ci], exposures[ci], z) if i != ci else None
+            for i, (x, n) in enumerate(zip(conversions, exposures))
+        ]
+        for i in range(len(variants)):
+            metrics_by_variant[i][name] = {
+                "conversions": conversions[i],
+                "rate": rates[i],
+                "ci_low": intervals[i][0],
+                "ci_high": intervals[i][1],
+                **(comparisons[i] or {}),
+            }
+
+    return {
+        "control": control,
+        "confidence": round(math.erf(z / math.sqrt(2)), 4),
+        "variants": [
+            {"variant": v, "exposures": exposures[i], "metrics": metrics_by_variant[i]}
+            for i, v in enumerate(variants)
+        ],
+    }
@@ -0,0 +1,398 @@
+# backend/jobs.py
+"""
+Background jobs, queued in the database and run inside the API processes.
+
+No broker: the `jobs` table is the queue. A request inserts a row (with any
+uploaded file in `input`) and returns its id right away; every uvicorn worker
+runs a JobWorker that claims due rows with SELECT ... FOR UPDATE SKIP LOCKED
+(Postgres), so several processes share one queue without two of them ever
+taking the same job.
+
+- Claiming sets status "running", bumps `attempts` and gives the job a lease.
+  Progress updates extend the lease; a job whose worker died (deploy, OOM)
+  simply becomes claimable again once its lease runs out.
+- `attempts` doubles as a fencing token: progress and the final outcome are
+  written only while the row still carries the attempt that claimed it, so a
+  worker that lost its lease cannot overwrite a newer run.
+- Handlers run in a thread with their own session. A ValueError is a permanent
+  failure (bad input; retrying won't help); anything else is retried with
+  backoff up to `max_attempts`. Delivery is at-least-once, so handlers must be
+  safe to run twice.
+
+Handlers register with @job_handler("kind"); the module that defines them has
+to be imported by main (routers do this) for a worker to know the kind. A
+handler can also register an `on_failure` hook, run once when a job of its
+kind fails for good (bad input, retries used up, or its last worker vanished),
+so state the handler keeps outside the jobs table doesn't stay "in progress".
+GET /admin/jobs/{id} polls a job, /events streams its progress (routers/jobs.py).
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+import config
+import models
+from db import SessionLocal
+from lead_delivery import backoff_seconds
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+JobHandler = Callable[["JobContext"], dict | None]
+FailureHook = Callable[[Session, "ClaimedJob", str], None]
+_handlers: dict[str, JobHandler] = {}
+_failure_hooks: dict[str, FailureHook] = {}
+
+
+def job_handler(kind: str, *, on_failure: FailureHook | None = None) -> Callable[[JobHandler], JobHandler]:
+    """
+    Register the function that runs jobs of `kind`.
+
+    `on_failure(db, job, error)` runs after a job of this kind is marked failed
+    for good; it gets its own session and commits its own writes.
+    """
+
+    def register(fn: JobHandler) -> JobHandler:
+        if kind in _handlers and _handlers[kind] is not fn:
+            raise RuntimeError(f"Job kind {kind!r} already has a handler")
+        _handlers[kind] = fn
+        if on_failure is not None:
+            _failure_hooks[kind] = on_failure
+        return fn
+
+    return register
+
+
+def enqueue(
+        db: Session,
+        kind: str,
+        params: dict,
+        *,
+        input: bytes | None = None,
+        created_by: str | None = None,
+        max_attempts: int = config.JOBS_MAX_ATTEMPTS,
+        commit: bool = True,
+) -> models.Job:
+    """
+    Queue a job. Call job_worker.notify() afterwards to start it without waiting for a poll.
+
+    With commit=False the row is only flushed (id assigned), to commit with the caller's own writes.
+    """
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind {kind!r}")
+    job = models.Job(
+        kind=kind,
+        status="queued",
+        params=params,
+        input=input,
+        progress_done=0,
+        attempts=0,
+        max_attempts=max_attempts,
+        run_after=datetime.now(timezone.utc),
+        created_by=created_by,
+    )
+    db.add(job)
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return job
+
+
+class JobLeaseLost(RuntimeError):
+    """The job was claimed again by another worker; this run must stop."""
+
+
+@dataclass(frozen=True, slots=True)
+class ClaimedJob:
+    id: int
+    kind: str
+    params: dict
+    attempt: int
+    max_attempts: int
+
+
+class JobContext:
+    """What a handler gets: its params, its input, a session, and a way to report progress."""
+
+    def __init__(self, worker: "JobWorker", job: ClaimedJob, db: Session, input: bytes | None):
+        self._worker = worker
+        self._job = job
+        self._last_progress = 0.0
+        self.id = job.id
+        self.params = job.params
+        self.attempt = job.attempt
+        self.db = db
+        self.input = input
+
+    def progress(self, done: int, total: int | None = None, message: str | None = None, *, force: bool = False) -> None:
+        """Record progress (at most every progress_interval unless forced) and extend the lease."""
+        now = time.monotonic()
+        if not force and now - self._last_progress < self._worker.progress_interval:
+            return
+        self._last_progress = now
+        values = {"progress_done": done, "progress_total": total}
+        if message is not None:
+            values["progress_message"] = message[:255]
+        if not self._worker.write(self._job, **values):
+            raise JobLeaseLost(f"Job {self.id} was claimed by another worker")
+
+
+class JobWorker:
+    def __init__(
+            self,
+            *,
+            session_factory: Callable[[], Session] = SessionLocal,
+            concurrency: int = config.JOBS_CONCURRENCY,
+            poll_interval: float = config.JOBS_POLL_INTERVAL,
+            lease_seconds: float = config.JOBS_LEASE_SECONDS,
+            backoff_base: float = config.JOBS_BACKOFF_BASE,
+            backoff_max: float = config.JOBS_BACKOFF_MAX,
+            progress_interval: float = 0.5,
+    ):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.progress_interval = progress_interval
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+        self._stopping = False
+
+    async def start(self) -> None:
+        if self._task is not None or self.concurrency <= 0:
+            return
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="job-worker")
+
+    async def stop(self) -> None:
+        """Stop claiming and wait for the jobs already running here to finish."""
+        self._stopping = True
+        if self._wake is not None:
+            self._wake.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def notify(self) -> None:
+        """Wake the worker now (callable from the sync request threadpool)."""
+        if self._loop is not None and self._wake is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            free = self.concurrency - len(self._running)
+            claimed = []
+            if free > 0:
+                try:
+                    claimed = await asyncio.to_thread(self._claim, free)
+                except Exception:
+                    logger.exception("jobs: claim failed")
+            for job in claimed:
+                task = asyncio.create_task(self._execute(job), name=f"job-{job.id}")
+                self._running.add(task)
+                task.add_done_callback(self._finished)
+            if len(claimed) < free or free <= 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+                self._wake.clear()
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        if self._wake is not None:
+            self._wake.set()  # a slot opened up
+
+    async def run_once(self) -> int:
+        """Claim up to `concurrency` due jobs and run them to completion. Returns jobs handled."""
+        claimed = await asyncio.to_thread(self._claim, max(self.concurrency, 1))
+        await asyncio.gather(*(self._execute(job) for job in claimed))
+        return len(claimed)
+
+    def _claim(self, limit: int) -> list[ClaimedJob]:
+        j = models.Job
+        now = datetime.now(timezone.utc)
+        db = self.session_factory()
+        try:
+            rows = db.execute(
+                select(j.id, j.kind, j.params, j.attempts, j.max_attempts)
+                .where(
+                    or_(
+                        and_(j.status == "queued", j.run_after <= now),
+                        and_(j.status == "running", j.lease_expires_at <= now),  # its worker went away
+                    )
+                )
+                .order_by(j.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not rows:
+                db.rollback()
+                return []
+
+            claimed, exhausted = [], []
+            for r in rows:
+                if r.attempts >= r.max_attempts:
+                    exhausted.append(ClaimedJob(r.id, r.kind, r.params, r.attempts, r.max_attempts))
+                else:
+                    claimed.append(ClaimedJob(r.id, r.kind, r.params, r.attempts + 1, r.max_attempts))
+            if exhausted:
+                db.execute(
+                    update(j)
+                    .where(j.id.in_([e.id for e in exhausted]))
+                    .values(
+                        status="failed",
+                        error="Worker stopped responding on the last attempt",
+                        input=None,
+                        finished_at=now,
+                    )
+                )
+            if claimed:
+                db.execute(
+                    update(j)
+                    .where(j.id.in_([c.id for c in claimed]))
+                    .values(
+                        status="running",
+                        attempts=j.attempts + 1,
+                        lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                        started_at=now,
+                    )
+                )
+            db.commit()
+        finally:
+            db.close()
+        for job in exhausted:
+            self._gave_up(job, "Worker stopped responding on the last attempt")
+        return claimed
+
+    def write(self, job: ClaimedJob, **values: Any) -> bool:
+        """Update a running job if this attempt still owns it (extends the lease). False if it doesn't."""
+        j = models.Job
+        now = datetime.now(timezone.utc)
+        if values.get("status", "running") == "running":
+            values["lease_expires_at"] = now + timedelta(seconds=self.lease_seconds)
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(j)
+                .where(j.id == job.id, j.status == "running", j.attempts == job.attempt)
+                .values(**values)
+            )
+            db.commit()
+            return result.rowcount == 1
+        finally:
+            db.close()
+
+    async def _execute(self, job: ClaimedJob) -> None:
+        try:
+            await asyncio.to_thread(self._call, job)
+        except Exception:
+            logger.exception("jobs: recording the outcome of job %s failed", job.id)
+
+    def _call(self, job: ClaimedJob) -> None:
+        handler = _handlers.get(job.kind)
+        if handler is None:
+            self.write(
+                job,
+                status="failed",
+                error=f"No handler for job kind {job.kind!r}",
+                input=None,
+                finished_at=datetime.now(timezone.utc),
+            )
+            return
+
+        db = self.session_factory()
+        try:
+            data = db.scalar(select(models.Job.input).where(models.Job.id == job.id))
+            db.rollback()  # don't hold the read transaction open while the handler runs
+            result = handler(JobContext(self, job, db, data))
+        except JobLeaseLost:
+            logger.warning("jobs: job %s attempt %s lost its lease; abandoning it", job.id, job.attempt)
+            return
+        except Exception as exc:
+            db.rollback()
+            self._failed(job, exc)
+            return
+        finally:
+            db.close()
+
+        finished = self.write(
+            job, status="succeeded", result=result, error=None, input=None, finished_at=datetime.now(timezone.utc)
+        )
+        if not finished:
+            logger.warning("jobs: job %s attempt %s finished after losing its lease", job.id, job.attempt)
+
+    def _failed(self, job: ClaimedJob, exc: Exception) -> None:
+        error = str(exc) or exc.__class__.__name__
+        now = datetime.now(timezone.utc)
+        if isinstance(exc, ValueError) or job.attempt >= job.max_attempts:
+            if not isinstance(exc, ValueError):
+                logger.error("jobs: job %s (%s) failed after %d attempts: %s", job.id, job.kind, job.attempt, error)
+            if self.write(job, status="failed", error=error, input=None, finished_at=now):
+                self._gave_up(job, error)
+            return
+        logger.warning("jobs: job %s (%s) attempt %d failed, will retry: %s", job.id, job.kind, job.attempt, error)
+        delay = backoff_seconds(job.attempt, base=self.backoff_base, cap=self.backoff_max)
+        self.write(
+            job,
+            status="queued",
+            error=error,
+            run_after=now + timedelta(seconds=delay),
+            lease_expires_at=None,
+        )
+
+    def _gave_up(self, job: ClaimedJob, error: str) -> None:
+        """Run the kind's on_failure hook, if any. Its errors are logged, not raised."""
+        hook = _failure_hooks.get(job.kind)
+        if hook is None:
+            return
+        db = self.session_factory()
+        try:
+            hook(db, job, error)
+        except Exception:
+            db.rollback()
+            logger.exception("jobs: on_failure hook for job %s (%s) failed", job.id, job.kind)
+        finally:
+            db.close()
+
+
+def job_state(job: models.Job) -> dict:
+    """The JSON view of a job shared by GET /admin/jobs/{id} and its event stream."""
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": {
+            "done": job.progress_done,
+            "total": job.progress_total,
+            "message": job.progress_message,
+        },
+        "attempts": job.attempts,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+# One worker per API process; started/stopped by main.lifespan.
+job_worker = JobWorker()
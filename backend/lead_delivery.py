@@ -0,0 +1,459 @@
+# backend/lead_delivery.py
+"""
+Outbound lead delivery (transactional outbox + background worker).
+
+The capture endpoint writes the lead and a `lead_deliveries` row in one
+transaction and returns; nothing on the request path talks to the provider.
+
+The worker (started from main.lifespan):
+- claims up to `batch_size` due rows per round (FOR UPDATE SKIP LOCKED on
+  Postgres) by pushing next_attempt_at forward by a lease, so a crashed worker's
+  rows simply become due again;
+- sends them concurrently over one pooled keep-alive httpx.AsyncClient, each
+  with the row's Idempotency-Key, and checks MailerLite saved every field;
+- records all outcomes in one transaction: delivered, rescheduled with
+  exponential backoff + equal jitter, or moved to lead_delivery_dead_letters once
+  retries are exhausted (or the provider rejects the payload outright).
+"""
+
+import asyncio
+import logging
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Callable
+from urllib.parse import quote
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+import config
+from db import SessionLocal
+import models
+from tools.pinterest_fit.mailerlite import FIELD_NAMES
+
+if TYPE_CHECKING:
+    import httpx  # imported on first use; only needed once a provider is configured
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_MAILERLITE = "mailerlite"
+
+
+def backoff_seconds(attempt: int, *, base: float, cap: float, rng: Callable[[], float] = random.random) -> float:
+    """Exponential backoff with equal jitter: half the window fixed, half random."""
+    window = min(cap, base * 2 ** max(attempt - 1, 0))
+    return window / 2 + rng() * window / 2
+
+
+def enqueue_lead(
+        db: Session,
+        *,
+        tool: str,
+        email: str,
+        answers: dict,
+        provider: str,
+        payload: dict,
+        results: dict | None = None,
+        rules_version: str | None = None,
+        idempotency_key: str | None = None,
+) -> models.LeadDelivery:
+    """Persist a lead plus its outbound delivery in one transaction."""
+    now = datetime.now(timezone.utc)
+    lead = models.ToolLead(
+        tool=tool,
+        email=email,
+        answers=answers,
+        results=results,
+        rules_version=rules_version,
+        computed_at=now if results is not None else None,
+    )
+    db.add(lead)
+    db.flush()
+
+    delivery = models.LeadDelivery(
+        lead_id=lead.id,
+        provider=provider,
+        idempotency_key=idempotency_key or uuid.uuid4().hex,
+        payload=payload,
+        status="pending",
+        attempts=0,
+        next_attempt_at=now,
+    )
+    db.add(delivery)
+    db.commit()
+    return delivery
+
+
+# -----------------------------
+# Provider
+# -----------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class DeliveryOutcome:
+    ok: bool
+    retryable: bool = True
+    error: str | None = None
+
+
+class MailerLiteProvider:
+    """
+    Delivers one subscriber the way the old frontend route did:
+
+    1. resolve each field's key by name (GET /fields), creating missing fields;
+       resolved keys are cached for the life of the provider, i.e. per worker;
+    2. upsert the subscriber (POST /subscribers, with the Idempotency-Key);
+    3. write the fields again (PUT /subscribers/{id}) and assign each group
+       explicitly (POST /subscribers/{id}/groups/{group_id});
+    4. read the subscriber back and fail unless every field was saved.
+
+    Every step is idempotent, so a retry simply runs them all again.
+    """
+
+    name = PROVIDER_MAILERLITE
+
+    def __init__(
+            self,
+            *,
+            api_key: str,
+            base_url: str,
+            timeout: float = 10.0,
+            max_connections: int = 10,
+            field_names: dict[str, str] | None = None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        # fallback key -> custom field name; keys not listed are sent as they are
+        self.field_names = field_names or {}
+        self._field_keys: dict[str, str] = {}
+        self._fields_lock: asyncio.Lock | None = None
+        self._fields_loop: asyncio.AbstractEventLoop | None = None
+
+    def build_client(self) -> "httpx.AsyncClient":
+        import httpx
+
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={
+                "Accept": "application/json",
+                "Authorization": f"Bearer {self.api_key}",
+            },
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=60,
+            ),
+        )
+
+    async def deliver(self, client: "httpx.AsyncClient", payload: dict, idempotency_key: str) -> DeliveryOutcome:
+        keys = await self._resolve_field_keys(client, payload.get("fields") or {})
+        fields = {keys.get(key, key): value for key, value in (payload.get("fields") or {}).items()}
+
+        r, failed = await self._call(
+            client, "POST", "/subscribers",
+            json={**payload, "fields": fields},
+            headers={"Idempotency-Key": idempotency_key},
+        )
+        if failed:
+            return failed
+
+        subscriber_id = _data(r).get("id")
+        if not subscriber_id:
+            r, failed = await self._call(client, "GET", f"/subscribers/{quote(payload['email'], safe='')}")
+            if failed:
+                return failed
+            subscriber_id = _data(r).get("id")
+            if not subscriber_id:
+                return DeliveryOutcome(ok=False, error="MailerLite did not return a subscriber id")
+
+        if fields:
+            _, failed = await self._call(client, "PUT", f"/subscribers/{subscriber_id}", json={"fields": fields})
+            if failed:
+                return failed
+        for group_id in payload.get("groups") or []:
+            _, failed = await self._call(client, "POST", f"/subscribers/{subscriber_id}/groups/{group_id}")
+            if failed:
+                return failed
+
+        if fields:
+            r, failed = await self._call(client, "GET", f"/subscribers/{subscriber_id}")
+            if failed:
+                return failed
+            saved = _data(r).get("fields") or {}
+            missing = sorted(key for key, value in fields.items() if saved.get(key) != value)
+            if missing:
+                # A key may have been renamed or deleted since it was cached; look them up again next time.
+                self._field_keys.clear()
+                return DeliveryOutcome(ok=False, error=f"MailerLite did not save fields: {', '.join(missing)}")
+        return DeliveryOutcome(ok=True)
+
+    async def _resolve_field_keys(self, client: "httpx.AsyncClient", fields: dict) -> dict[str, str]:
+        """Fallback key -> MailerLite key for the named fields in `fields`; unresolved fields keep their fallback."""
+        wanted = [key for key in fields if key in self.field_names]
+        if all(key in self._field_keys for key in wanted):
+            return self._field_keys
+
+        loop = asyncio.get_running_loop()
+        if self._fields_loop is not loop:
+            self._fields_lock, self._fields_loop = asyncio.Lock(), loop
+        async with self._fields_lock:  # one lookup per worker, not one per delivery in the batch
+            missing = [key for key in wanted if key not in self._field_keys]
+            if not missing:
+                return self._field_keys
+
+            r, failed = await self._call(client, "GET", "/fields", params={"limit": 100})
+            if failed:
+                logger.warning("lead delivery: MailerLite field lookup failed: %s", failed.error)
+                return self._field_keys
+            existing = _data_list(r)
+            for key in missing:
+                name = self.field_names[key]
+                match = next(
+                    (
+                        f for f in existing
+                        if str(f.get("name") or "").lower() == name.lower() or f.get("key") == key
+                    ),
+                    None,
+                )
+                if match is None:
+                    r, failed = await self._call(client, "POST", "/fields", json={"name": name, "type": "text"})
+                    if failed:
+                        logger.warning("lead delivery: could not create MailerLite field %r: %s", name, failed.error)
+                        continue  # keep the fallback key uncached; the next delivery tries again
+                    match = _data(r)
+                if match.get("key"):
+                    self._field_keys[key] = match["key"]
+        return self._field_keys
+
+    async def _call(
+            self,
+            client: "httpx.AsyncClient",
+            method: str,
+            url: str,
+            **kwargs,
+    ) -> tuple["httpx.Response | None", DeliveryOutcome | None]:
+        """Send one request; returns (response, None) on 2xx, else (response or None, failed outcome)."""
+        import httpx
+
+        try:
+            r = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            return None, DeliveryOutcome(ok=False, error=f"{type(exc).__name__} on {method} {url}: {exc}")
+        if r.is_success:
+            return r, None
+        retryable = r.status_code in (408, 429) or r.status_code >= 500
+        return r, DeliveryOutcome(
+            ok=False,
+            retryable=retryable,
+            error=f"HTTP {r.status_code} on {method} {url}: {r.text[:500]}",
+        )
+
+
+def _data(r: "httpx.Response") -> dict:
+    try:
+        data = r.json().get("data")
+    except (ValueError, AttributeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _data_list(r: "httpx.Response") -> list[dict]:
+    try:
+        data = r.json().get("data")
+    except (ValueError, AttributeError):
+        return []
+    return [f for f in data if isinstance(f, dict)] if isinstance(data, list) else []
+
+
+# -----------------------------
+# Worker
+# -----------------------------
+
+
+class LeadDeliveryWorker:
+    def __init__(
+            self,
+            provider: MailerLiteProvider,
+            *,
+            session_factory: Callable[[], Session] = SessionLocal,
+            batch_size: int = config.LEAD_DELIVERY_BATCH_SIZE,
+            max_attempts: int = config.LEAD_DELIVERY_MAX_ATTEMPTS,
+            backoff_base: float = config.LEAD_DELIVERY_BACKOFF_BASE,
+            backoff_max: float = config.LEAD_DELIVERY_BACKOFF_MAX,
+            lease_seconds: float = config.LEAD_DELIVERY_LEASE_SECONDS,
+            poll_interval: float = config.LEAD_DELIVERY_POLL_INTERVAL,
+    ):
+        self.provider = provider
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+
+        self._client: "httpx.AsyncClient | None" = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._client = self.provider.build_client()
+        self._task = asyncio.create_task(self._run(), name="lead-delivery-worker")
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._wake is not None:
+            self._wake.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def notify(self) -> None:
+        """Wake the worker now (callable from the sync request threadpool)."""
+        if self._loop is not None and self._wake is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                handled = await self.run_once()
+            except Exception:
+                logger.exception("lead delivery: round failed")
+                handled = 0
+            if handled < self.batch_size and not self._stopping:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+                self._wake.clear()
+
+    async def run_once(self) -> int:
+        """Claim one batch of due deliveries, send them, record outcomes. Returns rows handled."""
+        claimed = await asyncio.to_thread(self._claim)
+        if not claimed:
+            return 0
+
+        client = self._client or self.provider.build_client()
+        try:
+            outcomes = await asyncio.gather(
+                *(self.provider.deliver(client, d["payload"], d["idempotency_key"]) for d in claimed)
+            )
+        finally:
+            if client is not self._client:
+                await client.aclose()
+
+        await asyncio.to_thread(self._record, claimed, outcomes)
+        return len(claimed)
+
+    def _claim(self) -> list[dict]:
+        d = models.LeadDelivery
+        now = datetime.now(timezone.utc)
+        db = self.session_factory()
+        try:
+            rows = db.execute(
+                select(d.id, d.lead_id, d.payload, d.idempotency_key, d.attempts)
+                .where(
+                    d.status == "pending",
+                    d.provider == self.provider.name,
+                    d.next_attempt_at <= now,
+                )
+                .order_by(d.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not rows:
+                db.rollback()
+                return []
+            db.execute(
+                update(d)
+                .where(d.id.in_([r.id for r in rows]))
+                .values(
+                    next_attempt_at=now + timedelta(seconds=self.lease_seconds),
+                    attempts=d.attempts + 1,
+                )
+            )
+            db.commit()
+            return [
+                {
+                    "id": r.id,
+                    "lead_id": r.lead_id,
+                    "payload": r.payload,
+                    "idempotency_key": r.idempotency_key,
+                    "attempts": r.attempts + 1,
+                }
+                for r in rows
+            ]
+        finally:
+            db.close()
+
+    def _record(self, claimed: list[dict], outcomes: list[DeliveryOutcome]) -> None:
+        now = datetime.now(timezone.utc)
+        delivered, retried, dead = [], [], []
+        dead_letters = []
+        for item, outcome in zip(claimed, outcomes):
+            if outcome.ok:
+                delivered.append({"id": item["id"], "status": "delivered", "delivered_at": now, "last_error": None})
+            elif not outcome.retryable or item["attempts"] >= self.max_attempts:
+                dead.append({"id": item["id"], "status": "dead", "last_error": outcome.error})
+                dead_letters.append(
+                    models.LeadDeliveryDeadLetter(
+                        delivery_id=item["id"],
+                        lead_id=item["lead_id"],
+                        provider=self.provider.name,
+                        idempotency_key=item["idempotency_key"],
+                        payload=item["payload"],
+                        attempts=item["attempts"],
+                        last_error=outcome.error,
+                    )
+                )
+            else:
+                delay = backoff_seconds(item["attempts"], base=self.backoff_base, cap=self.backoff_max)
+                retried.append(
+                    {"id": item["id"], "next_attempt_at": now + timedelta(seconds=delay), "last_error": outcome.error}
+                )
+
+        db = self.session_factory()
+        try:
+            # One ORM bulk UPDATE by primary key per outcome kind.
+            for group in (delivered, retried, dead):
+                if group:
+                    db.execute(update(models.LeadDelivery), group)
+            db.add_all(dead_letters)
+            db.commit()
+        finally:
+            db.close()
+
+        if dead_letters:
+            logger.warning("lead delivery: %d delivery(ies) moved to dead letters", len(dead_letters))
+
+
+def build_worker() -> LeadDeliveryWorker | None:
+    """Worker for the configured provider, or None when MailerLite is not configured."""
+    if not config.MAILERLITE_API_KEY:
+        return None
+    return LeadDeliveryWorker(
+        MailerLiteProvider(
+            api_key=config.MAILERLITE_API_KEY,
+            base_url=config.MAILERLITE_API_BASE_URL,
+            field_names=FIELD_NAMES,
+        )
+    )
+
+
+# One worker per process; started/stopped by main.lifespan. Leads still queue up when unset.
+lead_delivery_worker = build_worker()
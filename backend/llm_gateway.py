@@ -0,0 +1,432 @@
+# backend/llm_gateway.py
+"""
+One way to call an LLM: deterministic, cached, coalesced and rate-limited.
+
+- Prompts come from versioned `PromptTemplate`s. The cache key is a sha256 of
+  (model, template name + version, inputs, sampling params), so the same
+  question under the same template is answered once, and editing a template
+  (new version) naturally misses instead of serving stale answers.
+- Lookups go: per-worker memory LRU -> `llm_responses` table -> provider. The
+  table is shared by every worker and survives deploys; it is kept under
+  LLM_CACHE_MAX_ENTRIES / LLM_CACHE_MAX_BYTES by evicting the least recently
+  used rows every ~1% of inserts.
+- Identical prompts that are already in flight share one provider call, and
+  provider calls are capped at LLM_MAX_CONCURRENCY per worker (cache hits never
+  wait on the cap).
+- Calls use temperature 0 by default; together with the cache that makes a
+  repeated QA of unchanged content return the same answer for zero tokens.
+
+Counters for lookups by result, tokens spent and tokens saved, plus provider
+latency, are in metrics.py (GET /metrics). Store errors are logged and treated
+as misses: the cache never turns a working provider call into a failure.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Protocol
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import config
+import models
+from db import SessionLocal
+from metrics import LLM_LOOKUPS_TOTAL, LLM_PROVIDER_DURATION, LLM_TOKENS_SAVED_TOTAL, LLM_TOKENS_TOTAL
+
+if TYPE_CHECKING:
+    import httpx  # imported on first provider call
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARAMS: dict[str, Any] = {"temperature": 0}
+# Memory hits are written back to the table's last_used_at in batches of this size.
+TOUCH_FLUSH_SIZE = 256
+
+
+class LLMProviderError(RuntimeError):
+    def __init__(self, message: str, *, status: int | None = None):
+        super().__init__(message)
+        self.status = status
+
+
+# -----------------------------
+# Prompts and results
+# -----------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class PromptTemplate:
+    """`user` / `system` are str.format templates; the version is a hash of their text."""
+
+    name: str
+    user: str
+    system: str = ""
+    version: str = field(init=False)
+
+    def __post_init__(self):
+        digest = hashlib.sha256(f"{self.system}\x00{self.user}".encode()).hexdigest()[:12]
+        object.__setattr__(self, "version", digest)
+
+    @property
+    def ref(self) -> str:
+        return f"{self.name}@{self.version}"
+
+    def render(self, inputs: Mapping[str, Any]) -> list[dict]:
+        messages = [{"role": "system", "content": self.system.format(**inputs)}] if self.system else []
+        messages.append({"role": "user", "content": self.user.format(**inputs)})
+        return messages
+
+
+def cache_key(model: str, template: PromptTemplate, inputs: Mapping[str, Any], params: Mapping[str, Any]) -> str:
+    canonical = json.dumps(
+        {"model": model, "template": template.ref, "inputs": inputs, "params": params},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class Completion:
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class LLMResult:
+    key: str
+    model: str
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+    # "provider" | "memory" | "store" | "coalesced"
+    source: str = "provider"
+
+    @property
+    def cached(self) -> bool:
+        return self.source != "provider"
+
+
+# -----------------------------
+# Providers
+# -----------------------------
+
+
+class Provider(Protocol):
+    async def complete(self, model: str, messages: list[dict], params: Mapping[str, Any]) -> Completion: ...
+
+    async def aclose(self) -> None: ...
+
+
+class OpenAIProvider:
+    """Chat Completions over one pooled keep-alive httpx client (any OpenAI-compatible base URL)."""
+
+    def __init__(self, *, api_key: str, base_url: str, timeout: float = 60.0, max_connections: int = 10):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: "httpx.AsyncClient | None" = None
+
+    def _http(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60,
+                ),
+            )
+        return self._client
+
+    async def complete(self, model: str, messages: list[dict], params: Mapping[str, Any]) -> Completion:
+        import httpx
+
+        try:
+            r = await self._http().post("/chat/completions", json={**params, "model": model, "messages": messages})
+        except httpx.HTTPError as exc:
+            raise LLMProviderError(f"{type(exc).__name__}: {exc}") from exc
+        if not r.is_success:
+            raise LLMProviderError(f"HTTP {r.status_code}: {r.text[:500]}", status=r.status_code)
+        body = r.json()
+        usage = body.get("usage") or {}
+        return Completion(
+            text=body["choices"][0]["message"]["content"] or "",
+            prompt_tokens=int(usage.get("prompt_tokens") or 0),
+            completion_tokens=int(usage.get("completion_tokens") or 0),
+        )
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+
+def default_provider() -> OpenAIProvider:
+    return OpenAIProvider(
+        api_key=config.require_openai_api_key(),
+        base_url=config.OPENAI_BASE_URL,
+        timeout=config.LLM_REQUEST_TIMEOUT_SECONDS,
+        max_connections=config.LLM_MAX_CONCURRENCY,
+    )
+
+
+# -----------------------------
+# Persistent store
+# -----------------------------
+
+
+class ResponseStore:
+    """The llm_responses table (sync; the gateway calls it from a worker thread)."""
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+
+    def get(self, key: str) -> LLMResult | None:
+        db = self.session_factory()
+        try:
+            row = db.execute(
+                select(
+                    models.LLMResponse.model,
+                    models.LLMResponse.response,
+                    models.LLMResponse.prompt_tokens,
+                    models.LLMResponse.completion_tokens,
+                ).where(models.LLMResponse.key == key)
+            ).first()
+            if row is None:
+                return None
+            db.execute(
+                update(models.LLMResponse)
+                .where(models.LLMResponse.key == key)
+                .values(hits=models.LLMResponse.hits + 1, last_used_at=_now())
+            )
+            db.commit()
+        finally:
+            db.close()
+        return LLMResult(key, row.model, row.response, row.prompt_tokens, row.completion_tokens, source="store")
+
+    def put(self, template_ref: str, result: LLMResult) -> None:
+        db = self.session_factory()
+        try:
+            db.add(
+                models.LLMResponse(
+                    key=result.key,
+                    model=result.model,
+                    template=template_ref,
+                    response=result.text,
+                    prompt_tokens=result.prompt_tokens,
+                    completion_tokens=result.completion_tokens,
+                    size_bytes=len(result.text.encode("utf-8")),
+                    hits=0,
+                    last_used_at=_now(),
+                )
+            )
+            db.commit()
+        except IntegrityError:  # another worker stored the same answer first
+            db.rollback()
+        finally:
+            db.close()
+
+    def touch(self, keys: list[str]) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(models.LLMResponse).where(models.LLMResponse.key.in_(keys)).values(last_used_at=_now())
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def prune(self, *, max_entries: int, max_bytes: int) -> int:
+        """Delete least recently used rows until both budgets hold; returns rows deleted."""
+        db = self.session_factory()
+        try:
+            count, total = db.execute(
+                select(func.count(), func.coalesce(func.sum(models.LLMResponse.size_bytes), 0))
+            ).one()
+            if count <= max_entries and total <= max_bytes:
+                return 0
+
+            evict: list[str] = []
+            rows = db.execute(
+                select(models.LLMResponse.key, models.LLMResponse.size_bytes).order_by(
+                    models.LLMResponse.last_used_at.asc()
+                )
+            )
+            for key, size in rows:
+                if count <= max_entries and total <= max_bytes:
+                    break
+                evict.append(key)
+                count -= 1
+                total -= size
+            for i in range(0, len(evict), 500):
+                db.execute(delete(models.LLMResponse).where(models.LLMResponse.key.in_(evict[i:i + 500])))
+            db.commit()
+            return len(evict)
+        finally:
+            db.close()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# -----------------------------
+# Gateway
+# -----------------------------
+
+
+class LLMGateway:
+    def __init__(
+            self,
+            provider: Provider | None = None,
+            *,
+            store: ResponseStore | None = None,
+            max_concurrency: int = config.LLM_MAX_CONCURRENCY,
+            memory_entries: int = config.LLM_CACHE_MEMORY_ENTRIES,
+            max_entries: int = config.LLM_CACHE_MAX_ENTRIES,
+            max_bytes: int = config.LLM_CACHE_MAX_BYTES,
+            default_model: str = config.LLM_DEFAULT_MODEL,
+    ):
+        self._provider = provider  # None: OpenAI, resolved on the first miss
+        self.store = store or ResponseStore()
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_model = default_model
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._memory: OrderedDict[str, LLMResult] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._touched: set[str] = set()
+        self._stores_since_prune = 0
+        self._maintenance_lock = threading.Lock()
+
+    @property
+    def provider(self) -> Provider:
+        if self._provider is None:
+            self._provider = default_provider()
+        return self._provider
+
+    async def complete(
+            self,
+            template: PromptTemplate,
+            inputs: Mapping[str, Any],
+            *,
+            model: str | None = None,
+            **params: Any,
+    ) -> LLMResult:
+        model = model or self.default_model
+        params = {**DEFAULT_PARAMS, **params}
+        key = cache_key(model, template, inputs, params)
+
+        hit = self._memory.get(key)
+        if hit is not None:
+            self._memory.move_to_end(key)
+            self._touched.add(key)
+            self._count_hit(hit, "memory")
+            if len(self._touched) >= TOUCH_FLUSH_SIZE:
+                self._schedule_maintenance()
+            return replace(hit, source="memory")
+
+        task = self._inflight.get(key)
+        if task is not None:
+            LLM_LOOKUPS_TOTAL.inc((("model", model), ("result", "coalesced")))
+            result = await asyncio.shield(task)
+            LLM_TOKENS_SAVED_TOTAL.inc((("model", model),), result.prompt_tokens + result.completion_tokens)
+            return replace(result, source="coalesced")
+
+        # Resolve in its own task so a caller that goes away doesn't cancel it for the others.
+        task = asyncio.ensure_future(self._resolve(key, template, template.render(inputs), model, params))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: (self._inflight.pop(key, None), t.cancelled() or t.exception()))
+        return await asyncio.shield(task)
+
+    async def _resolve(
+            self, key: str, template: PromptTemplate, messages: list[dict], model: str, params: Mapping[str, Any]
+    ) -> LLMResult:
+        try:
+            stored = await asyncio.to_thread(self.store.get, key)
+        except Exception:
+            logger.exception("llm gateway: cache lookup failed; calling the provider")
+            stored = None
+        if stored is not None:
+            self._count_hit(stored, "store")
+            self._remember(stored)
+            return stored
+
+        LLM_LOOKUPS_TOTAL.inc((("model", model), ("result", "miss")))
+        async with self._semaphore:
+            started = time.perf_counter()
+            completion = await self.provider.complete(model, messages, params)
+            LLM_PROVIDER_DURATION.observe((("model", model),), time.perf_counter() - started)
+        LLM_TOKENS_TOTAL.inc((("model", model), ("kind", "prompt")), completion.prompt_tokens)
+        LLM_TOKENS_TOTAL.inc((("model", model), ("kind", "completion")), completion.completion_tokens)
+
+        result = LLMResult(key, model, completion.text, completion.prompt_tokens, completion.completion_tokens)
+        try:
+            await asyncio.to_thread(self.store.put, template.ref, result)
+        except Exception:
+            logger.exception("llm gateway: could not store response %s", key)
+        self._remember(result)
+
+        self._stores_since_prune += 1
+        if self._stores_since_prune >= max(1, self.max_entries // 100):
+            self._stores_since_prune = 0
+            self._schedule_maintenance(prune=True)
+        return result
+
+    def _count_hit(self, result: LLMResult, where: str) -> None:
+        LLM_LOOKUPS_TOTAL.inc((("model", result.model), ("result", where)))
+        LLM_TOKENS_SAVED_TOTAL.inc((("model", result.model),), result.prompt_tokens + result.completion_tokens)
+
+    def _remember(self, result: LLMResult) -> None:
+        if self.memory_entries <= 0:
+            return
+        self._memory[result.key] = replace(result, source="provider")
+        self._memory.move_to_end(result.key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _schedule_maintenance(self, *, prune: bool = False) -> None:
+        touched, self._touched = list(self._touched), set()
+        asyncio.get_running_loop().run_in_executor(None, self.maintain, touched, prune)
+
+    def maintain(self, touched: list[str], prune: bool = True) -> int:
+        """Write memory hits back to the table, then (optionally) enforce the size budget."""
+        if not self._maintenance_lock.acquire(blocking=False):
+            return 0  # another round is already on it
+        try:
+            if touched:
+                self.store.touch(touched)
+            return self.store.prune(max_entries=self.max_entries, max_bytes=self.max_bytes) if prune else 0
+        except Exception:
+            logger.exception("llm gateway: cache maintenance failed")
+            return 0
+        finally:
+            self._maintenance_lock.release()
+
+    async def aclose(self) -> None:
+        if self._touched:
+            touched, self._touched = list(self._touched), set()
+            await asyncio.to_thread(self.maintain, touched, False)
+        if self._provider is not None:
+            await self._provider.aclose()
+
+
+# One gateway per process; main.lifespan closes it.
+llm_gateway = LLMGateway()
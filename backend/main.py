@@ -1,18 +1,65 @@
 # backend/main.py
+import asyncio
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from db import Base, engine
+import config
+
+from content_encoding import CompressionMiddleware
+from experiment_events import event_buffer
+from experiment_stats import counter_compactor
+from jobs import job_worker
+from lead_delivery import lead_delivery_worker
+from llm_gateway import llm_gateway
+from metrics import MetricsMiddleware, install_query_hooks, render_prometheus
+from profiling import ProfileRequestMiddleware, ProfilerBusy, SamplingProfiler, create_profile_token
+from query_budget import QueryBudgetMiddleware, query_budget
+from security import get_current_admin_user
+from serving import close_pool, warm_up
+from upload_spool import upload_spool
+from tools.fruitful_control import rule_reloader
+from tools.fruitful_control.batch import batch_evaluator
 from routers.auth import router as auth_router
 from routers.stats import router as stats_router
 from routers.admin_pinterest_stats import router as admin_pinterest_stats_router
+from routers.pinterest_potential import router as pinterest_potential_router
+from routers.pinterest_fit import router as pinterest_fit_router
+from routers.experiment_events import router as experiment_events_router
+from routers.admin_experiments import router as admin_experiments_router
+from routers.fruitful_control import router as fruitful_control_router
+from routers.admin_fruitful_control import router as admin_fruitful_control_router
+from routers.jobs import router as jobs_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # DB schema managed by Alembic migrations.
-    yield
+    await warm_up(app)
+    await event_buffer.start()
+    await counter_compactor.start()
+    await rule_reloader.start()
+    if lead_delivery_worker is not None:
+        await lead_delivery_worker.start()
+    await job_worker.start()
+    await upload_spool.start()
+    try:
+        yield
+    finally:
+        # Runs after uvicorn has finished in-flight requests (SIGTERM drain).
+        # Jobs running here finish first; queued ones wait for the next worker.
+        await job_worker.stop()
+        await upload_spool.stop()
+        if lead_delivery_worker is not None:
+            await lead_delivery_worker.stop()
+        # Drain buffered experiment events before the worker exits.
+        await event_buffer.stop()
+        await counter_compactor.stop()
+        await rule_reloader.stop()
+        await asyncio.to_thread(batch_evaluator.shutdown)
+        await llm_gateway.aclose()
+        close_pool()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -23,6 +70,13 @@ origins = [
     "https://fruitful-lab.vercel.app",
 ]
 
+# Starlette makes the last-added middleware the outermost, so the stack runs
+# Metrics -> QueryBudget -> Compression -> CORS -> Profile -> app.
+
+# X-Profile swaps the response for a cProfile report, so it is added first and wraps
+# only the app itself; the report still gets CORS headers and compression.
+app.add_middleware(ProfileRequestMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -31,10 +85,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/zstd for JSON and text bodies over RESPONSE_COMPRESSION_MIN_BYTES. Inside the
+# metrics middleware, so latency includes the compression time.
+app.add_middleware(CompressionMiddleware)
+
+# Budget checks read the per-request stats, so they sit just inside the metrics middleware.
+# Metrics is outermost, so latency includes CORS and error handling.
+install_query_hooks()
+app.add_middleware(QueryBudgetMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 # Routers
 app.include_router(auth_router)
 app.include_router(stats_router)
 app.include_router(admin_pinterest_stats_router)
+app.include_router(pinterest_potential_router)
+app.include_router(pinterest_fit_router)
+app.include_router(experiment_events_router)
+app.include_router(admin_experiments_router)
+app.include_router(fruitful_control_router)
+app.include_router(admin_fruitful_control_router)
+app.include_router(jobs_router)
 
 @app.get("/")
 def root():
@@ -43,3 +114,41 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(authorization: str | None = Header(None)):
+    """Prometheus text exposition for this worker process."""
+    if config.METRICS_TOKEN and authorization != f"Bearer {config.METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+# ---------------- Profiling (admin-only, this worker) ----------------
+
+@app.get("/admin/profile/sample", response_class=PlainTextResponse, tags=["admin_profiling"])
+@query_budget(1)
+async def sample_profile(
+        seconds: float = Query(5.0, gt=0, le=config.PROFILER_MAX_SECONDS),
+        interval_ms: float = Query(10.0, ge=1, le=1000),
+        idle: bool = False,
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """
+    Sample every thread of this worker for `seconds` and return collapsed stacks
+    (feed to flamegraph.pl or speedscope). Parked threads are skipped unless idle=true.
+    """
+    profiler = SamplingProfiler(interval=interval_ms / 1000, idle=idle)
+    try:
+        profiler.start()
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        collapsed = profiler.stop()
+    return PlainTextResponse(collapsed, headers={"X-Profile-Samples": str(profiler.samples)})
+
+@app.post("/admin/profile/request-token", tags=["admin_profiling"])
+@query_budget(1)
+def profile_request_token(current_admin=Depends(get_current_admin_user)):  # admin-only
+    """Short-lived token; send it as `X-Profile: <token>` to get one request's cProfile report."""
+    return {"header": "X-Profile", "token": create_profile_token(current_admin.email)}
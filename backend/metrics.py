@@ -0,0 +1,260 @@
+# backend/metrics.py
+"""
+Request instrumentation: per-route latency histograms, status counts, in-flight
+gauge, and DB query count/time attributed to the request that issued them.
+
+- `MetricsMiddleware` is a plain ASGI middleware (no BaseHTTPMiddleware task /
+  body wrapping), labelled by the matched route template, never the raw path,
+  so label cardinality stays bounded.
+- `install_query_hooks()` listens on every SQLAlchemy Engine; queries run in the
+  sync threadpool still land on the right request because the per-request
+  `RequestStats` lives in a ContextVar that anyio copies into worker threads.
+- `render_prometheus()` emits text exposition format 0.0.4 for GET /metrics.
+
+All registry updates happen on the event loop thread (the middleware folds the
+request's DB stats in when the response finishes), so no locks are needed.
+"""
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Seconds. Roughly Prometheus' defaults, with more resolution under 100ms.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """DB activity of one request (filled in by the SQLAlchemy hooks)."""
+
+    route: str = UNMATCHED_ROUTE
+    query_count: int = 0
+    query_time: float = 0.0
+    # SQL text (already parameterized, so it is the statement's shape) -> times seen
+    statements: dict[str, int] = field(default_factory=dict)
+
+
+current_request_stats: ContextVar[RequestStats | None] = ContextVar("current_request_stats", default=None)
+
+
+# -----------------------------
+# Registry
+# -----------------------------
+
+
+class Histogram:
+    __slots__ = ("name", "help", "buckets", "series")
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...]):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        # labels -> [bucket counts..., +Inf count, sum]
+        self.series: dict[tuple[tuple[str, str], ...], list[float]] = {}
+
+    def observe(self, labels: tuple[tuple[str, str], ...], value: float) -> None:
+        s = self.series.get(labels)
+        if s is None:
+            s = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        # Non-cumulative per bucket; rendering accumulates.
+        s[bisect_left(self.buckets, value)] += 1
+        s[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, s in sorted(self.series.items()):
+            running = 0
+            for le, n in zip((*self.buckets, "+Inf"), s[:-1]):
+                running += n
+                lines.append(f"{self.name}_bucket{_fmt_labels((*labels, ('le', _fmt_num(le))))} {running}")
+            lines.append(f"{self.name}_sum{_fmt_labels(labels)} {_fmt_num(s[-1])}")
+            lines.append(f"{self.name}_count{_fmt_labels(labels)} {running}")
+        return lines
+
+
+class Counter:
+    __slots__ = ("name", "help", "series")
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.series: dict[tuple[tuple[str, str], ...], float] = {}
+
+    def inc(self, labels: tuple[tuple[str, str], ...], value: float = 1) -> None:
+        self.series[labels] = self.series.get(labels, 0) + value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_fmt_labels(k)} {_fmt_num(v)}" for k, v in sorted(self.series.items())]
+        return lines
+
+
+class Gauge:
+    __slots__ = ("name", "help", "value")
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {self.value}"]
+
+
+def _fmt_num(v) -> str:
+    if isinstance(v, str):
+        return v
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+def _fmt_labels(labels) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for k, v in labels:
+        v = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Request latency by route (until the response body is sent).", LATENCY_BUCKETS
+)
+REQUESTS_TOTAL = Counter("http_requests_total", "Requests by route and status code.")
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being handled.")
+DB_QUERIES_PER_REQUEST = Histogram(
+    "http_request_db_queries", "SQL statements executed per request.", QUERY_COUNT_BUCKETS
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per request.", LATENCY_BUCKETS
+)
+
+# Updated by llm_gateway.py (on the event loop, like everything above).
+LLM_LOOKUPS_TOTAL = Counter(
+    "llm_cache_lookups_total", "LLM gateway lookups by model and result (memory, store, coalesced, miss)."
+)
+LLM_TOKENS_TOTAL = Counter("llm_tokens_total", "Tokens spent on provider calls by model and kind.")
+LLM_TOKENS_SAVED_TOTAL = Counter("llm_tokens_saved_total", "Tokens cache hits did not spend, by model.")
+LLM_PROVIDER_DURATION = Histogram(
+    "llm_provider_request_duration_seconds", "Provider call latency by model (cache misses only).", LATENCY_BUCKETS
+)
+
+REGISTRY = (
+    REQUEST_DURATION,
+    REQUESTS_TOTAL,
+    REQUESTS_IN_FLIGHT,
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    LLM_LOOKUPS_TOTAL,
+    LLM_TOKENS_TOTAL,
+    LLM_TOKENS_SAVED_TOTAL,
+    LLM_PROVIDER_DURATION,
+)
+
+
+def render_prometheus() -> str:
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    for metric in REGISTRY:
+        if isinstance(metric, Gauge):
+            metric.value = 0
+        else:
+            metric.series.clear()
+
+
+# -----------------------------
+# ASGI middleware
+# -----------------------------
+
+
+class MetricsMiddleware:
+    def __init__(self, app, *, skip_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.value += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.value -= 1
+            current_request_stats.reset(token)
+
+            route = scope.get("route")
+            stats.route = getattr(route, "path", None) or UNMATCHED_ROUTE
+            labels = (("method", scope["method"]), ("route", stats.route))
+            REQUEST_DURATION.observe(labels, elapsed)
+            REQUESTS_TOTAL.inc((*labels, ("status", str(status_code))))
+            DB_QUERIES_PER_REQUEST.observe(labels, stats.query_count)
+            DB_TIME_PER_REQUEST.observe(labels, stats.query_time)
+
+
+# -----------------------------
+# SQLAlchemy hooks
+# -----------------------------
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request_stats.get() is not None:
+        conn.info.setdefault("_metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("_metrics_query_start")
+    if not starts:
+        return
+    stats.query_count += 1
+    stats.query_time += time.perf_counter() - starts.pop()
+    stats.statements[statement] = stats.statements.get(statement, 0) + 1
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    starts = exception_context.connection.info.get("_metrics_query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+_hooks_installed = False
+
+
+def install_query_hooks() -> None:
+    """Attach the per-request query hooks to every Engine (idempotent)."""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _hooks_installed = True
@@ -0,0 +1,254 @@
+# backend/migration_helpers.py
+"""
+Online (no write downtime) building blocks for Alembic migrations.
+
+The legacy migrations did schema + data changes as single statements, which on
+a big table (pinterest_account_stats_monthly) holds locks for the whole
+backfill. Use these instead, from inside upgrade()/downgrade():
+
+    from migration_helpers import backfill_in_batches, create_index_concurrently, set_not_null
+
+    def upgrade() -> None:
+        op.add_column(TABLE, sa.Column("account_name", sa.String(255), nullable=True))
+        backfill_in_batches(TABLE, {"account_name": sa.text("'legacy'")}, where="account_name IS NULL")
+        set_not_null(TABLE, "account_name")
+        create_index_concurrently("ix_..._account_name", TABLE, ["account_name"])
+
+- backfill_in_batches: UPDATEs by primary-key range, each batch its own short
+  transaction, with a pause between batches and progress logged to the
+  `alembic` logger. The last finished id is stored in alembic_backfill_progress,
+  so a rerun after a crash or Ctrl-C resumes where it stopped. The statement
+  must be idempotent (guard it with `where`), as the migration guide requires.
+- create_index_concurrently / drop_index_concurrently: CONCURRENTLY on Postgres
+  (outside the migration transaction); an INVALID index left by an interrupted
+  build is dropped and rebuilt. Plain DDL elsewhere.
+- set_not_null: on Postgres, validates a NOT VALID check constraint first so
+  SET NOT NULL skips the table scan under ACCESS EXCLUSIVE.
+
+env.py runs each migration in its own transaction (needed for the autocommit
+blocks above), sets lock_timeout on Postgres so DDL fails fast instead of
+queueing writes behind it, and passes `-x` overrides to configure():
+
+    alembic -x batch_size=20000 -x batch_pause=0.05 -x lock_timeout_ms=5000 upgrade head
+"""
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Mapping, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+import config
+
+log = logging.getLogger("alembic.backfill")
+
+PROGRESS_TABLE = "alembic_backfill_progress"
+
+_settings = {
+    "batch_size": config.MIGRATION_BATCH_SIZE,
+    "batch_pause": config.MIGRATION_BATCH_PAUSE_SECONDS,
+    "lock_timeout_ms": config.MIGRATION_LOCK_TIMEOUT_MS,
+}
+
+_progress = sa.Table(
+    PROGRESS_TABLE,
+    sa.MetaData(),
+    sa.Column("name", sa.String(255), primary_key=True),
+    sa.Column("last_pk", sa.BigInteger, nullable=False),
+    sa.Column("rows_updated", sa.BigInteger, nullable=False),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+)
+
+
+def configure(**overrides) -> dict:
+    """Override batch_size / batch_pause / lock_timeout_ms (strings from `-x` are accepted)."""
+    for key, raw in overrides.items():
+        if key not in _settings:
+            raise ValueError(f"unknown migration setting {key!r}")
+        _settings[key] = type(_settings[key])(raw)
+    return dict(_settings)
+
+
+def settings() -> dict:
+    return dict(_settings)
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+# -----------------------------
+# Backfills
+# -----------------------------
+
+
+def backfill_in_batches(
+        table: str,
+        values: Mapping[str, object],
+        *,
+        where: str | sa.ColumnElement | None = None,
+        pk: str = "id",
+        name: str | None = None,
+        batch_size: int | None = None,
+        pause: float | None = None,
+) -> int:
+    """
+    UPDATE `table` SET `values` [WHERE `where`] in primary-key ranges of
+    `batch_size`, committing after each range. Returns rows updated by this run.
+
+    `values` maps column names to literals or SQL expressions; `where` is a SQL
+    string or expression (e.g. "groups IS NULL"). `name` keys the resume
+    checkpoint; it defaults to "<revision>:<table>:<columns>".
+    """
+    ctx = op.get_context()
+    batch_size = batch_size or _settings["batch_size"]
+    pause = _settings["batch_pause"] if pause is None else pause
+
+    target = sa.table(table, sa.column(pk), *(sa.column(c) for c in values))
+    # Typed literals, so `alembic upgrade --sql` can render them inline.
+    values = {c: v if isinstance(v, sa.ClauseElement) else sa.literal(v) for c, v in values.items()}
+    condition = sa.text(where) if isinstance(where, str) else where
+
+    def update_range(lo, hi):
+        stmt = sa.update(target).values(values)
+        if lo is not None:
+            stmt = stmt.where(target.c[pk] > lo, target.c[pk] <= hi)
+        return stmt.where(condition) if condition is not None else stmt
+
+    if ctx.as_sql:
+        # `alembic upgrade --sql` has no database to page through; emit one statement.
+        op.execute(update_range(None, None))
+        return 0
+
+    revision = ",".join(ctx.get_current_heads()) or "base"
+    name = name or f"{revision}:{table}:{','.join(values)}"
+    started = time.perf_counter()
+    updated = 0
+
+    with ctx.autocommit_block():
+        conn = op.get_bind()
+        _progress.create(conn, checkfirst=True)
+        lo, hi = conn.execute(sa.select(sa.func.min(target.c[pk]), sa.func.max(target.c[pk]))).one()
+        if lo is None:
+            log.info("backfill %s: table is empty", name)
+            return 0
+
+        resumed = conn.execute(
+            sa.select(_progress.c.last_pk, _progress.c.rows_updated).where(_progress.c.name == name)
+        ).first()
+        if resumed is not None:
+            cursor, updated = resumed
+            log.info("backfill %s: resuming after %s=%s (%s rows already updated)", name, pk, cursor, updated)
+        else:
+            cursor = lo - 1
+            conn.execute(
+                _progress.insert().values(name=name, last_pk=cursor, rows_updated=0, updated_at=_now())
+            )
+
+        first = cursor
+        while cursor < hi:
+            upper = min(cursor + batch_size, hi)
+            # Autocommit: each statement is its own short transaction. A crash between
+            # the two re-runs one (idempotent) range on resume.
+            updated += conn.execute(update_range(cursor, upper)).rowcount
+            conn.execute(
+                _progress.update()
+                .where(_progress.c.name == name)
+                .values(last_pk=upper, rows_updated=updated, updated_at=_now())
+            )
+            cursor = upper
+            _log_progress(name, cursor - first, hi - first, updated, started)
+            if pause and cursor < hi:
+                time.sleep(pause)
+
+        conn.execute(_progress.delete().where(_progress.c.name == name))
+
+    log.info("backfill %s: done, %s rows in %.1fs", name, updated, time.perf_counter() - started)
+    return updated
+
+
+def _log_progress(name: str, done: int, total: int, updated: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    log.info(
+        "backfill %s: %.0f%% of id range, %s rows updated (%.0f rows/s)",
+        name,
+        100 * done / total if total else 100,
+        updated,
+        updated / elapsed if elapsed else 0,
+    )
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# -----------------------------
+# Indexes / constraints
+# -----------------------------
+
+
+def create_index_concurrently(
+        index_name: str,
+        table: str,
+        columns: Sequence[str],
+        *,
+        unique: bool = False,
+        where: str | None = None,
+) -> None:
+    """CREATE INDEX CONCURRENTLY on Postgres (rebuilding an INVALID leftover); plain CREATE INDEX elsewhere."""
+    kwargs = {"unique": unique, "if_not_exists": True}
+    if where is not None:
+        kwargs["postgresql_where"] = sa.text(where)
+        kwargs["sqlite_where"] = sa.text(where)
+
+    if not _is_postgres():
+        op.create_index(index_name, table, list(columns), **kwargs)
+        return
+
+    with op.get_context().autocommit_block():
+        if _index_is_invalid(index_name):
+            log.info("index %s: dropping INVALID leftover of an interrupted build", index_name)
+            op.drop_index(index_name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        op.create_index(index_name, table, list(columns), postgresql_concurrently=True, **kwargs)
+
+
+def drop_index_concurrently(index_name: str, table: str) -> None:
+    if not _is_postgres():
+        op.drop_index(index_name, table_name=table, if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(index_name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def _index_is_invalid(index_name: str) -> bool:
+    if op.get_context().as_sql:
+        return False
+    return bool(
+        op.get_bind().scalar(
+            sa.text(
+                "SELECT NOT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND pg_catalog.pg_table_is_visible(c.oid)"
+            ),
+            {"name": index_name},
+        )
+    )
+
+
+def set_not_null(table: str, column: str) -> None:
+    """
+    SET NOT NULL without a long ACCESS EXCLUSIVE scan on Postgres: add a NOT VALID
+    check, VALIDATE it (doesn't block writes), then SET NOT NULL uses it.
+    """
+    if not _is_postgres():
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(column, nullable=False)
+        return
+
+    check = f"{table}_{column}_not_null"[:63]
+    op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{check}" CHECK ("{column}" IS NOT NULL) NOT VALID')
+    with op.get_context().autocommit_block():
+        op.execute(f'ALTER TABLE "{table}" VALIDATE CONSTRAINT "{check}"')
+        op.alter_column(table, column, nullable=False)
+        op.execute(f'ALTER TABLE "{table}" DROP CONSTRAINT "{check}"')
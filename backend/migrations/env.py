@@ -5,6 +5,7 @@ from sqlalchemy import pool
 
 from alembic import context
 
+import migration_helpers
 from db import DATABASE_URL
 from models import Base
 
@@ -31,6 +32,20 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+# Batched-migration knobs: `alembic -x batch_size=20000 -x lock_timeout_ms=3000 upgrade head`
+migration_helpers.configure(
+    **{
+        k: v
+        for k, v in context.get_x_argument(as_dictionary=True).items()
+        if k in migration_helpers.settings()
+    }
+)
+
+
+def include_name(name, type_, parent_names) -> bool:
+    # The backfill checkpoint table is migration bookkeeping (like alembic_version), not a model.
+    return not (type_ == "table" and name == migration_helpers.PROGRESS_TABLE)
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -50,6 +65,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -70,8 +87,21 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            # DDL waiting on a lock blocks every write queued behind it; give up
+            # quickly instead and let the deploy retry.
+            lock_timeout_ms = migration_helpers.settings()["lock_timeout_ms"]
+            connection.exec_driver_sql(f"SET lock_timeout = {int(lock_timeout_ms)}")
+            connection.commit()
+
+        # One transaction per migration, so helpers can step outside it
+        # (CREATE INDEX CONCURRENTLY, batched backfills) without holding
+        # earlier migrations' locks.
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
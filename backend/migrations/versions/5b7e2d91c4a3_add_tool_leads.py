@@ -0,0 +1,45 @@
+"""add tool_leads
+
+Revision ID: 5b7e2d91c4a3
+Revises: 0f1db0936876
+Create Date: 2026-10-19 10:12:04.118220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2d91c4a3'
+down_revision: Union[str, Sequence[str], None] = '0f1db0936876'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tool_leads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tool', sa.String(length=64), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('answers', sa.JSON(), nullable=False),
+    sa.Column('results', sa.JSON(), nullable=True),
+    sa.Column('rules_version', sa.String(length=64), nullable=True),
+    sa.Column('computed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tool_leads_email'), 'tool_leads', ['email'], unique=False)
+    op.create_index(op.f('ix_tool_leads_id'), 'tool_leads', ['id'], unique=False)
+    op.create_index(op.f('ix_tool_leads_tool'), 'tool_leads', ['tool'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tool_leads_tool'), table_name='tool_leads')
+    op.drop_index(op.f('ix_tool_leads_id'), table_name='tool_leads')
+    op.drop_index(op.f('ix_tool_leads_email'), table_name='tool_leads')
+    op.drop_table('tool_leads')
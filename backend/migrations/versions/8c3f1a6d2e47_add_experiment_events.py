@@ -0,0 +1,42 @@
+"""add experiment_events
+
+Revision ID: 8c3f1a6d2e47
+Revises: 5b7e2d91c4a3
+Create Date: 2026-10-19 11:02:37.540913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f1a6d2e47'
+down_revision: Union[str, Sequence[str], None] = '5b7e2d91c4a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('experiment_events',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('event_id', sa.String(length=64), nullable=True),
+    sa.Column('type', sa.String(length=16), nullable=False),
+    sa.Column('experiment_key', sa.String(length=128), nullable=True),
+    sa.Column('variant', sa.String(length=64), nullable=True),
+    sa.Column('event_name', sa.String(length=128), nullable=True),
+    sa.Column('attributes', sa.JSON(), nullable=True),
+    sa.Column('source', sa.String(length=64), nullable=True),
+    sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_experiment_events_experiment_key_occurred_at', 'experiment_events', ['experiment_key', 'occurred_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_experiment_events_experiment_key_occurred_at', table_name='experiment_events')
+    op.drop_table('experiment_events')
@@ -0,0 +1,44 @@
+"""add llm response cache
+
+Revision ID: a93c5e1f7b20
+Revises: e2a7d4c9b813
+Create Date: 2026-10-19 16:02:11.508214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93c5e1f7b20'
+down_revision: Union[str, Sequence[str], None] = 'e2a7d4c9b813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('llm_responses',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('model', sa.String(length=128), nullable=False),
+    sa.Column('template', sa.String(length=160), nullable=False),
+    sa.Column('response', sa.Text(), nullable=False),
+    sa.Column('prompt_tokens', sa.Integer(), nullable=False),
+    sa.Column('completion_tokens', sa.Integer(), nullable=False),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('hits', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_llm_responses_last_used_at'), 'llm_responses', ['last_used_at'], unique=False)
+    op.create_index(op.f('ix_llm_responses_template'), 'llm_responses', ['template'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_llm_responses_template'), table_name='llm_responses')
+    op.drop_index(op.f('ix_llm_responses_last_used_at'), table_name='llm_responses')
+    op.drop_table('llm_responses')
@@ -0,0 +1,49 @@
+"""add pinterest stats uploads
+
+Revision ID: b7e25d91c0a4
+Revises: 6c1f9e2a4d57
+Create Date: 2026-10-19 21:03:18.552610
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e25d91c0a4'
+down_revision: Union[str, Sequence[str], None] = '6c1f9e2a4d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pinterest_stats_uploads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('account_name', sa.String(length=255), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('idempotency_key', sa.String(length=64), nullable=True),
+    sa.Column('job_id', sa.Integer(), nullable=True),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('uploaded_by', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('idempotency_key')
+    )
+    op.create_index('ix_pinterest_stats_uploads_account_name_id', 'pinterest_stats_uploads', ['account_name', 'id'], unique=False)
+    op.create_index(op.f('ix_pinterest_stats_uploads_job_id'), 'pinterest_stats_uploads', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pinterest_stats_uploads_job_id'), table_name='pinterest_stats_uploads')
+    op.drop_index('ix_pinterest_stats_uploads_account_name_id', table_name='pinterest_stats_uploads')
+    op.drop_table('pinterest_stats_uploads')
@@ -0,0 +1,49 @@
+"""add experiment daily counters
+
+Revision ID: c41e9b7f0a2d
+Revises: 8c3f1a6d2e47
+Create Date: 2026-10-19 11:40:12.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e9b7f0a2d'
+down_revision: Union[str, Sequence[str], None] = '8c3f1a6d2e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('experiment_daily_counters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('experiment_key', sa.String(length=128), nullable=False),
+    sa.Column('variant', sa.String(length=64), nullable=False),
+    sa.Column('event_name', sa.String(length=128), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('experiment_key', 'variant', 'event_name', 'day', name='uq_experiment_daily_counter')
+    )
+    op.create_index(op.f('ix_experiment_daily_counters_id'), 'experiment_daily_counters', ['id'], unique=False)
+    op.create_table('experiment_aggregation_cursors',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('last_event_id', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_index(op.f('ix_experiment_events_event_id'), 'experiment_events', ['event_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_experiment_events_event_id'), table_name='experiment_events')
+    op.drop_table('experiment_aggregation_cursors')
+    op.drop_index(op.f('ix_experiment_daily_counters_id'), table_name='experiment_daily_counters')
+    op.drop_table('experiment_daily_counters')
@@ -0,0 +1,39 @@
+"""add fruitful control rule documents
+
+Revision ID: d4b81f26ce93
+Revises: a93c5e1f7b20
+Create Date: 2026-10-19 18:40:27.114093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b81f26ce93'
+down_revision: Union[str, Sequence[str], None] = 'a93c5e1f7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('fruitful_control_rule_documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('layer', sa.String(length=16), nullable=False),
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.String(length=12), nullable=True),
+    sa.Column('body', sa.JSON(), nullable=True),
+    sa.Column('published_by', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_fruitful_control_rule_documents_layer_key_id', 'fruitful_control_rule_documents', ['layer', 'key', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_fruitful_control_rule_documents_layer_key_id', table_name='fruitful_control_rule_documents')
+    op.drop_table('fruitful_control_rule_documents')
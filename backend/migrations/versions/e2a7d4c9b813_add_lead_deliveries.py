@@ -0,0 +1,70 @@
+"""add lead deliveries + dead letters
+
+Revision ID: e2a7d4c9b813
+Revises: c41e9b7f0a2d
+Create Date: 2026-10-19 12:21:45.377402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7d4c9b813'
+down_revision: Union[str, Sequence[str], None] = 'c41e9b7f0a2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('lead_deliveries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('lead_id', sa.Integer(), nullable=False),
+    sa.Column('provider', sa.String(length=32), nullable=False),
+    sa.Column('idempotency_key', sa.String(length=64), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['lead_id'], ['tool_leads.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('idempotency_key')
+    )
+    op.create_index(op.f('ix_lead_deliveries_id'), 'lead_deliveries', ['id'], unique=False)
+    op.create_index(op.f('ix_lead_deliveries_lead_id'), 'lead_deliveries', ['lead_id'], unique=False)
+    op.create_index(op.f('ix_lead_deliveries_next_attempt_at'), 'lead_deliveries', ['next_attempt_at'], unique=False)
+    op.create_index(op.f('ix_lead_deliveries_status'), 'lead_deliveries', ['status'], unique=False)
+    op.create_table('lead_delivery_dead_letters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('delivery_id', sa.Integer(), nullable=False),
+    sa.Column('lead_id', sa.Integer(), nullable=False),
+    sa.Column('provider', sa.String(length=32), nullable=False),
+    sa.Column('idempotency_key', sa.String(length=64), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['delivery_id'], ['lead_deliveries.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_lead_delivery_dead_letters_delivery_id'), 'lead_delivery_dead_letters', ['delivery_id'], unique=False)
+    op.create_index(op.f('ix_lead_delivery_dead_letters_id'), 'lead_delivery_dead_letters', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_lead_delivery_dead_letters_id'), table_name='lead_delivery_dead_letters')
+    op.drop_index(op.f('ix_lead_delivery_dead_letters_delivery_id'), table_name='lead_delivery_dead_letters')
+    op.drop_table('lead_delivery_dead_letters')
+    op.drop_index(op.f('ix_lead_deliveries_status'), table_name='lead_deliveries')
+    op.drop_index(op.f('ix_lead_deliveries_next_attempt_at'), table_name='lead_deliveries')
+    op.drop_index(op.f('ix_lead_deliveries_lead_id'), table_name='lead_deliveries')
+    op.drop_index(op.f('ix_lead_deliveries_id'), table_name='lead_deliveries')
+    op.drop_table('lead_deliveries')
@@ -0,0 +1,38 @@
+"""widen pinterest stats upload size, record spool session
+
+Revision ID: f58c2e0a9d16
+Revises: b7e25d91c0a4
+Create Date: 2026-10-19 23:41:07.318245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f58c2e0a9d16'
+down_revision: Union[str, Sequence[str], None] = 'b7e25d91c0a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('pinterest_stats_uploads', 'size_bytes',
+               existing_type=sa.Integer(),
+               type_=sa.BigInteger(),
+               existing_nullable=False)
+    op.add_column('pinterest_stats_uploads', sa.Column('spool_session', sa.String(length=32), nullable=True))
+    op.create_index(op.f('ix_pinterest_stats_uploads_spool_session'), 'pinterest_stats_uploads', ['spool_session'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pinterest_stats_uploads_spool_session'), table_name='pinterest_stats_uploads')
+    op.drop_column('pinterest_stats_uploads', 'spool_session')
+    op.alter_column('pinterest_stats_uploads', 'size_bytes',
+               existing_type=sa.BigInteger(),
+               type_=sa.Integer(),
+               existing_nullable=False)
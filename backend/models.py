@@ -1,15 +1,21 @@
 # backend/models.py
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     Date,
     DateTime,
+    ForeignKey,
+    Index,
     Integer,
     String,
     JSON,
+    LargeBinary,
+    Text,
     UniqueConstraint,
 )
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 from db import Base
@@ -79,3 +85,304 @@ class PinterestAccountStatsMonthly(Base):
         onupdate=func.now(),
         nullable=False,
     )
+
+
+class ToolLead(Base):
+    """A lead captured by one of the public tools, with the answers it submitted.
+
+    `results` holds the server-side evaluation and `rules_version` the engine
+    version that produced it, so results can be recomputed when rules change.
+    """
+
+    __tablename__ = "tool_leads"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # "pinterest_fit" | "pinterest_potential"
+    tool = Column(String(64), nullable=False, index=True)
+    email = Column(String(255), nullable=True, index=True)
+
+    answers = Column(JSON, nullable=False)
+    results = Column(JSON, nullable=True)
+    rules_version = Column(String(64), nullable=True)
+    computed_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class ExperimentEvent(Base):
+    """Raw experiment exposure/conversion event (append-only, bulk-flushed)."""
+
+    __tablename__ = "experiment_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+
+    # Client-supplied id, used to drop duplicate deliveries downstream.
+    event_id = Column(String(64), nullable=True, index=True)
+
+    # "exposure" | "conversion"
+    type = Column(String(16), nullable=False)
+    experiment_key = Column(String(128), nullable=True)
+    variant = Column(String(64), nullable=True)
+    event_name = Column(String(128), nullable=True)
+    attributes = Column(JSON, nullable=True)
+    source = Column(String(64), nullable=True)
+
+    occurred_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_experiment_events_experiment_key_occurred_at", "experiment_key", "occurred_at"),
+    )
+
+
+class ExperimentDailyCounter(Base):
+    """Event counts per (experiment, variant, event, UTC day), maintained by compaction."""
+
+    __tablename__ = "experiment_daily_counters"
+
+    __table_args__ = (
+        UniqueConstraint(
+            "experiment_key",
+            "variant",
+            "event_name",
+            "day",
+            name="uq_experiment_daily_counter",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    experiment_key = Column(String(128), nullable=False)
+    variant = Column(String(64), nullable=False)
+    # Conversion event name, or "exposure" for exposures.
+    event_name = Column(String(128), nullable=False)
+    day = Column(Date, nullable=False)
+
+    count = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class ExperimentAggregationCursor(Base):
+    """High-water mark (experiment_events.id) already folded into the daily counters."""
+
+    __tablename__ = "experiment_aggregation_cursors"
+
+    name = Column(String(64), primary_key=True)
+    last_event_id = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class LeadDelivery(Base):
+    """
+    Outbound delivery of a stored lead to an email provider (outbox row).
+
+    A worker claims due rows by pushing next_attempt_at forward by a lease; on
+    success the row is marked delivered, on failure it is rescheduled with
+    exponential backoff until it is moved to the dead-letter table.
+    """
+
+    __tablename__ = "lead_deliveries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    lead_id = Column(Integer, ForeignKey("tool_leads.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    provider = Column(String(32), nullable=False)
+    # Sent to the provider on every attempt so retries after a lost response are no-ops.
+    idempotency_key = Column(String(64), nullable=False, unique=True)
+    payload = Column(JSON, nullable=False)
+
+    # "pending" | "delivered" | "dead"
+    status = Column(String(16), nullable=False, default="pending", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    last_error = Column(Text, nullable=True)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class LeadDeliveryDeadLetter(Base):
+    """Deliveries that exhausted their retries; kept for inspection and manual replay."""
+
+    __tablename__ = "lead_delivery_dead_letters"
+
+    id = Column(Integer, primary_key=True, index=True)
+    delivery_id = Column(Integer, ForeignKey("lead_deliveries.id", ondelete="CASCADE"), nullable=False, index=True)
+    lead_id = Column(Integer, nullable=False)
+
+    provider = Column(String(32), nullable=False)
+    idempotency_key = Column(String(64), nullable=False)
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, nullable=False)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class LLMResponse(Base):
+    """
+    Cached LLM completion, addressed by a hash of (model, prompt template
+    version, inputs, sampling params); see llm_gateway.py.
+
+    Rows are immutable apart from the usage bookkeeping; the gateway evicts the
+    least recently used ones once the table exceeds its entry/byte budget.
+    """
+
+    __tablename__ = "llm_responses"
+
+    key = Column(String(64), primary_key=True)
+    model = Column(String(128), nullable=False)
+    # "<template name>@<template version>", for auditing and targeted purges.
+    template = Column(String(160), nullable=False, index=True)
+    response = Column(Text, nullable=False)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    size_bytes = Column(Integer, nullable=False)
+    hits = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_used_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class FruitfulControlRuleDocument(Base):
+    """
+    One published revision of a Fruitful Control rule document (append-only).
+
+    The current document for (layer, key) is its highest id; a row with a NULL
+    body retires the document. max(id) doubles as the library's revision
+    counter, which workers poll to know when to rebuild their rule snapshot.
+    """
+
+    __tablename__ = "fruitful_control_rule_documents"
+    __table_args__ = (
+        Index("ix_fruitful_control_rule_documents_layer_key_id", "layer", "key", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # "global" | "task" | "client"
+    layer = Column(String(16), nullable=False)
+    key = Column(String(64), nullable=False)
+    # Content hash of body (rules.document_version); NULL with a NULL body.
+    version = Column(String(12), nullable=True)
+    body = Column(JSON, nullable=True)
+    published_by = Column(String(255), nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class Job(Base):
+    """
+    Background job (see jobs.py). Queued by a request, claimed by whichever API
+    worker gets to it first, progress written back as it runs.
+
+    A running job's lease is extended by every progress update; if its worker
+    dies the lease runs out and another worker claims it again.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(64), nullable=False, index=True)
+    # "queued" | "running" | "succeeded" | "failed"
+    status = Column(String(16), nullable=False, default="queued")
+    params = Column(JSON, nullable=False)
+    # Uploaded file, when the job has one; loaded only by the worker that runs it.
+    input = deferred(Column(LargeBinary, nullable=True))
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    progress_done = Column(Integer, nullable=False, default=0)
+    progress_total = Column(Integer, nullable=True)
+    progress_message = Column(String(255), nullable=True)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_after = Column(DateTime(timezone=True), nullable=False)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    created_by = Column(String(255), nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class PinterestStatsUpload(Base):
+    """
+    Journal of monthly stats CSV uploads (see pinterest_stats_ingest.py).
+
+    One row per accepted upload, keyed by the sha256 of its normalized content,
+    so re-sending the file an account was last ingested from is answered from
+    here without parsing or writing anything.
+    """
+
+    __tablename__ = "pinterest_stats_uploads"
+    __table_args__ = (
+        Index("ix_pinterest_stats_uploads_account_name_id", "account_name", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    account_name = Column(String(255), nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    idempotency_key = Column(String(64), nullable=True, unique=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True, index=True)
+    filename = Column(String(255), nullable=True)
+    size_bytes = Column(BigInteger, nullable=False)  # chunked uploads can pass 2 GiB
+    # The chunked-upload session it came from, so completing that session again finds it.
+    spool_session = Column(String(32), nullable=True, unique=True, index=True)
+    # "pending" (job queued/running) | "succeeded" | "failed"
+    status = Column(String(16), nullable=False, default="pending")
+    row_count = Column(Integer, nullable=True)
+    result = Column(JSON, nullable=True)
+    uploaded_by = Column(String(255), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    finished_at = Column(DateTime(timezone=True), nullable=True)
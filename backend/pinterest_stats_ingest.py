@@ -0,0 +1,484 @@
+# backend/pinterest_stats_ingest.py
+"""
+Monthly Pinterest stats CSV ingestion.
+
+POST /admin/pinterest-stats/upload queues a "pinterest_stats.upload_csv" job
+with the file as its input (see jobs.py); `ingest_monthly_stats` runs on a job
+worker and upserts one row per (account, month). Re-running it with the same
+file gives the same rows, which is what at-least-once job delivery needs.
+
+Every accepted upload is journaled in pinterest_stats_uploads with the sha256
+of its normalized content (BOM dropped, line endings unified), computed while
+the file is read. `accept_upload` answers from the journal instead of queuing
+work when:
+
+- the Idempotency-Key was seen before (a retried request), or
+- the account's most recent upload that didn't fail has the same content (an
+  admin re-sending the same export). Only the most recent one counts: after a
+  different file overwrote some months, re-sending the older file must run.
+
+Compressed exports (.csv.gz / .csv.zst, see content_encoding.py) are stored
+compressed and decompressed as they are hashed and parsed; the content hash
+is of the CSV inside, so the same export counts as a repeat either way.
+"""
+
+import asyncio
+import csv
+import hashlib
+import re
+from datetime import date, datetime, timezone
+from io import BytesIO, TextIOWrapper
+from typing import IO, Awaitable, Callable, Dict, List, Protocol, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import models
+from content_encoding import open_decoded, upload_encoding
+from jobs import ClaimedJob, JobContext, enqueue, job_handler
+from upload_spool import upload_spool
+from utils import parse_calendar_month, parse_int_field
+
+UPLOAD_JOB_KIND = "pinterest_stats.upload_csv"
+
+_READ_CHUNK = 1024 * 1024
+_BOM = b"\xef\xbb\xbf"
+
+REQUIRED_HEADERS_NORM = {
+    "date_range",
+    "impressions",
+    "engagements",
+    "outbound_clicks",
+    "saves",
+}
+
+# Rows parsed between progress reports.
+PROGRESS_EVERY = 500
+
+
+def norm_header(s: str) -> str:
+    # "Outbound Clicks" -> "outbound_clicks"
+    s = (s or "").strip().lower()
+    s = re.sub(r"[^a-z0-9]+", "_", s).strip("_")
+    return s
+
+
+def find_header_row(rows: List[List[str]]) -> Tuple[int, List[str]]:
+    """
+    Find the first row that looks like the real header row.
+    This handles CSVs exported from sheets with title rows above the headers.
+    Returns (header_row_index, normalized_fieldnames).
+    """
+    for i, row in enumerate(rows):
+        norms = [norm_header(c) for c in row]
+        if REQUIRED_HEADERS_NORM.issubset(set(norms)):
+            return i, norms
+    raise ValueError(
+        "Could not find a header row containing: "
+        + ", ".join(sorted(REQUIRED_HEADERS_NORM))
+    )
+
+
+def row_to_dict(header_norms: List[str], row: List[str]) -> Dict[str, str]:
+    # Pad short rows, ignore extra columns.
+    padded = row + [""] * max(0, len(header_norms) - len(row))
+    return {header_norms[i]: padded[i] for i in range(len(header_norms))}
+
+
+class ContentDigest:
+    """sha256 of an upload as the parser sees it, fed chunk by chunk."""
+
+    def __init__(self):
+        self._hash = hashlib.sha256()
+        self._raw = hashlib.sha256()  # the bytes exactly as sent, for client-side checksums
+        self._head = b""  # the first bytes, until we know whether they are a BOM
+        self._cr = False  # previous chunk ended in "\r"
+        self.size = 0  # of the (decompressed) content
+        self.raw_size = 0
+        self.blank = True  # nothing but whitespace so far
+
+    def update_raw(self, chunk: bytes) -> None:
+        """Bytes as sent (compressed, for a compressed upload)."""
+        self.raw_size += len(chunk)
+        self._raw.update(chunk)
+
+    def update(self, chunk: bytes) -> None:
+        """Content bytes, i.e. what the CSV reader will see."""
+        self.size += len(chunk)
+        if self.blank and chunk.strip():
+            self.blank = False
+        if self._head is not None:
+            self._head += chunk
+            if len(self._head) < len(_BOM):
+                return
+            chunk, self._head = self._head.removeprefix(_BOM), None
+        self._feed(chunk)
+
+    def _feed(self, chunk: bytes) -> None:
+        if self._cr:
+            chunk = b"\r" + chunk
+        self._cr = chunk.endswith(b"\r")
+        if self._cr:
+            chunk = chunk[:-1]
+        self._hash.update(chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n"))
+
+    def hexdigest(self) -> str:
+        h = self._hash.copy()
+        if self._head:
+            h.update(self._head.removeprefix(_BOM))
+        if self._cr:
+            h.update(b"\n")
+        return h.hexdigest()
+
+    def raw_hexdigest(self) -> str:
+        return self._raw.hexdigest()
+
+
+class AsyncReadable(Protocol):
+    filename: str | None
+
+    def read(self, size: int = -1) -> Awaitable[bytes]: ...
+
+
+async def read_upload(
+        file: AsyncReadable,
+        *,
+        content_encoding: str | None = None,
+) -> tuple[bytes, ContentDigest, str | None]:
+    """
+    The whole upload as sent, the digest of its content and its compression.
+
+    A plain CSV is hashed as it is read. A compressed one is kept compressed
+    and decompressed once, in a thread, just to hash it; that also trips the
+    decompression-bomb guard before anything is queued.
+    """
+    first = await file.read(_READ_CHUNK)
+    encoding = upload_encoding(filename=file.filename, content_encoding=content_encoding, head=first[:4])
+    parts = [first]
+    if encoding is not None:
+        while chunk := await file.read(_READ_CHUNK):
+            parts.append(chunk)
+        data = b"".join(parts)
+        return data, await asyncio.to_thread(digest_stream, BytesIO(data), encoding), encoding
+
+    digest = ContentDigest()
+    digest.update_raw(first)
+    digest.update(first)
+    while chunk := await file.read(_READ_CHUNK):
+        digest.update_raw(chunk)
+        digest.update(chunk)
+        parts.append(chunk)
+    return b"".join(parts), digest, None
+
+
+def digest_stream(fp: IO[bytes], encoding: str | None = None) -> ContentDigest:
+    """Digest of a file-like read to the end in chunks, decompressing it if `encoding` says so."""
+    digest = ContentDigest()
+    if encoding is None:
+        while chunk := fp.read(_READ_CHUNK):
+            digest.update_raw(chunk)
+            digest.update(chunk)
+        return digest
+    with open_decoded(fp, encoding, on_raw=digest.update_raw) as content:
+        while chunk := content.read(_READ_CHUNK):
+            digest.update(chunk)
+    return digest
+
+
+# -----------------------------
+# Journal
+# -----------------------------
+
+
+def _replayable(db: Session, account_name: str, content_hash: str) -> tuple[models.PinterestStatsUpload, str] | None:
+    """The account's latest live upload and its status, if it carries exactly this content."""
+    U, J = models.PinterestStatsUpload, models.Job
+    row = db.execute(
+        select(U, J.status)
+        .outerjoin(J, J.id == U.job_id)
+        .where(U.account_name == account_name, U.status != "failed")
+        .order_by(U.id.desc())
+        .limit(1)
+    ).first()
+    if row is None or row[0].content_hash != content_hash:
+        return None
+    upload, job_status = row
+    if upload.status == "succeeded":
+        return upload, "succeeded"
+    if job_status in ("queued", "running"):
+        return upload, job_status  # same file still being ingested: follow that job
+    return None  # its job gave up without recording a result
+
+
+def _outcome(upload: models.PinterestStatsUpload, status: str, *, duplicate: bool) -> dict:
+    return {
+        "upload_id": upload.id,
+        "job_id": upload.job_id,
+        "status": status,
+        "account_name": upload.account_name,
+        "duplicate": duplicate,
+        "result": upload.result if status == "succeeded" else None,
+    }
+
+
+def accept_upload(
+        db: Session,
+        account_name: str,
+        content_hash: str,
+        *,
+        size: int,
+        data: bytes | None = None,
+        spool_session: str | None = None,
+        encoding: str | None = None,
+        filename: str | None = None,
+        idempotency_key: str | None = None,
+        uploaded_by: str | None = None,
+) -> dict:
+    """
+    Journal an upload and queue its ingestion, or return the earlier upload it repeats.
+
+    The file is either `data` (stored with the job) or a finalized chunked
+    upload in the spool (`spool_session`, read by the job from disk), as sent:
+    `encoding` says how it is compressed, if it is.
+    `duplicate` in the result says which; a new upload needs job_worker.notify().
+    Raises ValueError when the Idempotency-Key belongs to a different upload.
+    """
+    U = models.PinterestStatsUpload
+    if idempotency_key:
+        upload = db.scalars(select(U).where(U.idempotency_key == idempotency_key)).first()
+        if upload is not None:
+            return _keyed_outcome(db, upload, account_name, content_hash)
+
+    replay = _replayable(db, account_name, content_hash)
+    if replay is not None:
+        return _outcome(*replay, duplicate=True)
+
+    params = {"account_name": account_name, "filename": filename}
+    if spool_session is not None:
+        params["spool_session"] = spool_session
+    if encoding is not None:
+        params["encoding"] = encoding
+    job = enqueue(
+        db,
+        UPLOAD_JOB_KIND,
+        params,
+        input=data,
+        created_by=uploaded_by,
+        commit=False,
+    )
+    upload = U(
+        account_name=account_name,
+        content_hash=content_hash,
+        idempotency_key=idempotency_key,
+        job_id=job.id,
+        filename=(filename or "")[:255] or None,
+        size_bytes=size,
+        spool_session=spool_session,
+        status="pending",
+        uploaded_by=uploaded_by,
+    )
+    db.add(upload)
+    try:
+        db.flush()
+    except IntegrityError:  # the same Idempotency-Key raced us in
+        db.rollback()
+        upload = db.scalars(select(U).where(U.idempotency_key == idempotency_key)).one()
+        return _keyed_outcome(db, upload, account_name, content_hash)
+    outcome = _outcome(upload, "queued", duplicate=False)
+    db.commit()
+    return outcome
+
+
+def _keyed_outcome(db: Session, upload: models.PinterestStatsUpload, account_name: str, content_hash: str) -> dict:
+    if upload.account_name != account_name or upload.content_hash != content_hash:
+        raise ValueError("Idempotency-Key was already used for a different upload")
+    return _journaled_outcome(db, upload)
+
+
+def _journaled_outcome(db: Session, upload: models.PinterestStatsUpload) -> dict:
+    status = upload.status
+    if status == "pending" and upload.job_id is not None:
+        status = db.scalar(select(models.Job.status).where(models.Job.id == upload.job_id))
+    return _outcome(upload, status, duplicate=True)
+
+
+def completed_session_outcome(
+        db: Session,
+        spool_session: str,
+        *,
+        uploaded_by: str | None,
+        repeat_of: int | None = None,
+) -> dict | None:
+    """
+    What an already completed chunked session was answered with, or None.
+
+    Its chunks are gone once the job has ingested them, so a retried completion
+    is answered from the journal: the upload recorded for the session, or for a
+    session that repeated an earlier upload, that one (`repeat_of`, noted in the
+    spool by UploadSpool.mark_repeat).
+    """
+    U = models.PinterestStatsUpload
+    upload = db.scalars(select(U).where(U.spool_session == spool_session, U.uploaded_by == uploaded_by)).first()
+    if upload is None and repeat_of is not None:
+        upload = db.get(U, repeat_of)
+    return _journaled_outcome(db, upload) if upload is not None else None
+
+
+def ingest_monthly_stats(
+        db: Session,
+        account_name: str,
+        source: bytes | IO[bytes],
+        *,
+        progress: Callable[[int, int | None, str], None] | None = None,
+) -> dict:
+    """
+    Parse an exported monthly CSV and upsert it for `account_name`; the caller commits.
+
+    `source` is the file's bytes or a binary file, read as a stream: memory
+    grows with the number of distinct months, not the size of the file.
+    Raises ValueError (nothing written) for a file that isn't a usable export.
+    """
+    fp = BytesIO(source) if isinstance(source, bytes) else source
+    text = TextIOWrapper(fp, encoding="utf-8-sig", newline="")
+    by_month: Dict[date, tuple] = {}  # last row for a month wins
+    total = 0
+    try:
+        rows = (r for r in csv.reader(text) if any((c or "").strip() for c in r))  # drop empty rows
+        header_norms = None
+        for row in rows:  # title rows above the headers are skipped
+            norms = [norm_header(c) for c in row]
+            if REQUIRED_HEADERS_NORM.issubset(norms):
+                header_norms = norms
+                break
+        if header_norms is None:
+            find_header_row([])  # raises the "Could not find a header row" error
+
+        for r in rows:
+            d = row_to_dict(header_norms, r)
+
+            # Parse month from "Date Range" (e.g. "09/01-09/30 2023")
+            cm = parse_calendar_month(d["date_range"])
+            calendar_month = date(cm.year, cm.month, 1)  # normalize to first of month
+
+            by_month[calendar_month] = (
+                parse_int_field(d["impressions"], "impressions"),
+                parse_int_field(d["engagements"], "engagements"),
+                parse_int_field(d["outbound_clicks"], "outbound_clicks"),
+                parse_int_field(d["saves"], "saves"),
+            )
+            total += 1
+            if progress is not None and total % PROGRESS_EVERY == 0:
+                progress(total, None, "Parsing rows")
+    except (ValueError, KeyError) as exc:  # UnicodeDecodeError is a ValueError too
+        raise ValueError(f"Error parsing CSV: {exc}") from exc
+    finally:
+        text.detach()  # the caller owns `fp`
+
+    if progress is not None:
+        progress(total, total, "Saving")
+
+    now = datetime.now(timezone.utc)
+
+    # One lookup for every month in the file instead of a SELECT per row.
+    existing_by_month = {
+        s.calendar_month: s
+        for s in db.query(models.PinterestAccountStatsMonthly)
+        .filter(models.PinterestAccountStatsMonthly.account_name == account_name)
+        .filter(models.PinterestAccountStatsMonthly.calendar_month.in_(by_month))
+    }
+
+    new_rows = []
+    for calendar_month, (impressions, engagements, outbound_clicks, saves) in by_month.items():
+        existing = existing_by_month.get(calendar_month)
+        if existing:
+            existing.impressions = impressions
+            existing.engagements = engagements
+            existing.outbound_clicks = outbound_clicks
+            existing.saves = saves
+            existing.uploaded_at = now
+        else:
+            new_rows.append(
+                {
+                    "account_name": account_name,
+                    "calendar_month": calendar_month,
+                    "impressions": impressions,
+                    "engagements": engagements,
+                    "outbound_clicks": outbound_clicks,
+                    "saves": saves,
+                    "uploaded_at": now,
+                }
+            )
+
+    # Single multi-row INSERT; updates above flush as one executemany.
+    if new_rows:
+        db.execute(insert(models.PinterestAccountStatsMonthly), new_rows)
+
+    # A month's first row in the file inserts it (if new); every other row counts as an update.
+    return {
+        "account_name": account_name,
+        "uploaded_at": now.isoformat(),
+        "rows": total,
+        "inserted": len(new_rows),
+        "updated": total - len(new_rows),
+    }
+
+
+def _upload_job_failed(db: Session, job: ClaimedJob, error: str) -> None:
+    """The job gave up (retries used up, or its last worker vanished): so does its journal entry."""
+    U = models.PinterestStatsUpload
+    db.execute(
+        update(U)
+        .where(U.job_id == job.id, U.status == "pending")
+        .values(status="failed", finished_at=datetime.now(timezone.utc))
+    )
+    db.commit()
+    if job.params.get("spool_session") is not None:
+        upload_spool.discard(job.params["spool_session"])
+
+
+@job_handler(UPLOAD_JOB_KIND, on_failure=_upload_job_failed)
+def run_upload_job(ctx: JobContext) -> dict:
+    db = ctx.db
+    upload = db.scalars(
+        select(models.PinterestStatsUpload).where(models.PinterestStatsUpload.job_id == ctx.id)
+    ).first()
+    spool_session = ctx.params.get("spool_session")
+    try:
+        if spool_session is not None:
+            try:
+                source = upload_spool.open_stream(spool_session)
+            except FileNotFoundError as exc:
+                raise ValueError("The uploaded file expired before it could be ingested") from exc
+        else:
+            source = ctx.input or b""
+        if isinstance(source, bytes):
+            source = BytesIO(source)
+        try:
+            with open_decoded(source, ctx.params.get("encoding")) as content:
+                result = ingest_monthly_stats(db, ctx.params["account_name"], content, progress=ctx.progress)
+        finally:
+            source.close()
+    except ValueError:
+        db.rollback()
+        if upload is not None:
+            upload.status = "failed"
+            upload.finished_at = datetime.now(timezone.utc)
+            db.commit()
+        if spool_session is not None:
+            upload_spool.discard(spool_session)
+        raise
+    except Exception:
+        db.rollback()
+        raise  # retried: the spooled file stays
+
+    # The stats and the journal entry that lets re-uploads skip them commit together.
+    if upload is not None:
+        upload.status = "succeeded"
+        upload.row_count = result["rows"]
+        upload.result = result
+        upload.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    if spool_session is not None:
+        upload_spool.discard(spool_session)
+    return result
@@ -0,0 +1,132 @@
+# backend/principals.py
+"""
+Minimal signed principals for GET/HEAD /auth/session (the Next.js middleware's
+per-navigation auth check).
+
+A principal is just what route gating needs: id, is_active, is_admin, groups.
+It is serialized once, signed with an HMAC over the exact body bytes (keyed by
+JWT_SECRET_KEY), and kept in an in-process TTL cache keyed by the token
+subject, so a warm check costs a JWT decode and a dict lookup: no DB session,
+no Pydantic. The signature doubles as the ETag.
+
+Cached entries can be up to PRINCIPAL_CACHE_TTL_SECONDS stale (per worker), so
+an admin/group change or deactivation takes that long to reach gating.
+`principal_cache.invalidate(email)` drops an entry early in this process.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import select
+
+import config
+import models
+from db import SessionLocal
+
+
+@dataclass(frozen=True, slots=True)
+class SignedPrincipal:
+    id: int
+    is_active: bool
+    is_admin: bool
+    groups: tuple[str, ...]
+    body: bytes  # JSON, including "sig"
+    etag: str
+
+    def headers(self) -> dict[str, str]:
+        # HEAD callers get the principal without parsing a body.
+        return {
+            "ETag": self.etag,
+            "X-Principal-Id": str(self.id),
+            "X-Principal-Active": "1" if self.is_active else "0",
+            "X-Principal-Admin": "1" if self.is_admin else "0",
+            "X-Principal-Groups": ",".join(self.groups),
+        }
+
+
+def sign_principal(id: int, is_active: bool, is_admin: bool, groups) -> SignedPrincipal:
+    groups = tuple(groups or ())
+    claims = {"id": id, "is_active": is_active, "is_admin": is_admin, "groups": list(groups)}
+    canonical = json.dumps(claims, separators=(",", ":"), sort_keys=True).encode()
+    mac = hmac.new(config.require_jwt_secret().encode(), canonical, hashlib.sha256).digest()
+    sig = base64.urlsafe_b64encode(mac).rstrip(b"=").decode()
+    body = json.dumps({**claims, "sig": sig}, separators=(",", ":"), sort_keys=True).encode()
+    return SignedPrincipal(id, is_active, is_admin, groups, body, f'"{sig[:27]}"')
+
+
+def verify_principal(body: bytes) -> dict | None:
+    """Claims from a /auth/session body if its signature checks out, else None."""
+    try:
+        claims = json.loads(body)
+        claims.pop("sig")
+        expected = sign_principal(claims["id"], claims["is_active"], claims["is_admin"], claims["groups"])
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+    return claims if hmac.compare_digest(expected.body, body) else None
+
+
+class PrincipalCache:
+    """Thread-safe LRU of email -> SignedPrincipal with a fixed TTL (misses aren't cached)."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, SignedPrincipal]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, email: str) -> SignedPrincipal | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[email]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(email)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, email: str, principal: SignedPrincipal) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[email] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, email: str | None = None) -> None:
+        with self._lock:
+            if email is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(email, None)
+
+
+principal_cache = PrincipalCache(config.PRINCIPAL_CACHE_TTL_SECONDS, config.PRINCIPAL_CACHE_MAX_ENTRIES)
+
+
+def load_principal(email: str) -> SignedPrincipal | None:
+    """Blocking: one narrow SELECT (no password hash, no timestamps). Call from a threadpool."""
+    u = models.User
+    db = SessionLocal()
+    try:
+        row = db.execute(
+            select(u.id, u.is_active, u.is_admin, u.groups).where(u.email == email)
+        ).first()
+    finally:
+        db.close()
+    if row is None:
+        return None
+    principal = sign_principal(row.id, bool(row.is_active), bool(row.is_admin), row.groups)
+    principal_cache.put(email, principal)
+    return principal
@@ -0,0 +1,225 @@
+# backend/profiling.py
+"""
+In-place profiling of a live worker (admin-only; endpoints live in main.py).
+
+- `SamplingProfiler`: a daemon thread that snapshots every other thread's stack
+  via `sys._current_frames()` at a fixed interval and aggregates them into
+  collapsed stacks ("frame;frame;frame count"), the input format of
+  flamegraph.pl / speedscope / inferno. Nothing is hooked into the profiled
+  code, so overhead is one stack walk per thread per tick (~100 Hz by default).
+- `ProfileRequestMiddleware`: a request that carries `X-Profile: <token>` runs
+  under cProfile and gets the pstats report back *instead of* its normal body
+  (the original status is kept in `X-Profiled-Status`). The token is minted by
+  an admin endpoint, so the header cannot be used to burn CPU anonymously.
+
+On Python 3.12 cProfile is built on sys.monitoring and therefore sees every
+thread: sync endpoints running in the threadpool are included, but so is any
+other request the worker handles meanwhile. Only one cProfile capture (and one
+sampling run) can be active per process; the second caller gets 409.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from jose import JWTError, jwt
+
+import config
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_TOKEN_CLAIM = "profiler"
+
+# Leaf frames that mean "this thread is parked", dropped unless idle=True.
+_IDLE_LEAVES = {
+    ("threading.py", "Condition.wait"),
+    ("threading.py", "Event.wait"),
+    ("queue.py", "Queue.get"),
+    ("selectors.py", "EpollSelector.select"),
+    ("selectors.py", "KqueueSelector.select"),
+    ("selectors.py", "PollSelector.select"),
+    ("selectors.py", "SelectSelector.select"),
+}
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+def _short_path(filename: str) -> str:
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    cwd = os.getcwd() + os.sep
+    if filename.startswith(cwd):
+        return filename[len(cwd):]
+    return filename
+
+
+# -----------------------------
+# Sampling profiler
+# -----------------------------
+
+
+class SamplingProfiler:
+    _lock = threading.Lock()  # one sampling run per process
+
+    def __init__(self, *, interval: float = 0.01, idle: bool = False):
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        self.interval = interval
+        self.idle = idle
+        self.samples = 0
+        self.stacks: Counter[str] = Counter()
+        self._labels: dict = {}  # code object -> label; keeps the per-sample cost to dict lookups
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _label(self, code) -> tuple[str, str]:
+        label = self._labels.get(code)
+        if label is None:
+            path = _short_path(code.co_filename)
+            label = self._labels[code] = (f"{path}:{code.co_qualname}", os.path.basename(path))
+        return label
+
+    def _sample(self, own_ident: int) -> None:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            leaf = frame.f_code
+            if not self.idle and (os.path.basename(leaf.co_filename), leaf.co_qualname) in _IDLE_LEAVES:
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(self._label(frame.f_code)[0])
+                frame = frame.f_back
+            frames.append(names.get(ident, f"thread-{ident}").replace(";", ":"))
+            self.stacks[";".join(reversed(frames))] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            self._sample(own)
+            next_tick += self.interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_tick = time.perf_counter()  # fell behind; don't burst to catch up
+
+    def start(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("A sampling profile is already running in this worker")
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        """Stop sampling and return the collapsed stacks."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._lock.release()
+        return self.collapsed()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+# -----------------------------
+# Per-request cProfile
+# -----------------------------
+
+
+def create_profile_token(admin_email: str, expires_minutes: int | None = None) -> str:
+    # Deliberately no "sub": get_current_user rejects this token as an access token.
+    now = datetime.now(timezone.utc)
+    ttl = timedelta(minutes=expires_minutes or config.PROFILER_TOKEN_EXPIRE_MINUTES)
+    claims = {PROFILE_TOKEN_CLAIM: admin_email, "iat": now, "exp": now + ttl}
+    return jwt.encode(claims, config.require_jwt_secret(), algorithm=config.JWT_ALGORITHM)
+
+
+def verify_profile_token(token: str) -> str | None:
+    """Admin email the token was issued to, or None if it is invalid/expired."""
+    try:
+        payload = jwt.decode(token, config.require_jwt_secret(), algorithms=[config.JWT_ALGORITHM])
+    except (JWTError, RuntimeError):
+        return None
+    return payload.get(PROFILE_TOKEN_CLAIM)
+
+
+_cprofile_lock = threading.Lock()
+
+
+def _plain(status: int, body: str, extra_headers: list | None = None) -> tuple[dict, dict]:
+    data = body.encode()
+    headers = [
+        (b"content-type", b"text/plain; charset=utf-8"),
+        (b"content-length", str(len(data)).encode()),
+        *(extra_headers or []),
+    ]
+    return (
+        {"type": "http.response.start", "status": status, "headers": headers},
+        {"type": "http.response.body", "body": data},
+    )
+
+
+class ProfileRequestMiddleware:
+    def __init__(self, app, *, sort: str = "cumulative", limit: int = 60):
+        self.app = app
+        self.sort = sort
+        self.limit = limit
+
+    async def __call__(self, scope, receive, send):
+        token = None
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    token = value.decode("latin-1")
+                    break
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+
+        if verify_profile_token(token) is None:
+            messages = _plain(403, "Invalid or expired profile token\n")
+        elif not _cprofile_lock.acquire(blocking=False):
+            messages = _plain(409, "Another request is being profiled in this worker\n")
+        else:
+            try:
+                messages = await self._profile(scope, receive)
+            finally:
+                _cprofile_lock.release()
+        for message in messages:
+            await send(message)
+
+    async def _profile(self, scope, receive) -> tuple[dict, dict]:
+        status = 500
+
+        async def capture(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            # The body is discarded; the report replaces it.
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - started
+
+        out = io.StringIO()
+        out.write(f"{scope['method']} {scope['path']} -> {status} in {elapsed * 1000:.1f} ms (pid {os.getpid()})\n\n")
+        pstats.Stats(profiler, stream=out).sort_stats(self.sort).print_stats(self.limit)
+        return _plain(200, out.getvalue(), [(b"x-profiled-status", str(status).encode())])
@@ -0,0 +1,98 @@
+# backend/query_budget.py
+"""
+Per-route query budgets and N+1 detection.
+
+Routes declare what they are allowed to do:
+
+    @router.get("/monthly")
+    @query_budget(2)                     # at most 2 statements per request
+    def list_monthly(...): ...
+
+Every request is also checked for the N+1 smell: the same statement shape
+(SQLAlchemy's parameterized SQL text) executed more than `max_repeats` times.
+Routes without a decorator get only the repeat check.
+
+Counting piggybacks on metrics.RequestStats (filled by the before/after
+cursor hooks), so QueryBudgetMiddleware must sit inside MetricsMiddleware.
+QUERY_BUDGET_MODE decides what happens on a violation: "off", "log"
+(default; production) or "raise" (tests; the request fails with
+QueryBudgetExceeded so the suite breaks when a new N+1 appears).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+import config
+from metrics import RequestStats, current_request_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class QueryBudget:
+    max_queries: int | None = None
+    max_repeats: int | None = config.QUERY_BUDGET_MAX_REPEATS
+
+
+DEFAULT_BUDGET = QueryBudget()
+
+
+def query_budget(max_queries: int | None = None, *, max_repeats: int | None = config.QUERY_BUDGET_MAX_REPEATS):
+    """
+    Declare a route's budget. Use `None` to opt out of a check explicitly
+    (e.g. batch endpoints that loop by design). Apply below the router decorator.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        fn.__query_budget__ = QueryBudget(max_queries=max_queries, max_repeats=max_repeats)
+        return fn
+
+    return decorator
+
+
+def get_budget(endpoint) -> QueryBudget | None:
+    return getattr(endpoint, "__query_budget__", None)
+
+
+def find_violations(stats: RequestStats, budget: QueryBudget) -> list[str]:
+    violations = []
+    if budget.max_queries is not None and stats.query_count > budget.max_queries:
+        violations.append(f"{stats.query_count} queries (budget {budget.max_queries})")
+    if budget.max_repeats is not None:
+        for statement, n in stats.statements.items():
+            if n > budget.max_repeats:
+                shape = " ".join(statement.split())[:200]
+                violations.append(f"statement repeated {n}x (max {budget.max_repeats}), likely N+1: {shape}")
+    return violations
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, app, *, mode: str | None = None):
+        self.app = app
+        self.mode = mode or config.QUERY_BUDGET_MODE
+
+    async def __call__(self, scope, receive, send):
+        if self.mode == "off" or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+        stats = current_request_stats.get()
+        if stats is None:
+            return
+        endpoint = scope.get("endpoint")
+        violations = find_violations(stats, get_budget(endpoint) or DEFAULT_BUDGET)
+        if not violations:
+            return
+
+        route = getattr(scope.get("route"), "path", scope["path"])
+        message = f"Query budget exceeded for {scope['method']} {route}: " + "; ".join(violations)
+        if self.mode == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,50 @@
+# backend/routers/admin_experiments.py
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from experiment_stats import compact_events, load_totals, summarize
+from query_budget import query_budget
+from security import get_db, get_current_admin_user
+
+router = APIRouter(
+    prefix="/admin/experiments",
+    tags=["admin_experiments"],
+)
+
+
+@router.get("/{experiment_key}/results")
+@query_budget(2)
+def get_experiment_results(
+        experiment_key: str,
+        start: date | None = None,
+        end: date | None = None,
+        control: str | None = None,
+        db: Session = Depends(get_db),
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """
+    Per-variant conversion rates (95% Wilson CIs) and lift vs control.
+
+    Reads only the daily counters, so cost does not grow with raw event volume.
+    """
+    totals = load_totals(db, experiment_key, start=start, end=end)
+    if not totals:
+        raise HTTPException(status_code=404, detail="No data for this experiment")
+    return {
+        "experiment_key": experiment_key,
+        "start": start,
+        "end": end,
+        **summarize(totals, control=control),
+    }
+
+
+@router.post("/compact")
+@query_budget(None, max_repeats=None)  # batch job: one round of statements per id chunk
+def compact_experiment_events(
+        db: Session = Depends(get_db),
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """Fold newly ingested events into the daily counters now (the CLI does the same)."""
+    return compact_events(db)
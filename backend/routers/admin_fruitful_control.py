@@ -0,0 +1,80 @@
+# backend/routers/admin_fruitful_control.py
+from typing import Literal
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+import config
+from query_budget import query_budget
+from schemas import FruitfulControlPublishOut, FruitfulControlRuleRevisionOut
+from security import get_db, get_current_admin_user
+from tools.fruitful_control import engine
+from tools.fruitful_control.repository import document_history, publish_document, retire_document
+
+router = APIRouter(
+    prefix="/admin/fruitful-control/rules",
+    tags=["admin_fruitful_control"],
+)
+
+Layer = Literal["global", "task", "client"]
+
+
+def _apply_now() -> str | None:
+    """Refresh this worker's snapshot right away (the rest follow on their next poll)."""
+    if config.FRUITFUL_CONTROL_RULES_SOURCE != "db":
+        return engine.snapshot_version
+    try:
+        engine.refresh()
+    except ValueError:
+        pass  # the library as a whole is still inconsistent (e.g. no global yet); keep serving the old one
+    return engine.snapshot_version
+
+
+@router.get("/{layer}/{key}/history", response_model=list[FruitfulControlRuleRevisionOut])
+@query_budget(2)
+def rule_document_history(
+        layer: Layer,
+        key: str,
+        limit: int = Query(50, ge=1, le=500),
+        db: Session = Depends(get_db),
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """Published revisions of one rule document, newest first."""
+    return document_history(db, layer, key, limit=limit)
+
+
+@router.put("/{layer}/{key}", response_model=FruitfulControlPublishOut)
+@query_budget(None, max_repeats=None)  # publish + the snapshot rebuild it triggers
+def publish_rule_document(
+        layer: Layer,
+        key: str,
+        body: dict = Body(...),
+        db: Session = Depends(get_db),
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """
+    Publish a new revision of a rule document (same JSON as the files under
+    tools/fruitful_control/data). Validated before it is stored; publishing
+    unchanged content is a no-op. Takes effect when FRUITFUL_CONTROL_RULES_SOURCE=db.
+    """
+    try:
+        row, changed = publish_document(db, layer, key, body, published_by=current_admin.email)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    snapshot_version = _apply_now() if changed else engine.snapshot_version
+    return {"revision": row, "changed": changed, "snapshot_version": snapshot_version}
+
+
+@router.delete("/client/{key}", response_model=FruitfulControlPublishOut)
+@query_budget(None, max_repeats=None)
+def retire_client_rules(
+        key: str,
+        db: Session = Depends(get_db),
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """Retire a client profile (history is kept); QA for that client then returns 404."""
+    try:
+        row = retire_document(db, "client", key, published_by=current_admin.email)
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return {"revision": row, "changed": True, "snapshot_version": _apply_now()}
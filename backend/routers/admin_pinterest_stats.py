@@ -1,67 +1,62 @@
 # backend/routers/admin_pinterest_stats.py
-import csv
-import re
-from datetime import datetime, timezone, date
-from io import StringIO
-from typing import Dict, List, Tuple
-
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Path, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 import models
+from content_encoding import DecompressionBomb, DecompressionError, UnsupportedEncoding, upload_encoding
+from jobs import job_worker
+from pinterest_stats_ingest import (  # noqa: F401 (find_header_row etc. re-exported)
+    accept_upload,
+    completed_session_outcome,
+    digest_stream,
+    find_header_row,
+    norm_header,
+    read_upload,
+    row_to_dict,
+)
+from query_budget import query_budget
+from schemas import (
+    PinterestStatsUploadChunkOut,
+    PinterestStatsUploadOut,
+    PinterestStatsUploadSessionCompleteIn,
+    PinterestStatsUploadSessionIn,
+    PinterestStatsUploadSessionOut,
+)
 from security import get_db, get_current_admin_user
-from utils import parse_calendar_month, parse_int_field
+from upload_spool import SESSION_ID_PATTERN, ChunkRejected, UploadSessionNotFound, upload_spool
 
 router = APIRouter(
     prefix="/admin/pinterest-stats",
     tags=["admin_pinterest_stats"],
 )
 
-REQUIRED_HEADERS_NORM = {
-    "date_range",
-    "impressions",
-    "engagements",
-    "outbound_clicks",
-    "saves",
-}
-
 
-def norm_header(s: str) -> str:
-    # "Outbound Clicks" -> "outbound_clicks"
-    s = (s or "").strip().lower()
-    s = re.sub(r"[^a-z0-9]+", "_", s).strip("_")
-    return s
-
-
-def find_header_row(rows: List[List[str]]) -> Tuple[int, List[str]]:
-    """
-    Find the first row that looks like the real header row.
-    This handles CSVs exported from sheets with title rows above the headers.
-    Returns (header_row_index, normalized_fieldnames).
-    """
-    for i, row in enumerate(rows):
-        norms = [norm_header(c) for c in row]
-        if REQUIRED_HEADERS_NORM.issubset(set(norms)):
-            return i, norms
-    raise ValueError(
-        "Could not find a header row containing: "
-        + ", ".join(sorted(REQUIRED_HEADERS_NORM))
-    )
-
-
-def row_to_dict(header_norms: List[str], row: List[str]) -> Dict[str, str]:
-    # Pad short rows, ignore extra columns.
-    padded = row + [""] * max(0, len(header_norms) - len(row))
-    return {header_norms[i]: padded[i] for i in range(len(header_norms))}
-
-
-@router.post("/upload")
+@router.post("/upload", response_model=PinterestStatsUploadOut, status_code=status.HTTP_202_ACCEPTED)
+@query_budget(6)
 async def upload_monthly_stats_csv(
+        response: Response,
         account_name: str = Form(...),
         file: UploadFile = File(...),
+        idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=64),
         db: Session = Depends(get_db),
         current_admin=Depends(get_current_admin_user),  # admin-only
 ):
+    """
+    Queue a monthly stats CSV for ingestion and return its job right away.
+
+    Parsing and the upsert run on a background job worker; poll
+    GET /admin/jobs/{job_id} (or stream /events) for progress and the
+    inserted/updated counts.
+
+    Re-sending the file the account was last ingested from, or retrying with
+    the same Idempotency-Key, queues nothing: the answer is 200 with
+    `duplicate: true` and the earlier upload's job (and result, once done).
+
+    The file may be gzip- or zstd-compressed (.csv.gz / .csv.zst, or a
+    Content-Encoding on the file part); it is stored compressed and
+    decompressed while it is parsed.
+    """
     account_name = (account_name or "").strip()
     if not account_name:
         raise HTTPException(status_code=400, detail="account_name is required")
@@ -70,80 +65,202 @@ async def upload_monthly_stats_csv(
             "text/csv",
             "application/vnd.ms-excel",
             "application/octet-stream",
+            "application/gzip",
+            "application/x-gzip",
+            "application/zstd",
     ):
         raise HTTPException(status_code=400, detail="Please upload a CSV file.")
 
-    raw = (await file.read()).decode("utf-8-sig")
-    reader = csv.reader(StringIO(raw))
-    rows = [r for r in reader if any((c or "").strip() for c in r)]  # drop empty rows
+    try:
+        data, digest, encoding = await read_upload(file, content_encoding=file.headers.get("content-encoding"))
+    except UnsupportedEncoding as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+    except DecompressionBomb as e:
+        raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(e))
+    except DecompressionError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if digest.blank:
+        raise HTTPException(status_code=400, detail="The uploaded file is empty.")
 
     try:
-        header_idx, header_norms = find_header_row(rows)
+        outcome = await run_in_threadpool(
+            accept_upload,
+            db,
+            account_name,
+            digest.hexdigest(),
+            size=len(data),
+            data=data,
+            encoding=encoding,
+            filename=file.filename,
+            idempotency_key=idempotency_key,
+            uploaded_by=getattr(current_admin, "email", None),
+        )
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
-    data_rows = rows[header_idx + 1 :]
+    if outcome["duplicate"]:
+        response.status_code = status.HTTP_200_OK
+    else:
+        job_worker.notify()
+    return _upload_out(outcome)
+
+
+def _upload_out(outcome: dict) -> dict:
+    job_id = outcome["job_id"]
+    return {
+        **outcome,
+        "status_url": f"/admin/jobs/{job_id}" if job_id is not None else None,
+        "events_url": f"/admin/jobs/{job_id}/events" if job_id is not None else None,
+    }
 
-    now = datetime.now(timezone.utc)
-    inserted = 0
-    updated = 0
 
+# -----------------------------
+# Chunked, resumable uploads (see upload_spool.py)
+# -----------------------------
+
+SessionId = Path(..., pattern=SESSION_ID_PATTERN)
+
+
+@router.post("/upload-sessions", response_model=PinterestStatsUploadSessionOut, status_code=status.HTTP_201_CREATED)
+@query_budget(1)
+def create_upload_session(
+        payload: PinterestStatsUploadSessionIn,
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """
+    Start a chunked upload for a large export: PUT its chunks to
+    .../chunks/{n}, then POST .../complete. Idle sessions expire.
+    """
+    account_name = payload.account_name.strip()
+    if not account_name:
+        raise HTTPException(status_code=400, detail="account_name is required")
+    return upload_spool.create(account_name=account_name, filename=payload.filename, owner=current_admin.email)
+
+
+@router.get("/upload-sessions/{session_id}", response_model=PinterestStatsUploadSessionOut)
+@query_budget(1)
+def get_upload_session(
+        session_id: str = SessionId,
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """The chunks received so far, so an interrupted client can send only the missing ones."""
     try:
-        for n, r in enumerate(data_rows, start=header_idx + 2):  # 1-based-ish line nums
-            d = row_to_dict(header_norms, r)
-
-            # Parse month from "Date Range" (e.g. "09/01-09/30 2023")
-            cm = parse_calendar_month(d["date_range"])
-            calendar_month = date(cm.year, cm.month, 1)  # normalize to first of month
-
-            impressions = parse_int_field(d["impressions"], "impressions")
-            engagements = parse_int_field(d["engagements"], "engagements")
-            outbound_clicks = parse_int_field(d["outbound_clicks"], "outbound_clicks")
-            saves = parse_int_field(d["saves"], "saves")
-
-            existing = (
-                db.query(models.PinterestAccountStatsMonthly)
-                .filter(models.PinterestAccountStatsMonthly.account_name == account_name)
-                .filter(models.PinterestAccountStatsMonthly.calendar_month == calendar_month)
-                .first()
+        return upload_spool.describe(session_id, owner=current_admin.email)
+    except UploadSessionNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.put("/upload-sessions/{session_id}/chunks/{n}", response_model=PinterestStatsUploadChunkOut)
+@query_budget(1)
+async def put_upload_chunk(
+        request: Request,
+        session_id: str = SessionId,
+        n: int = Path(..., ge=0),
+        chunk_sha256: str = Header(..., alias="X-Chunk-Sha256", pattern=r"^[0-9a-fA-F]{64}$"),
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """
+    Store chunk `n` (the raw request body). X-Chunk-Sha256 must be the hex
+    sha256 of the body; on a mismatch nothing is stored and the chunk can be
+    sent again. Re-sending a stored chunk replaces it.
+    """
+    body = bytearray()
+    async for part in request.stream():
+        body += part
+        if len(body) > upload_spool.max_chunk_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                detail=f"Chunks are limited to {upload_spool.max_chunk_bytes} bytes",
             )
+    try:
+        return await run_in_threadpool(
+            upload_spool.put_chunk, session_id, n, bytes(body), chunk_sha256, owner=current_admin.email
+        )
+    except UploadSessionNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ChunkRejected as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-            if existing:
-                existing.impressions = impressions
-                existing.engagements = engagements
-                existing.outbound_clicks = outbound_clicks
-                existing.saves = saves
-                existing.uploaded_at = now
-                updated += 1
-            else:
-                db.add(
-                    models.PinterestAccountStatsMonthly(
-                        account_name=account_name,
-                        calendar_month=calendar_month,
-                        impressions=impressions,
-                        engagements=engagements,
-                        outbound_clicks=outbound_clicks,
-                        saves=saves,
-                        uploaded_at=now,
-                    )
-                )
-                inserted += 1
-
-        db.commit()
-
-    except Exception as exc:
-        db.rollback()
-        raise HTTPException(status_code=400, detail=f"Error parsing CSV: {exc}")
 
-    return {
-        "account_name": account_name,
-        "uploaded_at": now.isoformat(),
-        "inserted": inserted,
-        "updated": updated,
-    }
+@router.post(
+    "/upload-sessions/{session_id}/complete",
+    response_model=PinterestStatsUploadOut,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+@query_budget(6)
+def complete_upload_session(
+        payload: PinterestStatsUploadSessionCompleteIn,
+        response: Response,
+        session_id: str = SessionId,
+        idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=64),
+        db: Session = Depends(get_db),
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """
+    Finish a chunked upload and queue its ingestion; same answer as POST /upload
+    (including `duplicate` for a file the account was last ingested from).
+    Safe to retry: completing a session again returns the same upload and job
+    (200, `duplicate`) from the journal, also after the job has run and the
+    spooled chunks are gone, until the session itself expires.
+
+    A compressed file (.csv.gz / .csv.zst name, or recognised by its first
+    bytes) stays compressed in the spool; `sha256` is of the bytes as sent.
+    """
+    owner = current_admin.email
+    try:
+        repeat_of = upload_spool.meta(session_id, owner=owner).get("repeat_of")
+    except UploadSessionNotFound:
+        repeat_of = None  # or ingested and discarded: the journal knows
+    done = completed_session_outcome(db, session_id, uploaded_by=owner, repeat_of=repeat_of)
+    if done is not None:
+        response.status_code = status.HTTP_200_OK
+        return _upload_out(done)
+
+    try:
+        meta, paths = upload_spool.chunk_paths(session_id, payload.chunks, owner=owner)
+        with upload_spool.open_stream(session_id, paths) as fp:
+            encoding = upload_encoding(filename=meta["filename"], head=fp.peek(4)[:4])
+            digest = digest_stream(fp, encoding)
+        if payload.sha256 and digest.raw_hexdigest() != payload.sha256.lower():
+            raise ChunkRejected("The assembled file doesn't match the given sha256")
+        if digest.blank:
+            raise ChunkRejected("The uploaded file is empty.")
+        first_completion = upload_spool.mark_finalized(session_id, owner=owner)
+    except UploadSessionNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except UnsupportedEncoding as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+    except DecompressionBomb as e:
+        raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(e))
+    except (ChunkRejected, DecompressionError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
+        outcome = accept_upload(
+            db,
+            meta["account_name"],
+            digest.hexdigest(),
+            size=digest.raw_size,
+            spool_session=session_id,
+            encoding=encoding,
+            filename=meta["filename"],
+            idempotency_key=idempotency_key,
+            uploaded_by=owner,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    if outcome["duplicate"]:
+        response.status_code = status.HTTP_200_OK
+        if first_completion:  # nothing will read the chunks (a retry's session feeds its job)
+            upload_spool.mark_repeat(session_id, outcome["upload_id"], owner=owner)
+    else:
+        job_worker.notify()
+    return _upload_out(outcome)
 
 
 @router.get("/accounts")
+@query_budget(2)
 def list_accounts(
         db: Session = Depends(get_db),
         current_admin=Depends(get_current_admin_user),
@@ -158,6 +275,7 @@ def list_accounts(
 
 
 @router.get("/monthly")
+@query_budget(2)
 def list_monthly(
         account_name: str,
         db: Session = Depends(get_db),
@@ -1,26 +1,33 @@
 # backend/routers/auth.py
 
+import time
 from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 import config
 import models
+from principals import load_principal, principal_cache
+from query_budget import query_budget
 from schemas import Token, UserCreate, UserOut
 from security import (
     authenticate_user,
     create_access_token,
+    decode_access_token,
     get_db,
     hash_password,
     get_current_active_user,
+    oauth2_scheme,
 )
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=UserOut)
+@query_budget(3)
 def register_user(payload: UserCreate, db: Session = Depends(get_db)):
     """
     Simple user registration endpoint.
@@ -57,6 +64,7 @@ def register_user(payload: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
+@query_budget(1)
 def login_for_access_token(
         form_data: OAuth2PasswordRequestForm = Depends(),
         db: Session = Depends(get_db),
@@ -88,6 +96,7 @@ def login_for_access_token(
 
 
 @router.get("/me", response_model=UserOut)
+@query_budget(1)
 async def read_current_user(
         current_user: models.User = Depends(get_current_active_user),
 ):
@@ -96,4 +105,48 @@ async def read_current_user(
 
     Used by the frontend to hydrate session info.
     """
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+@router.get("/session")
+@router.head("/session")
+@query_budget(1)
+async def read_session(request: Request, token: str = Depends(oauth2_scheme)):
+    """
+    Minimal signed principal for route gating (Next.js middleware):
+    {"id", "is_active", "is_admin", "groups", "sig"}, also as X-Principal-* headers.
+
+    Served from the per-worker principal cache when warm (no DB), with an ETag
+    (If-None-Match -> 304). Inactive users get 200 with is_active=false;
+    bad/expired tokens get 401.
+
+    Caching: `public, max-age, s-maxage` (SESSION_MAX_AGE_SECONDS, never past
+    token expiry) with `Vary: Authorization`, so the middleware and a shared
+    cache at the edge may reuse a response for that long, per token. `public`
+    is what lets a shared cache store a response to an Authorization request
+    at all; Vary keeps one token's principal from answering another's. Don't
+    put this behind a cache that ignores Vary.
+    """
+    claims = decode_access_token(token)
+    email = claims["sub"]
+    principal = principal_cache.get(email) or await run_in_threadpool(load_principal, email)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    max_age = config.SESSION_MAX_AGE_SECONDS
+    if "exp" in claims:
+        max_age = max(0, min(max_age, int(claims["exp"] - time.time())))
+    headers = {
+        **principal.headers(),
+        "Cache-Control": f"public, max-age={max_age}, s-maxage={max_age}",
+        "Vary": "Authorization",
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if principal.etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(principal.body, media_type="application/json", headers=headers)
@@ -0,0 +1,36 @@
+# backend/routers/experiment_events.py
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, HTTPException, status
+
+from experiment_events import event_buffer
+from schemas import ExperimentEventBatchIn, ExperimentEventIn
+
+router = APIRouter(
+    prefix="/experiment-events",
+    tags=["experiment_events"],
+)
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_experiment_events(payload: ExperimentEventBatchIn | ExperimentEventIn):
+    """
+    Accept one event or {"events": [...]} and buffer them for the background flusher.
+
+    Never touches the DB; answers 503 + Retry-After when the buffer is full.
+    """
+    events = payload.events if isinstance(payload, ExperimentEventBatchIn) else [payload]
+    now = datetime.now(timezone.utc)
+    rows = []
+    for e in events:
+        row = e.model_dump()
+        row["occurred_at"] = row["occurred_at"] or now
+        rows.append(row)
+
+    if not event_buffer.offer(rows):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Experiment event buffer is full; retry later",
+            headers={"Retry-After": "1"},
+        )
+    return {"ok": True, "accepted": len(rows)}
@@ -0,0 +1,115 @@
+# backend/routers/fruitful_control.py
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from query_budget import query_budget
+from schemas import (
+    FruitfulControlBatchIn,
+    FruitfulControlDesignOut,
+    FruitfulControlEvaluateIn,
+    FruitfulControlEvaluateOut,
+    FruitfulControlRulesOut,
+)
+from security import get_current_contractor_user
+from tools.fruitful_control import TASK_TYPES, UnknownClientError, engine
+from tools.fruitful_control.batch import batch_evaluator
+from tools.fruitful_control.images import ImageRejected, design_analyzer
+
+router = APIRouter(
+    prefix="/contractor/fruitful-control",
+    tags=["fruitful_control"],
+)
+
+
+@router.get("/rules", response_model=FruitfulControlRulesOut)
+@query_budget(1)
+def list_rule_sources(current_user=Depends(get_current_contractor_user)):  # contractor-only
+    """Clients with a rule profile, the task types, and the rule versions in force."""
+    snapshot = engine.snapshot
+    library = snapshot.library
+    return FruitfulControlRulesOut(
+        snapshot_version=snapshot.version,
+        task_types=list(TASK_TYPES),
+        global_version=library.global_rules.version,
+        clients=[{"key": d.key, "name": d.name, "version": d.version} for d in library.clients.values()],
+    )
+
+
+@router.post("/evaluate", response_model=FruitfulControlEvaluateOut)
+@query_budget(1)
+def evaluate_items(
+        payload: FruitfulControlEvaluateIn,
+        current_user=Depends(get_current_contractor_user),  # contractor-only
+):
+    """
+    QA a batch of titles or descriptions against global + task + client rules.
+
+    Deterministic: the same items under the same `rules_version` always get the
+    same verdicts, scores and breakdowns.
+    """
+    try:
+        return engine.evaluate_batch(
+            payload.client, payload.task_type, ((item.id, item.text) for item in payload.items)
+        )
+    except UnknownClientError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.post("/batch", response_class=StreamingResponse)
+@query_budget(1)
+async def evaluate_batch_stream(
+        payload: FruitfulControlBatchIn,
+        current_user=Depends(get_current_contractor_user),  # contractor-only
+):
+    """
+    Like /evaluate, for up to 5000 items, streamed as NDJSON while chunks finish.
+
+    Lines: one "batch" header (rules version and sources), one "result" per item
+    (with its request `index`; identical texts share one evaluation), "error" for
+    a failed chunk, and a final "summary". Large batches run on a process pool.
+    """
+    # Off the loop: a worker that skipped warm-up builds its first snapshot here.
+    snapshot = await run_in_threadpool(lambda: engine.snapshot)
+    try:
+        rule_set = snapshot.rule_set(payload.client, payload.task_type)
+    except UnknownClientError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    items = [(item.id, item.text) for item in payload.items]
+    return StreamingResponse(
+        batch_evaluator.stream(rule_set, items, snapshot_version=snapshot.version),
+        media_type="application/x-ndjson",
+        # Proxies must pass lines through as they come, not buffer the whole batch.
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/design", response_model=FruitfulControlDesignOut)
+@query_budget(1)
+def evaluate_design(
+        client: str = Form(..., min_length=1, max_length=64),
+        image: UploadFile = File(...),
+        template_id: str | None = Form(None, max_length=64),
+        current_user=Depends(get_current_contractor_user),  # contractor-only
+):
+    """
+    Design QA: run the client's image rules (ratio, size, contrast, text density,
+    safe zone) on one pin creative (PNG, JPEG or WebP).
+
+    Deterministic and cached by file hash: re-submitting an unchanged design
+    under the same `rules_version` returns the stored verdict (`cached: true`).
+    """
+    snapshot = engine.snapshot
+    try:
+        rule_set = snapshot.rule_set(client, "design")
+    except UnknownClientError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    try:
+        # image.file is Starlette's spool (memory up to 1 MB, then disk); it is read in chunks.
+        result = design_analyzer.evaluate(rule_set, image.file, snapshot_version=snapshot.version)
+    except ImageRejected as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {**result, "template_id": template_id}
@@ -0,0 +1,95 @@
+# backend/routers/jobs.py
+import asyncio
+import json
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+import config
+import models
+from jobs import TERMINAL_STATUSES, job_state
+from query_budget import query_budget
+from schemas import JobOut
+from security import get_db, get_current_admin_user
+
+router = APIRouter(
+    prefix="/admin/jobs",
+    tags=["admin_jobs"],
+)
+
+
+def _load(db: Session, job_id: int) -> models.Job:
+    job = db.get(models.Job, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}", response_model=JobOut)
+@query_budget(1)
+def get_job(
+        job_id: int,
+        db: Session = Depends(get_db),
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """Status, progress and (once finished) result or error of a background job."""
+    return job_state(_load(db, job_id))
+
+
+@router.get("/{job_id}/events", response_class=StreamingResponse)
+@query_budget(None, max_repeats=None)  # polls the job row until it finishes
+async def stream_job_events(
+        job_id: int,
+        request: Request,
+        db: Session = Depends(get_db),
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """
+    Server-sent events for one job: a "progress" event whenever its state
+    changes, then one "done" event (succeeded or failed) and the stream ends.
+
+    The job may be running in any API worker, so this worker follows it by
+    polling the row (JOBS_EVENTS_POLL_SECONDS); no broker is involved.
+    """
+    first = job_state(await asyncio.to_thread(_load, db, job_id))
+    bind = db.get_bind()  # each poll gets a fresh session: the request's own ends with the handler
+
+    def poll() -> dict | None:
+        with Session(bind=bind) as s:
+            job = s.get(models.Job, job_id)
+            return job_state(job) if job is not None else None
+
+    async def events():
+        state, last = first, None
+        keepalive_at = time.monotonic() + config.JOBS_EVENTS_KEEPALIVE_SECONDS
+        while True:
+            if state is None:
+                yield _event("done", {"id": job_id, "status": "failed", "error": "Job was deleted"})
+                return
+            if state != last:
+                done = state["status"] in TERMINAL_STATUSES
+                yield _event("done" if done else "progress", state)
+                if done:
+                    return
+                last = state
+                keepalive_at = time.monotonic() + config.JOBS_EVENTS_KEEPALIVE_SECONDS
+            elif time.monotonic() >= keepalive_at:
+                yield b": keepalive\n\n"
+                keepalive_at = time.monotonic() + config.JOBS_EVENTS_KEEPALIVE_SECONDS
+
+            await asyncio.sleep(config.JOBS_EVENTS_POLL_SECONDS)
+            if await request.is_disconnected():
+                return
+            state = await asyncio.to_thread(poll)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _event(name: str, data: dict) -> bytes:
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
@@ -0,0 +1,79 @@
+# backend/routers/pinterest_fit.py
+
+from fastapi import APIRouter, Depends, Header, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import config
+import lead_delivery
+import models
+from query_budget import query_budget
+from schemas import LeadCaptureOut, PinterestFitLeadIn
+from security import get_db
+from tools.pinterest_fit import RULES_VERSION, score_assessment
+from tools.pinterest_fit.mailerlite import LEAD_SOURCE, build_subscriber_payload
+
+router = APIRouter(
+    prefix="/tools/pinterest-fit-assessment",
+    tags=["pinterest_fit"],
+)
+
+
+@router.post("/lead", response_model=LeadCaptureOut, status_code=status.HTTP_202_ACCEPTED)
+@query_budget(4)
+def capture_pinterest_fit_lead(
+        payload: PinterestFitLeadIn,
+        idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=64),
+        db: Session = Depends(get_db),
+):
+    """
+    Store the lead and queue its MailerLite delivery; the provider is never called inline.
+
+    Retrying with the same Idempotency-Key returns the original lead instead of a duplicate.
+    """
+    if idempotency_key:
+        existing = _delivery_by_key(db, idempotency_key)
+        if existing:
+            return LeadCaptureOut(lead_id=existing.lead_id)
+
+    lead = payload.model_dump(exclude={"email", "answers"})
+    lead["source"] = (payload.source or "").strip() or LEAD_SOURCE
+
+    results = None
+    if payload.answers:
+        try:
+            results = score_assessment(payload.answers)
+        except ValueError:
+            results = None  # store the raw answers anyway; recompute can retry later
+
+    try:
+        delivery = lead_delivery.enqueue_lead(
+            db,
+            tool="pinterest_fit",
+            email=payload.email.lower(),
+            answers=payload.answers or {},
+            results=results,
+            rules_version=RULES_VERSION if results is not None else None,
+            provider=lead_delivery.PROVIDER_MAILERLITE,
+            payload=build_subscriber_payload(payload.email, config.MAILERLITE_PINTEREST_FIT_GROUP_ID, lead),
+            idempotency_key=idempotency_key,
+        )
+    except IntegrityError:
+        if not idempotency_key:
+            raise
+        # A concurrent retry with the same key committed first: answer with its lead.
+        db.rollback()
+        return LeadCaptureOut(lead_id=_delivery_by_key(db, idempotency_key).lead_id)
+
+    if lead_delivery.lead_delivery_worker is not None:
+        lead_delivery.lead_delivery_worker.notify()
+
+    return LeadCaptureOut(lead_id=delivery.lead_id)
+
+
+def _delivery_by_key(db: Session, idempotency_key: str) -> models.LeadDelivery | None:
+    return (
+        db.query(models.LeadDelivery)
+        .filter(models.LeadDelivery.idempotency_key == idempotency_key)
+        .first()
+    )
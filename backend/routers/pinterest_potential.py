@@ -0,0 +1,39 @@
+# backend/routers/pinterest_potential.py
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from schemas import PinterestPotentialAnswers, PinterestPotentialBatchIn
+from security import get_current_admin_user
+from tools.pinterest_potential import compute_results, compute_results_batch
+
+router = APIRouter(
+    prefix="/tools/pinterest-potential",
+    tags=["pinterest_potential"],
+)
+
+
+@router.post("/compute")
+def compute_pinterest_potential(payload: PinterestPotentialAnswers):
+    """
+    Server-side twin of the browser's computeResults().
+
+    Returns the results bundle, or 400 with per-question errors.
+    """
+    r = compute_results(payload.model_dump(exclude_none=True))
+    if not r["ok"]:
+        raise HTTPException(status_code=400, detail=r["errors"])
+    return r["results"]
+
+
+@router.post("/compute/batch")
+def compute_pinterest_potential_batch(
+        payload: PinterestPotentialBatchIn,
+        current_admin=Depends(get_current_admin_user),  # admin-only
+):
+    """
+    Recompute many answer sets in one call (e.g. stored leads).
+
+    Each item is {"ok": true, "results": ...} or {"ok": false, "errors": ...}, in input order.
+    """
+    items = [a.model_dump(exclude_none=True) for a in payload.items]
+    return {"results": compute_results_batch(items)}
@@ -4,9 +4,11 @@ from datetime import datetime
 from io import StringIO
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 import models
+from query_budget import query_budget
 from schemas import PinterestAccountStatsMonthlyOut
 from security import get_db, get_current_active_user, get_current_admin_user
 from utils import parse_calendar_month, parse_int_field
@@ -14,6 +16,7 @@ from utils import parse_calendar_month, parse_int_field
 router = APIRouter(tags=["pinterest"])
 
 @router.get("/users")
+@query_budget(2)
 def list_users(
         db: Session = Depends(get_db),
         current_admin = Depends(get_current_admin_user),  # admin-only
@@ -23,6 +26,7 @@ def list_users(
 
 
 @router.get("/pinterest-stats")
+@query_budget(2)
 def list_pinterest_stats(
         db: Session = Depends(get_db),
         current_admin = Depends(get_current_admin_user),  # admin-only
@@ -32,6 +36,7 @@ def list_pinterest_stats(
 
 
 @router.post("/pinterest-stats/upload-csv")
+@query_budget(3)
 async def upload_pinterest_stats_csv(
         file: UploadFile = File(...),
         convert_calendar_range: bool = False,
@@ -67,6 +72,7 @@ async def upload_pinterest_stats_csv(
 
     inserted = 0
     line_number = 1
+    new_rows = []
 
     try:
         for row in reader:
@@ -82,17 +88,20 @@ async def upload_pinterest_stats_csv(
             else:
                 calendar_month = datetime.strptime(raw_cm, "%Y-%m-%d").date()
 
-            stats = models.PinterestAccountStatsMonthly(
-                calendar_month=calendar_month,
-                impressions=parse_int_field(row["impressions"], "impressions"),
-                engagements=parse_int_field(row["engagements"], "engagements"),
-                outbound_clicks=parse_int_field(row["outbound_clicks"], "outbound_clicks"),
-                saves=parse_int_field(row["saves"], "saves"),
+            new_rows.append(
+                {
+                    "calendar_month": calendar_month,
+                    "impressions": parse_int_field(row["impressions"], "impressions"),
+                    "engagements": parse_int_field(row["engagements"], "engagements"),
+                    "outbound_clicks": parse_int_field(row["outbound_clicks"], "outbound_clicks"),
+                    "saves": parse_int_field(row["saves"], "saves"),
+                }
             )
-
-            db.add(stats)
             inserted += 1
 
+        # One multi-row INSERT instead of a statement per CSV row.
+        if new_rows:
+            db.execute(insert(models.PinterestAccountStatsMonthly), new_rows)
         db.commit()
 
     except (ValueError, KeyError) as exc:
@@ -109,6 +118,7 @@ async def upload_pinterest_stats_csv(
     "/pinterest-stats/monthly",
     response_model=list[PinterestAccountStatsMonthlyOut],
 )
+@query_budget(2)
 def list_pinterest_stats_monthly(
         db: Session = Depends(get_db),
         current_admin = Depends(get_current_admin_user),  # admin-only → dashboard-only
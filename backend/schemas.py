@@ -1,8 +1,10 @@
 # backend/schemas.py
 
+import re
 from datetime import date, datetime
+from typing import Any, Literal
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 
 # ===================== Auth / Users =====================
@@ -55,4 +57,266 @@ class PinterestAccountStatsMonthlyOut(PinterestAccountStatsMonthlyBase):
     updated_at: datetime
 
     # Pydantic v2-style config
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PinterestStatsUploadOut(BaseModel):
+    upload_id: int
+    job_id: int | None
+    status: str  # the job's status ("queued", "running", ...)
+    account_name: str
+    # True when this repeats an earlier upload (same content or Idempotency-Key); nothing new was queued.
+    duplicate: bool = False
+    result: dict[str, Any] | None = None  # a duplicate's earlier result, once it has one
+    status_url: str | None
+    events_url: str | None
+
+
+class PinterestStatsUploadSessionIn(BaseModel):
+    account_name: str = Field(..., min_length=1, max_length=255)
+    filename: str | None = Field(None, max_length=255)
+
+
+class PinterestStatsUploadChunkOut(BaseModel):
+    n: int
+    size: int
+    sha256: str
+
+
+class PinterestStatsUploadSessionOut(BaseModel):
+    session_id: str
+    account_name: str
+    filename: str | None
+    finalized: bool
+    chunk_size: int  # suggested size for every chunk but the last
+    max_chunk_bytes: int
+    expires_at: datetime  # if no further chunk arrives
+    chunks: list[PinterestStatsUploadChunkOut]  # what has arrived so far, by number
+
+
+class PinterestStatsUploadSessionCompleteIn(BaseModel):
+    chunks: int = Field(..., ge=1)  # chunks 0..chunks-1 make up the file
+    sha256: str | None = Field(None, pattern=r"^[0-9a-fA-F]{64}$")  # of the whole file, if the client has it
+
+
+# ===================== Pinterest Potential =====================
+
+
+class PinterestPotentialAnswers(BaseModel):
+    """Q1–Q8 answer slugs; validated by the compute engine, not here."""
+
+    Q1: str | None = None
+    Q2: str | None = None
+    Q3: str | None = None
+    Q4: str | None = None
+    Q5: str | None = None
+    Q6: str | None = None
+    Q7: str | None = None
+    Q8: str | None = None
+
+
+class PinterestPotentialBatchIn(BaseModel):
+    items: list[PinterestPotentialAnswers] = Field(..., max_length=1000)
+
+
+# ===================== Experiment Events =====================
+
+_CONTROL_CHARS = re.compile(r"[\x00-\x1f\x7f]")
+
+
+def _has_nul(value: Any) -> bool:
+    """NUL anywhere in a JSON value (keys included): Postgres can't store it in text or jsonb."""
+    stack = [value]
+    while stack:
+        v = stack.pop()
+        if isinstance(v, str):
+            if "\x00" in v:
+                return True
+        elif isinstance(v, dict):
+            stack.extend(v.keys())
+            stack.extend(v.values())
+        elif isinstance(v, list):
+            stack.extend(v)
+    return False
+
+
+class ExperimentEventIn(BaseModel):
+    """Same payload the frontend's logExperimentEvent() posts (camelCase accepted)."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    type: Literal["exposure", "conversion"]
+    experiment_key: str | None = Field(None, alias="experimentKey", max_length=128)
+    variant: str | None = Field(None, max_length=64)
+    event_name: str | None = Field(None, alias="eventName", max_length=128)
+    attributes: dict[str, Any] | None = None
+    source: str | None = Field(None, max_length=64)
+    # Optional client id for dedupe, and client timestamp (defaults to receive time).
+    event_id: str | None = Field(None, alias="eventId", max_length=64)
+    occurred_at: datetime | None = Field(None, alias="occurredAt")
+
+    # Rejected here rather than by the database, where one bad row fails the whole batch flush.
+    @field_validator("experiment_key", "variant", "event_name", "source", "event_id")
+    @classmethod
+    def _no_control_characters(cls, v: str | None) -> str | None:
+        if v is not None and _CONTROL_CHARS.search(v):
+            raise ValueError("must not contain control characters")
+        return v
+
+    @field_validator("attributes")
+    @classmethod
+    def _no_nul_in_attributes(cls, v: dict[str, Any] | None) -> dict[str, Any] | None:
+        if v is not None and _has_nul(v):
+            raise ValueError("must not contain NUL characters")
+        return v
+
+
+class ExperimentEventBatchIn(BaseModel):
+    events: list[ExperimentEventIn] = Field(..., min_length=1, max_length=1000)
+
+
+# ===================== Pinterest Fit Leads =====================
+
+
+class PinterestFitLeadIn(BaseModel):
+    """Same body the frontend lead route accepts (camelCase accepted)."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    email: EmailStr
+    result: Literal["Strong Pinterest Fit", "Possible Pinterest Fit", "Not the Right Fit Right Now"]
+    top_reason_1: str | None = Field(None, alias="topReason1", max_length=255)
+    top_reason_2: str | None = Field(None, alias="topReason2", max_length=255)
+    top_reason_3: str | None = Field(None, alias="topReason3", max_length=255)
+    pinterest_role: str | None = Field(None, alias="pinterestRole", max_length=255)
+    recommended_next_step: str | None = Field(None, alias="recommendedNextStep", max_length=255)
+    source: str | None = Field(None, max_length=255)
+    # Raw q1..q7 answers, stored so the lead can be re-scored server-side.
+    answers: dict[str, str] | None = None
+
+
+class LeadCaptureOut(BaseModel):
+    ok: bool = True
+    lead_id: int
+
+
+# ===================== Fruitful Control =====================
+
+
+class FruitfulControlItemIn(BaseModel):
+    id: str | None = Field(None, max_length=128)
+    text: str = Field(..., max_length=5000)
+
+
+class FruitfulControlEvaluateIn(BaseModel):
+    client: str = Field(..., min_length=1, max_length=64)
+    task_type: Literal["title", "description"]
+    items: list[FruitfulControlItemIn] = Field(..., min_length=1, max_length=1000)
+
+
+class FruitfulControlBatchIn(FruitfulControlEvaluateIn):
+    """Streaming variant (/batch): a board's worth of items or more."""
+
+    items: list[FruitfulControlItemIn] = Field(..., min_length=1, max_length=5000)
+
+
+class FruitfulControlBreakdownItem(BaseModel):
+    rule_id: str
+    severity: Literal["S1", "S2", "S3", "soft"]
+    deduction: float
+    note: str
+
+
+class FruitfulControlItemResult(BaseModel):
+    id: str | None
+    verdict: Literal["ready", "needs_revision"]
+    qa_score: int = Field(..., ge=0, le=10)
+    score_breakdown: list[FruitfulControlBreakdownItem]
+    hard_issues: list[str]
+    soft_improvements: list[str]
+    suggested_changes: list[str]
+
+
+class FruitfulControlEvaluateOut(BaseModel):
+    client: str
+    task_type: str
+    # Rule snapshot the verdicts were computed under (auditing; see tools/fruitful_control/engine.py).
+    snapshot_version: str
+    rules_version: str
+    rule_sources: list[str]
+    results: list[FruitfulControlItemResult]
+
+
+class FruitfulControlImageFacts(BaseModel):
+    format: str
+    width: int
+    height: int
+    aspect_ratio: float
+    # Only measured when the rule set has pixel checks.
+    contrast: float | None
+    text_density: float | None
+
+
+class FruitfulControlDesignOut(FruitfulControlItemResult):
+    client: str
+    template_id: str | None
+    snapshot_version: str
+    rules_version: str
+    rule_sources: list[str]
+    content_hash: str
+    cached: bool
+    image: FruitfulControlImageFacts
+
+
+class FruitfulControlClientOut(BaseModel):
+    key: str
+    name: str
+    version: str
+
+
+class FruitfulControlRuleRevisionOut(BaseModel):
+    id: int
+    layer: str
+    key: str
+    version: str | None  # None: the document was retired by this revision
+    published_by: str | None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FruitfulControlPublishOut(BaseModel):
+    revision: FruitfulControlRuleRevisionOut
+    changed: bool
+    # Snapshot this worker serves after the publish (others pick it up within the poll interval).
+    snapshot_version: str | None
+
+
+class FruitfulControlRulesOut(BaseModel):
+    snapshot_version: str
+    task_types: list[str]
+    global_version: str
+    clients: list[FruitfulControlClientOut]
+
+
+# ===================== Background Jobs =====================
+
+
+class JobProgressOut(BaseModel):
+    done: int
+    total: int | None
+    message: str | None
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    progress: JobProgressOut
+    attempts: int
+    result: dict[str, Any] | None  # handler output once succeeded
+    error: str | None  # last failure; kept while a retry is queued
+    created_at: datetime | None
+    started_at: datetime | None
+    finished_at: datetime | None
+
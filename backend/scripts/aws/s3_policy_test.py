@@ -21,9 +21,6 @@ import argparse
 import datetime as dt
 import sys
 
-import boto3
-from botocore.exceptions import ClientError
-
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -42,6 +39,12 @@ def main():
     parser.add_argument("--prefix", default="policy-tests", help="object prefix/folder in the bucket")
     args = parser.parse_args()
 
+    try:
+        import boto3
+        from botocore.exceptions import ClientError
+    except ImportError:
+        sys.exit("boto3 is not installed; run `uv sync --extra aws`")
+
     s3 = boto3.client("s3")
 
     ts = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
@@ -0,0 +1,439 @@
+# backend/scripts/bench/api_suite.py
+"""
+End-to-end API benchmark: the real FastAPI `app` against a seeded database.
+
+Seeds synthetic users (one admin) and multi-account monthly stats, then runs
+scripted workloads and reports throughput and p50/p95/p99 latency per workload:
+
+- login      POST /auth/login storm across the synthetic users
+- dashboard  /auth/me, /admin/pinterest-stats/accounts and /monthly reads
+- upload_N   POST /admin/pinterest-stats/upload with an N-row CSV (one per --csv-rows);
+             measures the request up to the queued job, not the ingestion itself
+             (repeats of an account's last file are answered from the upload journal)
+- mixed      weighted mix of all of the above at the same concurrency
+
+By default the app runs in-process through httpx's ASGI transport against a
+throwaway SQLite file, so it needs nothing but the repo. Point --database-url
+at a local Postgres to benchmark the real driver, and add --base-url to drive a
+server you started yourself against that same database (e.g. several uvicorn
+workers). Seeding wipes the users and monthly stats tables, so non-SQLite
+databases require --reset.
+
+Results can be saved as a named baseline in api_baselines.json and compared
+on later runs; p95 or throughput moving by more than --tolerance is flagged.
+
+Usage (from backend/):
+    python -m scripts.bench.api_suite
+    python -m scripts.bench.api_suite --requests 1000 --concurrency 32 --save-baseline sqlite-default
+    python -m scripts.bench.api_suite --database-url postgresql+psycopg://localhost/fruitful_bench --reset \
+        --compare postgres-local --fail-on-regression
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+from sqlalchemy import delete, insert
+
+BASELINES_PATH = Path(__file__).with_name("api_baselines.json")
+
+ADMIN_EMAIL = "bench-admin@example.com"
+PASSWORD = "bench-password-123"
+
+WORKLOADS = ("login", "dashboard", "upload", "mixed")
+
+
+@dataclass(slots=True)
+class BenchConfig:
+    database_url: str | None = None
+    base_url: str | None = None
+    reset: bool = False
+    users: int = 100
+    accounts: int = 20
+    months: int = 36
+    csv_rows: tuple[int, ...] = (12, 120, 1200)
+    requests: int = 300
+    concurrency: int = 16
+    workloads: tuple[str, ...] = WORKLOADS
+    seed: int = 42
+
+
+@dataclass(slots=True)
+class WorkloadResult:
+    name: str
+    requests: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    error_samples: list[str] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        lat = sorted(self.latencies)
+        if len(lat) >= 2:
+            q = statistics.quantiles(lat, n=100, method="inclusive")
+            p50, p95, p99 = q[49], q[94], q[98]
+        else:
+            p50 = p95 = p99 = lat[0] if lat else 0.0
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rps": round(self.requests / self.seconds, 1) if self.seconds else 0.0,
+            "p50_ms": round(p50 * 1000, 2),
+            "p95_ms": round(p95 * 1000, 2),
+            "p99_ms": round(p99 * 1000, 2),
+            "max_ms": round((lat[-1] if lat else 0.0) * 1000, 2),
+        }
+
+
+# -----------------------------
+# Seeding
+# -----------------------------
+
+
+def user_email(i: int) -> str:
+    return f"bench-user-{i:05d}@example.com"
+
+
+def account_name(i: int) -> str:
+    return f"bench-account-{i:03d}"
+
+
+def _month(index: int, start_year: int = 2000) -> date:
+    return date(start_year + index // 12, index % 12 + 1, 1)
+
+
+def prepare_database(cfg: BenchConfig) -> None:
+    """Create tables and (re)seed users + monthly stats through the app's own engine."""
+    import db
+    import models
+    from security import hash_password
+
+    engine = db.get_engine()
+    engine.echo = False  # the app logs every statement; that would dominate the numbers
+    if engine.dialect.name != "sqlite" and not cfg.reset:
+        sys.exit("❌ Seeding wipes users and monthly stats; pass --reset to use a non-SQLite database.")
+
+    rng = random.Random(cfg.seed)
+    now = datetime.now(timezone.utc)
+    hashed = hash_password(PASSWORD)  # one hash shared by every synthetic user
+
+    models.Base.metadata.create_all(engine)
+    users = [
+        {
+            "email": ADMIN_EMAIL if i == 0 else user_email(i),
+            "full_name": f"Bench User {i}",
+            "hashed_password": hashed,
+            "is_active": True,
+            "is_admin": i == 0,
+            "groups": [],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(cfg.users)
+    ]
+    stats = [
+        {
+            "account_name": account_name(a),
+            "calendar_month": _month(m),
+            "impressions": rng.randint(1_000, 2_000_000),
+            "engagements": rng.randint(10, 50_000),
+            "outbound_clicks": rng.randint(0, 10_000),
+            "saves": rng.randint(0, 20_000),
+            "uploaded_at": now,
+        }
+        for a in range(cfg.accounts)
+        for m in range(cfg.months)
+    ]
+    with engine.begin() as conn:
+        conn.execute(delete(models.PinterestAccountStatsMonthly))
+        conn.execute(delete(models.User))
+        conn.execute(insert(models.User), users)
+        if stats:
+            conn.execute(insert(models.PinterestAccountStatsMonthly), stats)
+    print(f"✅ Seeded {len(users)} users and {len(stats)} monthly rows ({engine.dialect.name})")
+
+
+def make_csv(rows: int, rng: random.Random) -> bytes:
+    """Monthly export in the shape the admin upload expects, title row included."""
+    lines = ["Pinterest monthly export", "Date Range,Impressions,Engagements,Outbound Clicks,Saves"]
+    for i in range(rows):
+        m = _month(i, start_year=1900)
+        lines.append(
+            f"{m.month:02d}/01-{m.month:02d}/28 {m.year},"
+            f"{rng.randint(1_000, 2_000_000)},{rng.randint(10, 50_000)},"
+            f"{rng.randint(0, 10_000)},{rng.randint(0, 20_000)}"
+        )
+    return ("\n".join(lines) + "\n").encode()
+
+
+# -----------------------------
+# Workloads
+# -----------------------------
+
+RequestFn = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+async def run_workload(
+        client: httpx.AsyncClient,
+        name: str,
+        request: RequestFn,
+        n: int,
+        concurrency: int,
+) -> WorkloadResult:
+    result = WorkloadResult(name)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with sem:
+            started = time.perf_counter()
+            try:
+                r = await request(client, i)
+                ok = r.status_code < 400
+                detail = f"HTTP {r.status_code}: {r.text[:200]}"
+            except Exception as exc:  # connection errors etc. count as failed requests
+                ok, detail = False, f"{type(exc).__name__}: {exc}"
+            result.latencies.append(time.perf_counter() - started)
+            result.requests += 1
+            if not ok:
+                result.errors += 1
+                if len(result.error_samples) < 3:
+                    result.error_samples.append(detail)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def build_requests(cfg: BenchConfig, admin_headers: dict) -> dict[str, RequestFn]:
+    rng = random.Random(cfg.seed)
+    csvs = {rows: make_csv(rows, rng) for rows in cfg.csv_rows}
+
+    async def login(client, i):
+        k = i % cfg.users
+        return await client.post(
+            "/auth/login",
+            data={"username": ADMIN_EMAIL if k == 0 else user_email(k), "password": PASSWORD},
+        )
+
+    async def dashboard(client, i):
+        step = i % 3
+        if step == 0:
+            return await client.get("/auth/me", headers=admin_headers)
+        if step == 1:
+            return await client.get("/admin/pinterest-stats/accounts", headers=admin_headers)
+        return await client.get(
+            "/admin/pinterest-stats/monthly",
+            params={"account_name": account_name(i % max(cfg.accounts, 1))},
+            headers=admin_headers,
+        )
+
+    def upload(rows: int) -> RequestFn:
+        async def send(client, i):
+            # A handful of target accounts, so later requests exercise the update path.
+            return await client.post(
+                "/admin/pinterest-stats/upload",
+                data={"account_name": f"bench-upload-{rows}-{i % 4}"},
+                files={"file": ("export.csv", csvs[rows], "text/csv")},
+                headers=admin_headers,
+            )
+
+        return send
+
+    requests: dict[str, RequestFn] = {"login": login, "dashboard": dashboard}
+    for rows in cfg.csv_rows:
+        requests[f"upload_{rows}"] = upload(rows)
+
+    small_upload = upload(min(cfg.csv_rows)) if cfg.csv_rows else dashboard
+    mix = [(dashboard, 75), (login, 15), (small_upload, 10)]
+    mix_rng = random.Random(cfg.seed)
+    schedule = mix_rng.choices([fn for fn, _ in mix], weights=[w for _, w in mix], k=cfg.requests)
+
+    async def mixed(client, i):
+        return await schedule[i % len(schedule)](client, i)
+
+    requests["mixed"] = mixed
+    return requests
+
+
+def _selected(cfg: BenchConfig, requests: dict[str, RequestFn]) -> list[str]:
+    names = []
+    for w in cfg.workloads:
+        if w == "upload":
+            names += [f"upload_{rows}" for rows in cfg.csv_rows]
+        elif w in requests:
+            names.append(w)
+        else:
+            raise ValueError(f"Unknown workload {w!r}; choose from {', '.join(WORKLOADS)}")
+    return names
+
+
+def _client(cfg: BenchConfig) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=cfg.concurrency, max_keepalive_connections=cfg.concurrency)
+    if cfg.base_url:
+        return httpx.AsyncClient(base_url=cfg.base_url, limits=limits, timeout=120)
+
+    # Imported only now: DATABASE_URL / JWT_SECRET_KEY have been set up by the caller.
+    from main import app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120)
+
+
+async def run_suite(cfg: BenchConfig) -> dict[str, dict]:
+    async with _client(cfg) as client:
+        r = await client.post("/auth/login", data={"username": ADMIN_EMAIL, "password": PASSWORD})
+        r.raise_for_status()
+        admin_headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+        requests = build_requests(cfg, admin_headers)
+        results: dict[str, dict] = {}
+        for name in _selected(cfg, requests):
+            await run_workload(client, name, requests[name], min(cfg.concurrency, cfg.requests), cfg.concurrency)  # warm-up
+            res = await run_workload(client, name, requests[name], cfg.requests, cfg.concurrency)
+            results[name] = res.summary()
+            for sample in res.error_samples:
+                print(f"  ⚠️  {name}: {sample}")
+        return results
+
+
+# -----------------------------
+# Baselines
+# -----------------------------
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(name: str, cfg: BenchConfig, results: dict, path: Path = BASELINES_PATH) -> None:
+    baselines = load_baselines(path)
+    scale = {k: v for k, v in asdict(cfg).items() if k not in ("database_url", "base_url", "reset")}
+    baselines[name] = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} cpus",
+        "scale": scale,
+        "results": results,
+    }
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Human-readable regressions: p95 up, or throughput down, by more than `tolerance`."""
+    regressions = []
+    for name, now in results.items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+        if before["rps"] and now["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {before['rps']} -> {now['rps']} req/s")
+        if now["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {now['errors']}")
+    return regressions
+
+
+def print_results(results: dict, baseline: dict | None = None) -> None:
+    print(f"\n{'workload':<14}{'reqs':>7}{'errs':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in results.items():
+        line = (
+            f"{name:<14}{r['requests']:>7}{r['errors']:>6}{r['rps']:>10.1f}"
+            f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+        )
+        before = (baseline or {}).get("results", {}).get(name)
+        if before and before["p95_ms"]:
+            line += f"   (p95 {(r['p95_ms'] / before['p95_ms'] - 1) * 100:+.0f}% vs baseline)"
+        print(line)
+
+
+def configure_environment(cfg: BenchConfig) -> None:
+    """Point the app at the bench database before anything touches the engine."""
+    import config
+    import db
+
+    if not cfg.database_url:
+        cfg.database_url = f"sqlite:///{Path(tempfile.mkdtemp(prefix='bench-api-')) / 'bench.db'}"
+    os.environ["DATABASE_URL"] = cfg.database_url
+    db.reset_engine()
+    if not config.JWT_SECRET_KEY:
+        config.JWT_SECRET_KEY = "bench-only-secret"
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="End-to-end API benchmark suite")
+    p.add_argument("--database-url", help="defaults to a throwaway SQLite file")
+    p.add_argument("--base-url", help="drive a running server (it must use --database-url) instead of in-process")
+    p.add_argument("--reset", action="store_true", help="allow wiping users/stats on a non-SQLite database")
+    p.add_argument("--users", type=int, default=100)
+    p.add_argument("--accounts", type=int, default=20)
+    p.add_argument("--months", type=int, default=36)
+    p.add_argument("--csv-rows", default="12,120,1200", help="comma-separated CSV sizes for upload workloads")
+    p.add_argument("--requests", type=int, default=300, help="requests per workload")
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--workloads", default=",".join(WORKLOADS))
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--compare", metavar="NAME", help="compare against this saved baseline")
+    p.add_argument("--save-baseline", metavar="NAME", help="store these results under NAME")
+    p.add_argument("--tolerance", type=float, default=0.2, help="allowed p95/throughput drift (0.2 = 20%%)")
+    p.add_argument("--fail-on-regression", action="store_true")
+    args = p.parse_args()
+
+    if args.base_url and not args.database_url:
+        p.error("--base-url needs --database-url (the server's database) for seeding")
+
+    cfg = BenchConfig(
+        database_url=args.database_url,
+        base_url=args.base_url,
+        reset=args.reset,
+        users=max(args.users, 1),
+        accounts=args.accounts,
+        months=args.months,
+        csv_rows=tuple(int(x) for x in args.csv_rows.split(",") if x.strip()),
+        requests=args.requests,
+        concurrency=args.concurrency,
+        workloads=tuple(w.strip() for w in args.workloads.split(",") if w.strip()),
+        seed=args.seed,
+    )
+
+    configure_environment(cfg)
+    prepare_database(cfg)
+    results = asyncio.run(run_suite(cfg))
+
+    baseline = load_baselines().get(args.compare) if args.compare else None
+    if args.compare and baseline is None:
+        print(f"⚠️  No baseline named {args.compare!r} in {BASELINES_PATH.name}")
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, cfg, results)
+        print(f"\n✅ Saved baseline {args.save_baseline!r} to {BASELINES_PATH.name}")
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n🔥 Regressions vs baseline:")
+            for r in regressions:
+                print(f"  - {r}")
+            if args.fail_on_regression:
+                sys.exit(1)
+        else:
+            print(f"\n🏁 Within {args.tolerance:.0%} of baseline {args.compare!r}")
+
+
+if __name__ == "__main__":
+    main()
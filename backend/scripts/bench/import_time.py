@@ -0,0 +1,122 @@
+# backend/scripts/bench/import_time.py
+"""
+Import-time profile of the API (or any module), from `python -X importtime`.
+
+Runs the import in a fresh interpreter a few times, keeps the fastest run, and
+prints where the time goes: per top-level package (self time summed, so
+nothing is counted twice) and the slowest individual modules by cumulative
+time. Optionally also times `pytest --collect-only`, which pays the same cost.
+
+DATABASE_URL is removed from the child's environment, so a module that still
+touches the database at import shows up as an error here.
+
+Usage (from backend/):
+    python -m scripts.bench.import_time
+    python -m scripts.bench.import_time --module routers.stats --top 30 --runs 5
+    python -m scripts.bench.import_time --collect
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def _child_env() -> dict:
+    env = dict(os.environ)
+    env.pop("DATABASE_URL", None)
+    return env
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def measure_imports(module: str) -> list[ImportRecord]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=_child_env(),
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+        raise RuntimeError(f"`import {module}` failed:\n{tail}")
+    return parse_importtime(proc.stderr)
+
+
+def total_us(records: list[ImportRecord], module: str) -> int:
+    return next(r.cumulative_us for r in reversed(records) if r.module == module and r.depth == 0)
+
+
+def by_package(records: list[ImportRecord]) -> dict[str, int]:
+    totals: dict[str, int] = defaultdict(int)
+    for r in records:
+        totals[r.module.split(".", 1)[0]] += r.self_us
+    return totals
+
+
+def time_collect(runs: int) -> float:
+    walls = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "--collect-only", "tests"],
+            capture_output=True,
+            env=_child_env(),
+        )
+        walls.append(time.perf_counter() - started)
+    return statistics.median(walls)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Per-module import-time report")
+    p.add_argument("--module", default="main")
+    p.add_argument("--runs", type=int, default=3, help="fresh interpreters; the fastest run is reported")
+    p.add_argument("--top", type=int, default=20)
+    p.add_argument("--collect", action="store_true", help="also time `pytest --collect-only tests`")
+    args = p.parse_args()
+
+    try:
+        runs = [measure_imports(args.module) for _ in range(args.runs)]
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    records = min(runs, key=lambda rs: total_us(rs, args.module))
+    total = total_us(records, args.module)
+
+    print(f"🏁 import {args.module}: {total / 1000:.1f} ms (best of {args.runs})\n")
+
+    print("By top-level package (self time):")
+    for pkg, us in sorted(by_package(records).items(), key=lambda kv: -kv[1])[: args.top]:
+        print(f"  {us / 1000:8.1f} ms  {us / total * 100:5.1f}%  {pkg}")
+
+    print("\nSlowest modules (cumulative):")
+    for r in sorted(records, key=lambda r: -r.cumulative_us)[: args.top]:
+        print(f"  {r.cumulative_us / 1000:8.1f} ms  {r.self_us / 1000:7.1f} ms self  {r.module}")
+
+    if args.collect:
+        print(f"\npytest --collect-only: {time_collect(args.runs):.2f} s wall (median of {args.runs})")
+
+
+if __name__ == "__main__":
+    main()
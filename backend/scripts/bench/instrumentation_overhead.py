@@ -0,0 +1,98 @@
+# backend/scripts/bench/instrumentation_overhead.py
+"""
+Measure what MetricsMiddleware + the SQLAlchemy query hooks cost per request.
+
+Drives two otherwise identical in-process apps (bare vs instrumented) through
+httpx's ASGI transport, so network noise is out of the picture and the
+difference is the instrumentation itself. Each request runs a couple of cheap
+SQLite queries so the DB hooks are exercised too.
+
+Usage (from backend/):
+    python -m scripts.bench.instrumentation_overhead --requests 5000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from metrics import MetricsMiddleware, install_query_hooks, reset_metrics
+
+
+def build_app(*, instrumented: bool) -> FastAPI:
+    # File-backed so the regular QueuePool is used; the queries themselves need no tables.
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-metrics-"), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    make_session = sessionmaker(bind=engine)
+
+    def get_db():
+        db = make_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int, db: Session = Depends(get_db)):
+        a = db.execute(text("SELECT :x"), {"x": item_id}).scalar()
+        b = db.execute(text("SELECT :x + 1"), {"x": item_id}).scalar()
+        return {"id": item_id, "a": a, "b": b}
+
+    if instrumented:
+        install_query_hooks()
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def drive(app: FastAPI, n: int, concurrency: int) -> float:
+    """Return requests/second for n requests at the given concurrency."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(i: int) -> None:
+            async with sem:
+                r = await client.get(f"/items/{i}")
+                r.raise_for_status()
+
+        await asyncio.gather(*(one(i) for i in range(50)))  # warm-up
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n)))
+        return n / (time.perf_counter() - started)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Instrumentation overhead benchmark")
+    p.add_argument("--requests", type=int, default=3000)
+    p.add_argument("--rounds", type=int, default=5)
+    p.add_argument("--concurrency", type=int, default=16)
+    args = p.parse_args()
+
+    # Note: the query hooks are global once installed, so bare rounds run first.
+    bare_app = build_app(instrumented=False)
+    bare = [asyncio.run(drive(bare_app, args.requests, args.concurrency)) for _ in range(args.rounds)]
+
+    inst_app = build_app(instrumented=True)
+    inst = [asyncio.run(drive(inst_app, args.requests, args.concurrency)) for _ in range(args.rounds)]
+    reset_metrics()
+
+    bare_rps, inst_rps = statistics.median(bare), statistics.median(inst)
+    overhead_pct = (bare_rps - inst_rps) / bare_rps * 100
+    per_request_us = (1 / inst_rps - 1 / bare_rps) * 1e6
+
+    print(f"bare:         {bare_rps:,.0f} req/s (median of {args.rounds})")
+    print(f"instrumented: {inst_rps:,.0f} req/s")
+    print(f"overhead:     {overhead_pct:.1f}% (~{per_request_us:.0f} µs/request)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# backend/scripts/db/compact_experiment_events.py
+"""
+Fold raw experiment events into the daily counters used by the results endpoint.
+
+Usage (from backend/):
+    python -m scripts.db.compact_experiment_events run        # incremental (cron-friendly)
+    python -m scripts.db.compact_experiment_events rebuild    # wipe counters, backfill from all events
+"""
+
+import argparse
+import time
+
+from db import SessionLocal
+from experiment_stats import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_SETTLE_SECONDS,
+    compact_events,
+    rebuild_counters,
+)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Compact experiment events into daily counters")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    for name, help_text in (
+            ("run", "Fold events past the high-water mark into the counters"),
+            ("rebuild", "Delete all counters and recompute them from raw events"),
+    ):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Event ids per transaction")
+        cmd.add_argument(
+            "--settle-seconds",
+            type=float,
+            default=DEFAULT_SETTLE_SECONDS,
+            help="Leave events newer than this for the next run",
+        )
+
+    args = p.parse_args()
+    job = rebuild_counters if args.cmd == "rebuild" else compact_events
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        result = job(db, chunk_size=args.chunk_size, settle_seconds=args.settle_seconds)
+        elapsed = time.perf_counter() - started
+        print(
+            f"✅ Compacted up to event id {result['last_event_id']} "
+            f"({result['id_span']:,} ids, {result['counter_rows']:,} counter upserts) in {elapsed:.1f}s."
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# backend/scripts/db/generate_pinterest_stats.py
+"""
+Generate synthetic Pinterest monthly stats for N accounts x M months.
+
+Two outputs:
+- `csv`:  one file per account in the export shape the admin upload parses
+          (title row, then "Date Range,Impressions,...", then data), so files
+          can go through POST /admin/pinterest-stats/upload as-is;
+- `load`: rows go straight into pinterest_account_stats_monthly, via COPY on
+          psycopg/Postgres (one COPY per worker, in parallel) and multi-row
+          INSERTs elsewhere.
+
+Each account draws from its own RNG seeded with "<seed>:<account index>", so
+the output is identical for a given --seed whatever --workers/--chunk is.
+
+The numbers follow a simple per-account model: lognormal base reach, a random
+walk with drift for growth, a shared Q4-heavy seasonal curve with per-account
+amplitude, and per-account engagement / outbound-click / save rates. Counts
+are nested (saves and clicks <= engagements <= impressions).
+
+Usage (from backend/):
+    python -m scripts.db.generate_pinterest_stats csv --accounts 20 --months 36 --out ./synthetic-csv
+    python -m scripts.db.generate_pinterest_stats load --accounts 100000 --months 100 --workers 8
+    python -m scripts.db.generate_pinterest_stats load --accounts 500 --months 60 --replace
+"""
+
+import argparse
+import calendar
+import csv
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy import delete, insert, inspect
+
+import db
+import models
+
+TABLE = models.PinterestAccountStatsMonthly.__tablename__
+COLUMNS = ("account_name", "calendar_month", "impressions", "engagements", "outbound_clicks", "saves", "uploaded_at")
+CSV_HEADER = ("Date Range", "Impressions", "Engagements", "Outbound Clicks", "Saves")
+
+# Jan..Dec relative reach; Pinterest planning traffic peaks ahead of the holidays.
+SEASONALITY = (0.93, 0.90, 0.96, 0.98, 0.97, 0.93, 0.91, 0.96, 1.03, 1.10, 1.17, 1.14)
+
+_COPY_SQL = f"COPY {TABLE} ({', '.join(COLUMNS)}) FROM STDIN"
+_INSERT_BATCH = 5_000
+
+
+# -----------------------------
+# Model (worker side, top-level so it pickles)
+# -----------------------------
+
+
+def account_name(prefix: str, index: int) -> str:
+    return f"{prefix}{index:07d}"
+
+
+def account_rows(seed: int, index: int, months: int, start: date) -> Iterator[tuple[date, int, int, int, int]]:
+    """(calendar_month, impressions, engagements, outbound_clicks, saves) for one account."""
+    rng = random.Random(f"{seed}:{index}")
+    level = rng.gauss(10.0, 1.4)  # log monthly impressions; median ~22k
+    drift = rng.gauss(0.01, 0.02)  # log growth per month
+    volatility = rng.uniform(0.04, 0.12)
+    season_amp = rng.uniform(0.3, 1.3)
+    engagement_rate = rng.betavariate(2, 60)  # ~3%
+    click_share = rng.betavariate(2, 8)  # of engagements, ~20%
+    save_share = rng.betavariate(3, 7)  # of engagements, ~30%
+
+    first = start.year * 12 + start.month - 1
+    for m in range(months):
+        year, month0 = divmod(first + m, 12)
+        level = min(max(level + drift + rng.gauss(0, volatility), 2.0), 18.0)
+        season = 1 + season_amp * (SEASONALITY[month0] - 1)
+        impressions = int(math.exp(level) * season * rng.lognormvariate(0, 0.1))
+        engagements = min(impressions, int(impressions * engagement_rate * rng.lognormvariate(0, 0.15)))
+        clicks = min(engagements, int(engagements * click_share * rng.lognormvariate(0, 0.2)))
+        saves = min(engagements, int(engagements * save_share * rng.lognormvariate(0, 0.2)))
+        yield date(year, month0 + 1, 1), impressions, engagements, clicks, saves
+
+
+def date_range_label(month: date) -> str:
+    last = calendar.monthrange(month.year, month.month)[1]
+    return f"{month.month:02d}/01-{month.month:02d}/{last:02d} {month.year}"
+
+
+def _init_worker() -> None:
+    # Forked children must not reuse the parent's pooled connections.
+    db.reset_engine(close=False)
+
+
+def write_csv_chunk(out_dir: str, prefix: str, seed: int, lo: int, hi: int, months: int, start: date) -> int:
+    rows = 0
+    for index in range(lo, hi):
+        name = account_name(prefix, index)
+        with open(Path(out_dir) / f"{name}.csv", "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow([f"Pinterest analytics export: {name}"])
+            w.writerow(CSV_HEADER)
+            for month, *counts in account_rows(seed, index, months, start):
+                w.writerow([date_range_label(month), *counts])
+                rows += 1
+    return rows
+
+
+def load_chunk(prefix: str, seed: int, lo: int, hi: int, months: int, start: date) -> int:
+    engine = db.get_engine()
+    engine.echo = False
+    now = datetime.now(timezone.utc)
+    rows = 0
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg":
+            with conn.connection.driver_connection.cursor() as cur:
+                with cur.copy(_COPY_SQL) as copy:
+                    for index in range(lo, hi):
+                        name = account_name(prefix, index)
+                        for row in account_rows(seed, index, months, start):
+                            copy.write_row((name, *row, now))
+                            rows += 1
+        else:
+            batch = []
+            for index in range(lo, hi):
+                name = account_name(prefix, index)
+                for row in account_rows(seed, index, months, start):
+                    batch.append(dict(zip(COLUMNS, (name, *row, now))))
+                    if len(batch) >= _INSERT_BATCH:
+                        conn.execute(insert(models.PinterestAccountStatsMonthly), batch)
+                        rows += len(batch)
+                        batch = []
+            if batch:
+                conn.execute(insert(models.PinterestAccountStatsMonthly), batch)
+                rows += len(batch)
+    return rows
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+
+
+def _chunks(accounts: int, chunk: int) -> list[tuple[int, int]]:
+    return [(lo, min(lo + chunk, accounts)) for lo in range(0, accounts, chunk)]
+
+
+def run_parallel(fn, chunk_args: list[tuple], *, workers: int, total_rows: int) -> int:
+    started = time.perf_counter()
+    done = 0
+    if workers <= 1:
+        for args in chunk_args:
+            done += fn(*args)
+            _progress(done, total_rows, started)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(fn, *args) for args in chunk_args]
+            for fut in as_completed(futures):
+                done += fut.result()
+                _progress(done, total_rows, started)
+    elapsed = time.perf_counter() - started
+    print(f"\n🏁 {done:,} rows in {elapsed:.1f}s ({done / elapsed if elapsed else 0:,.0f} rows/s)")
+    return done
+
+
+def _progress(done: int, total: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed else 0
+    print(f"\r  {done:,}/{total:,} rows ({done / total:.0%}) · {rate:,.0f} rows/s", end="", flush=True)
+
+
+def _parse_month(raw: str) -> date:
+    return datetime.strptime(raw, "%Y-%m").date()
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Generate synthetic Pinterest monthly stats")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    def common(sp):
+        sp.add_argument("--accounts", type=int, required=True)
+        sp.add_argument("--months", type=int, default=36)
+        sp.add_argument("--start", type=_parse_month, default=date(2018, 1, 1), help="first month, YYYY-MM")
+        sp.add_argument("--seed", type=int, default=1)
+        sp.add_argument("--prefix", default="synthetic-", help="account_name prefix")
+        sp.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        sp.add_argument("--chunk", type=int, default=0, help="accounts per task (default: auto)")
+
+    csv_p = sub.add_parser("csv", help="Write one upload-shaped CSV per account")
+    common(csv_p)
+    csv_p.add_argument("--out", required=True, help="output directory")
+
+    load_p = sub.add_parser("load", help="Insert rows directly (COPY on Postgres)")
+    common(load_p)
+    load_p.add_argument("--replace", action="store_true", help="first delete rows whose account_name has --prefix")
+
+    args = p.parse_args()
+    total_rows = args.accounts * args.months
+    # ~20 tasks per worker keeps everyone busy without tiny COPYs.
+    chunk = args.chunk or max(1, min(2_000, args.accounts // (max(args.workers, 1) * 20) or 1))
+    chunks = _chunks(args.accounts, chunk)
+
+    if args.cmd == "csv":
+        os.makedirs(args.out, exist_ok=True)
+        print(f"Writing {args.accounts:,} account file(s) to {args.out} ({total_rows:,} rows)")
+        run_parallel(
+            write_csv_chunk,
+            [(args.out, args.prefix, args.seed, lo, hi, args.months, args.start) for lo, hi in chunks],
+            workers=args.workers,
+            total_rows=total_rows,
+        )
+        return
+
+    engine = db.get_engine()
+    engine.echo = False
+    workers = args.workers
+    if engine.dialect.name == "sqlite" and workers > 1:
+        print("SQLite allows one writer at a time; loading with a single worker.")
+        workers = 1
+
+    # The schema belongs to Alembic; never create the table behind its back.
+    if not inspect(engine).has_table(TABLE):
+        raise SystemExit(f"❌ Table {TABLE} does not exist. Run `alembic upgrade head` first.")
+    if args.replace:
+        from scripts.db.manage_pinterest_stats import require_secret
+
+        require_secret()
+        with engine.begin() as conn:
+            deleted = conn.execute(
+                delete(models.PinterestAccountStatsMonthly).where(
+                    models.PinterestAccountStatsMonthly.account_name.startswith(args.prefix, autoescape=True)
+                )
+            ).rowcount
+        print(f"🔥 Deleted {deleted:,} existing row(s) with prefix {args.prefix!r}")
+    # Workers open their own connections; don't hand them the parent's pool.
+    engine.dispose()
+
+    print(f"Loading {total_rows:,} rows into {TABLE} ({engine.dialect.name}, {workers} worker(s))")
+    run_parallel(
+        load_chunk,
+        [(args.prefix, args.seed, lo, hi, args.months, args.start) for lo, hi in chunks],
+        workers=workers,
+        total_rows=total_rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
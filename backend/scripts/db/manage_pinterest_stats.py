@@ -1,12 +1,40 @@
+# backend/scripts/db/manage_pinterest_stats.py
+"""
+Maintenance for pinterest_account_stats_monthly.
+
+Usage (from backend/):
+    python -m scripts.db.manage_pinterest_stats count                 # catalog estimate on Postgres
+    python -m scripts.db.manage_pinterest_stats count --exact --account "Acme"
+    python -m scripts.db.manage_pinterest_stats delete --account "Acme" --from 2023-01 --to 2023-12
+    python -m scripts.db.manage_pinterest_stats wipe                  # TRUNCATE on Postgres
+    python -m scripts.db.manage_pinterest_stats export --out stats.csv [--account "Acme"]
+    python -m scripts.db.manage_pinterest_stats import --file stats.csv [--upsert | --truncate]
+
+Scoped deletes run in id-ordered batches, each in its own short transaction,
+so other writers never wait behind one long lock. Import/export use COPY on
+psycopg/Postgres and fall back to batched statements elsewhere (SQLite).
+Destructive commands require ADMIN_DANGEROUS_SECRET.
+"""
+
 import argparse
+import csv
 import getpass
 import os
+import time
+from datetime import date, datetime
 
-from sqlalchemy import text
+from sqlalchemy import delete, func, insert, select, text
 
-from db import SessionLocal
+from db import SessionLocal, get_engine
+import models
 
 TABLE = "pinterest_account_stats_monthly"
+Stats = models.PinterestAccountStatsMonthly
+
+# Columns carried by export/import; ids and created/updated stamps are regenerated.
+DATA_COLUMNS = ("account_name", "calendar_month", "impressions", "engagements", "outbound_clicks", "saves", "uploaded_at")
+INT_COLUMNS = {"impressions", "engagements", "outbound_clicks", "saves"}
+IMPORT_BATCH = 5_000
 
 
 def require_secret() -> None:
@@ -18,6 +46,108 @@ def require_secret() -> None:
         raise SystemExit("❌ Invalid secret. Aborting.")
 
 
+def _is_psycopg(engine) -> bool:
+    return engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg"
+
+
+def _parse_month(raw: str) -> date:
+    return datetime.strptime(raw, "%Y-%m").date()
+
+
+def _scope(account: str | None, start: date | None, end: date | None) -> list:
+    conditions = []
+    if account is not None:
+        conditions.append(Stats.account_name == account)
+    if start is not None:
+        conditions.append(Stats.calendar_month >= start)
+    if end is not None:
+        conditions.append(Stats.calendar_month <= end)
+    return conditions
+
+
+# -----------------------------
+# count
+# -----------------------------
+
+
+def estimate_rows(db) -> int | None:
+    """Planner estimate from pg_class (instant, refreshed by autovacuum/ANALYZE); None if unknown."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    estimate = db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+        {"t": TABLE},
+    ).scalar()
+    # -1 means the table has never been vacuumed/analyzed.
+    return estimate if estimate is not None and estimate >= 0 else None
+
+
+def count_monthly_stats(*, exact: bool = False, account: str | None = None) -> None:
+    db = SessionLocal()
+    try:
+        if not exact and account is None:
+            estimate = estimate_rows(db)
+            if estimate is not None:
+                print(f"Rows in monthly stats: ~{estimate} (catalog estimate; --exact for COUNT(*))")
+                return
+        stmt = select(func.count()).select_from(Stats).where(*_scope(account, None, None))
+        count = db.execute(stmt).scalar() or 0
+        scope = f" for {account!r}" if account is not None else ""
+        print(f"Rows in monthly stats{scope}: {count}")
+    finally:
+        db.close()
+
+
+# -----------------------------
+# delete / wipe
+# -----------------------------
+
+
+def delete_monthly_stats(
+        *,
+        account: str | None,
+        start: date | None,
+        end: date | None,
+        batch_size: int,
+        pause: float,
+        yes: bool,
+) -> int:
+    conditions = _scope(account, start, end)
+    if not conditions:
+        raise SystemExit("❌ Give --account and/or --from/--to (use `wipe` to clear the whole table).")
+
+    require_secret()
+    if not yes:
+        confirm = input(
+            f"⚠️ This will DELETE rows from {TABLE} for account={account!r}, from={start}, to={end}.\n"
+            'Type "DELETE_PINTEREST_MONTHLY_STATS" to confirm: '
+        )
+        if confirm != "DELETE_PINTEREST_MONTHLY_STATS":
+            print("❌ Aborted. No changes made.")
+            return 0
+
+    batch_ids = select(Stats.id).where(*conditions).order_by(Stats.id).limit(batch_size).scalar_subquery()
+    stmt = delete(Stats).where(Stats.id.in_(batch_ids))
+
+    deleted = 0
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        while True:
+            n = db.execute(stmt).rowcount
+            db.commit()  # one short transaction per batch
+            deleted += n
+            if n < batch_size:
+                break
+            print(f"  … {deleted} row(s) deleted", flush=True)
+            if pause:
+                time.sleep(pause)  # let replication / other writers catch up
+    finally:
+        db.close()
+    print(f"🔥 Deleted {deleted} row(s) in {time.perf_counter() - started:.1f}s.")
+    return deleted
+
+
 def wipe_monthly_stats(*, yes: bool) -> None:
     require_secret()
 
@@ -32,37 +162,196 @@ def wipe_monthly_stats(*, yes: bool) -> None:
 
     db = SessionLocal()
     try:
-        count = db.execute(text(f"SELECT COUNT(*) FROM {TABLE}")).scalar() or 0
-        db.execute(text(f"DELETE FROM {TABLE}"))
-        db.commit()
-        print(f"🔥 Wiped monthly stats table. Deleted {count} row(s).")
+        if db.get_bind().dialect.name == "postgresql":
+            estimate = estimate_rows(db)
+            # TRUNCATE drops the heap in O(1) instead of visiting (and WAL-logging) every row.
+            db.execute(text(f"TRUNCATE TABLE {TABLE}"))
+            db.commit()
+            about = f"~{estimate}" if estimate is not None else "all"
+            print(f"🔥 Wiped monthly stats table (TRUNCATE). Removed {about} row(s).")
+        else:
+            count = db.execute(text(f"DELETE FROM {TABLE}")).rowcount
+            db.commit()
+            print(f"🔥 Wiped monthly stats table. Deleted {count} row(s).")
     finally:
         db.close()
 
 
-def count_monthly_stats() -> None:
-    db = SessionLocal()
-    try:
-        count = db.execute(text(f"SELECT COUNT(*) FROM {TABLE}")).scalar() or 0
-        print(f"Rows in monthly stats: {count}")
-    finally:
-        db.close()
+# -----------------------------
+# export / import
+# -----------------------------
+
+
+def export_monthly_stats(*, out: str, account: str | None) -> int:
+    engine = get_engine()
+    stmt = select(*(Stats.__table__.c[c] for c in DATA_COLUMNS)).where(*_scope(account, None, None)).order_by(
+        Stats.account_name, Stats.calendar_month
+    )
+    started = time.perf_counter()
+    rows = 0
+    with engine.connect() as conn:
+        if _is_psycopg(engine):
+            sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+            with open(out, "wb") as f, conn.connection.driver_connection.cursor() as cur:
+                with cur.copy(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER)") as copy:
+                    for block in copy:
+                        f.write(block)
+                rows = cur.rowcount
+        else:
+            with open(out, "w", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(DATA_COLUMNS)
+                for row in conn.execution_options(stream_results=True, yield_per=IMPORT_BATCH).execute(stmt):
+                    w.writerow(row)
+                    rows += 1
+    print(f"✅ Exported {rows} row(s) to {out} in {time.perf_counter() - started:.1f}s.")
+    return rows
+
+
+def _read_header(path: str) -> list[str]:
+    with open(path, newline="") as f:
+        header = next(csv.reader(f), [])
+    unknown = set(header) - set(DATA_COLUMNS)
+    missing = {"account_name", "calendar_month"} - set(header)
+    if unknown or missing:
+        raise SystemExit(f"❌ Unexpected CSV header {header}; expected columns from {', '.join(DATA_COLUMNS)}.")
+    return header
+
+
+def _copy_from_file(cur, path: str, target: str, header: list[str]) -> None:
+    with open(path, "rb") as f, cur.copy(f"COPY {target} ({', '.join(header)}) FROM STDIN WITH (FORMAT csv, HEADER)") as copy:
+        while block := f.read(1 << 20):
+            copy.write(block)
+
+
+def _import_postgres(conn, path: str, header: list[str], *, upsert: bool) -> int:
+    with conn.connection.driver_connection.cursor() as cur:
+        if not upsert:
+            _copy_from_file(cur, path, TABLE, header)
+            return cur.rowcount
+        # COPY into a scratch table, then merge in one statement on the unique key.
+        cols = ", ".join(header)
+        cur.execute(f"CREATE TEMP TABLE stats_import ON COMMIT DROP AS SELECT {cols} FROM {TABLE} WITH NO DATA")
+        _copy_from_file(cur, path, "stats_import", header)
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in header if c not in ("account_name", "calendar_month"))
+        cur.execute(
+            f"INSERT INTO {TABLE} ({cols}) SELECT {cols} FROM stats_import "
+            f"ON CONFLICT (account_name, calendar_month) DO "
+            + (f"UPDATE SET {updates}, updated_at = now()" if updates else "NOTHING")
+        )
+        return cur.rowcount
+
+
+def _import_batched(conn, path: str, *, upsert: bool) -> int:
+    if upsert:
+        if conn.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert_insert
+        elif conn.dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert_insert
+        else:
+            raise SystemExit(f"❌ --upsert is not supported on {conn.dialect.name!r}")
+
+        base = upsert_insert(Stats.__table__)
+        stmt = base.on_conflict_do_update(
+            index_elements=["account_name", "calendar_month"],
+            set_={c: base.excluded[c] for c in DATA_COLUMNS if c not in ("account_name", "calendar_month")},
+        )
+    else:
+        stmt = insert(Stats.__table__)
+
+    def convert(row: dict) -> dict:
+        out = {}
+        for k, v in row.items():
+            if k in INT_COLUMNS:
+                out[k] = int(v)
+            elif k == "calendar_month":
+                out[k] = date.fromisoformat(v)
+            elif k == "uploaded_at":
+                if v:  # empty -> column default
+                    out[k] = datetime.fromisoformat(v)
+            else:
+                out[k] = v
+        return out
+
+    rows = 0
+    batch: list[dict] = []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            batch.append(convert(row))
+            if len(batch) >= IMPORT_BATCH:
+                conn.execute(stmt, batch)
+                rows += len(batch)
+                batch = []
+    if batch:
+        conn.execute(stmt, batch)
+        rows += len(batch)
+    return rows
+
+
+def import_monthly_stats(*, path: str, upsert: bool, truncate: bool) -> int:
+    header = _read_header(path)
+    if truncate:
+        require_secret()
+    engine = get_engine()
+    started = time.perf_counter()
+    with engine.begin() as conn:  # all-or-nothing, including the optional truncate
+        if truncate:
+            conn.execute(text(f"TRUNCATE TABLE {TABLE}" if engine.dialect.name == "postgresql" else f"DELETE FROM {TABLE}"))
+        if _is_psycopg(engine):
+            rows = _import_postgres(conn, path, header, upsert=upsert)
+        else:
+            rows = _import_batched(conn, path, upsert=upsert)
+    print(f"✅ Imported {rows} row(s) from {path} in {time.perf_counter() - started:.1f}s.")
+    return rows
 
 
 def main() -> None:
     p = argparse.ArgumentParser(description="Manage Pinterest monthly stats")
     sub = p.add_subparsers(dest="cmd", required=True)
 
-    wipe = sub.add_parser("wipe", help="Wipe ALL monthly stats rows (dangerous)")
+    wipe = sub.add_parser("wipe", help="Wipe ALL monthly stats rows (dangerous; TRUNCATE on Postgres)")
     wipe.add_argument("--yes", action="store_true", help="Skip phrase confirmation")
 
-    sub.add_parser("count", help="Count rows")
+    count = sub.add_parser("count", help="Count rows (catalog estimate on Postgres unless --exact)")
+    count.add_argument("--exact", action="store_true", help="Run COUNT(*) instead of using the estimate")
+    count.add_argument("--account", help="Count one account (always exact)")
+
+    rm = sub.add_parser("delete", help="Delete rows for an account and/or month range, in batches")
+    rm.add_argument("--account")
+    rm.add_argument("--from", dest="start", type=_parse_month, help="first month, YYYY-MM")
+    rm.add_argument("--to", dest="end", type=_parse_month, help="last month, YYYY-MM")
+    rm.add_argument("--batch-size", type=int, default=5_000)
+    rm.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    rm.add_argument("--yes", action="store_true", help="Skip phrase confirmation")
+
+    exp = sub.add_parser("export", help="Export rows to CSV (COPY on Postgres)")
+    exp.add_argument("--out", required=True)
+    exp.add_argument("--account")
+
+    imp = sub.add_parser("import", help="Import rows from an exported CSV (COPY on Postgres)")
+    imp.add_argument("--file", required=True)
+    mode = imp.add_mutually_exclusive_group()
+    mode.add_argument("--upsert", action="store_true", help="Update rows that already exist (account, month)")
+    mode.add_argument("--truncate", action="store_true", help="Empty the table first, in the same transaction")
 
     args = p.parse_args()
     if args.cmd == "wipe":
         wipe_monthly_stats(yes=bool(args.yes))
     elif args.cmd == "count":
-        count_monthly_stats()
+        count_monthly_stats(exact=args.exact, account=args.account)
+    elif args.cmd == "delete":
+        delete_monthly_stats(
+            account=args.account,
+            start=args.start,
+            end=args.end,
+            batch_size=args.batch_size,
+            pause=args.pause,
+            yes=bool(args.yes),
+        )
+    elif args.cmd == "export":
+        export_monthly_stats(out=args.out, account=args.account)
+    elif args.cmd == "import":
+        import_monthly_stats(path=args.file, upsert=args.upsert, truncate=args.truncate)
 
 
 if __name__ == "__main__":
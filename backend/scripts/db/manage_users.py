@@ -1,13 +1,26 @@
 # backend/manage_users.py
 import argparse
+import csv
 import getpass
+import json
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+
 from db import SessionLocal
 import models
+from schemas import UserCreate
 from security import hash_password
 
+# Existence checks are chunked so the IN list stays under every driver's bind-parameter limit.
+EXISTS_CHUNK = 10_000
+
 
 def parse_groups(raw: str | None) -> list[str]:
     """Parse a comma-separated group string into a normalized list[str]."""
@@ -73,19 +86,171 @@ def delete_user(email: str) -> None:
         db.close()
 
 
-def list_users() -> None:
-    """List all users (with admin flag + groups)."""
+LIST_COLUMNS = ("id", "email", "full_name", "is_active", "is_admin", "groups", "created_at")
+
+
+def list_users(*, as_json: bool = False, batch_size: int = 1000) -> None:
+    """
+    List all users (with admin flag + groups).
+
+    Rows are streamed (server-side cursor on Postgres) and printed as they
+    arrive; --json emits one JSON object per line. Password hashes are never read.
+    """
+    table = models.User.__table__
+    stmt = select(*(table.c[c] for c in LIST_COLUMNS)).order_by(table.c.id)
+
     db = SessionLocal()
     try:
-        users = db.query(models.User).all()
-        for u in users:
-            groups = getattr(u, "groups", None) or []
-            print(
-                f"- id={u.id}, email={u.email}, "
-                f"active={getattr(u, 'is_active', None)}, "
-                f"is_admin={getattr(u, 'is_admin', None)}, "
-                f"groups={groups}"
+        result = db.execute(stmt, execution_options={"stream_results": True, "yield_per": batch_size})
+        for row in result.mappings():
+            if as_json:
+                print(json.dumps({**row, "groups": row["groups"] or []}, default=str))
+            else:
+                print(
+                    f"- id={row['id']}, email={row['email']}, "
+                    f"active={row['is_active']}, "
+                    f"is_admin={row['is_admin']}, "
+                    f"groups={row['groups'] or []}"
+                )
+    finally:
+        db.close()
+
+
+# ---------------- Bulk create ----------------
+
+
+@dataclass(slots=True)
+class BulkRow:
+    line: int
+    email: str
+    status: str = "pending"  # created | exists | duplicate | invalid | pending
+    id: int | None = None
+    error: str | None = None
+    # Input only; never reported.
+    password: str = ""
+    full_name: str | None = None
+    is_admin: bool = False
+    groups: list | None = None
+
+    def outcome(self) -> dict:
+        return {k: v for k, v in asdict(self).items() if k in ("line", "email", "status", "id", "error")}
+
+
+def _truthy(raw) -> bool:
+    return str(raw).strip().lower() in ("1", "true", "yes", "y") if raw is not None else False
+
+
+def read_user_rows(path: str) -> list[tuple[int, dict]]:
+    """(line number, record) from a CSV with a header row, or from JSONL."""
+    if path.endswith((".jsonl", ".ndjson")):
+        with open(path) as f:
+            return [(n, json.loads(line)) for n, line in enumerate(f, start=1) if line.strip()]
+    with open(path, newline="") as f:
+        return list(enumerate(csv.DictReader(f), start=2))
+
+
+def parse_bulk_rows(records: list[tuple[int, dict]], *, allow_admins: bool) -> list[BulkRow]:
+    """Validate like /auth/register (email, password) and normalize groups like `create`."""
+    rows: list[BulkRow] = []
+    seen: set[str] = set()
+    for line, rec in records:
+        raw_groups = rec.get("groups")
+        groups = parse_groups(",".join(raw_groups) if isinstance(raw_groups, list) else raw_groups)
+        row = BulkRow(line=line, email=str(rec.get("email") or "").strip())
+        try:
+            user = UserCreate(
+                email=row.email,
+                password=rec.get("password") or "",
+                full_name=rec.get("full_name") or rec.get("name") or None,
+                groups=groups,
             )
+        except ValidationError as exc:
+            row.status, row.error = "invalid", "; ".join(e["msg"] for e in exc.errors())
+            rows.append(row)
+            continue
+        row.email, row.password, row.full_name, row.groups = user.email, user.password, user.full_name, user.groups
+
+        if not row.password:
+            row.status, row.error = "invalid", "password is required"
+        elif _truthy(rec.get("is_admin")) and not allow_admins:
+            row.status, row.error = "invalid", "is_admin rows need --allow-admins"
+        elif row.email.lower() in seen:
+            row.status, row.error = "duplicate", "email repeated earlier in the file"
+        else:
+            row.is_admin = _truthy(rec.get("is_admin"))
+            seen.add(row.email.lower())
+        rows.append(row)
+    return rows
+
+
+def _existing_emails(db, emails: list[str]) -> set[str]:
+    found: set[str] = set()
+    email = models.User.email
+    for i in range(0, len(emails), EXISTS_CHUNK):
+        found.update(db.scalars(select(email).where(email.in_(emails[i:i + EXISTS_CHUNK]))))
+    return found
+
+
+def _insert_skipping_conflicts(db, values: list[dict]):
+    """Multi-row INSERT ... RETURNING that skips emails another writer inserted meanwhile."""
+    dialect = db.get_bind().dialect.name
+    table = models.User.__table__
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return db.execute(insert(table).returning(table.c.id, table.c.email), values)
+    stmt = dialect_insert(table).on_conflict_do_nothing(index_elements=["email"])
+    return db.execute(stmt.returning(table.c.id, table.c.email), values)
+
+
+def bulk_create_users(rows: list[BulkRow], *, workers: int | None = None, dry_run: bool = False) -> list[BulkRow]:
+    """
+    Create every valid pending row: one existence query (per EXISTS_CHUNK emails),
+    pbkdf2 hashing spread over a process pool, one batched INSERT, one commit.
+    """
+    db = SessionLocal()
+    try:
+        pending = [r for r in rows if r.status == "pending"]
+        existing = _existing_emails(db, [r.email for r in pending])
+        for r in pending:
+            if r.email in existing:
+                r.status, r.error = "exists", "a user with this email already exists"
+        pending = [r for r in pending if r.status == "pending"]
+        if dry_run or not pending:
+            return rows
+
+        passwords = [r.password for r in pending]
+        if len(pending) > 1 and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                hashes = list(pool.map(hash_password, passwords, chunksize=max(1, len(pending) // 64)))
+        else:
+            hashes = [hash_password(p) for p in passwords]
+
+        now = datetime.now(timezone.utc)
+        values = [
+            {
+                "email": r.email,
+                "full_name": r.full_name,
+                "hashed_password": h,
+                "is_active": True,
+                "is_admin": r.is_admin,
+                "groups": r.groups or [],
+                "created_at": now,
+                "updated_at": now,
+            }
+            for r, h in zip(pending, hashes)
+        ]
+        ids = {email: id_ for id_, email in _insert_skipping_conflicts(db, values)}
+        db.commit()
+
+        for r in pending:
+            if r.email in ids:
+                r.status, r.id = "created", ids[r.email]
+            else:
+                r.status, r.error = "exists", "created concurrently by another writer"
+        return rows
     finally:
         db.close()
 
@@ -108,6 +273,46 @@ def wipe_users(*, yes: bool = False) -> None:
         db.close()
 
 
+def check_admin_creation_secret() -> bool:
+    secret_env = os.getenv("ADMIN_CREATION_SECRET")
+    if not secret_env:
+        print(
+            "❌ ADMIN_CREATION_SECRET is not set in the environment.\n"
+            "   Refusing to create an admin user."
+        )
+        return False
+
+    provided = getpass.getpass("Admin creation secret: ")
+    if provided != secret_env:
+        print("❌ Invalid admin creation secret. Aborting admin user creation.")
+        return False
+    return True
+
+
+def run_bulk_create(path: str, *, allow_admins: bool, workers: int | None, dry_run: bool, report: str | None) -> None:
+    if allow_admins and not check_admin_creation_secret():
+        return
+
+    started = time.perf_counter()
+    rows = parse_bulk_rows(read_user_rows(path), allow_admins=allow_admins)
+    bulk_create_users(rows, workers=workers, dry_run=dry_run)
+
+    icons = {"created": "✅", "pending": "🧪", "exists": "↩️", "duplicate": "↩️", "invalid": "❌"}
+    for r in rows:
+        detail = f"id={r.id}" if r.id is not None else (r.error or "would be created (dry run)")
+        print(f"{icons[r.status]} line {r.line}: {r.email or '<no email>'} {r.status} ({detail})")
+    if report:
+        with open(report, "w") as f:
+            for r in rows:
+                f.write(json.dumps(r.outcome()) + "\n")
+
+    totals: dict[str, int] = {}
+    for r in rows:
+        totals[r.status] = totals.get(r.status, 0) + 1
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(totals.items()))
+    print(f"🏁 {len(rows)} row(s) in {time.perf_counter() - started:.1f}s: {summary}", file=sys.stderr)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Manage Fruitful Lab users")
     sub = parser.add_subparsers(dest="command", required=True)
@@ -135,8 +340,21 @@ def main() -> None:
     delete_cmd = sub.add_parser("delete", help="Delete a user by email")
     delete_cmd.add_argument("email")
 
+    # bulk-create
+    bulk_cmd = sub.add_parser("bulk-create", help="Create users from a CSV (header row) or JSONL file")
+    bulk_cmd.add_argument("file", help="columns/keys: email, password, full_name, groups, is_admin")
+    bulk_cmd.add_argument(
+        "--allow-admins",
+        action="store_true",
+        help="Honor is_admin=true rows (requires ADMIN_CREATION_SECRET)",
+    )
+    bulk_cmd.add_argument("--workers", type=int, help="Password hashing processes (default: CPU count)")
+    bulk_cmd.add_argument("--dry-run", action="store_true", help="Validate and check existence only")
+    bulk_cmd.add_argument("--report", help="Write per-row outcomes as JSONL to this path")
+
     # list
-    sub.add_parser("list", help="List all users")
+    list_cmd = sub.add_parser("list", help="List all users")
+    list_cmd.add_argument("--json", action="store_true", help="One JSON object per line")
 
     # wipe
     wipe_cmd = sub.add_parser("wipe", help="Wipe ALL users from the database")
@@ -154,17 +372,7 @@ def main() -> None:
 
         if args.admin:
             # Only allow admin creation if secret matches
-            secret_env = os.getenv("ADMIN_CREATION_SECRET")
-            if not secret_env:
-                print(
-                    "❌ ADMIN_CREATION_SECRET is not set in the environment.\n"
-                    "   Refusing to create an admin user."
-                )
-                return
-
-            provided = getpass.getpass("Admin creation secret: ")
-            if provided != secret_env:
-                print("❌ Invalid admin creation secret. Aborting admin user creation.")
+            if not check_admin_creation_secret():
                 return
 
             is_admin = True
@@ -182,8 +390,17 @@ def main() -> None:
     elif args.command == "delete":
         delete_user(args.email)
 
+    elif args.command == "bulk-create":
+        run_bulk_create(
+            args.file,
+            allow_admins=args.allow_admins,
+            workers=args.workers,
+            dry_run=args.dry_run,
+            report=args.report,
+        )
+
     elif args.command == "list":
-        list_users()
+        list_users(as_json=args.json)
 
     elif args.command == "wipe":
         wipe_users(yes=bool(getattr(args, "yes", False)))
@@ -0,0 +1,241 @@
+# backend/scripts/db/recompute_leads.py
+"""
+Re-run stored tool leads through the current server-side engines.
+
+Usage (from backend/):
+    python -m scripts.db.recompute_leads run --only-stale
+    python -m scripts.db.recompute_leads run --tool pinterest_fit --workers 4 --batch-size 2000
+    python -m scripts.db.recompute_leads run --reset      # ignore the checkpoint, start from id 0
+
+How it stays fast on large tables:
+- rows are streamed with a server-side cursor (stream_results + yield_per), keyed
+  on id > checkpoint, so memory is bounded by batch_size * in-flight batches;
+- batches are scored in a process pool; at most 2 * workers batches are in
+  flight and results are consumed in submission order;
+- each batch is written back with one ORM bulk UPDATE by primary key and
+  committed, then its last id is written to the checkpoint file, so a killed
+  run resumes where it stopped. The checkpoint records the run's filters
+  (--tool, --only-stale) and is deleted once a run completes, so the next run
+  starts from the first row again.
+
+Writes go through a separate session while the reader cursor stays open, which
+Postgres handles fine (SQLite would lock).
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Iterator, Sequence
+
+from sqlalchemy import or_, select, update
+
+from db import SessionLocal, get_engine
+import models
+from tools.pinterest_fit import RULES_VERSION as FIT_RULES_VERSION
+from tools.pinterest_fit import score_assessment
+from tools.pinterest_potential import RULES_VERSION as POTENTIAL_RULES_VERSION
+from tools.pinterest_potential import compute_results
+
+DEFAULT_CHECKPOINT = ".recompute_leads.checkpoint.json"
+
+RULES_VERSIONS = {
+    "pinterest_fit": FIT_RULES_VERSION,
+    "pinterest_potential": POTENTIAL_RULES_VERSION,
+}
+
+
+# -----------------------------
+# Worker side (must stay picklable / top-level)
+# -----------------------------
+
+
+def _evaluate(tool: str, answers: dict) -> dict:
+    if tool == "pinterest_fit":
+        try:
+            return {"ok": True, "results": score_assessment(answers)}
+        except ValueError as exc:
+            return {"ok": False, "error": str(exc)}
+    if tool == "pinterest_potential":
+        # compute_results already returns the {"ok": ..., "results"/"errors"} envelope.
+        return compute_results(answers)
+    return {"ok": False, "error": f"Unknown tool {tool!r}"}
+
+
+def recompute_chunk(rows: Sequence[tuple[int, str, dict]]) -> list[dict]:
+    """Score one batch of (id, tool, answers) rows; returns bulk-update parameter dicts."""
+    return [
+        {
+            "id": lead_id,
+            "results": _evaluate(tool, answers or {}),
+            "rules_version": RULES_VERSIONS.get(tool),
+        }
+        for lead_id, tool, answers in rows
+    ]
+
+
+# -----------------------------
+# Checkpoint
+# -----------------------------
+
+
+def load_checkpoint(path: str, filters: dict) -> int:
+    """Last id done by an interrupted run with the same `filters`; 0 without a checkpoint."""
+    if not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    saved = {key: data.get(key) for key in filters}
+    if saved != filters:
+        # Its last id means nothing for a different selection of rows.
+        raise SystemExit(
+            f"❌ Checkpoint {path} is from a run with {saved}, not {filters}. "
+            "Re-run with the same options to resume, or pass --reset to start over."
+        )
+    return int(data.get("last_id", 0))
+
+
+def save_checkpoint(path: str, last_id: int, processed: int, filters: dict) -> None:
+    # Write-then-rename so a crash mid-write never leaves a corrupt checkpoint.
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"last_id": last_id, "processed": processed, **filters}, f)
+    os.replace(tmp, path)
+
+
+def clear_checkpoint(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+
+
+def _stream_batches(
+        *,
+        after_id: int,
+        tool: str | None,
+        only_stale: bool,
+        batch_size: int,
+) -> Iterator[list[tuple[int, str, dict]]]:
+    lead = models.ToolLead
+    stmt = select(lead.id, lead.tool, lead.answers).where(lead.id > after_id).order_by(lead.id)
+    if tool:
+        stmt = stmt.where(lead.tool == tool)
+    if only_stale:
+        stmt = stmt.where(
+            or_(
+                lead.rules_version.is_(None),
+                lead.rules_version.not_in(list(RULES_VERSIONS.values())),
+            )
+        )
+
+    with get_engine().connect().execution_options(stream_results=True, yield_per=batch_size) as conn:
+        for partition in conn.execute(stmt).partitions():
+            yield [tuple(row) for row in partition]
+
+
+def _write_batch(updates: list[dict]) -> None:
+    now = datetime.now(timezone.utc)
+    for u in updates:
+        u["computed_at"] = now
+
+    db = SessionLocal()
+    try:
+        db.execute(update(models.ToolLead), updates)
+        db.commit()
+    finally:
+        db.close()
+
+
+def recompute_leads(
+        *,
+        tool: str | None = None,
+        batch_size: int = 1000,
+        workers: int = 0,
+        checkpoint: str = DEFAULT_CHECKPOINT,
+        only_stale: bool = False,
+        reset: bool = False,
+) -> int:
+    """Recompute results for stored leads. Returns the number of rows updated."""
+    if tool is not None and tool not in RULES_VERSIONS:
+        raise SystemExit(f"❌ Unknown tool {tool!r}. Expected one of: {', '.join(RULES_VERSIONS)}")
+
+    filters = {"tool": tool, "only_stale": only_stale}
+    after_id = 0 if reset else load_checkpoint(checkpoint, filters)
+    if after_id:
+        print(f"↩️  Resuming after id {after_id} (checkpoint: {checkpoint})")
+
+    processed = 0
+    started = time.perf_counter()
+
+    def commit(updates: list[dict]) -> None:
+        nonlocal processed
+        if not updates:
+            return
+        _write_batch(updates)
+        processed += len(updates)
+        last_id = updates[-1]["id"]
+        save_checkpoint(checkpoint, last_id, processed, filters)
+        elapsed = time.perf_counter() - started
+        rate = processed / elapsed if elapsed else 0.0
+        print(f"✅ {processed:,} row(s) recomputed — {rate:,.0f} rows/s (last id {last_id})")
+
+    batches = _stream_batches(after_id=after_id, tool=tool, only_stale=only_stale, batch_size=batch_size)
+
+    if workers <= 1:
+        for batch in batches:
+            commit(recompute_chunk(batch))
+    else:
+        max_in_flight = workers * 2
+        in_flight: deque[Future] = deque()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for batch in batches:
+                in_flight.append(pool.submit(recompute_chunk, batch))
+                if len(in_flight) >= max_in_flight:
+                    commit(in_flight.popleft().result())
+            while in_flight:
+                commit(in_flight.popleft().result())
+
+    clear_checkpoint(checkpoint)  # complete: the next run starts from the first row
+    elapsed = time.perf_counter() - started
+    print(f"🏁 Done. {processed:,} row(s) in {elapsed:.1f}s.")
+    return processed
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Recompute stored tool lead results")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    run = sub.add_parser("run", help="Recompute results for stored leads")
+    run.add_argument("--tool", choices=sorted(RULES_VERSIONS), help="Only recompute leads of this tool")
+    run.add_argument("--batch-size", type=int, default=1000, help="Rows per fetch/compute/update batch")
+    run.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Process pool size (0/1 = compute in-process)",
+    )
+    run.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="Checkpoint file for resume")
+    run.add_argument("--only-stale", action="store_true", help="Skip rows already on the current rules version")
+    run.add_argument("--reset", action="store_true", help="Ignore the checkpoint and start from the first row")
+
+    args = p.parse_args()
+    if args.cmd == "run":
+        recompute_leads(
+            tool=args.tool,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            checkpoint=args.checkpoint,
+            only_stale=bool(args.only_stale),
+            reset=bool(args.reset),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -73,10 +74,8 @@ def create_access_token(
     return jwt.encode(to_encode, secret, algorithm=config.JWT_ALGORITHM)
 
 
-async def get_current_user(
-        token: str = Depends(oauth2_scheme),
-        db: Session = Depends(get_db),
-) -> models.User:
+def decode_access_token(token: str) -> dict:
+    """Verified claims of an access token (with a "sub"), or 401."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -89,13 +88,28 @@ async def get_current_user(
             config.require_jwt_secret(),
             algorithms=[config.JWT_ALGORITHM],
         )
-        email: str | None = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
         raise credentials_exception
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
 
-    user = get_user_by_email(db, email)
+
+async def get_current_user(
+        token: str = Depends(oauth2_scheme),
+        db: Session = Depends(get_db),
+) -> models.User:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    email: str = decode_access_token(token)["sub"]
+
+    # Blocking query: keep it off the event loop, or a drained connection pool
+    # stalls every in-flight request (including the ones that would free a connection).
+    user = await run_in_threadpool(get_user_by_email, db, email)
     if user is None:
         raise credentials_exception
 
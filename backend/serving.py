@@ -0,0 +1,220 @@
+# backend/serving.py
+"""
+Production serving mode: `python -m serving` (Railway start command, `make serve`).
+
+- Worker count: usable CPUs (affinity and cgroup quota aware), capped so every
+  worker's full SQLAlchemy pool (pool_size + max_overflow) fits in the database's
+  max_connections minus a reserve. WEB_CONCURRENCY / --workers overrides.
+- uvloop + httptools when installed (uvicorn[standard]), else asyncio + h11.
+- Each worker is a separate process that imports `main` itself, so it builds
+  its own engine; db.py also drops an inherited engine after a fork.
+- Startup (`warm_up`, from the FastAPI lifespan): open DB_POOL_PREWARM pooled
+  connections and fill the hot in-process caches (OpenAPI schema, Pinterest
+  potential segment x niche contexts, the password hasher) before the worker
+  takes traffic.
+- SIGTERM: uvicorn stops accepting, gives in-flight requests
+  SHUTDOWN_GRACE_SECONDS, then the lifespan drains background work and
+  `close_pool()` closes the connections cleanly.
+
+Usage (from backend/):
+    python -m serving                      # PORT (default 8000), auto workers
+    python -m serving --workers 4 --port 8001
+    python -m serving --print-config       # show the computed policy and exit
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import time
+from importlib.util import find_spec
+
+from sqlalchemy import text
+
+import config
+import db
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------
+# Worker policy
+# -----------------------------
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: scheduler affinity, further capped by a cgroup CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    return max(1, min(cpus, math.ceil(quota))) if quota else cpus
+
+
+def _cgroup_cpu_quota() -> float | None:
+    try:  # cgroup v2: "max 100000" or "<quota> <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:  # cgroup v1
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def connections_per_worker() -> int:
+    return config.DB_POOL_SIZE + config.DB_MAX_OVERFLOW
+
+
+def worker_count(
+        cpus: int,
+        *,
+        db_max_connections: int = config.DB_MAX_CONNECTIONS,
+        reserved: int = config.DB_RESERVED_CONNECTIONS,
+        per_worker: int | None = None,
+) -> int:
+    """One worker per usable CPU, but never more than the DB connection budget can serve at full pool."""
+    per_worker = per_worker or connections_per_worker()
+    by_db = max(1, (db_max_connections - reserved) // per_worker)
+    return max(1, min(cpus, by_db))
+
+
+def resolve_workers(requested: int | None = None) -> int:
+    requested = requested or config.WEB_CONCURRENCY
+    url = os.getenv("DATABASE_URL", "")
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/") == "sqlite:"):
+        return 1  # an in-memory database only exists inside one process
+    if requested:
+        budget = worker_count(requested)
+        if requested > budget:
+            logger.warning(
+                "%s workers x %s pooled connections exceeds DB_MAX_CONNECTIONS=%s (minus %s reserved)",
+                requested, connections_per_worker(), config.DB_MAX_CONNECTIONS, config.DB_RESERVED_CONNECTIONS,
+            )
+        return requested
+    return worker_count(available_cpus())
+
+
+def event_loop_impl() -> str:
+    return "uvloop" if find_spec("uvloop") else "asyncio"
+
+
+def http_impl() -> str:
+    return "httptools" if find_spec("httptools") else "h11"
+
+
+# -----------------------------
+# Lifespan hooks (run in every worker)
+# -----------------------------
+
+
+def prewarm_pool(connections: int = config.DB_POOL_PREWARM) -> int:
+    """Check out `connections` at once (so they are distinct), ping each, return them to the pool."""
+    if connections <= 0 or not os.getenv("DATABASE_URL"):
+        return 0
+    engine = db.get_engine()
+    if engine.dialect.name != "sqlite":
+        connections = min(connections, config.DB_POOL_SIZE)
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
+
+
+def warm_caches(app) -> None:
+    from security import pwd_context
+    from tools.pinterest_potential.benchmarks import BENCHMARK_MAP
+    from tools.fruitful_control import engine as fruitful_control_engine
+    from tools.pinterest_potential.compute import segment_niche_context
+
+    app.openapi()
+    # Builds the rule snapshot (every client/task set compiled) before the first QA request.
+    fruitful_control_engine.snapshot
+    for segment, niche in BENCHMARK_MAP:
+        segment_niche_context(segment, niche)
+    # Loads and self-tests the hash backend, which otherwise happens on the first login.
+    pwd_context.dummy_verify()
+
+
+async def warm_up(app) -> None:
+    """Best effort: a cold cache or an unreachable DB must not stop the worker from starting."""
+    started = time.perf_counter()
+    try:
+        warmed = await asyncio.to_thread(prewarm_pool)
+    except Exception:
+        logger.warning("Connection pool pre-warm failed", exc_info=True)
+        warmed = 0
+    try:
+        await asyncio.to_thread(warm_caches, app)
+    except Exception:
+        logger.warning("Cache warm-up failed", exc_info=True)
+    logger.info(
+        "Worker %s warm in %.0f ms (%s pooled connection(s))", os.getpid(), (time.perf_counter() - started) * 1000,
+        warmed,
+    )
+
+
+def close_pool() -> None:
+    """Close this worker's pooled connections on shutdown instead of letting the server time them out."""
+    db.reset_engine()
+
+
+# -----------------------------
+# Entrypoint
+# -----------------------------
+
+
+def main() -> None:
+    import uvicorn
+
+    p = argparse.ArgumentParser(description="Run the API with production server settings")
+    p.add_argument("--host", default="0.0.0.0")
+    p.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    p.add_argument("--workers", type=int, help="default: WEB_CONCURRENCY, else CPU/DB-budget policy")
+    p.add_argument("--print-config", action="store_true", help="print the resolved settings and exit")
+    args = p.parse_args()
+
+    # Workers are spawned and re-read the environment; statement echo is for local dev only.
+    os.environ.setdefault("DB_ECHO", "false")
+
+    settings = {
+        "workers": resolve_workers(args.workers),
+        "loop": event_loop_impl(),
+        "http": http_impl(),
+        "timeout_graceful_shutdown": config.SHUTDOWN_GRACE_SECONDS,
+        "timeout_keep_alive": config.SERVER_KEEPALIVE_SECONDS,
+    }
+    print(
+        f"🏁 {settings['workers']} worker(s) on {args.host}:{args.port} "
+        f"({settings['loop']}/{settings['http']}, {available_cpus()} CPU(s), "
+        f"{connections_per_worker()} DB connections per worker)"
+    )
+    if args.print_config:
+        return
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        proxy_headers=True,
+        forwarded_allow_ips="*",  # Railway's edge terminates TLS
+        **settings,
+    )
+
+
+if __name__ == "__main__":
+    main()
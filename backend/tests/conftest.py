@@ -0,0 +1,4 @@
+import os
+
+# Fail the request (and the test) when a route blows its query budget or repeats a statement (N+1).
+os.environ.setdefault("QUERY_BUDGET_MODE", "raise")
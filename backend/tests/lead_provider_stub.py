@@ -0,0 +1,112 @@
+"""
+Local stand-in for the MailerLite API, served by uvicorn on a random port.
+
+Records every subscribe request, dedupes on Idempotency-Key like a well-behaved
+provider, and can be told to fail or stall so retry/backoff paths run over real
+HTTP. Like MailerLite, it only keeps subscriber fields whose key exists.
+"""
+
+import asyncio
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+class StubProvider:
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.subscribers: dict[str, dict] = {}
+        self.seen_keys: set[str] = set()
+        self.client_ports: set[int] = set()
+        self.fail_next = 0
+        self.fail_status = 503
+        self.delay = 0.0
+        self.fields: dict[str, str] = {}  # custom field name -> key
+        self.field_requests = 0
+        self.drop_fields = False  # accept writes but save no fields
+
+        self.app = FastAPI()
+        self.app.get("/api/fields")(self._list_fields)
+        self.app.post("/api/fields")(self._create_field)
+        self.app.post("/api/subscribers")(self._subscribe)
+        self.app.get("/api/subscribers/{subscriber_id}")(self._get_subscriber)
+        self.app.put("/api/subscribers/{subscriber_id}")(self._update_subscriber)
+        self.app.post("/api/subscribers/{subscriber_id}/groups/{group_id}")(self._assign_group)
+
+        self._server: uvicorn.Server | None = None
+        self._thread: threading.Thread | None = None
+        self.base_url = ""
+
+    async def _subscribe(self, request: Request):
+        body = await request.json()
+        key = request.headers.get("idempotency-key")
+        self.requests.append({"body": body, "idempotency_key": key})
+        self.client_ports.add(request.client.port)
+
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            return JSONResponse({"message": "stub failure"}, status_code=self.fail_status)
+
+        replay = key in self.seen_keys
+        self.seen_keys.add(key)
+        subscriber = self.subscribers.setdefault(
+            body["email"], {"id": body["email"], "email": body["email"], "fields": {}, "groups": []}
+        )
+        self._save_fields(subscriber, body.get("fields") or {})
+        return JSONResponse({"data": {"id": subscriber["id"]}}, status_code=200 if replay else 201)
+
+    async def _list_fields(self, request: Request):
+        self.field_requests += 1
+        self.client_ports.add(request.client.port)
+        return {"data": [{"name": name, "key": key, "type": "text"} for name, key in self.fields.items()]}
+
+    async def _create_field(self, request: Request):
+        body = await request.json()
+        self.field_requests += 1
+        key = self.fields.setdefault(body["name"], body["name"].lower().replace(" ", "_"))
+        return JSONResponse({"data": {"name": body["name"], "key": key, "type": "text"}}, status_code=201)
+
+    async def _get_subscriber(self, subscriber_id: str):
+        if subscriber_id not in self.subscribers:
+            return JSONResponse({"message": "not found"}, status_code=404)
+        return {"data": self.subscribers[subscriber_id]}
+
+    async def _update_subscriber(self, subscriber_id: str, request: Request):
+        body = await request.json()
+        self._save_fields(self.subscribers[subscriber_id], body.get("fields") or {})
+        return {"data": self.subscribers[subscriber_id]}
+
+    async def _assign_group(self, subscriber_id: str, group_id: str):
+        groups = self.subscribers[subscriber_id]["groups"]
+        if group_id not in groups:
+            groups.append(group_id)
+        return {"data": {"id": group_id}}
+
+    def _save_fields(self, subscriber: dict, fields: dict) -> None:
+        if self.drop_fields:
+            return
+        known = set(self.fields.values())
+        subscriber["fields"].update({k: v for k, v in fields.items() if k in known})
+
+    def __enter__(self) -> "StubProvider":
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=0, log_level="warning", lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("stub provider did not start")
+            time.sleep(0.01)
+        port = self._server.servers[0].sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/api"
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
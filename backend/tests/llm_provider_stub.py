@@ -0,0 +1,77 @@
+"""
+Local stand-in for an OpenAI-compatible Chat Completions API, served by uvicorn
+on a random port.
+
+Answers deterministically from the prompt, reports token usage, records every
+request, tracks peak concurrency, and can be told to fail or stall.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+class StubLLMProvider:
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.delay = 0.0
+        self.fail_next = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+        self.app = FastAPI()
+        self.app.post("/v1/chat/completions")(self._complete)
+
+        self._server: uvicorn.Server | None = None
+        self._thread: threading.Thread | None = None
+        self.base_url = ""
+
+    async def _complete(self, request: Request):
+        body = await request.json()
+        self.requests.append({"body": body, "authorization": request.headers.get("authorization")})
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            return JSONResponse({"error": {"message": "stub failure"}}, status_code=503)
+
+        prompt = "\n".join(m["content"] for m in body["messages"])
+        answer = f"verdict:{hashlib.sha256(prompt.encode()).hexdigest()[:8]}"
+        return {
+            "id": f"chatcmpl-{len(self.requests)}",
+            "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": len(prompt.split()),
+                "completion_tokens": 3,
+                "total_tokens": len(prompt.split()) + 3,
+            },
+        }
+
+    def __enter__(self) -> "StubLLMProvider":
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=0, log_level="warning", lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("stub LLM provider did not start")
+            time.sleep(0.01)
+        port = self._server.servers[0].sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/v1"
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
@@ -0,0 +1,52 @@
+import asyncio
+import random
+
+import pytest
+
+import config
+import db
+from routers.admin_pinterest_stats import find_header_row
+from scripts.bench import api_suite
+
+
+@pytest.fixture
+def bench_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "JWT_SECRET_KEY", "test-secret")
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'bench.db'}")
+    cfg = api_suite.BenchConfig(
+        database_url=f"sqlite:///{tmp_path / 'bench.db'}",
+        users=3,
+        accounts=2,
+        months=3,
+        csv_rows=(5,),
+        requests=6,
+        concurrency=3,
+    )
+    api_suite.configure_environment(cfg)
+    yield cfg
+    db.reset_engine()
+
+
+def test_suite_runs_every_workload_end_to_end(bench_config):
+    api_suite.prepare_database(bench_config)
+    results = asyncio.run(api_suite.run_suite(bench_config))
+
+    assert list(results) == ["login", "dashboard", "upload_5", "mixed"]
+    for summary in results.values():
+        assert summary["requests"] == 6
+        assert summary["errors"] == 0
+        assert 0 < summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+
+
+def test_compare_flags_latency_throughput_and_error_regressions():
+    baseline = {"results": {"dashboard": {"rps": 100.0, "p95_ms": 10.0, "errors": 0}}}
+    assert api_suite.compare({"dashboard": {"rps": 95.0, "p95_ms": 11.0, "errors": 0}}, baseline, 0.2) == []
+
+    regressions = api_suite.compare({"dashboard": {"rps": 50.0, "p95_ms": 30.0, "errors": 2}}, baseline, 0.2)
+    assert len(regressions) == 3
+
+
+def test_generated_csv_is_accepted_by_the_upload_parser():
+    lines = api_suite.make_csv(24, random.Random(1)).decode().splitlines()
+    header_idx, _ = find_header_row([line.split(",") for line in lines])
+    assert header_idx == 1 and len(lines) == 26
@@ -0,0 +1,254 @@
+import asyncio
+import gzip
+import hashlib
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import content_encoding
+import models
+from content_encoding import (
+    GZIP,
+    CompressionMiddleware,
+    DecompressionBomb,
+    DecompressionError,
+    UnsupportedEncoding,
+    negotiate,
+    open_decoded,
+    upload_encoding,
+)
+from jobs import JobWorker
+from main import app
+from security import get_current_admin_user, get_db
+from upload_spool import upload_spool
+
+TABLES = [
+    models.Job.__table__,
+    models.PinterestAccountStatsMonthly.__table__,
+    models.PinterestStatsUpload.__table__,
+]
+
+CSV = (
+    "Pinterest monthly export\n"
+    "Date Range,Impressions,Engagements,Outbound Clicks,Saves\n"
+    + "".join(f"{m:02d}/01-{m:02d}/28 2023,{1000 + m},{m},{m},{m}\n" for m in range(1, 13))
+).encode()
+
+
+# -----------------------------
+# Uploads
+# -----------------------------
+
+
+def _decode(data: bytes, encoding=GZIP, **kwargs) -> bytes:
+    with open_decoded(io.BytesIO(data), encoding, **kwargs) as fp:
+        return fp.read()
+
+
+def test_upload_encoding_prefers_header_then_name_then_magic():
+    gz = gzip.compress(CSV)
+    assert upload_encoding(filename="stats.csv", head=CSV[:4]) is None
+    assert upload_encoding(filename="stats.csv.gz") == GZIP
+    assert upload_encoding(filename="export", head=gz[:4]) == GZIP
+    assert upload_encoding(content_encoding="x-gzip") == GZIP
+    assert upload_encoding(content_encoding="identity", filename="stats.csv") is None
+    with pytest.raises(UnsupportedEncoding):
+        upload_encoding(content_encoding="br")
+
+
+def test_zstd_upload_is_refused_without_zstandard(monkeypatch):
+    monkeypatch.setattr(content_encoding, "zstandard", None)
+    with pytest.raises(UnsupportedEncoding, match="zstd"):
+        upload_encoding(filename="stats.csv.zst")
+    assert negotiate("zstd, gzip;q=0.5") == GZIP
+
+
+def test_zstd_upload_is_decoded_when_zstandard_is_installed():
+    zstandard = pytest.importorskip("zstandard")  # the optional 'zstd' extra
+    data = zstandard.ZstdCompressor().compress(CSV)
+    assert upload_encoding(filename="export", head=data[:4]) == content_encoding.ZSTD
+    assert _decode(data, content_encoding.ZSTD) == CSV
+    assert negotiate("gzip, zstd") == content_encoding.ZSTD
+
+
+def test_gzip_stream_is_decoded_across_members_and_rejects_truncation():
+    two_members = gzip.compress(CSV[:100]) + gzip.compress(CSV[100:]) + b"\0" * 8
+    assert _decode(two_members) == CSV
+
+    with pytest.raises(DecompressionError, match="truncated"):
+        _decode(gzip.compress(CSV)[:-10])
+    with pytest.raises(DecompressionError, match="Not valid gzip"):
+        _decode(b"\x1f\x8b" + b"garbage" * 10)
+
+
+def test_decompression_bomb_is_stopped():
+    bomb = gzip.compress(b"\0" * (64 * 1024 * 1024))  # ~64 KB that expands 1000x
+    with pytest.raises(DecompressionBomb, match="expands more than"):
+        _decode(bomb, max_ratio=100)
+    with pytest.raises(DecompressionBomb, match="larger than"):
+        _decode(gzip.compress(CSV), max_size=100)
+
+
+@pytest.fixture()
+def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_spool, "root", tmp_path / "spool")
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(engine, tables=TABLES)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture()
+def client(session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin_user] = lambda: SimpleNamespace(email="admin@example.com")
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_current_admin_user, None)
+
+
+def _run_jobs(session_factory) -> int:
+    return asyncio.run(JobWorker(session_factory=session_factory, concurrency=1).run_once())
+
+
+def _upload(client, data: bytes, filename: str, content_type: str = "text/csv"):
+    return client.post(
+        "/admin/pinterest-stats/upload",
+        data={"account_name": "acme"},
+        files={"file": (filename, data, content_type)},
+    )
+
+
+def test_gzipped_upload_is_stored_compressed_and_ingested(client, session_factory):
+    gz = gzip.compress(CSV)
+    r = _upload(client, gz, "stats.csv.gz", "application/gzip")
+    assert r.status_code == 202, r.text
+
+    db = session_factory()
+    job = db.get(models.Job, r.json()["job_id"])
+    assert job.params["encoding"] == GZIP
+    assert db.scalar(select(models.Job.input).where(models.Job.id == job.id)) == gz
+    db.close()
+
+    _run_jobs(session_factory)
+    done = client.get(r.json()["status_url"]).json()
+    assert done["status"] == "succeeded" and done["result"]["inserted"] == 12
+
+    # The content hash is of the CSV inside: the plain file is a repeat.
+    again = _upload(client, CSV, "stats.csv")
+    assert again.status_code == 200 and again.json()["duplicate"] is True
+
+
+def test_bad_compressed_uploads_are_rejected(client, monkeypatch):
+    monkeypatch.setattr(content_encoding.config, "UPLOAD_MAX_DECOMPRESSED_BYTES", 1000)
+    assert _upload(client, gzip.compress(CSV * 10), "stats.csv.gz").status_code == 413
+    assert _upload(client, gzip.compress(CSV)[:-10], "stats.csv.gz").status_code == 400
+    assert _upload(client, gzip.compress(b" \n\n"), "stats.csv.gz").status_code == 400
+
+
+def test_chunked_upload_of_gzipped_file(client, session_factory):
+    gz = gzip.compress(CSV)
+    sid = client.post(
+        "/admin/pinterest-stats/upload-sessions", json={"account_name": "acme", "filename": "stats.csv.gz"}
+    ).json()["session_id"]
+    chunks = [gz[i:i + 40] for i in range(0, len(gz), 40)]
+    for n, chunk in enumerate(chunks):
+        client.put(
+            f"/admin/pinterest-stats/upload-sessions/{sid}/chunks/{n}",
+            content=chunk,
+            headers={"X-Chunk-Sha256": hashlib.sha256(chunk).hexdigest()},
+        )
+    r = client.post(
+        f"/admin/pinterest-stats/upload-sessions/{sid}/complete",
+        json={"chunks": len(chunks), "sha256": hashlib.sha256(gz).hexdigest()},
+    )
+    assert r.status_code == 202, r.text
+
+    _run_jobs(session_factory)
+    assert client.get(r.json()["status_url"]).json()["result"]["inserted"] == 12
+
+
+# -----------------------------
+# Responses
+# -----------------------------
+
+PAYLOAD = {"rows": [{"calendar_month": f"2023-{m:02d}-01", "impressions": 1000 + m} for m in range(1, 13)] * 20}
+
+
+@pytest.fixture()
+def compressed_client():
+    mini = FastAPI()
+
+    @mini.get("/big")
+    def big():
+        return PAYLOAD
+
+    @mini.get("/small")
+    def small():
+        return {"ok": True}
+
+    @mini.get("/events")
+    def events():
+        return StreamingResponse(iter([b"data: 1\n\n"] * 200), media_type="text/event-stream")
+
+    @mini.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"line of text\n"] * 200), media_type="text/plain")
+
+    @mini.get("/encoded")
+    def encoded():
+        return PlainTextResponse("x" * 5000, headers={"Content-Encoding": "identity"})
+
+    mini.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(mini)
+
+
+def test_response_is_gzipped_when_accepted_and_large_enough(compressed_client):
+    r = compressed_client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert int(r.headers["content-length"]) < len(json.dumps(PAYLOAD)) // 5
+    assert r.json() == PAYLOAD  # httpx decodes it
+
+    plain = compressed_client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.json() == PAYLOAD
+
+    small = compressed_client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert "Accept-Encoding" in small.headers["vary"]
+
+
+def test_streams_compress_incrementally_but_event_streams_do_not(compressed_client):
+    r = compressed_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip" and "content-length" not in r.headers
+    assert r.text == "line of text\n" * 200
+
+    events = compressed_client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in events.headers
+
+    already = compressed_client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert already.headers["content-encoding"] == "identity"
+
+
+def test_negotiation_follows_q_values():
+    assert negotiate(None) is None
+    assert negotiate("br") is None
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("*") in content_encoding.available_encodings()
+    assert negotiate("br, gzip;q=0.8, *;q=0") == GZIP
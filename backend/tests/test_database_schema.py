@@ -6,7 +6,7 @@ import pytest
 from sqlalchemy import inspect, text   # ← add text here
 from sqlalchemy.exc import OperationalError
 
-from db import engine
+from db import get_engine
 from models import User, PinterestAccountStatsMonthly
 
 
@@ -18,13 +18,13 @@ def test_remote_db_schema_matches_models():
     """
     Integration-style sanity check:
 
-    - Uses the same engine as the app (db.engine)
+    - Uses the same engine as the app (db.get_engine())
     - Connects to the DB defined by DATABASE_URL (e.g. Railway)
     - Verifies that the core tables exist and match the ORM models
     """
 
     try:
-        with engine.connect() as conn:
+        with get_engine().connect() as conn:
             # Basic connectivity test (SQLAlchemy 2.x style)
             conn.execute(text("SELECT 1"))
 
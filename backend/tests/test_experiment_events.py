@@ -0,0 +1,162 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+import models
+from experiment_events import ExperimentEventBuffer, event_buffer, write_events
+from main import app
+
+client = TestClient(app)
+
+
+def _event(i: int = 0) -> dict:
+    return {
+        "event_id": f"e{i}",
+        "type": "exposure",
+        "experiment_key": "pp_hero",
+        "variant": "b",
+        "event_name": None,
+        "attributes": {"i": i},
+        "source": "growthbook",
+        "occurred_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+    }
+
+
+@pytest.fixture(autouse=True)
+def _empty_global_buffer():
+    event_buffer._ring.clear()
+    yield
+    event_buffer._ring.clear()
+
+
+def test_buffer_flushes_in_batches_and_drains_on_stop():
+    written: list[list[dict]] = []
+
+    async def scenario():
+        buf = ExperimentEventBuffer(capacity=100, flush_size=10, flush_interval=60, writer=written.append)
+        await buf.start()
+        assert buf.offer([_event(i) for i in range(25)])
+        await asyncio.sleep(0.05)  # size trigger wakes the flusher
+        assert buf.offer([_event(99)])
+        await buf.stop()
+        return buf
+
+    buf = asyncio.run(scenario())
+    assert [len(b) for b in written] == [10, 10, 5, 1]
+    assert buf.flushed == 26 and len(buf) == 0
+
+
+def test_buffer_applies_backpressure_when_full():
+    buf = ExperimentEventBuffer(capacity=5, flush_size=5, writer=lambda rows: None)
+    assert buf.offer([_event(i) for i in range(4)])
+    assert not buf.offer([_event(5), _event(6)])  # all-or-nothing
+    assert len(buf) == 4 and buf.rejected == 2
+
+
+def test_failed_flush_requeues_batch_in_order():
+    calls = {"n": 0}
+    written: list[dict] = []
+
+    def flaky(rows):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("db down")
+        written.extend(rows)
+
+    buf = ExperimentEventBuffer(capacity=10, flush_size=10, writer=flaky)
+    buf.offer([_event(i) for i in range(3)])
+    assert asyncio.run(buf.flush()) == 0
+    assert len(buf) == 3 and buf.flush_errors == 1
+    assert asyncio.run(buf.flush()) == 3
+    assert [r["event_id"] for r in written] == ["e0", "e1", "e2"]
+
+
+def _rejecting(bad_ids: set[str], written: list[dict], down: dict | None = None):
+    def writer(rows):
+        if (down or {}).get("down") or any(r["event_id"] in bad_ids for r in rows):
+            raise RuntimeError("rejected by the database")
+        written.extend(rows)
+
+    return writer
+
+
+def test_batch_that_keeps_failing_is_split_and_the_bad_event_dropped():
+    written: list[dict] = []
+    buf = ExperimentEventBuffer(capacity=100, flush_size=8, flush_retries=2, writer=_rejecting({"e5"}, written))
+    buf.offer([_event(i) for i in range(20)])
+
+    for _ in range(10):
+        asyncio.run(buf.flush())
+    assert sorted(int(r["event_id"][1:]) for r in written) == [i for i in range(20) if i != 5]
+    assert len(buf) == 0 and buf.dead_lettered == 1
+
+    buf.offer([_event(30)])
+    assert asyncio.run(buf.flush()) == 1  # back to normal
+
+
+def test_nothing_is_dropped_while_every_write_fails():
+    written: list[dict] = []
+    db = {"down": True}
+    buf = ExperimentEventBuffer(capacity=100, flush_size=8, flush_retries=1, writer=_rejecting(set(), written, db))
+    buf.offer([_event(i) for i in range(20)])
+
+    for _ in range(10):
+        asyncio.run(buf.flush())
+    assert len(buf) == 20 and buf.dead_lettered == 0
+
+    db["down"] = False
+    for _ in range(5):
+        asyncio.run(buf.flush())
+    assert [r["event_id"] for r in written] == [f"e{i}" for i in range(20)]
+
+
+def test_write_events_inserts_batch():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.ExperimentEvent.__table__.create(engine)
+
+    write_events([_event(i) for i in range(50)], bind=engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(models.ExperimentEvent)).scalar() == 50
+
+
+def test_endpoint_accepts_single_and_batched_events():
+    r = client.post("/experiment-events", json={"type": "exposure", "experimentKey": "pp_hero", "variant": "a"})
+    assert r.status_code == 202
+    assert r.json() == {"ok": True, "accepted": 1}
+
+    batch = {"events": [{"type": "conversion", "eventName": "pp_complete"}, {"type": "exposure"}]}
+    r = client.post("/experiment-events", json=batch)
+    assert r.status_code == 202
+    assert r.json()["accepted"] == 2
+
+    buffered = list(event_buffer._ring)
+    assert buffered[0]["experiment_key"] == "pp_hero"
+    assert buffered[1]["event_name"] == "pp_complete"
+    assert all(e["occurred_at"] is not None for e in buffered)
+
+
+def test_endpoint_rejects_invalid_type():
+    r = client.post("/experiment-events", json={"type": "click"})
+    assert r.status_code == 422
+
+
+def test_endpoint_rejects_control_characters():
+    assert client.post("/experiment-events", json={"type": "conversion", "eventName": "a\u0000b"}).status_code == 422
+    assert client.post("/experiment-events", json={"type": "exposure", "variant": "a\nb"}).status_code == 422
+    nul_key = {"type": "exposure", "attributes": {"nested": [{"k\u0000": "v"}]}}
+    assert client.post("/experiment-events", json=nul_key).status_code == 422
+    text = {"type": "exposure", "attributes": {"note": "two\nlines"}}
+    assert client.post("/experiment-events", json=text).status_code == 202
+    assert len(event_buffer) == 1
+
+
+def test_endpoint_returns_503_when_buffer_full(monkeypatch):
+    monkeypatch.setattr(event_buffer, "capacity", 0)
+    r = client.post("/experiment-events", json={"type": "exposure"})
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "1"
@@ -0,0 +1,132 @@
+import asyncio
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+from experiment_stats import CounterCompactor, compact_events, load_totals, rebuild_counters, summarize
+
+TABLES = [
+    models.ExperimentEvent.__table__,
+    models.ExperimentDailyCounter.__table__,
+    models.ExperimentAggregationCursor.__table__,
+]
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(engine, tables=TABLES)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _add(db, *, variant, type_="exposure", event_name=None, event_id=None, day=1, key="pp_hero"):
+    db.add(
+        models.ExperimentEvent(
+            event_id=event_id,
+            type=type_,
+            experiment_key=key,
+            variant=variant,
+            event_name=event_name,
+            occurred_at=datetime(2026, 1, day, 12, tzinfo=timezone.utc),
+        )
+    )
+
+
+def _compact(db):
+    # Negative settle window so rows inserted a moment ago are eligible.
+    return compact_events(db, settle_seconds=-60)
+
+
+def test_compaction_counts_by_day_and_skips_duplicate_event_ids(db):
+    _add(db, variant="a", event_id="x1")
+    _add(db, variant="a", event_id="x1")  # duplicate delivery
+    _add(db, variant="a", type_="conversion", event_name="pp_complete", event_id="x2")
+    _add(db, variant="b")
+    _add(db, variant=None)  # not attributable
+    db.commit()
+    _compact(db)
+
+    # Late duplicate of an already-compacted event, plus an out-of-order event for an older day.
+    _add(db, variant="a", type_="conversion", event_name="pp_complete", event_id="x2", day=3)
+    _add(db, variant="b", day=1, event_id="late")
+    db.commit()
+    _compact(db)
+
+    assert sorted(load_totals(db, "pp_hero")) == [
+        ("a", "exposure", 1),
+        ("a", "pp_complete", 1),
+        ("b", "exposure", 2),
+    ]
+    assert load_totals(db, "pp_hero", start=date(2026, 1, 2)) == []
+
+
+def test_rebuild_matches_incremental(db):
+    for i in range(30):
+        _add(db, variant="ab"[i % 2], event_id=f"e{i}", day=1 + i % 3)
+        _add(db, variant="ab"[i % 2], event_id=f"e{i}")
+    db.commit()
+    _compact(db)
+    incremental = sorted(load_totals(db, "pp_hero"))
+
+    rebuild_counters(db, settle_seconds=-60, chunk_size=7)
+    assert sorted(load_totals(db, "pp_hero")) == incremental == [("a", "exposure", 15), ("b", "exposure", 15)]
+
+
+def test_summarize_rates_intervals_and_lift():
+    totals = [
+        ("a", "exposure", 1000),
+        ("a", "signup", 100),
+        ("b", "exposure", 1000),
+        ("b", "signup", 130),
+    ]
+    out = summarize(totals, control="a")
+
+    assert out["control"] == "a"
+    a, b = out["variants"]
+    assert a["metrics"]["signup"]["rate"] == pytest.approx(0.1)
+    assert a["metrics"]["signup"]["ci_low"] == pytest.approx(0.0829, abs=1e-4)
+    assert a["metrics"]["signup"]["ci_high"] == pytest.approx(0.1202, abs=1e-4)
+    assert "lift_abs" not in a["metrics"]["signup"]
+
+    m = b["metrics"]["signup"]
+    assert m["lift_abs"] == pytest.approx(0.03)
+    assert m["lift_rel"] == pytest.approx(0.3)
+    assert m["p_value"] == pytest.approx(0.0355, abs=1e-4)
+    assert m["lift_abs_ci_low"] < 0.03 < m["lift_abs_ci_high"]
+
+
+def test_summarize_handles_variant_without_exposures():
+    out = summarize([("a", "exposure", 10), ("b", "signup", 2)])
+    b = out["variants"][1]
+    assert b["exposures"] == 0
+    assert b["metrics"]["signup"]["rate"] is None
+    assert b["metrics"]["signup"]["p_value"] is None
+    assert (b["metrics"]["signup"]["ci_low"], b["metrics"]["signup"]["ci_high"]) == (None, None)
+
+
+def test_summarize_caps_conversions_at_exposures():
+    # Conversions logged without their exposure (or flushed before it) must not break the maths.
+    out = summarize([("a", "exposure", 1), ("a", "purchase", 3), ("b", "exposure", 5), ("b", "purchase", 1)])
+    a, b = out["variants"]
+    assert a["metrics"]["purchase"]["conversions"] == 3
+    assert a["metrics"]["purchase"]["rate"] == 1.0
+    assert 0 <= a["metrics"]["purchase"]["ci_low"] <= a["metrics"]["purchase"]["ci_high"] == 1.0
+    assert b["metrics"]["purchase"]["lift_abs"] == pytest.approx(-0.8)
+    assert 0 <= b["metrics"]["purchase"]["p_value"] <= 1
+
+
+def test_background_compactor_folds_new_events(db):
+    _add(db, variant="a")
+    db.commit()
+    compactor = CounterCompactor(interval=60, settle_seconds=-60, session_factory=lambda: db)
+
+    assert asyncio.run(compactor.run_once())["counter_rows"] == 1
+    assert load_totals(db, "pp_hero") == [("a", "exposure", 1)]
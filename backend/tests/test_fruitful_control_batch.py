@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from main import app
+from security import get_current_contractor_user
+from tools.fruitful_control import engine
+from tools.fruitful_control.batch import BatchEvaluator, batch_evaluator, evaluate_chunk
+
+GOOD = "Cozy Fall Living Room Ideas for Small Apartments"
+BAD = "CLICK HERE for ikea vibes!!"
+
+
+def _collect(evaluator, items, task_type="title"):
+    async def run():
+        rule_set = engine.rule_set("demo", task_type)
+        return [json.loads(line) async for chunk in evaluator.stream(rule_set, items) for line in chunk.splitlines()]
+
+    return asyncio.run(run())
+
+
+def test_stream_dedupes_and_matches_the_engine():
+    items = [(f"p{i}", GOOD if i % 2 else BAD) for i in range(10)]
+    lines = _collect(BatchEvaluator(chunk_size=3, inline_max=100, cache_entries=0), items)
+
+    header, *results, summary = lines
+    assert header["type"] == "batch" and header["unique"] == 2
+    assert sorted(r["index"] for r in results) == list(range(10))
+    rs = engine.rule_set("demo", "title")
+    for r in results:
+        assert r["id"] == f"p{r['index']}"
+        expected = rs.evaluate(items[r["index"]][1])
+        assert {k: r[k] for k in ("verdict", "qa_score", "score_breakdown")} == {
+            k: expected[k] for k in ("verdict", "qa_score", "score_breakdown")
+        }
+    assert summary == {**summary, "type": "summary", "evaluated": 2, "ready": 5, "needs_revision": 5}
+
+
+def test_resubmission_only_evaluates_changed_items():
+    evaluator = BatchEvaluator(inline_max=100, cache_entries=100)
+    _collect(evaluator, [("a", GOOD), ("b", BAD)])
+    summary = _collect(evaluator, [("a", GOOD), ("b", GOOD + " Today")])[-1]
+    assert summary["evaluated"] == 1
+
+
+def test_large_batches_use_the_process_pool():
+    evaluator = BatchEvaluator(workers=2, chunk_size=25, inline_max=0, cache_entries=0)
+    try:
+        items = [(str(i), f"{GOOD} number {i}") for i in range(120)]
+        lines = _collect(evaluator, items)
+        assert evaluator._pool is not None
+        assert lines[-1]["evaluated"] == 120 and lines[-1]["failed_chunks"] == 0
+        assert len([l for l in lines if l["type"] == "result"]) == 120
+    finally:
+        evaluator.shutdown()
+
+
+def test_chunk_refuses_to_judge_under_other_rules():
+    import pytest
+
+    with pytest.raises(RuntimeError, match="Rules changed"):
+        evaluate_chunk("demo", "title", "not-a-version", [GOOD])
+
+
+def test_batch_endpoint_streams_ndjson():
+    client = TestClient(app)
+    body = {"client": "demo", "task_type": "description", "items": [{"id": "1", "text": "x" * 150}] * 3}
+    assert client.post("/contractor/fruitful-control/batch", json=body).status_code == 401
+
+    app.dependency_overrides[get_current_contractor_user] = lambda: None
+    try:
+        resp = client.post("/contractor/fruitful-control/batch", json=body)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(l) for l in resp.text.splitlines()]
+        assert [l["type"] for l in lines] == ["batch", "result", "result", "result", "summary"]
+        assert client.post("/contractor/fruitful-control/batch", json={**body, "client": "x"}).status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_current_contractor_user, None)
+        batch_evaluator.cache = type(batch_evaluator.cache)(batch_evaluator.cache.max_entries)
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from security import get_current_contractor_user
+from tools.fruitful_control import RuleEngine, UnknownClientError, engine, parse_document
+from tools.fruitful_control.engine import compile_rule_set
+from tools.fruitful_control.matcher import PhraseMatcher, RegexBundle
+
+GOOD_TITLE = "Cozy Fall Living Room Ideas for Small Apartments"
+
+
+def test_phrase_matcher_finds_overlapping_whole_word_phrases():
+    m = PhraseMatcher(["he", "she", "hers", "his", "click here", "#1", "ad"])
+    found = {m.phrases[i] for i in m.find("Ushers: she said HIS  Click\nHere deal is #1; add it")}
+    assert found == {"she", "his", "click here", "#1"}  # "he"/"hers" only occur inside words, "ad" in "add"
+
+
+def test_regex_bundle_prefilter_skips_clean_text():
+    bundle = RegexBundle([(r"\bfoo\b", 0), (r"bar", 2), (r"(x)\1", 0)], [True, True, True])
+    assert bundle.prefiltered_clean("nothing here")
+    assert not bundle.prefiltered_clean("a BAR b")
+    assert not bundle.is_prefiltered(2)  # backreference can't be OR-ed safely
+
+
+def test_layered_rules_score_and_verdict():
+    rs = engine.rule_set("demo", "title")
+    assert [s.split("@")[0] for s in rs.sources] == ["global", "task:title", "client:demo"]
+
+    [ok] = rs.evaluate_batch([("a", GOOD_TITLE)])
+    assert ok["verdict"] == "ready" and ok["qa_score"] == 10
+
+    bad = rs.evaluate("CLICK HERE for ikea vibes!!", "b")
+    ids = [b["rule_id"] for b in bad["score_breakdown"]]
+    assert ids == [
+        "global:banned-phrases",
+        "global:all-caps-words",
+        "global:repeated-punctuation",
+        "task:title:length",
+        "client:demo:no-slang",
+        "client:demo:no-competitor-names",
+    ]
+    assert bad["qa_score"] == 0 and bad["verdict"] == "needs_revision"
+    assert 'Banned phrase: "click here"' in bad["hard_issues"]
+
+    # A soft miss alone keeps "ready"; any hard issue forces "needs_revision" even at 9/10.
+    desc = engine.rule_set("demo", "description").evaluate("x" * 120)
+    assert (desc["verdict"], desc["qa_score"], desc["soft_improvements"]) == ("ready", 10, ["No call to action"])
+    short = rs.evaluate("Fall Living Room Ideas")
+    assert (short["verdict"], short["qa_score"]) == ("needs_revision", 9)
+
+
+def test_compiled_sets_are_cached_by_version(tmp_path):
+    (tmp_path / "tasks").mkdir()
+    (tmp_path / "clients").mkdir()
+    (tmp_path / "global.json").write_text(json.dumps({"rules": []}))
+    client_file = tmp_path / "clients" / "acme.json"
+    client_file.write_text(json.dumps({"rules": [{"id": "x", "type": "phrases", "phrases": ["foo"], "severity": "S2"}]}))
+
+    eng = RuleEngine(tmp_path)
+    first = eng.rule_set("acme", "title")
+    assert eng.rule_set("acme", "title") is first
+    eng.reload()
+    assert eng.rule_set("acme", "title") is first  # same content, same version
+
+    client_file.write_text(json.dumps({"rules": [{"id": "x", "type": "phrases", "phrases": ["bar"], "severity": "S2"}]}))
+    eng.reload()
+    second = eng.rule_set("acme", "title")
+    assert second.version != first.version
+    assert second.evaluate("bar")["verdict"] == "needs_revision"
+
+    with pytest.raises(UnknownClientError):
+        eng.rule_set("nobody", "title")
+
+
+def test_bad_rule_documents_fail_loudly():
+    with pytest.raises(ValueError, match="severity"):
+        parse_document({"rules": [{"id": "x", "type": "phrases", "phrases": ["a"], "severity": "S9"}]},
+                       layer="client", key="acme")
+    with pytest.raises(ValueError, match="soft deduction"):
+        parse_document({"rules": [{"id": "x", "type": "length", "max_chars": 5, "severity": "soft", "deduction": 2}]},
+                       layer="client", key="acme")
+
+
+def test_client_rules_only_tighten():
+    lib = engine.library
+    loose = parse_document({"rules": [{"id": "banned-phrases", "type": "phrases", "phrases": ["zzz"], "severity": "soft"}]},
+                           layer="client", key="loose")
+    rs = compile_rule_set(lib.global_rules, lib.tasks["title"], loose, "title")
+    result = rs.evaluate("Click here to see our cozy fall living room ideas")
+    assert "global:banned-phrases" in [b["rule_id"] for b in result["score_breakdown"]]
+
+
+def test_evaluate_endpoint_is_contractor_only():
+    client = TestClient(app)
+    body = {"client": "demo", "task_type": "title", "items": [{"id": "1", "text": GOOD_TITLE}]}
+    assert client.post("/contractor/fruitful-control/evaluate", json=body).status_code == 401
+
+    app.dependency_overrides[get_current_contractor_user] = lambda: None
+    try:
+        resp = client.post("/contractor/fruitful-control/evaluate", json=body)
+        assert resp.status_code == 200
+        assert resp.json()["results"][0]["verdict"] == "ready"
+        assert client.post("/contractor/fruitful-control/evaluate", json={**body, "client": "nope"}).status_code == 404
+        assert "demo" in [c["key"] for c in client.get("/contractor/fruitful-control/rules").json()["clients"]]
+    finally:
+        app.dependency_overrides.pop(get_current_contractor_user, None)
@@ -0,0 +1,140 @@
+import io
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from security import get_current_contractor_user
+from tools.fruitful_control import engine, parse_document
+from tools.fruitful_control.images import DesignAnalyzer, ImageRejected, hash_upload
+
+
+@pytest.fixture()
+def pil():
+    from PIL import Image
+
+    return Image
+
+
+def _png(pil, size=(1000, 1500), *, text_rows=0, edge_text=False, fill=(245, 240, 230), fmt="PNG") -> io.BytesIO:
+    from PIL import ImageDraw
+
+    im = pil.new("RGB", size, fill)
+    draw = ImageDraw.Draw(im)
+    w, h = size
+    draw.rectangle([0, h // 2, w, h], fill=(40, 60, 90))  # photo block: contrast without clutter
+    for row in range(text_rows):  # headline-ish stripes in the top half
+        y = h // 10 + row * 24
+        for x in range(w // 8, w - w // 8, 18):
+            draw.rectangle([x, y, x + 10, y + 12], fill=(20, 20, 20))
+    if edge_text:  # a headline running into the top edge
+        for x in range(w // 8, w - w // 8, 32):
+            draw.rectangle([x, 8, x + 16, 70], fill=(0, 0, 0))
+    buf = io.BytesIO()
+    im.save(buf, fmt)
+    buf.seek(0)
+    return buf
+
+
+def _ids(result) -> list[str]:
+    return [b["rule_id"] for b in result["score_breakdown"]]
+
+
+def test_image_rules_only_apply_to_design():
+    design = engine.rule_set("demo", "design")
+    assert {r.type for r in design.rules} == {"image"}
+    assert all(r.type != "image" for r in engine.rule_set("demo", "title").rules)
+
+
+def test_bad_image_rules_fail_loudly():
+    def doc(rule):
+        return {"rules": [{"id": "x", "type": "image", "severity": "S2", **rule}]}
+
+    for bad in (
+            {"check": "sharpness"},
+            {"check": "contrast"},
+            {"check": "safe_zone", "margin": 0.05},
+            {"check": "safe_zone", "margin": 0.6, "max_density": 0.1},
+            {"check": "aspect_ratio", "min_ratio": "wide"},
+            {"check": "aspect_ratio", "min_ratio": 0.5, "task_types": ["title"]},
+    ):
+        with pytest.raises(ValueError, match="Rule config error"):
+            parse_document(doc(bad), layer="client", key="acme")
+    with pytest.raises(ValueError, match="task_types"):
+        parse_document(
+            {"rules": [{"id": "y", "type": "length", "max_chars": 5, "severity": "S3", "task_types": ["design"]}]},
+            layer="client",
+            key="acme",
+        )
+
+
+def test_upload_hash_is_streamed_and_bounded():
+    data = io.BytesIO(b"x" * (3 * 1024 * 1024 + 5))
+    digest, size = hash_upload(data)
+    assert size == 3 * 1024 * 1024 + 5 and data.tell() == 0 and len(digest) == 64
+    with pytest.raises(ImageRejected, match="larger than"):
+        hash_upload(data, max_bytes=1024)
+
+
+def test_clean_pin_is_ready_and_problems_map_to_rules(pil):
+    rule_set = engine.rule_set("demo", "design")
+    analyzer = DesignAnalyzer()
+
+    clean = analyzer.evaluate(rule_set, _png(pil, text_rows=3))
+    assert clean["verdict"] == "ready", clean["score_breakdown"]
+    assert clean["image"]["width"] == 1000 and clean["image"]["contrast"] > 0.12
+
+    square = analyzer.evaluate(rule_set, _png(pil, size=(800, 800)))
+    assert _ids(square) == ["task:design:aspect-ratio", "task:design:min-size"]
+    assert square["verdict"] == "needs_revision"
+
+    flat = pil.new("RGB", (1000, 1500), (200, 200, 200))
+    buf = io.BytesIO()
+    flat.save(buf, "JPEG")
+    assert _ids(analyzer.evaluate(rule_set, buf)) == ["task:design:low-contrast"]
+
+    assert "task:design:safe-zone" in _ids(analyzer.evaluate(rule_set, _png(pil, edge_text=True)))
+
+
+def test_results_are_cached_by_content(pil):
+    rule_set = engine.rule_set("demo", "design")
+    analyzer = DesignAnalyzer()
+    first = analyzer.evaluate(rule_set, _png(pil, text_rows=2))
+    again = analyzer.evaluate(rule_set, _png(pil, text_rows=2))
+    assert (first["cached"], again["cached"]) == (False, True)
+    assert {**again, "cached": False} == first
+
+
+def test_analysis_takes_tens_of_milliseconds(pil):
+    rule_set = engine.rule_set("demo", "design")
+    analyzer = DesignAnalyzer(cache_entries=0)
+    images = [_png(pil, text_rows=4, fmt=fmt) for fmt in ("PNG", "JPEG", "WEBP")]
+    for im in images:
+        analyzer.evaluate(rule_set, im)  # warm imports/codecs
+    started = time.perf_counter()
+    for im in images * 5:
+        analyzer.evaluate(rule_set, im)
+    assert (time.perf_counter() - started) / 15 < 0.1
+
+
+def test_design_endpoint(pil):
+    client = TestClient(app)
+    files = {"image": ("pin.png", _png(pil, text_rows=3).getvalue(), "image/png")}
+    assert client.post("/contractor/fruitful-control/design", data={"client": "demo"}, files=files).status_code == 401
+
+    app.dependency_overrides[get_current_contractor_user] = lambda: None
+    try:
+        r = client.post(
+            "/contractor/fruitful-control/design", data={"client": "demo", "template_id": "recipe-v2"}, files=files
+        )
+        assert r.status_code == 200, r.text
+        body = r.json()
+        assert body["verdict"] == "ready" and body["template_id"] == "recipe-v2"
+        assert body["rule_sources"][1].startswith("task:design@")
+
+        bad = {"image": ("pin.png", b"not an image", "image/png")}
+        assert client.post("/contractor/fruitful-control/design", data={"client": "demo"}, files=bad).status_code == 400
+        assert client.post("/contractor/fruitful-control/design", data={"client": "nope"}, files=files).status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_current_contractor_user, None)
@@ -0,0 +1,163 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import config
+import models
+import routers.admin_fruitful_control as admin_router
+from main import app
+from security import get_current_admin_user, get_db
+from tools.fruitful_control import RuleEngine, UnknownClientError
+from tools.fruitful_control.repository import (
+    DbRuleSource,
+    RuleReloader,
+    document_history,
+    import_files,
+    publish_document,
+    retire_document,
+)
+from tools.fruitful_control.rules import DATA_DIR
+
+GOOD_TITLE = "Cozy Fall Living Room Ideas for Small Apartments"
+
+
+class CountingSessions:
+    """Session factory that counts how often the rule source touches the DB."""
+
+    def __init__(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        models.Base.metadata.create_all(engine, tables=[models.FruitfulControlRuleDocument.__table__])
+        self._factory = sessionmaker(bind=engine)
+        self.opened = 0
+
+    def __call__(self):
+        self.opened += 1
+        return self._factory()
+
+
+@pytest.fixture()
+def sessions():
+    s = CountingSessions()
+    with s() as db:
+        import_files(db, published_by="seed")
+    return s
+
+
+def _demo_rules() -> dict:
+    return json.loads((DATA_DIR / "clients" / "demo.json").read_text())
+
+
+def test_import_is_versioned_and_idempotent(sessions):
+    with sessions() as db:
+        assert import_files(db) == []
+        [seed] = document_history(db, "client", "demo")
+        assert seed.published_by == "seed" and seed.version
+
+        with pytest.raises(ValueError, match="Rule config error"):
+            publish_document(db, "client", "demo", {"rules": [{"id": "x", "type": "nope", "severity": "S1"}]})
+        with pytest.raises(ValueError, match="task must be one of"):
+            publish_document(db, "task", "captions", {"rules": []})
+        assert len(document_history(db, "client", "demo")) == 1
+
+
+def test_snapshots_swap_copy_on_write(sessions):
+    eng = RuleEngine(source=DbRuleSource(sessions))
+    old = eng.snapshot
+    assert old.version == "db@r5"  # global, three task documents, demo
+    assert eng.refresh() is False
+
+    rules = _demo_rules()
+    rules["rules"][0]["phrases"].append("amazing")
+    with sessions() as db:
+        publish_document(db, "client", "demo", rules, published_by="admin@example.com")
+    assert eng.refresh() is True
+
+    new = eng.snapshot
+    assert new.version == "db@r6"
+    text = f"{GOOD_TITLE}, amazing"
+    # A request still holding the old snapshot keeps judging under the old rules.
+    assert old.rule_set("demo", "title").evaluate(text)["verdict"] == "ready"
+    assert new.rule_set("demo", "title").evaluate(text)["verdict"] == "needs_revision"
+
+    with sessions() as db:
+        publish_document(db, "task", "description", {"name": "Descriptions", "rules": []})
+    eng.refresh()
+    assert eng.snapshot.rule_sets[("demo", "title")] is new.rule_sets[("demo", "title")]  # untouched: shared
+    assert eng.snapshot.rule_sets[("demo", "description")] is not new.rule_sets[("demo", "description")]
+    assert new.library.tasks["description"].rules  # the old snapshot was not mutated
+
+
+def test_hot_path_never_touches_the_db(sessions):
+    eng = RuleEngine(source=DbRuleSource(sessions))
+    eng.snapshot
+    before = sessions.opened
+    for _ in range(500):
+        out = eng.evaluate_batch("demo", "title", [("1", GOOD_TITLE)])
+    assert sessions.opened == before
+    assert out["snapshot_version"] == "db@r5"
+
+
+def test_failed_reload_keeps_serving_the_last_good_snapshot(sessions):
+    eng = RuleEngine(source=DbRuleSource(sessions))
+    good = eng.snapshot
+    with sessions() as db:  # bypasses publish_document's validation, like a bad manual edit
+        db.add(models.FruitfulControlRuleDocument(layer="client", key="demo", version="x", body={"rules": [{}]}))
+        db.commit()
+
+    reloader = RuleReloader(eng, interval=0)
+    assert asyncio.run(reloader.poll()) is False
+    assert reloader.errors == 1 and eng.snapshot is good
+
+
+def test_retired_clients_disappear(sessions):
+    eng = RuleEngine(source=DbRuleSource(sessions))
+    eng.rule_set("demo", "title")
+    with sessions() as db:
+        retire_document(db, "client", "demo")
+        with pytest.raises(LookupError):
+            retire_document(db, "client", "demo")
+    eng.refresh()
+    with pytest.raises(UnknownClientError):
+        eng.rule_set("demo", "title")
+
+
+def test_admin_publish_endpoint(sessions, monkeypatch):
+    eng = RuleEngine(source=DbRuleSource(sessions))
+    monkeypatch.setattr(admin_router, "engine", eng)
+    monkeypatch.setattr(config, "FRUITFUL_CONTROL_RULES_SOURCE", "db")
+
+    def override_get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin_user] = lambda: SimpleNamespace(email="admin@example.com")
+    try:
+        client = TestClient(app)
+        rules = _demo_rules()
+        rules["name"] = "Demo (renamed)"
+        r = client.put("/admin/fruitful-control/rules/client/demo", json=rules)
+        assert r.status_code == 200, r.text
+        assert r.json()["changed"] is True and r.json()["snapshot_version"] == "db@r6"
+        assert eng.library.clients["demo"].name == "Demo (renamed)"
+
+        assert client.put("/admin/fruitful-control/rules/client/demo", json=rules).json()["changed"] is False
+        assert client.put("/admin/fruitful-control/rules/client/demo", json={"rules": [{}]}).status_code == 400
+
+        history = client.get("/admin/fruitful-control/rules/client/demo/history").json()
+        assert [h["published_by"] for h in history] == ["admin@example.com", "seed"]
+
+        assert client.delete("/admin/fruitful-control/rules/client/demo").json()["snapshot_version"] == "db@r7"
+        assert client.delete("/admin/fruitful-control/rules/client/demo").status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_current_admin_user, None)
@@ -0,0 +1,60 @@
+import csv
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+import db
+import models
+from routers.admin_pinterest_stats import find_header_row, row_to_dict
+from scripts.db import generate_pinterest_stats as gen
+from utils import parse_calendar_month
+
+START = date(2023, 11, 1)
+
+
+def test_rows_are_deterministic_nested_and_consecutive():
+    rows = list(gen.account_rows(7, 3, 14, START))
+    assert rows == list(gen.account_rows(7, 3, 14, START))
+    assert rows != list(gen.account_rows(8, 3, 14, START))
+
+    assert [r[0] for r in rows[:3]] == [date(2023, 11, 1), date(2023, 12, 1), date(2024, 1, 1)]
+    for _, impressions, engagements, clicks, saves in rows:
+        assert impressions > 0
+        assert clicks <= engagements and saves <= engagements and engagements <= impressions
+
+
+def test_csv_matches_the_admin_upload_shape(tmp_path):
+    written = gen.write_csv_chunk(str(tmp_path), "acct-", 1, 0, 2, 3, START)
+    assert written == 6
+
+    with open(tmp_path / "acct-0000001.csv", newline="") as f:
+        rows = list(csv.reader(f))
+    header_idx, header_norms = find_header_row(rows)
+    assert header_idx == 1
+    first = row_to_dict(header_norms, rows[2])
+    assert parse_calendar_month(first["date_range"]) == START
+    assert int(first["impressions"]) == list(gen.account_rows(1, 1, 1, START))[0][1]
+
+
+def test_load_chunk_inserts_every_row(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.PinterestAccountStatsMonthly.__table__.create(engine)
+    monkeypatch.setattr(db, "get_engine", lambda: engine)
+
+    assert gen.load_chunk("acct-", 1, 0, 4, 12, START) == 48
+    with engine.connect() as conn:
+        total = conn.scalar(select(func.sum(models.PinterestAccountStatsMonthly.impressions)))
+    assert total == sum(r[1] for i in range(4) for r in gen.account_rows(1, i, 12, START))
+
+
+def test_load_refuses_to_create_the_table(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    monkeypatch.setattr(db, "get_engine", lambda: engine)
+    monkeypatch.setattr("sys.argv", ["generate_pinterest_stats", "load", "--accounts", "1", "--months", "1"])
+
+    with pytest.raises(SystemExit, match="alembic upgrade head"):
+        gen.main()
+    with engine.connect() as conn:
+        assert not conn.dialect.has_table(conn, gen.TABLE)
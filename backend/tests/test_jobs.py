@@ -0,0 +1,258 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import config
+import models
+from jobs import JobWorker, enqueue, job_handler
+from main import app
+from pinterest_stats_ingest import UPLOAD_JOB_KIND
+from security import get_current_admin_user, get_db
+
+TABLES = [
+    models.Job.__table__,
+    models.PinterestAccountStatsMonthly.__table__,
+    models.PinterestStatsUpload.__table__,
+]
+
+CSV = (
+    "Pinterest monthly export\n"
+    "Date Range,Impressions,Engagements,Outbound Clicks,Saves\n"
+    "09/01-09/30 2023,\"1,200\",80,12,9\n"
+    "10/01-10/31 2023,1500,95,20,11\n"
+).encode()
+
+calls: list[tuple[int, int]] = []
+
+
+@job_handler("test.echo")
+def _echo(ctx):
+    calls.append((ctx.id, ctx.attempt))
+    ctx.progress(1, 2, "halfway", force=True)
+    if ctx.params.get("fail") == "permanent":
+        raise ValueError("bad input")
+    if ctx.params.get("fail") == "transient" and ctx.attempt < 2:
+        raise ConnectionError("database went away")
+    return {"echo": ctx.params, "input": (ctx.input or b"").decode()}
+
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(engine, tables=TABLES)
+    calls.clear()
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture()
+def file_session_factory(tmp_path):
+    """For tests where the worker and the test touch the DB at the same time (one connection each)."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(engine, tables=TABLES)
+    calls.clear()
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _client(session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin_user] = lambda: SimpleNamespace(email="admin@example.com")
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_current_admin_user, None)
+
+
+@pytest.fixture()
+def client(session_factory):
+    yield from _client(session_factory)
+
+
+@pytest.fixture()
+def file_client(file_session_factory):
+    yield from _client(file_session_factory)
+
+
+def _enqueue(session_factory, params: dict, **kwargs) -> int:
+    db = session_factory()
+    try:
+        return enqueue(db, "test.echo", params, **kwargs).id
+    finally:
+        db.close()
+
+
+def _job(session_factory, job_id: int) -> models.Job:
+    db = session_factory()
+    try:
+        return db.get(models.Job, job_id)
+    finally:
+        db.close()
+
+
+def _worker(session_factory, **kwargs) -> JobWorker:
+    kwargs.setdefault("backoff_base", 0)
+    kwargs.setdefault("concurrency", 1)  # the StaticPool sqlite connection can't run two jobs at once
+    return JobWorker(session_factory=session_factory, **kwargs)
+
+
+def test_worker_runs_job_and_records_result_and_progress(session_factory):
+    job_id = _enqueue(session_factory, {"n": 1}, input=b"payload", created_by="admin@example.com")
+
+    assert asyncio.run(_worker(session_factory).run_once()) == 1
+    job = _job(session_factory, job_id)
+    assert job.status == "succeeded"
+    assert job.result == {"echo": {"n": 1}, "input": "payload"}
+    assert (job.progress_done, job.progress_total, job.progress_message) == (1, 2, "halfway")
+    assert job.attempts == 1 and job.finished_at is not None
+    db = session_factory()
+    assert db.scalar(select(models.Job.input).where(models.Job.id == job_id)) is None  # upload not kept once done
+    db.close()
+
+    assert asyncio.run(_worker(session_factory).run_once()) == 0
+
+
+def test_value_error_fails_permanently_and_other_errors_retry(session_factory):
+    bad = _enqueue(session_factory, {"fail": "permanent"})
+    flaky = _enqueue(session_factory, {"fail": "transient"})
+    worker = _worker(session_factory)
+
+    asyncio.run(worker.run_once())
+    asyncio.run(worker.run_once())
+    assert _job(session_factory, bad).status == "failed"
+    assert _job(session_factory, bad).error == "bad input"
+    retry = _job(session_factory, flaky)
+    assert (retry.status, retry.attempts, retry.error) == ("queued", 1, "database went away")
+
+    asyncio.run(worker.run_once())
+    assert _job(session_factory, flaky).status == "succeeded"
+    assert [c for c in calls if c[0] == flaky] == [(flaky, 1), (flaky, 2)]
+
+
+def test_transient_errors_stop_at_max_attempts(session_factory):
+    job_id = _enqueue(session_factory, {"fail": "transient"}, max_attempts=1)
+    asyncio.run(_worker(session_factory).run_once())
+    job = _job(session_factory, job_id)
+    assert (job.status, job.attempts) == ("failed", 1)
+
+
+def test_expired_lease_is_reclaimed_and_stale_attempt_cannot_finish(session_factory):
+    job_id = _enqueue(session_factory, {"n": 2})
+    first = _worker(session_factory)
+    (claimed,) = first._claim(5)
+    assert first._claim(5) == []  # leased: nobody else takes it
+
+    db = session_factory()
+    db.execute(
+        update(models.Job)
+        .where(models.Job.id == job_id)
+        .values(lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+    db.commit()
+    db.close()
+
+    asyncio.run(_worker(session_factory).run_once())  # another worker takes over and finishes it
+    assert _job(session_factory, job_id).attempts == 2
+    assert first.write(claimed, progress_done=99) is False  # fenced out by the attempt number
+    assert _job(session_factory, job_id).status == "succeeded"
+
+
+def test_background_loop_picks_up_notified_jobs(file_session_factory):
+    session_factory = file_session_factory
+    job_id = _enqueue(session_factory, {"n": 3})
+    worker = _worker(session_factory, poll_interval=30)
+
+    async def scenario():
+        await worker.start()
+        try:
+            worker.notify()
+            for _ in range(500):
+                if _job(session_factory, job_id).status == "succeeded":
+                    return
+                await asyncio.sleep(0.01)
+        finally:
+            await worker.stop()
+
+    asyncio.run(scenario())
+    assert _job(session_factory, job_id).status == "succeeded"
+
+
+def test_upload_returns_job_id_and_job_ingests_csv(client, session_factory):
+    r = client.post(
+        "/admin/pinterest-stats/upload",
+        data={"account_name": " acme "},
+        files={"file": ("stats.csv", CSV, "text/csv")},
+    )
+    assert r.status_code == 202
+    body = r.json()
+    assert body["status"] == "queued" and body["account_name"] == "acme"
+    assert body["status_url"] == f"/admin/jobs/{body['job_id']}"
+
+    queued = client.get(body["status_url"]).json()
+    assert queued["kind"] == UPLOAD_JOB_KIND and queued["status"] == "queued"
+
+    asyncio.run(_worker(session_factory).run_once())
+    done = client.get(body["status_url"]).json()
+    assert done["status"] == "succeeded"
+    assert done["result"]["inserted"] == 2 and done["result"]["updated"] == 0
+
+    db = session_factory()
+    rows = db.scalars(select(models.PinterestAccountStatsMonthly).order_by("calendar_month")).all()
+    assert [(r.account_name, r.impressions) for r in rows] == [("acme", 1200), ("acme", 1500)]
+    db.close()
+
+
+def test_unparseable_upload_fails_its_job(client, session_factory):
+    r = client.post(
+        "/admin/pinterest-stats/upload",
+        data={"account_name": "acme"},
+        files={"file": ("stats.csv", b"just,some\nthing,else\n", "text/csv")},
+    )
+    assert r.status_code == 202
+    asyncio.run(_worker(session_factory).run_once())
+    job = client.get(r.json()["status_url"]).json()
+    assert job["status"] == "failed"
+    assert "Could not find a header row" in job["error"]
+    assert client.get("/admin/jobs/999").status_code == 404
+
+
+def test_event_stream_reports_progress_then_done(file_client, file_session_factory, monkeypatch):
+    session_factory = file_session_factory
+    monkeypatch.setattr(config, "JOBS_EVENTS_POLL_SECONDS", 0.01)
+    job_id = _enqueue(session_factory, {"n": 4})
+
+    def run_later():
+        asyncio.run(_worker(session_factory).run_once())
+
+    timer = threading.Timer(0.1, run_later)
+    timer.start()
+    try:
+        with file_client.stream("GET", f"/admin/jobs/{job_id}/events") as r:
+            assert r.headers["content-type"].startswith("text/event-stream")
+            text = "".join(r.iter_text())
+    finally:
+        timer.join()
+
+    events = [
+        (block.split("\n")[0].removeprefix("event: "), json.loads(block.split("\n")[1].removeprefix("data: ")))
+        for block in text.strip().split("\n\n")
+        if block.startswith("event:")
+    ]
+    assert events[0][0] == "progress" and events[0][1]["status"] == "queued"
+    assert events[-1][0] == "done" and events[-1][1]["status"] == "succeeded"
+    assert [name for name, _ in events].count("done") == 1
@@ -0,0 +1,276 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+from lead_delivery import LeadDeliveryWorker, MailerLiteProvider, backoff_seconds, enqueue_lead
+from main import app
+from routers import pinterest_fit as pinterest_fit_router
+from security import get_db
+from tests.lead_provider_stub import StubProvider
+from tools.pinterest_fit.mailerlite import FIELD_NAMES, build_subscriber_payload
+
+TABLES = [
+    models.ToolLead.__table__,
+    models.LeadDelivery.__table__,
+    models.LeadDeliveryDeadLetter.__table__,
+]
+
+LEAD = {
+    "email": "Owner@Example.com",
+    "result": "Strong Pinterest Fit",
+    "topReason1": "Your category is a strong match",
+    "source": "",
+    "answers": {
+        "q1": "home_decor",
+        "q2": "very_proven",
+        "q3": "strong",
+        "q4": "ready",
+        "q5": "discovery",
+        "q6": "ready_now",
+        "q7": "very_open",
+    },
+}
+
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(engine, tables=TABLES)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture()
+def stub():
+    with StubProvider() as s:
+        yield s
+
+
+def _worker(stub, session_factory, **kwargs) -> LeadDeliveryWorker:
+    provider = MailerLiteProvider(
+        api_key="test", base_url=stub.base_url, timeout=5.0, max_connections=4, field_names=FIELD_NAMES
+    )
+    kwargs.setdefault("backoff_base", 0)
+    return LeadDeliveryWorker(provider, session_factory=session_factory, **kwargs)
+
+
+def _enqueue(session_factory, n: int) -> None:
+    db = session_factory()
+    try:
+        for i in range(n):
+            enqueue_lead(
+                db,
+                tool="pinterest_fit",
+                email=f"lead{i}@example.com",
+                answers={},
+                provider="mailerlite",
+                payload={"email": f"lead{i}@example.com", "groups": ["g"], "fields": {}},
+            )
+    finally:
+        db.close()
+
+
+def _enqueue_payload(session_factory, payload: dict) -> None:
+    db = session_factory()
+    try:
+        enqueue_lead(db, tool="pinterest_fit", email=payload["email"], answers={}, provider="mailerlite", payload=payload)
+    finally:
+        db.close()
+
+
+def _deliveries(session_factory) -> list[models.LeadDelivery]:
+    db = session_factory()
+    try:
+        return list(db.scalars(select(models.LeadDelivery).order_by(models.LeadDelivery.id)))
+    finally:
+        db.close()
+
+
+def test_capture_endpoint_persists_and_queues_without_calling_provider(session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        r = client.post("/tools/pinterest-fit-assessment/lead", json=LEAD, headers={"Idempotency-Key": "abc"})
+        assert r.status_code == 202
+        lead_id = r.json()["lead_id"]
+
+        again = client.post("/tools/pinterest-fit-assessment/lead", json=LEAD, headers={"Idempotency-Key": "abc"})
+        assert again.json()["lead_id"] == lead_id
+
+        bad = client.post("/tools/pinterest-fit-assessment/lead", json={**LEAD, "result": "Great"})
+        assert bad.status_code == 422
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    (delivery,) = _deliveries(session_factory)
+    assert delivery.status == "pending"
+    assert delivery.idempotency_key == "abc"
+    assert delivery.payload["email"] == "owner@example.com"
+    assert delivery.payload["fields"] == {
+        "pinterest_fit_result": "Strong Pinterest Fit",
+        "top_reason_1": "Your category is a strong match",
+        "lead_source": "Pinterest Fit Assessment",
+    }
+
+    db = session_factory()
+    lead = db.get(models.ToolLead, lead_id)
+    assert lead.results["final_outcome"] == "strong_fit"
+    db.close()
+
+
+def test_worker_delivers_batch_over_pooled_connections(stub, session_factory):
+    _enqueue(session_factory, 20)
+    worker = _worker(stub, session_factory, batch_size=20)
+
+    async def scenario():
+        await worker.start()  # background loop picks the rows up on its own
+        try:
+            deadline = time.monotonic() + 10
+            while len(stub.subscribers) < 20 and time.monotonic() < deadline:
+                await asyncio.sleep(0.02)
+        finally:
+            await worker.stop()
+
+    asyncio.run(scenario())
+    assert all(d.status == "delivered" for d in _deliveries(session_factory))
+    assert len(stub.subscribers) == 20
+    assert len(stub.client_ports) <= 4  # connections reused, never more than the pool size
+    assert {r["idempotency_key"] for r in stub.requests} == {d.idempotency_key for d in _deliveries(session_factory)}
+
+
+def test_worker_retries_with_backoff_then_succeeds(stub, session_factory):
+    _enqueue(session_factory, 1)
+    stub.fail_next = 2
+    worker = _worker(stub, session_factory)
+
+    for _ in range(3):
+        asyncio.run(worker.run_once())
+
+    (d,) = _deliveries(session_factory)
+    assert d.status == "delivered"
+    assert d.attempts == 3
+    # Same key every attempt, so the provider can dedupe.
+    assert len({r["idempotency_key"] for r in stub.requests}) == 1
+
+
+def test_worker_dead_letters_after_max_attempts_and_on_rejection(stub, session_factory):
+    _enqueue(session_factory, 1)
+    stub.fail_next = 10
+    worker = _worker(stub, session_factory, max_attempts=2)
+    asyncio.run(worker.run_once())
+    asyncio.run(worker.run_once())
+
+    _enqueue(session_factory, 1)
+    stub.fail_next, stub.fail_status = 1, 422  # non-retryable
+    asyncio.run(worker.run_once())
+
+    assert [d.status for d in _deliveries(session_factory)] == ["dead", "dead"]
+    db = session_factory()
+    letters = list(db.scalars(select(models.LeadDeliveryDeadLetter).order_by(models.LeadDeliveryDeadLetter.id)))
+    db.close()
+    assert [(dl.attempts, dl.last_error[:8]) for dl in letters] == [(2, "HTTP 503"), (1, "HTTP 422")]
+
+
+def test_worker_resolves_field_keys_by_name_and_checks_they_were_saved(stub, session_factory):
+    stub.fields = {"pinterest fit result": "fit_result"}  # existing field under a non-fallback key
+    lead = {"result": "Strong Pinterest Fit", "top_reason_1": "Great category", "source": "Pinterest Fit Assessment"}
+    _enqueue_payload(session_factory, build_subscriber_payload("a@example.com", "g", lead))
+    worker = _worker(stub, session_factory)
+    asyncio.run(worker.run_once())
+
+    assert [d.status for d in _deliveries(session_factory)] == ["delivered"]
+    assert stub.subscribers["a@example.com"]["fields"] == {
+        "fit_result": "Strong Pinterest Fit",
+        "top_reason_1": "Great category",
+        "lead_source": "Pinterest Fit Assessment",
+    }
+    assert stub.subscribers["a@example.com"]["groups"] == ["g"]
+    assert set(stub.fields) == {"pinterest fit result", "Top Reason 1", "Lead Source"}
+
+    # Keys are cached per worker: the next lead does not look them up again.
+    lookups = stub.field_requests
+    _enqueue_payload(session_factory, build_subscriber_payload("b@example.com", "g", lead))
+    asyncio.run(worker.run_once())
+    assert stub.field_requests == lookups
+    assert stub.subscribers["b@example.com"]["fields"]["fit_result"] == "Strong Pinterest Fit"
+
+
+def test_worker_retries_when_provider_does_not_save_the_fields(stub, session_factory):
+    _enqueue_payload(session_factory, build_subscriber_payload("a@example.com", "g", {"result": "Strong Pinterest Fit"}))
+    stub.drop_fields = True
+    worker = _worker(stub, session_factory)
+    asyncio.run(worker.run_once())
+
+    (d,) = _deliveries(session_factory)
+    assert d.status == "pending"
+    assert d.last_error == "MailerLite did not save fields: pinterest_fit_result"
+
+    stub.drop_fields = False
+    asyncio.run(worker.run_once())
+    assert [d.status for d in _deliveries(session_factory)] == ["delivered"]
+
+
+def test_capture_latency_independent_of_slow_provider(stub, session_factory):
+    stub.delay = 2.0
+    db = session_factory()
+    started = time.perf_counter()
+    enqueue_lead(db, tool="pinterest_fit", email="a@b.co", answers={}, provider="mailerlite", payload={"email": "a@b.co"})
+    db.close()
+    assert time.perf_counter() - started < 0.5
+    assert stub.requests == []
+
+
+def test_backoff_grows_and_is_capped():
+    assert backoff_seconds(1, base=2, cap=900, rng=lambda: 0) == 1
+    assert backoff_seconds(4, base=2, cap=900, rng=lambda: 1) == 16
+    assert backoff_seconds(30, base=2, cap=900, rng=lambda: 1) == 900
+
+
+def test_concurrent_retry_with_same_key_returns_the_winning_lead(session_factory, monkeypatch):
+    db = session_factory()
+    winner = enqueue_lead(
+        db,
+        tool="pinterest_fit",
+        email="owner@example.com",
+        answers={},
+        provider="mailerlite",
+        payload={},
+        idempotency_key="race",
+    ).lead_id
+    db.close()
+
+    # The losing request checked for the key before the winner committed.
+    lookups = iter([None])
+    real_lookup = pinterest_fit_router._delivery_by_key
+    monkeypatch.setattr(
+        pinterest_fit_router, "_delivery_by_key", lambda db, key: next(lookups, None) or real_lookup(db, key)
+    )
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        r = TestClient(app).post("/tools/pinterest-fit-assessment/lead", json=LEAD, headers={"Idempotency-Key": "race"})
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert r.status_code == 202
+    assert r.json()["lead_id"] == winner
+    assert len(_deliveries(session_factory)) == 1
@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+from llm_gateway import LLMGateway, LLMProviderError, OpenAIProvider, PromptTemplate, ResponseStore, cache_key
+from metrics import LLM_LOOKUPS_TOTAL, LLM_TOKENS_TOTAL, reset_metrics
+from tests.llm_provider_stub import StubLLMProvider
+
+TITLE_QA = PromptTemplate(
+    name="fruitful-control-title",
+    system="You review Pinterest titles for {client}.",
+    user="Title: {title}\nAnswer with a verdict.",
+)
+
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(engine, tables=[models.LLMResponse.__table__])
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture()
+def stub():
+    with StubLLMProvider() as s:
+        yield s
+
+
+def _gateway(stub, session_factory, **kwargs) -> LLMGateway:
+    provider = OpenAIProvider(api_key="test", base_url=stub.base_url)
+    return LLMGateway(provider, store=ResponseStore(session_factory), default_model="stub-1", **kwargs)
+
+
+def _run(gateway, coro):
+    async def go():
+        try:
+            return await coro
+        finally:
+            await gateway.aclose()
+
+    return asyncio.run(go())
+
+
+def _rows(session_factory) -> int:
+    with session_factory() as db:
+        return db.scalar(select(func.count()).select_from(models.LLMResponse))
+
+
+def test_template_version_tracks_its_text():
+    edited = PromptTemplate(name=TITLE_QA.name, system=TITLE_QA.system, user=TITLE_QA.user + " Be brief.")
+    assert TITLE_QA.version != edited.version
+    inputs = {"client": "demo", "title": "Cozy fall decor"}
+    params = {"temperature": 0}
+    assert cache_key("m", TITLE_QA, inputs, params) == cache_key("m", TITLE_QA, dict(reversed(inputs.items())), params)
+    assert cache_key("m", TITLE_QA, inputs, params) != cache_key("m", edited, inputs, params)
+    assert cache_key("m", TITLE_QA, inputs, params) != cache_key("m", TITLE_QA, inputs, {"temperature": 0.7})
+
+
+def test_repeat_prompts_cost_no_tokens(stub, session_factory):
+    reset_metrics()
+    inputs = {"client": "demo", "title": "Cozy fall decor"}
+
+    first = _run(g := _gateway(stub, session_factory), g.complete(TITLE_QA, inputs))
+    assert first.source == "provider" and first.text.startswith("verdict:")
+    assert stub.requests[0]["body"]["temperature"] == 0
+    assert stub.requests[0]["authorization"] == "Bearer test"
+
+    async def twice():
+        return await g.complete(TITLE_QA, inputs), await g.complete(TITLE_QA, inputs)
+
+    g = _gateway(stub, session_factory)  # a fresh worker: memory is empty, the table is not
+    from_store, from_memory = _run(g, twice())
+    assert (from_store.source, from_memory.source) == ("store", "memory")
+    assert from_store.text == from_memory.text == first.text
+    assert len(stub.requests) == 1
+
+    started = time.perf_counter()
+    for _ in range(100):
+        asyncio.run(g.complete(TITLE_QA, inputs))
+    assert (time.perf_counter() - started) / 100 < 0.005
+
+    spent = sum(LLM_TOKENS_TOTAL.series.values())
+    assert spent == first.prompt_tokens + first.completion_tokens
+    assert LLM_LOOKUPS_TOTAL.series[(("model", "stub-1"), ("result", "miss"))] == 1
+    assert LLM_LOOKUPS_TOTAL.series[(("model", "stub-1"), ("result", "memory"))] == 101
+
+
+def test_identical_in_flight_prompts_share_one_call(stub, session_factory):
+    stub.delay = 0.2
+    g = _gateway(stub, session_factory)
+
+    async def burst():
+        same = [g.complete(TITLE_QA, {"client": "demo", "title": "Same"}) for _ in range(10)]
+        return await asyncio.gather(*same)
+
+    results = _run(g, burst())
+    assert len(stub.requests) == 1
+    assert sorted(r.source for r in results) == ["coalesced"] * 9 + ["provider"]
+    assert len({r.text for r in results}) == 1
+
+
+def test_concurrency_limit_caps_provider_calls(stub, session_factory):
+    stub.delay = 0.1
+    g = _gateway(stub, session_factory, max_concurrency=2)
+
+    async def burst():
+        return await asyncio.gather(*(g.complete(TITLE_QA, {"client": "demo", "title": f"T{i}"}) for i in range(6)))
+
+    _run(g, burst())
+    assert len(stub.requests) == 6
+    assert stub.peak_in_flight == 2
+
+
+def test_failures_are_not_cached(stub, session_factory):
+    stub.fail_next = 1
+    g = _gateway(stub, session_factory)
+    with pytest.raises(LLMProviderError) as exc:
+        _run(g, g.complete(TITLE_QA, {"client": "demo", "title": "Flaky"}))
+    assert exc.value.status == 503
+    assert _rows(session_factory) == 0
+
+    result = _run(g, g.complete(TITLE_QA, {"client": "demo", "title": "Flaky"}))
+    assert result.source == "provider" and _rows(session_factory) == 1
+
+
+def test_store_evicts_least_recently_used(stub, session_factory):
+    # Big budget while filling, so background pruning doesn't race the test's own calls.
+    g = _gateway(stub, session_factory, max_entries=1000, memory_entries=0)
+
+    async def fill():
+        for i in range(5):
+            await g.complete(TITLE_QA, {"client": "demo", "title": f"T{i}"})
+            if i == 2:
+                await g.complete(TITLE_QA, {"client": "demo", "title": "T0"})  # T0 is recent again
+
+    _run(g, fill())
+    g.max_entries = 3
+    assert g.maintain([], prune=True) == 2
+    assert _rows(session_factory) == 3
+    with session_factory() as db:
+        kept = {r.key for r in db.scalars(select(models.LLMResponse))}
+    params = {"temperature": 0}
+    keys = {f"T{i}": cache_key("stub-1", TITLE_QA, {"client": "demo", "title": f"T{i}"}, params) for i in range(5)}
+    assert kept == {keys["T0"], keys["T3"], keys["T4"]}
+
+    assert ResponseStore(session_factory).prune(max_entries=10, max_bytes=1) == 3
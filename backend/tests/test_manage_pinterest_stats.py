@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+from scripts.db import generate_pinterest_stats as gen
+from scripts.db import manage_pinterest_stats as mps
+
+Stats = models.PinterestAccountStatsMonthly
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Stats.__table__.create(engine)
+    monkeypatch.setattr(mps, "get_engine", lambda: engine)
+    monkeypatch.setattr(mps, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(mps, "require_secret", lambda: None)
+    monkeypatch.setattr(gen.db, "get_engine", lambda: engine)
+    gen.load_chunk("acct-", 1, 0, 3, 24, date(2022, 1, 1))  # 3 accounts x 24 months
+    return engine
+
+
+def _count(engine, *where) -> int:
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count()).select_from(Stats).where(*where))
+
+
+def test_scoped_delete_runs_in_batches_and_leaves_other_rows(engine, capsys):
+    deleted = mps.delete_monthly_stats(
+        account="acct-0000001", start=date(2022, 3, 1), end=date(2022, 12, 1), batch_size=4, pause=0, yes=True,
+    )
+    assert deleted == 10
+    assert "row(s) deleted" in capsys.readouterr().out  # progress printed between batches
+    assert _count(engine, Stats.account_name == "acct-0000001") == 14
+    assert _count(engine) == 62
+
+
+def test_delete_requires_a_scope(engine):
+    with pytest.raises(SystemExit):
+        mps.delete_monthly_stats(account=None, start=None, end=None, batch_size=10, pause=0, yes=True)
+
+
+def test_count_is_exact_off_postgres(engine, capsys):
+    mps.count_monthly_stats()
+    mps.count_monthly_stats(account="acct-0000002")
+    out = capsys.readouterr().out
+    assert "Rows in monthly stats: 72" in out
+    assert "for 'acct-0000002': 24" in out
+
+
+def test_export_then_import_round_trips(engine, tmp_path):
+    path = str(tmp_path / "stats.csv")
+    assert mps.export_monthly_stats(out=path, account="acct-0000000") == 24
+
+    mps.import_monthly_stats(path=path, upsert=False, truncate=True)
+    assert _count(engine) == 24
+
+    # Re-importing the same rows conflicts unless upserting.
+    with engine.begin() as conn:
+        conn.execute(Stats.__table__.update().values(impressions=0))
+    assert mps.import_monthly_stats(path=path, upsert=True, truncate=False) == 24
+    assert _count(engine) == 24
+    assert _count(engine, Stats.impressions == 0) == 0
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+from scripts.db import manage_users as mu
+from security import verify_password
+
+
+@pytest.fixture
+def Session(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.User.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+    monkeypatch.setattr(mu, "SessionLocal", Session)
+    mu.create_user("taken@example.com", "pw", groups=["flagship"])
+    return Session
+
+
+def _rows(*records, allow_admins=False):
+    return mu.parse_bulk_rows(list(enumerate(records, start=2)), allow_admins=allow_admins)
+
+
+def test_bulk_create_reports_every_row(Session):
+    rows = _rows(
+        {"email": "a@example.com", "password": "secret-a", "groups": "Flagship, beta"},
+        {"email": "taken@example.com", "password": "x"},
+        {"email": "A@example.com", "password": "again"},
+        {"email": "not-an-email", "password": "x"},
+        {"email": "b@example.com", "password": ""},
+        {"email": "boss@example.com", "password": "x", "is_admin": "true"},
+        {"email": "c@example.com", "password": "secret-c", "groups": ["x"]},
+    )
+    mu.bulk_create_users(rows, workers=1)
+
+    assert [r.status for r in rows] == ["created", "exists", "duplicate", "invalid", "invalid", "invalid", "created"]
+    assert "password" not in rows[0].outcome()
+
+    with Session() as db:
+        a = db.scalars(select(models.User).where(models.User.email == "a@example.com")).one()
+        assert a.id == rows[0].id and a.groups == ["flagship", "beta"] and not a.is_admin
+        assert verify_password("secret-a", a.hashed_password)
+        assert len(db.scalars(select(models.User)).all()) == 3
+
+
+def test_bulk_create_hashes_in_a_process_pool(Session):
+    rows = _rows(*({"email": f"u{i}@example.com", "password": f"pw{i}"} for i in range(3)))
+    mu.bulk_create_users(rows, workers=2)
+    with Session() as db:
+        users = db.scalars(select(models.User).where(models.User.email.startswith("u"))).all()
+    assert sorted(verify_password(f"pw{u.email[1]}", u.hashed_password) for u in users) == [True] * 3
+
+
+def test_dry_run_and_admin_rows(Session):
+    rows = _rows({"email": "boss@example.com", "password": "x", "is_admin": "1"}, allow_admins=True)
+    mu.bulk_create_users(rows, dry_run=True)
+    assert rows[0].status == "pending" and rows[0].is_admin
+
+    mu.bulk_create_users(rows, workers=1)
+    assert rows[0].status == "created"
+
+
+def test_read_rows_and_json_list(Session, tmp_path, capsys):
+    path = tmp_path / "users.jsonl"
+    path.write_text('{"email": "j@example.com", "password": "p"}\n\n')
+    assert mu.read_user_rows(str(path)) == [(1, {"email": "j@example.com", "password": "p"})]
+
+    mu.list_users(as_json=True, batch_size=1)
+    [line] = capsys.readouterr().out.splitlines()
+    user = json.loads(line)
+    assert user["email"] == "taken@example.com" and user["groups"] == ["flagship"]
+    assert "hashed_password" not in user
@@ -0,0 +1,70 @@
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import metrics
+from main import app
+
+
+def _instrumented_app() -> FastAPI:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    make_session = sessionmaker(bind=engine)
+
+    def get_db():
+        db = make_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    demo = FastAPI()
+
+    @demo.get("/things/{thing_id}")
+    def read_thing(thing_id: int, db: Session = Depends(get_db)):
+        for _ in range(3):
+            db.execute(text("SELECT 1"))
+        return {"id": thing_id}
+
+    metrics.install_query_hooks()
+    demo.add_middleware(metrics.MetricsMiddleware)
+    return demo
+
+
+def test_route_latency_status_and_db_queries_are_recorded():
+    metrics.reset_metrics()
+    client = TestClient(_instrumented_app())
+    client.get("/things/1")
+    client.get("/things/2")
+    client.get("/nope")
+
+    labels = (("method", "GET"), ("route", "/things/{thing_id}"))
+    assert metrics.REQUESTS_TOTAL.series[(*labels, ("status", "200"))] == 2
+    assert metrics.REQUESTS_TOTAL.series[(("method", "GET"), ("route", "<unmatched>"), ("status", "404"))] == 1
+    assert sum(metrics.REQUEST_DURATION.series[labels][:-1]) == 2
+    assert metrics.DB_QUERIES_PER_REQUEST.series[labels][-1] == 6  # sum: 3 queries x 2 requests
+    assert metrics.REQUESTS_IN_FLIGHT.value == 0
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = metrics.Histogram("demo_seconds", "Demo.", (0.1, 1.0))
+    labels = (("route", "/x"),)
+    for v in (0.05, 0.1, 0.5, 3.0):
+        h.observe(labels, v)
+
+    out = "\n".join(h.render())
+    assert 'demo_seconds_bucket{route="/x",le="0.1"} 2' in out
+    assert 'demo_seconds_bucket{route="/x",le="1"} 3' in out
+    assert 'demo_seconds_bucket{route="/x",le="+Inf"} 4' in out
+    assert 'demo_seconds_count{route="/x"} 4' in out
+
+
+def test_metrics_endpoint_exposes_prometheus_text():
+    client = TestClient(app)
+    client.get("/health")
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert "# TYPE http_request_duration_seconds histogram" in r.text
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in r.text
@@ -0,0 +1,94 @@
+import io
+from contextlib import contextmanager
+
+import pytest
+import sqlalchemy as sa
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy.pool import StaticPool
+
+import migration_helpers as mh
+
+TABLE = "pinterest_account_stats_monthly"
+
+
+@pytest.fixture
+def engine():
+    engine = sa.create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"CREATE TABLE {TABLE} (id INTEGER PRIMARY KEY, account_name VARCHAR(255))")
+        # Sparse ids: empty ranges must be skipped over, not end the backfill.
+        conn.execute(sa.text(f"INSERT INTO {TABLE} (id) VALUES (:id)"), [{"id": i} for i in (*range(1, 26), 500)])
+    return engine
+
+
+@contextmanager
+def migration(engine, **opts):
+    with engine.connect() as conn:
+        ctx = MigrationContext.configure(conn, opts={"transaction_per_migration": True, **opts})
+        with Operations.context(ctx), ctx.begin_transaction(_per_migration=True):
+            yield ctx
+
+
+def _filled(engine) -> int:
+    with engine.connect() as conn:
+        return conn.scalar(sa.text(f"SELECT count(*) FROM {TABLE} WHERE account_name = 'legacy'"))
+
+
+def test_backfill_runs_in_ranges_and_clears_its_checkpoint(engine, caplog):
+    caplog.set_level("INFO", logger="alembic.backfill")
+    with migration(engine):
+        updated = mh.backfill_in_batches(
+            TABLE, {"account_name": "legacy"}, where="account_name IS NULL", batch_size=10, pause=0,
+        )
+    assert updated == 26 and _filled(engine) == 26
+    assert sum("rows updated" in r.message for r in caplog.records) == 50  # ids 1..500 in ranges of 10
+
+    with engine.connect() as conn:
+        assert conn.scalar(sa.select(sa.func.count()).select_from(mh._progress)) == 0
+
+
+def test_backfill_resumes_from_checkpoint(engine):
+    with engine.begin() as conn:
+        mh._progress.create(conn)
+        conn.execute(mh._progress.insert().values(name="fill", last_pk=20, rows_updated=20, updated_at=mh._now()))
+
+    with migration(engine):
+        updated = mh.backfill_in_batches(TABLE, {"account_name": "legacy"}, name="fill", batch_size=100, pause=0)
+    assert updated == 26  # 20 from the earlier run + ids 21..25 and 500
+    assert _filled(engine) == 6
+
+
+def test_offline_mode_emits_a_single_update():
+    buf = io.StringIO()
+    ctx = MigrationContext.configure(
+        dialect_name="postgresql", opts={"as_sql": True, "output_buffer": buf, "literal_binds": True}
+    )
+    with Operations.context(ctx):
+        mh.backfill_in_batches(TABLE, {"account_name": "legacy"}, where="account_name IS NULL")
+        mh.create_index_concurrently("ix_stats_account", TABLE, ["account_name"])
+    sql = buf.getvalue()
+    assert "UPDATE pinterest_account_stats_monthly SET account_name='legacy' WHERE account_name IS NULL" in sql
+    assert "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_stats_account" in sql
+    assert "COMMIT" in sql  # CONCURRENTLY can't run inside the migration transaction
+
+
+def test_index_and_not_null_fall_back_off_postgres(engine):
+    with migration(engine):
+        mh.backfill_in_batches(TABLE, {"account_name": "legacy"}, pause=0)
+        mh.set_not_null(TABLE, "account_name")
+        mh.create_index_concurrently("ix_stats_account", TABLE, ["account_name"])
+        mh.create_index_concurrently("ix_stats_account", TABLE, ["account_name"])  # idempotent
+    insp = sa.inspect(engine)
+    assert [ix["name"] for ix in insp.get_indexes(TABLE)] == ["ix_stats_account"]
+    assert {c["name"]: c["nullable"] for c in insp.get_columns(TABLE)}["account_name"] is False
+
+
+def test_configure_coerces_x_arguments():
+    before = mh.settings()
+    try:
+        assert mh.configure(batch_size="500", batch_pause="0")["batch_size"] == 500
+        with pytest.raises(ValueError):
+            mh.configure(bogus="1")
+    finally:
+        mh.configure(**before)
@@ -0,0 +1,39 @@
+from dataclasses import asdict
+
+import pytest
+
+from tests.pinterest_fit.engine import evaluate
+from tests.pinterest_fit.fixtures import iter_all_answers
+from tools.pinterest_fit import normalize_answers, score_assessment, score_normalized
+
+
+def test_backend_engine_matches_simulator_for_all_answer_sets():
+    for answers in iter_all_answers():
+        expected = evaluate(answers)
+        result = score_normalized(asdict(answers))
+
+        assert result["score"] == expected.total_score
+        assert result["base_outcome"] == expected.base_outcome
+        assert result["final_outcome"] == expected.final_outcome
+        assert tuple(result["reason_keys"]) == expected.reason_keys
+        assert result["role_key"] == expected.role_key
+
+
+def test_score_assessment_normalizes_raw_answers():
+    raw = {
+        "q1": "home_decor",
+        "q2": "very_proven",
+        "q3": "strong",
+        "q4": "ready",
+        "q5": "discovery",
+        "q6": "ready_now",
+        "q7": "very_open",
+    }
+    n = normalize_answers(raw)
+    assert n["q5_goal_type"] == "discovery"
+    assert score_assessment(raw) == score_normalized(n)
+
+
+def test_unknown_answer_value_raises():
+    with pytest.raises(ValueError):
+        normalize_answers({"q1": "nope"})
@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from tools.pinterest_potential import compute_results, compute_results_batch
+from tools.pinterest_potential.compute import segment_niche_context
+
+# Generated from the TS engine by frontend/__tests__/pinterestPotential.parity.test.ts
+FIXTURE = Path(__file__).parent / "fixtures" / "pinterest_potential_parity.json"
+CASES = json.loads(FIXTURE.read_text(encoding="utf-8"))["cases"]
+
+
+@pytest.mark.parametrize("case", CASES, ids=lambda c: ":".join(str(v) for v in c["answers"].values()) or "empty")
+def test_python_engine_matches_ts_outputs(case):
+    assert compute_results(case["answers"]) == case["expected"]
+
+
+def test_batch_matches_single_and_reuses_segment_niche_context():
+    answers = [c["answers"] for c in CASES]
+    segment_niche_context.cache_clear()
+
+    assert compute_results_batch(answers) == [c["expected"] for c in CASES]
+
+    # 30 benchmark rows -> at most 30 misses, whatever the batch size.
+    assert segment_niche_context.cache_info().misses <= 30
+
+
+def test_compute_endpoint_returns_results_or_400():
+    client = TestClient(app)
+    case = CASES[0]
+
+    resp = client.post("/tools/pinterest-potential/compute", json=case["answers"])
+    assert resp.status_code == 200, resp.text
+    assert resp.json() == case["expected"]["results"]
+
+    resp = client.post("/tools/pinterest-potential/compute", json={"Q1": "content_creator"})
+    assert resp.status_code == 400
+    assert "Q2" in resp.json()["detail"]
@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+import pinterest_stats_ingest
+from jobs import JobWorker
+from main import app
+from pinterest_stats_ingest import ContentDigest
+from security import get_current_admin_user, get_db
+
+TABLES = [
+    models.Job.__table__,
+    models.PinterestAccountStatsMonthly.__table__,
+    models.PinterestStatsUpload.__table__,
+]
+
+SEPT = "Date Range,Impressions,Engagements,Outbound Clicks,Saves\n09/01-09/30 2023,1200,80,12,9\n"
+SEPT_V2 = "Date Range,Impressions,Engagements,Outbound Clicks,Saves\n09/01-09/30 2023,1300,80,12,9\n"
+
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(engine, tables=TABLES)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture()
+def client(session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin_user] = lambda: SimpleNamespace(email="admin@example.com")
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_current_admin_user, None)
+
+
+def _upload(client, text: str, account: str = "acme", headers: dict | None = None):
+    return client.post(
+        "/admin/pinterest-stats/upload",
+        data={"account_name": account},
+        files={"file": ("stats.csv", text.encode(), "text/csv")},
+        headers=headers or {},
+    )
+
+
+def _run_jobs(session_factory) -> int:
+    return asyncio.run(JobWorker(session_factory=session_factory, concurrency=1).run_once())
+
+
+def _count(session_factory, model) -> int:
+    db = session_factory()
+    try:
+        return db.scalar(select(func.count()).select_from(model))
+    finally:
+        db.close()
+
+
+def test_digest_ignores_bom_and_line_endings_across_chunk_boundaries():
+    plain = b"a,b\nc,d\n"
+    expected = hashlib.sha256(plain).hexdigest()
+    for variant in (b"\xef\xbb\xbf" + plain, plain.replace(b"\n", b"\r\n"), plain.replace(b"\n", b"\r")):
+        for size in (1, 2, 3, 5, 64):
+            digest = ContentDigest()
+            for i in range(0, len(variant), size):
+                digest.update(variant[i:i + size])
+            assert digest.hexdigest() == expected, (variant, size)
+            assert digest.size == len(variant)
+    assert ContentDigest().hexdigest() == hashlib.sha256(b"").hexdigest()
+
+
+def test_reupload_of_same_content_is_a_no_op(client, session_factory):
+    first = _upload(client, SEPT)
+    assert first.status_code == 202 and first.json()["duplicate"] is False
+    assert _run_jobs(session_factory) == 1
+
+    again = _upload(client, SEPT.replace("\n", "\r\n"))  # same content, Windows line endings
+    assert again.status_code == 200
+    body = again.json()
+    assert body["duplicate"] is True and body["status"] == "succeeded"
+    assert body["job_id"] == first.json()["job_id"]
+    assert body["result"]["inserted"] == 1 and body["result"]["rows"] == 1
+    assert _run_jobs(session_factory) == 0
+    assert _count(session_factory, models.Job) == 1
+
+    db = session_factory()
+    (upload,) = db.scalars(select(models.PinterestStatsUpload)).all()
+    assert (upload.status, upload.row_count, upload.uploaded_by) == ("succeeded", 1, "admin@example.com")
+    db.close()
+
+
+def test_same_file_is_reingested_after_a_different_one(client, session_factory):
+    _upload(client, SEPT)
+    _run_jobs(session_factory)
+    _upload(client, SEPT_V2)
+    _run_jobs(session_factory)
+
+    back = _upload(client, SEPT)  # must restore the earlier numbers, so it can't be skipped
+    assert back.status_code == 202 and back.json()["duplicate"] is False
+    _run_jobs(session_factory)
+
+    db = session_factory()
+    assert db.scalar(select(models.PinterestAccountStatsMonthly.impressions)) == 1200
+    db.close()
+
+    # The same content for another account is that account's own first upload.
+    assert _upload(client, SEPT, account="other").status_code == 202
+
+
+def test_pending_duplicate_follows_the_queued_job(client, session_factory):
+    first = _upload(client, SEPT).json()
+    second = _upload(client, SEPT).json()
+    assert second["duplicate"] is True and second["status"] == "queued"
+    assert second["job_id"] == first["job_id"]
+    assert _count(session_factory, models.Job) == 1
+
+
+def test_failed_upload_is_not_replayed(client, session_factory):
+    bad = "not,a\nstats,export\n"
+    assert _upload(client, bad).status_code == 202
+    _run_jobs(session_factory)
+    retry = _upload(client, bad)
+    assert retry.status_code == 202 and retry.json()["duplicate"] is False
+
+    db = session_factory()
+    statuses = db.scalars(select(models.PinterestStatsUpload.status).order_by(models.PinterestStatsUpload.id)).all()
+    assert statuses == ["failed", "pending"]
+    db.close()
+
+
+def test_idempotency_key_replays_and_rejects_reuse(client, session_factory):
+    first = _upload(client, SEPT, headers={"Idempotency-Key": "k1"})
+    assert first.status_code == 202
+    _run_jobs(session_factory)
+    _upload(client, SEPT_V2)
+    _run_jobs(session_factory)
+
+    # A retried request still gets its original upload, even though it's no longer the latest content.
+    retried = _upload(client, SEPT, headers={"Idempotency-Key": "k1"})
+    assert retried.status_code == 200
+    assert retried.json()["upload_id"] == first.json()["upload_id"]
+
+    conflict = _upload(client, SEPT_V2, headers={"Idempotency-Key": "k1"})
+    assert conflict.status_code == 409
+
+
+def _journal(session_factory) -> list[tuple]:
+    db = session_factory()
+    try:
+        U = models.PinterestStatsUpload
+        return db.execute(select(U.status, U.finished_at.is_not(None)).order_by(U.id)).all()
+    finally:
+        db.close()
+
+
+def _set_job(session_factory, job_id: int, **values) -> None:
+    db = session_factory()
+    db.execute(update(models.Job).where(models.Job.id == job_id).values(**values))
+    db.commit()
+    db.close()
+
+
+def test_upload_fails_when_its_job_runs_out_of_retries(client, session_factory, monkeypatch):
+    def flaky(*args, **kwargs):
+        raise ConnectionError("database went away")
+
+    monkeypatch.setattr(pinterest_stats_ingest, "ingest_monthly_stats", flaky)
+    job_id = _upload(client, SEPT).json()["job_id"]
+    _set_job(session_factory, job_id, max_attempts=1)
+    _run_jobs(session_factory)
+
+    assert _journal(session_factory) == [("failed", True)]
+    assert _upload(client, SEPT).json()["duplicate"] is False  # not stuck on the dead job
+
+
+def test_upload_fails_when_its_last_worker_vanishes(client, session_factory):
+    job_id = _upload(client, SEPT).json()["job_id"]
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    _set_job(session_factory, job_id, status="running", attempts=3, max_attempts=3, lease_expires_at=past)
+
+    assert _run_jobs(session_factory) == 0
+    assert _journal(session_factory) == [("failed", True)]
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+import config
+import profiling
+from main import app
+from security import get_current_user
+
+
+def _spin_for_profiler(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def test_sampling_profiler_collapses_busy_thread_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin_for_profiler, args=(stop,), name="busy")
+    worker.start()
+    profiler = profiling.SamplingProfiler(interval=0.002)
+    try:
+        profiler.start()
+        time.sleep(0.3)
+    finally:
+        out = profiler.stop()
+        stop.set()
+        worker.join()
+
+    assert profiler.samples > 10
+    busy = [line for line in out.splitlines() if line.startswith("busy;")]
+    assert busy and all("_spin_for_profiler" in line for line in busy)
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) > 0 and "sampling-profiler" not in out
+
+
+def test_only_one_sampling_run_per_process():
+    first = profiling.SamplingProfiler()
+    first.start()
+    try:
+        with pytest.raises(profiling.ProfilerBusy):
+            profiling.SamplingProfiler().start()
+    finally:
+        first.stop()
+
+
+@pytest.fixture
+def profiled_app(monkeypatch):
+    monkeypatch.setattr(config, "JWT_SECRET_KEY", "test-secret")
+    demo = FastAPI()
+
+    def slow_thing():
+        return sum(range(10_000))
+
+    @demo.get("/thing")
+    def thing():
+        return {"total": slow_thing()}
+
+    demo.add_middleware(profiling.ProfileRequestMiddleware)
+    return TestClient(demo)
+
+
+def test_profile_header_returns_cprofile_report(profiled_app):
+    token = profiling.create_profile_token("admin@example.com")
+    resp = profiled_app.get("/thing", headers={"X-Profile": token})
+    assert resp.status_code == 200
+    assert resp.headers["x-profiled-status"] == "200"
+    assert "GET /thing -> 200" in resp.text
+    assert "slow_thing" in resp.text
+
+    # Without the header the endpoint behaves normally.
+    assert profiled_app.get("/thing").json() == {"total": sum(range(10_000))}
+
+
+def test_profile_header_with_bad_token_is_rejected(profiled_app):
+    resp = profiled_app.get("/thing", headers={"X-Profile": "nope"})
+    assert resp.status_code == 403
+
+
+def test_profile_middleware_wraps_only_the_app():
+    # user_middleware runs outermost first; the profiler must sit inside CORS and the rest.
+    assert app.user_middleware[-1].cls is profiling.ProfileRequestMiddleware
+
+
+def test_profile_token_is_not_an_access_token(monkeypatch):
+    monkeypatch.setattr(config, "JWT_SECRET_KEY", "test-secret")
+    token = profiling.create_profile_token("admin@example.com")
+    assert profiling.verify_profile_token(token) == "admin@example.com"
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(get_current_user(token=token, db=None))
+    assert exc.value.status_code == 401
+
+
+def test_profiling_endpoints_require_auth():
+    client = TestClient(app)
+    assert client.get("/admin/profile/sample", params={"seconds": 0.1}).status_code == 401
+    assert client.post("/admin/profile/request-token").status_code == 401
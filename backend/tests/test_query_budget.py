@@ -0,0 +1,76 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from main import app
+from metrics import MetricsMiddleware, install_query_hooks
+from query_budget import QueryBudgetExceeded, QueryBudgetMiddleware, get_budget, query_budget
+from security import get_db
+
+
+def _demo_client() -> TestClient:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    make_session = sessionmaker(bind=engine)
+
+    def demo_db():
+        db = make_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    demo = FastAPI()
+
+    @demo.get("/n-plus-one")
+    def n_plus_one(db: Session = Depends(demo_db)):
+        return [db.execute(text("SELECT :i"), {"i": i}).scalar() for i in range(10)]
+
+    @demo.get("/declared")
+    @query_budget(2)
+    def declared(db: Session = Depends(demo_db)):
+        return [db.execute(text(f"SELECT {i}")).scalar() for i in range(3)]
+
+    @demo.get("/within")
+    @query_budget(3)
+    def within(db: Session = Depends(demo_db)):
+        return [db.execute(text(f"SELECT {i}")).scalar() for i in range(3)]
+
+    @demo.get("/opt-out")
+    @query_budget(None, max_repeats=None)
+    def opt_out(db: Session = Depends(demo_db)):
+        return [db.execute(text("SELECT :i"), {"i": i}).scalar() for i in range(10)]
+
+    install_query_hooks()
+    demo.add_middleware(QueryBudgetMiddleware, mode="raise")
+    demo.add_middleware(MetricsMiddleware)
+    return TestClient(demo)
+
+
+def test_repeated_statement_shape_is_flagged_as_n_plus_one():
+    with pytest.raises(QueryBudgetExceeded, match="likely N\\+1"):
+        _demo_client().get("/n-plus-one")
+
+
+def test_declared_budget_is_enforced():
+    client = _demo_client()
+    with pytest.raises(QueryBudgetExceeded, match="3 queries \\(budget 2\\)"):
+        client.get("/declared")
+    assert client.get("/within").status_code == 200
+    assert client.get("/opt-out").status_code == 200
+
+
+def _uses_db(dependant) -> bool:
+    return any(d.call is get_db or _uses_db(d) for d in dependant.dependencies)
+
+
+def test_every_db_route_declares_a_budget():
+    missing = [
+        f"{sorted(r.methods)} {r.path}"
+        for r in app.routes
+        if isinstance(r, APIRoute) and _uses_db(r.dependant) and get_budget(r.endpoint) is None
+    ]
+    assert missing == []
@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+from scripts.db import recompute_leads as rl
+
+Lead = models.ToolLead
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Lead.__table__.create(engine)
+    monkeypatch.setattr(rl, "get_engine", lambda: engine)
+    monkeypatch.setattr(rl, "SessionLocal", sessionmaker(bind=engine))
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Lead),
+            [{"tool": "pinterest_fit" if i % 2 else "pinterest_potential", "answers": {}} for i in range(10)],
+        )
+    return engine
+
+
+def _versions(engine) -> list:
+    with engine.connect() as conn:
+        return conn.scalars(select(Lead.rules_version).order_by(Lead.id)).all()
+
+
+def test_interrupted_run_resumes_then_completes_and_clears_checkpoint(engine, tmp_path, monkeypatch):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    write_batch = rl._write_batch
+    calls = []
+
+    def failing_write(updates):
+        calls.append(len(updates))
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        write_batch(updates)
+
+    monkeypatch.setattr(rl, "_write_batch", failing_write)
+    with pytest.raises(KeyboardInterrupt):
+        rl.recompute_leads(batch_size=4, checkpoint=checkpoint)
+    assert rl.load_checkpoint(checkpoint, {"tool": None, "only_stale": False}) == 4
+
+    # A different selection must not pick up this checkpoint.
+    with pytest.raises(SystemExit):
+        rl.recompute_leads(batch_size=4, checkpoint=checkpoint, tool="pinterest_fit")
+
+    monkeypatch.setattr(rl, "_write_batch", write_batch)
+    assert rl.recompute_leads(batch_size=4, checkpoint=checkpoint) == 6  # the rest only
+    assert None not in _versions(engine)
+    assert not (tmp_path / "checkpoint.json").exists()
+
+    # After a rules change the next run starts from the first row again.
+    with engine.begin() as conn:
+        conn.execute(update(Lead).values(rules_version="old"))
+    assert rl.recompute_leads(batch_size=4, checkpoint=checkpoint, only_stale=True) == 10
+    assert "old" not in _versions(engine)
@@ -0,0 +1,61 @@
+import multiprocessing
+
+import pytest
+
+import db
+import serving
+from main import app
+from tools.pinterest_potential.benchmarks import BENCHMARK_MAP
+from tools.pinterest_potential.compute import segment_niche_context
+
+
+def test_worker_count_is_capped_by_cpus_and_db_budget():
+    assert serving.worker_count(8, db_max_connections=100, reserved=10, per_worker=15) == 6
+    assert serving.worker_count(2, db_max_connections=100, reserved=10, per_worker=15) == 2
+    assert serving.worker_count(8, db_max_connections=10, reserved=10, per_worker=15) == 1
+
+
+def test_in_memory_sqlite_is_single_worker(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    assert serving.resolve_workers(4) == 1
+    monkeypatch.setenv("DATABASE_URL", "sqlite:////tmp/app.db")
+    assert serving.resolve_workers(4) == 4
+
+
+def test_prewarm_pool_opens_and_returns_connections(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'app.db'}")
+    db.reset_engine()
+    try:
+        assert serving.prewarm_pool(3) == 3
+        assert db.get_engine().pool.checkedout() == 0
+    finally:
+        db.reset_engine()
+    assert serving.prewarm_pool(0) == 0
+
+
+def test_warm_caches_fills_hot_paths():
+    segment_niche_context.cache_clear()
+    serving.warm_caches(app)
+    assert segment_niche_context.cache_info().currsize == len(BENCHMARK_MAP)
+    assert app.openapi_schema is not None
+
+
+def _child_engine_cached(queue) -> None:
+    queue.put(db.get_engine.cache_info().currsize)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_forked_child_does_not_inherit_the_engine(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'app.db'}")
+    db.reset_engine()
+    try:
+        db.get_engine()
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        child = ctx.Process(target=_child_engine_cached, args=(queue,))
+        child.start()
+        child.join(10)
+        assert queue.get(timeout=5) == 0
+        assert db.get_engine.cache_info().currsize == 1
+    finally:
+        db.reset_engine()
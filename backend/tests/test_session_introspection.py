@@ -0,0 +1,110 @@
+import time
+import warnings
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import config
+import models
+import principals
+from main import app
+from security import create_access_token
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(config, "JWT_SECRET_KEY", "test-secret")
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.User.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            models.User.__table__.insert(),
+            [
+                {"email": "ops@example.com", "hashed_password": "x", "is_active": True, "is_admin": False,
+                 "groups": ["contractor"]},
+                {"email": "gone@example.com", "hashed_password": "x", "is_active": False, "is_admin": False,
+                 "groups": []},
+            ],
+        )
+    monkeypatch.setattr(principals, "SessionLocal", sessionmaker(bind=engine))
+    principals.principal_cache.invalidate()
+    yield engine
+    principals.principal_cache.invalidate()
+
+
+def _auth(email: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(subject=email)}"}
+
+
+def test_session_returns_a_signed_minimal_principal(engine):
+    resp = client.get("/auth/session", headers=_auth("ops@example.com"))
+    assert resp.status_code == 200
+    body = resp.json()
+    assert {k: body[k] for k in ("is_active", "is_admin", "groups")} == {
+        "is_active": True, "is_admin": False, "groups": ["contractor"],
+    }
+    assert "email" not in body and "created_at" not in body
+    assert principals.verify_principal(resp.content) == {k: v for k, v in body.items() if k != "sig"}
+    assert principals.verify_principal(resp.content.replace(b'"is_admin":false', b'"is_admin":true')) is None
+
+    assert resp.headers["cache-control"] == "public, max-age=30, s-maxage=30"
+    assert "Authorization" in resp.headers["vary"]
+    assert resp.headers["x-principal-groups"] == "contractor"
+
+
+def test_warm_principal_skips_the_database_until_ttl(engine):
+    headers = _auth("ops@example.com")
+    first = client.get("/auth/session", headers=headers)
+    with engine.begin() as conn:
+        conn.execute(update(models.User).values(is_admin=True))
+
+    assert client.get("/auth/session", headers=headers).json()["is_admin"] is False  # cached
+    principals.principal_cache.invalidate("ops@example.com")
+    fresh = client.get("/auth/session", headers=headers)
+    assert fresh.json()["is_admin"] is True
+    assert fresh.headers["etag"] != first.headers["etag"]
+
+
+def test_etag_revalidation_and_head(engine):
+    headers = _auth("ops@example.com")
+    etag = client.get("/auth/session", headers=headers).headers["etag"]
+
+    not_modified = client.get("/auth/session", headers={**headers, "If-None-Match": f"W/{etag}"})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+
+    head = client.head("/auth/session", headers=headers)
+    assert head.status_code == 200 and head.content == b""
+    assert head.headers["x-principal-admin"] == "0" and head.headers["etag"] == etag
+
+
+def test_get_and_head_have_distinct_operation_ids():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        app.openapi_schema = None
+        operations = app.openapi()["paths"]["/auth/session"]
+    assert operations["get"]["operationId"] != operations["head"]["operationId"]
+
+
+def test_inactive_unknown_and_bad_tokens(engine):
+    assert client.get("/auth/session", headers=_auth("gone@example.com")).json()["is_active"] is False
+    assert client.get("/auth/session", headers=_auth("nobody@example.com")).status_code == 401
+    assert client.get("/auth/session", headers={"Authorization": "Bearer nope"}).status_code == 401
+    assert client.head("/auth/session").status_code == 401
+
+
+def test_principal_cache_evicts_oldest_and_expires():
+    cache = principals.PrincipalCache(ttl=60, max_entries=2)
+    p = principals.SignedPrincipal(1, True, False, (), b"{}", '"x"')
+    for email in ("a", "b", "c"):
+        cache.put(email, p)
+    assert cache.get("a") is None and cache.get("c") is p
+
+    expired = principals.PrincipalCache(ttl=0.0001, max_entries=2)
+    expired.put("a", p)
+    time.sleep(0.001)
+    assert expired.get("a") is None
@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+
+from scripts.bench.import_time import measure_imports, total_us
+
+# Generous on purpose (currently ~0.8-1.1s locally): it catches a heavy
+# dependency creeping into the import path, not normal machine noise.
+IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "2000"))
+
+# Only needed once the app actually talks to the DB / an external service.
+DEFERRED_MODULES = (
+    "psycopg",
+    "httpx",
+    "sqlalchemy.dialects.postgresql",
+    "boto3",
+    "langchain_openai",
+    "openai",
+    "numpy",
+    "PIL",
+)
+
+
+def _import_main_in_fresh_interpreter() -> set[str]:
+    env = dict(os.environ)
+    env.pop("DATABASE_URL", None)
+    proc = subprocess.run(
+        [sys.executable, "-c", "import json, sys, main; print(json.dumps(sorted(sys.modules)))"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    assert proc.returncode == 0, proc.stderr
+    return set(json.loads(proc.stdout.splitlines()[-1]))
+
+
+def test_app_imports_without_database_url_and_defers_heavy_modules():
+    loaded = _import_main_in_fresh_interpreter()
+    assert [m for m in DEFERRED_MODULES if m in loaded] == []
+
+
+def test_import_main_within_budget():
+    best_ms = min(total_us(measure_imports("main"), "main") for _ in range(3)) / 1000
+    assert best_ms < IMPORT_BUDGET_MS, f"import main took {best_ms:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
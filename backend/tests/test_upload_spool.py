@@ -0,0 +1,200 @@
+import asyncio
+import hashlib
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+from jobs import JobWorker
+from main import app
+from security import get_current_admin_user, get_db
+from upload_spool import UploadSpool, upload_spool
+
+TABLES = [
+    models.Job.__table__,
+    models.PinterestAccountStatsMonthly.__table__,
+    models.PinterestStatsUpload.__table__,
+]
+
+HEADER = "Pinterest monthly export\nDate Range,Impressions,Engagements,Outbound Clicks,Saves\n"
+
+
+def _export(months: int, base: int = 1000) -> bytes:
+    rows = [f"{m:02d}/01-{m:02d}/28 2023,{base + m},{m},{m},{m}\n" for m in range(1, months + 1)]
+    return (HEADER + "".join(rows)).encode()
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture()
+def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_spool, "root", tmp_path / "spool")
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(engine, tables=TABLES)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture()
+def client(session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    admin = {"email": "admin@example.com"}
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin_user] = lambda: SimpleNamespace(email=admin["email"])
+    try:
+        c = TestClient(app)
+        c.admin = admin
+        yield c
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_current_admin_user, None)
+
+
+def _run_jobs(session_factory) -> int:
+    return asyncio.run(JobWorker(session_factory=session_factory, concurrency=1).run_once())
+
+
+def _send(client, data: bytes, *, size: int = 50, account: str = "acme", order=None) -> tuple[str, int]:
+    session = client.post("/admin/pinterest-stats/upload-sessions", json={"account_name": account, "filename": "big.csv"})
+    assert session.status_code == 201
+    sid = session.json()["session_id"]
+    chunks = [data[i:i + size] for i in range(0, len(data), size)]
+    for n in order or range(len(chunks)):
+        r = client.put(
+            f"/admin/pinterest-stats/upload-sessions/{sid}/chunks/{n}",
+            content=chunks[n],
+            headers={"X-Chunk-Sha256": _sha(chunks[n])},
+        )
+        assert r.status_code == 200, r.text
+    return sid, len(chunks)
+
+
+def test_chunked_upload_resumes_and_ingests(client, session_factory):
+    data = _export(12)
+    chunks = [data[i:i + 50] for i in range(0, len(data), 50)]  # boundaries fall mid-line
+    sid, count = _send(client, data, order=[3, 0, 1])
+
+    bad = client.put(
+        f"/admin/pinterest-stats/upload-sessions/{sid}/chunks/2",
+        content=chunks[2],
+        headers={"X-Chunk-Sha256": _sha(b"something else")},
+    )
+    assert bad.status_code == 400 and "Checksum mismatch" in bad.json()["detail"]
+
+    early = client.post(f"/admin/pinterest-stats/upload-sessions/{sid}/complete", json={"chunks": count})
+    assert early.status_code == 400 and "Missing chunks" in early.json()["detail"]
+
+    # Resume: ask what arrived, send the rest.
+    state = client.get(f"/admin/pinterest-stats/upload-sessions/{sid}").json()
+    have = {c["n"] for c in state["chunks"]}
+    assert have == {0, 1, 3}
+    for n in sorted(set(range(count)) - have):
+        client.put(
+            f"/admin/pinterest-stats/upload-sessions/{sid}/chunks/{n}",
+            content=chunks[n],
+            headers={"X-Chunk-Sha256": _sha(chunks[n])},
+        )
+
+    wrong = client.post(
+        f"/admin/pinterest-stats/upload-sessions/{sid}/complete", json={"chunks": count, "sha256": "0" * 64}
+    )
+    assert wrong.status_code == 400
+
+    done = client.post(
+        f"/admin/pinterest-stats/upload-sessions/{sid}/complete", json={"chunks": count, "sha256": _sha(data)}
+    )
+    assert done.status_code == 202, done.text
+    again = client.post(f"/admin/pinterest-stats/upload-sessions/{sid}/complete", json={"chunks": count})
+    assert again.json()["job_id"] == done.json()["job_id"]  # a retried completion follows the same job
+
+    assert _run_jobs(session_factory) == 1
+    job = client.get(done.json()["status_url"]).json()
+    assert job["status"] == "succeeded", job
+    assert job["result"]["inserted"] == 12
+    assert not (upload_spool.root / sid).exists()  # discarded once ingested
+
+    late_retry = client.post(f"/admin/pinterest-stats/upload-sessions/{sid}/complete", json={"chunks": count})
+    assert late_retry.status_code == 200, late_retry.text
+    assert late_retry.json()["job_id"] == done.json()["job_id"]
+    assert late_retry.json()["status"] == "succeeded"
+
+    db = session_factory()
+    impressions = db.scalars(
+        select(models.PinterestAccountStatsMonthly.impressions).order_by(models.PinterestAccountStatsMonthly.calendar_month)
+    ).all()
+    db.close()
+    assert impressions == [1000 + m for m in range(1, 13)]
+
+
+def test_repeat_of_last_file_is_answered_from_the_journal(client, session_factory):
+    data = _export(3)
+    sid, count = _send(client, data)
+    first = client.post(f"/admin/pinterest-stats/upload-sessions/{sid}/complete", json={"chunks": count})
+    _run_jobs(session_factory)
+
+    sid2, count2 = _send(client, data, size=7)
+    complete = f"/admin/pinterest-stats/upload-sessions/{sid2}/complete"
+    repeat = client.post(complete, json={"chunks": count2})
+    assert repeat.status_code == 200
+    assert repeat.json()["duplicate"] is True and repeat.json()["job_id"] == first.json()["job_id"]
+    assert not list((upload_spool.root / sid2).glob("*.part"))  # only the meta is kept
+
+    retried = client.post(complete, json={"chunks": count2})
+    assert retried.status_code == 200 and retried.json()["upload_id"] == repeat.json()["upload_id"]
+
+
+def test_sessions_are_private_and_finalized_ones_take_no_chunks(client):
+    sid, count = _send(client, _export(2))
+    client.post(f"/admin/pinterest-stats/upload-sessions/{sid}/complete", json={"chunks": count})
+    late = client.put(
+        f"/admin/pinterest-stats/upload-sessions/{sid}/chunks/{count}",
+        content=b"x",
+        headers={"X-Chunk-Sha256": _sha(b"x")},
+    )
+    assert late.status_code == 400
+
+    client.admin["email"] = "someone-else@example.com"
+    assert client.get(f"/admin/pinterest-stats/upload-sessions/{sid}").status_code == 404
+    assert client.get("/admin/pinterest-stats/upload-sessions/..%2F..%2Fetc").status_code in (404, 422)
+
+
+def test_oversized_chunk_is_refused(client, monkeypatch):
+    monkeypatch.setattr(upload_spool, "max_chunk_bytes", 10)
+    sid = client.post("/admin/pinterest-stats/upload-sessions", json={"account_name": "acme"}).json()["session_id"]
+    r = client.put(
+        f"/admin/pinterest-stats/upload-sessions/{sid}/chunks/0",
+        content=b"x" * 11,
+        headers={"X-Chunk-Sha256": _sha(b"x" * 11)},
+    )
+    assert r.status_code == 413
+
+
+def test_sweep_expires_idle_sessions_and_stale_finalized_ones(tmp_path):
+    spool = UploadSpool(tmp_path, session_ttl=60, finalized_ttl=3600)
+    idle = spool.create(account_name="a", filename=None, owner="o")["session_id"]
+    fresh = spool.create(account_name="a", filename=None, owner="o")["session_id"]
+    done = spool.create(account_name="a", filename=None, owner="o")["session_id"]
+    spool.put_chunk(done, 0, b"data", _sha(b"data"), owner="o")
+    spool.mark_finalized(done, owner="o")
+
+    now = time.time()
+    os.utime(tmp_path / idle, (now - 120, now - 120))
+    os.utime(tmp_path / done, (now - 120, now - 120))
+    assert spool.sweep(now) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([fresh, done])
+
+    assert spool.sweep(now + 7200) == 2
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1 @@
+"""Server-side ports of the frontend tool engines (frontend/lib/tools)."""
@@ -0,0 +1,36 @@
+"""Fruitful Control QA: layered rule documents compiled into multi-pattern matchers and image checks."""
+
+from tools.fruitful_control.engine import (
+    READY_THRESHOLD,
+    CompiledRuleSet,
+    RuleEngine,
+    RuleSnapshot,
+    UnknownClientError,
+    compile_rule_set,
+    engine,
+    rule_reloader,
+)
+from tools.fruitful_control.images import ImageRejected, analyze_image, design_analyzer
+from tools.fruitful_control.repository import DbRuleSource, FileRuleSource, publish_document
+from tools.fruitful_control.rules import IMAGE_CHECKS, TASK_TYPES, load_library, parse_document
+
+__all__ = [
+    "IMAGE_CHECKS",
+    "READY_THRESHOLD",
+    "TASK_TYPES",
+    "CompiledRuleSet",
+    "DbRuleSource",
+    "FileRuleSource",
+    "ImageRejected",
+    "RuleEngine",
+    "RuleSnapshot",
+    "UnknownClientError",
+    "analyze_image",
+    "compile_rule_set",
+    "design_analyzer",
+    "engine",
+    "load_library",
+    "parse_document",
+    "publish_document",
+    "rule_reloader",
+]
@@ -0,0 +1,215 @@
+# backend/tools/fruitful_control/batch.py
+"""
+Large Fruitful Control batches: dedupe by content hash, fan out over a process
+pool, stream NDJSON lines back as chunks finish.
+
+- Items are keyed by sha256 of their text. Each distinct text is evaluated
+  once per batch, and results are also kept in a bounded per-worker LRU keyed
+  by (rules version, hash). A resubmission where only a few pins changed then
+  only evaluates those few.
+- Batches with more than `inline_max` uncached texts go to a process pool
+  (forkserver, with the rule modules preloaded). Each pool process compiles
+  a rule set once per version and reuses it for every chunk it gets; a chunk
+  carries the version it must be judged under, and a process that sees
+  different rules reloads (or fails the chunk, rather than judging under other
+  rules). Smaller batches run on the threadpool: process hops would cost more.
+- Output order is completion order; every line carries the item's `index` in
+  the request. Line types: "batch" (header), "result", "error" (a failed
+  chunk, with the indices it covered), "summary" (last).
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Sequence
+
+import config
+from tools.fruitful_control.engine import CompiledRuleSet, engine
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def evaluate_chunk(client: str, task_type: str, version: str, texts: Sequence[str]) -> list[dict]:
+    """Pool task: judge `texts` under exactly rules `version`."""
+    rule_set = engine.rule_set(client, task_type)
+    if rule_set.version != version:
+        engine.reload()
+        rule_set = engine.rule_set(client, task_type)
+        if rule_set.version != version:
+            raise RuntimeError(f"Rules changed during the batch (have {rule_set.version}, need {version})")
+    return [rule_set.evaluate(text) for text in texts]
+
+
+def _init_pool_process() -> None:
+    engine.library  # parse the rule documents before the first chunk arrives
+
+
+class ResultCache:
+    """Thread-safe LRU of (rules version, content hash) -> result."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version: str, digest: str) -> dict | None:
+        with self._lock:
+            result = self._entries.get((version, digest))
+            if result is not None:
+                self._entries.move_to_end((version, digest))
+            return result
+
+    def put(self, version: str, digest: str, result: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[(version, digest)] = result
+            self._entries.move_to_end((version, digest))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class BatchEvaluator:
+    def __init__(
+            self,
+            *,
+            workers: int = config.FRUITFUL_CONTROL_WORKERS,
+            chunk_size: int = config.FRUITFUL_CONTROL_CHUNK_SIZE,
+            inline_max: int = config.FRUITFUL_CONTROL_INLINE_MAX,
+            cache_entries: int = config.FRUITFUL_CONTROL_RESULT_CACHE_ENTRIES,
+    ):
+        self.workers = workers or min(4, len(os.sched_getaffinity(0)))
+        self.chunk_size = chunk_size
+        self.inline_max = inline_max
+        self.cache = ResultCache(cache_entries)
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                ctx = multiprocessing.get_context("forkserver")
+                ctx.set_forkserver_preload(["tools.fruitful_control"])
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=ctx, initializer=_init_pool_process
+                )
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    async def stream(
+            self,
+            rule_set: CompiledRuleSet,
+            items: Sequence[tuple[str | None, str]],
+            *,
+            snapshot_version: str | None = None,
+    ) -> AsyncIterator[bytes]:
+        """NDJSON lines for `items` ([(id, text)]) judged under `rule_set`'s version."""
+        started = time.perf_counter()
+        version = rule_set.version
+
+        by_hash: dict[str, list[int]] = {}
+        texts: dict[str, str] = {}
+        for index, (_, text) in enumerate(items):
+            digest = content_hash(text)
+            by_hash.setdefault(digest, []).append(index)
+            texts.setdefault(digest, text)
+
+        yield _line(
+            type="batch",
+            client=rule_set.client,
+            task_type=rule_set.task_type,
+            snapshot_version=snapshot_version,
+            rules_version=version,
+            rule_sources=list(rule_set.sources),
+            items=len(items),
+            unique=len(by_hash),
+        )
+
+        counts = {"ready": 0, "needs_revision": 0, "errors": 0}
+
+        def emit(digest: str, result: dict) -> bytes:
+            lines = []
+            for index in by_hash[digest]:
+                counts[result["verdict"]] += 1
+                lines.append(_line(type="result", index=index, content_hash=digest, **{**result, "id": items[index][0]}))
+            return b"".join(lines)
+
+        pending = []
+        for digest in by_hash:
+            cached = self.cache.get(version, digest)
+            if cached is not None:
+                yield emit(digest, cached)
+            else:
+                pending.append(digest)
+
+        chunks = [pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)]
+        loop = asyncio.get_running_loop()
+        use_pool = len(pending) > self.inline_max
+        executor = self.pool() if use_pool else None
+
+        async def run(chunk: list[str]):
+            chunk_texts = [texts[d] for d in chunk]
+            try:
+                if executor is None:
+                    # Same process: judge with the rule set resolved for this request.
+                    results = await loop.run_in_executor(None, lambda: [rule_set.evaluate(t) for t in chunk_texts])
+                else:
+                    results = await loop.run_in_executor(
+                        executor, evaluate_chunk, rule_set.client, rule_set.task_type, version, chunk_texts
+                    )
+            except Exception as exc:  # one bad chunk shouldn't sink the stream
+                return chunk, None, exc
+            return chunk, results, None
+
+        tasks = [asyncio.ensure_future(run(chunk)) for chunk in chunks]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                chunk, results, exc = await fut
+                if exc is not None:
+                    counts["errors"] += 1
+                    yield _line(
+                        type="error",
+                        indices=sorted(i for d in chunk for i in by_hash[d]),
+                        detail=str(exc) or exc.__class__.__name__,
+                    )
+                    continue
+                out = []
+                for digest, result in zip(chunk, results):
+                    self.cache.put(version, digest, result)
+                    out.append(emit(digest, result))
+                yield b"".join(out)
+        finally:
+            for t in tasks:
+                t.cancel()  # client went away: don't keep the pool busy for nobody
+
+        yield _line(
+            type="summary",
+            snapshot_version=snapshot_version,
+            items=len(items),
+            unique=len(by_hash),
+            evaluated=len(pending),
+            ready=counts["ready"],
+            needs_revision=counts["needs_revision"],
+            failed_chunks=counts["errors"],
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+
+
+def _line(**fields) -> bytes:
+    return json.dumps(fields, separators=(",", ":")).encode() + b"\n"
+
+
+batch_evaluator = BatchEvaluator()
@@ -0,0 +1,285 @@
+# backend/tools/fruitful_control/engine.py
+"""
+Compiled rule sets and deterministic scoring for Fruitful Control text QA.
+
+compile_rule_set() merges global + task + client rules for one (client, task
+type) into a CompiledRuleSet: one Aho–Corasick automaton for every phrase rule,
+one RegexBundle for every regex rule, plus the length and image rules.
+
+RuleEngine serves immutable RuleSnapshots: the library of one source revision
+with every (client, task type) set already compiled. A reload builds the next
+snapshot off to the side, reusing compiled sets whose rules version did not
+change, and swaps it in with a single assignment; a request reads the current
+snapshot once and uses it throughout, so it never sees half an update, never
+compiles, and never touches the rule source.
+
+Scoring follows the spec's "Rating System": start at 10, subtract each
+violated rule's deduction once, floor at 0, round half up. Any hard (S1-S3)
+issue forces "needs_revision"; otherwise the score must reach READY_THRESHOLD.
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Mapping
+
+from tools.fruitful_control.matcher import PhraseMatcher, RegexBundle, normalize_text
+from tools.fruitful_control.repository import FileRuleSource, RuleReloader, RuleSource, default_source
+from tools.fruitful_control.rules import DATA_DIR, Rule, RuleDocument, RuleLibrary, TASK_TYPES
+
+READY_THRESHOLD = 8
+MAX_SCORE = 10.0
+
+
+class UnknownClientError(LookupError):
+    """No rule profile for the selected client (the spec forbids silently falling back to global only)."""
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRuleSet:
+    client: str
+    task_type: str
+    version: str
+    sources: tuple[str, ...]
+    rules: tuple[Rule, ...]
+    phrases: PhraseMatcher
+    phrase_rule: tuple[int, ...]  # phrase index -> rule index
+    regexes: RegexBundle
+    regex_rule: tuple[int, ...]  # pattern index -> rule index
+
+    def evaluate(self, text: str, item_id: str | None = None) -> dict:
+        rules = self.rules
+        hits: dict[int, list[str]] = {}  # rule index -> what matched (empty list = rule violated, nothing to quote)
+
+        # Phrase rules: one automaton pass for all of them.
+        found = self.phrases.find(normalize_text(text), normalized=True) if len(self.phrases) else ()
+        present: dict[int, list[str]] = {}
+        for idx in sorted(found):
+            present.setdefault(self.phrase_rule[idx], []).append(self.phrases.phrases[idx])
+        for ri, rule in enumerate(rules):
+            if rule.type != "phrases":
+                continue
+            if rule.mode == "forbid" and ri in present:
+                hits[ri] = present[ri]
+            elif rule.mode == "require_any" and ri not in present:
+                hits[ri] = []
+
+        # Regex rules: clean texts usually stop at the bundled prefilter.
+        bundle = self.regexes
+        skip_prefiltered = bundle.prefiltered_clean(text)
+        for pi, pattern in enumerate(bundle.patterns):
+            if skip_prefiltered and bundle.is_prefiltered(pi):
+                continue
+            ri = self.regex_rule[pi]
+            rule = rules[ri]
+            if rule.mode == "require":
+                if pattern.search(text) is None:
+                    hits[ri] = []
+                continue
+            matches = [m.group(0) for m in pattern.finditer(text)]
+            if len(matches) > rule.max_matches:
+                hits[ri] = list(dict.fromkeys(matches))
+
+        length = len(text.strip())
+        for ri, rule in enumerate(rules):
+            if rule.type != "length":
+                continue
+            if (rule.min_chars is not None and length < rule.min_chars) or (
+                    rule.max_chars is not None and length > rule.max_chars
+            ):
+                hits[ri] = [f"{length} chars"]
+
+        return self.score(item_id, hits)
+
+    def evaluate_batch(self, items: Iterable[tuple[str | None, str]]) -> list[dict]:
+        """[(item id, text)] -> results in the same order; identical texts are evaluated once."""
+        seen: dict[str, dict] = {}
+        out = []
+        for item_id, text in items:
+            result = seen.get(text)
+            if result is None:
+                result = seen[text] = self.evaluate(text)
+            out.append({**result, "id": item_id})
+        return out
+
+    def score(self, item_id: str | None, hits: Mapping[int, list[str]]) -> dict:
+        """Verdict, score and breakdown for violated rules ({rule index: what matched})."""
+        breakdown, hard, soft, suggestions = [], [], [], []
+        total = 0.0
+        for ri in sorted(hits):  # rule order, so output is deterministic
+            rule = self.rules[ri]
+            matched = hits[ri]
+            note = rule.note.replace("{match}", ", ".join(f'"{m}"' for m in matched)) if matched else rule.note
+            breakdown.append(
+                {"rule_id": rule.rule_id, "severity": rule.severity, "deduction": rule.deduction, "note": note}
+            )
+            (hard if rule.hard else soft).append(note)
+            if rule.suggestion:
+                suggestions.append(rule.suggestion)
+            total += rule.deduction
+
+        qa_score = int(math.floor(max(0.0, MAX_SCORE - total) + 0.5))
+        ready = not hard and qa_score >= READY_THRESHOLD
+        return {
+            "id": item_id,
+            "verdict": "ready" if ready else "needs_revision",
+            "qa_score": qa_score,
+            "score_breakdown": breakdown,
+            "hard_issues": hard,
+            "soft_improvements": soft,
+            "suggested_changes": suggestions,
+        }
+
+
+def rule_set_version(docs: Iterable[RuleDocument]) -> str:
+    return hashlib.sha256("|".join(d.source for d in docs).encode()).hexdigest()[:12]
+
+
+def compile_rule_set(
+        global_rules: RuleDocument,
+        task_rules: RuleDocument | None,
+        client_rules: RuleDocument,
+        task_type: str,
+) -> CompiledRuleSet:
+    docs = [d for d in (global_rules, task_rules, client_rules) if d is not None]
+    rules = tuple(r for d in docs for r in d.rules if task_type in r.task_types)
+
+    phrases, phrase_rule = [], []
+    patterns, prefilterable, regex_rule = [], [], []
+    for ri, rule in enumerate(rules):
+        if rule.type == "phrases":
+            phrases.extend(rule.phrases)
+            phrase_rule.extend([ri] * len(rule.phrases))
+        elif rule.type == "regex":
+            patterns.append((rule.pattern, re.I if rule.ignore_case else 0))
+            # Only "must not match at all" rules can be skipped on a prefilter miss.
+            prefilterable.append(rule.mode == "forbid")
+            regex_rule.append(ri)
+
+    return CompiledRuleSet(
+        client=client_rules.key,
+        task_type=task_type,
+        version=rule_set_version(docs),
+        sources=tuple(d.source for d in docs),
+        rules=rules,
+        phrases=PhraseMatcher(phrases),
+        phrase_rule=tuple(phrase_rule),
+        regexes=RegexBundle(patterns, prefilterable),
+        regex_rule=tuple(regex_rule),
+    )
+
+
+def _docs(library: RuleLibrary, client: str, task_type: str) -> tuple[RuleDocument, RuleDocument | None, RuleDocument]:
+    client_rules = library.clients.get(client)
+    if client_rules is None:
+        raise UnknownClientError(f"No rules for client {client!r}")
+    if task_type not in TASK_TYPES:
+        raise ValueError(f"Unknown task type {task_type!r}")
+    return library.global_rules, library.tasks.get(task_type), client_rules
+
+
+@dataclass(frozen=True, slots=True)
+class RuleSnapshot:
+    """Everything QA needs for one revision of the rules; never mutated once built."""
+
+    version: str  # "files@<content hash>" or "db@r<revision>"; recorded on every verdict
+    revision: str  # the source's change marker this was loaded at
+    library: RuleLibrary
+    rule_sets: Mapping[tuple[str, str], CompiledRuleSet]
+    loaded_at: float
+
+    def rule_set(self, client: str, task_type: str) -> CompiledRuleSet:
+        compiled = self.rule_sets.get((client, task_type))
+        if compiled is None:
+            _docs(self.library, client, task_type)  # raises the right error
+        return compiled
+
+
+def build_snapshot(
+        source_name: str, revision: str, library: RuleLibrary, previous: RuleSnapshot | None = None
+) -> RuleSnapshot:
+    reuse = previous.rule_sets if previous else {}
+    rule_sets = {}
+    for client in library.clients:
+        for task_type in TASK_TYPES:
+            docs = _docs(library, client, task_type)
+            compiled = reuse.get((client, task_type))
+            if compiled is None or compiled.version != rule_set_version(d for d in docs if d is not None):
+                compiled = compile_rule_set(*docs, task_type)
+            rule_sets[(client, task_type)] = compiled
+
+    if source_name == "files":
+        everything = [library.global_rules, *library.tasks.values(), *library.clients.values()]
+        version = f"files@{rule_set_version(everything)}"
+    else:
+        version = f"{source_name}@{revision}"
+    return RuleSnapshot(version, revision, library, rule_sets, time.time())
+
+
+class RuleEngine:
+    """Holds the current RuleSnapshot; `reload()`/`refresh()` replace it copy-on-write."""
+
+    def __init__(self, data_dir: Path = DATA_DIR, *, source: RuleSource | None = None):
+        self.source = source or FileRuleSource(data_dir)
+        self._snapshot: RuleSnapshot | None = None
+        self._lock = threading.Lock()  # serializes reloads; readers never take it
+
+    @property
+    def snapshot(self) -> RuleSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._build(None)
+                snapshot = self._snapshot
+        return snapshot
+
+    @property
+    def snapshot_version(self) -> str | None:
+        return self._snapshot.version if self._snapshot is not None else None
+
+    @property
+    def library(self) -> RuleLibrary:
+        return self.snapshot.library
+
+    def _build(self, previous: RuleSnapshot | None) -> RuleSnapshot:
+        revision, library = self.source.load()
+        return build_snapshot(self.source.name, revision, library, previous)
+
+    def reload(self) -> RuleSnapshot:
+        """Build a snapshot from the source now and swap it in (unchanged sets are shared)."""
+        with self._lock:
+            self._snapshot = self._build(self._snapshot)
+            return self._snapshot
+
+    def refresh(self) -> bool:
+        """Reload only if the source's revision moved; True when a new snapshot went live."""
+        current = self._snapshot
+        if current is not None and self.source.revision() == current.revision:
+            return False
+        self.reload()
+        return True
+
+    def rule_set(self, client: str, task_type: str) -> CompiledRuleSet:
+        return self.snapshot.rule_set(client, task_type)
+
+    def evaluate_batch(self, client: str, task_type: str, items: Iterable[tuple[str | None, str]]) -> dict:
+        snapshot = self.snapshot
+        rule_set = snapshot.rule_set(client, task_type)
+        return {
+            "client": rule_set.client,
+            "task_type": rule_set.task_type,
+            "snapshot_version": snapshot.version,
+            "rules_version": rule_set.version,
+            "rule_sources": list(rule_set.sources),
+            "results": rule_set.evaluate_batch(items),
+        }
+
+
+engine = RuleEngine(source=default_source())
+# Started/stopped by main.lifespan.
+rule_reloader = RuleReloader(engine)
@@ -0,0 +1,223 @@
+# backend/tools/fruitful_control/images.py
+"""
+Design QA: deterministic image checks for pin creatives (spec "Design QA (V1)").
+
+Every check is an "image" rule in the rule documents (see rules.IMAGE_CHECKS),
+so findings map to rule ids and are scored like title/description issues.
+
+    aspect_ratio  width / height within [min_ratio, max_ratio]
+    min_size      pixel dimensions at least min_width x min_height
+    contrast      RMS contrast of the luminance (0..0.5) at least min_contrast
+    text_density  share of the canvas covered by sharp luminance edges, the
+                  spec's documented proxy for "how much text/detail is on it"
+    safe_zone     edge density of the outer `margin` strip along each side
+                  (text bleeding into an edge) at most max_density
+
+Cost control:
+- The upload is never read into one bytes object. Starlette already spools
+  multipart files (memory up to 1 MB, then a temp file); we hash that spool
+  in chunks and hand the same file to Pillow.
+- Decoding is lazy: Image.open only parses the header, so size/ratio-only rule
+  sets never touch pixels. Otherwise JPEGs are decoded straight at a reduced
+  scale (draft mode), then reduced to ANALYSIS_SIDE on the long side before
+  any pixel math; all measures are whole-array NumPy ops on that grid.
+- Results are cached by (rules version, sha256 of the file), so re-checking an
+  unchanged design under unchanged rules does no decoding at all.
+
+NumPy and Pillow are imported on first use, keeping them off the API's import path.
+"""
+
+import hashlib
+from typing import IO, TYPE_CHECKING
+
+import config
+from tools.fruitful_control.batch import ResultCache
+from tools.fruitful_control.engine import CompiledRuleSet
+
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
+
+ALLOWED_FORMATS = ("PNG", "JPEG", "WEBP")
+ANALYSIS_SIDE = config.FRUITFUL_CONTROL_IMAGE_ANALYSIS_SIDE
+# Luminance step (0..1) between neighbouring analysis pixels that counts as an edge.
+EDGE_THRESHOLD = 0.12
+_PIXEL_CHECKS = frozenset({"contrast", "text_density", "safe_zone"})
+_HASH_CHUNK = 1024 * 1024
+
+
+class ImageRejected(ValueError):
+    """Not something design QA can analyze (format, size, unreadable data)."""
+
+
+def hash_upload(fp: IO[bytes], *, max_bytes: int = config.FRUITFUL_CONTROL_IMAGE_MAX_BYTES) -> tuple[str, int]:
+    """sha256 and size of a seekable file, read in chunks; leaves it rewound."""
+    digest = hashlib.sha256()
+    size = 0
+    fp.seek(0)
+    while chunk := fp.read(_HASH_CHUNK):
+        size += len(chunk)
+        if size > max_bytes:
+            raise ImageRejected(f"Image is larger than {max_bytes // (1024 * 1024)} MB")
+        digest.update(chunk)
+    fp.seek(0)
+    if size == 0:
+        raise ImageRejected("Empty upload")
+    return digest.hexdigest(), size
+
+
+class ImageAnalysis:
+    """One opened image; pixels are decoded and measured only when a check asks."""
+
+    def __init__(self, image: "Image.Image"):
+        self._image = image
+        self.format = image.format
+        self.width, self.height = image.size
+        self._luminance: "np.ndarray | None" = None
+        self._edges: "np.ndarray | None" = None
+
+    @property
+    def aspect_ratio(self) -> float:
+        return self.width / self.height
+
+    def luminance(self) -> "np.ndarray":
+        if self._luminance is None:
+            import numpy as np
+            from PIL import Image
+
+            im = self._image
+            # JPEG: decode only the luma plane, already scaled down in the DCT domain.
+            im.draft("L", (ANALYSIS_SIDE, ANALYSIS_SIDE))
+            if "A" in im.getbands() or "transparency" in im.info:  # judge transparent pins on white
+                rgba = im.convert("RGBA")
+                im = Image.alpha_composite(Image.new("RGBA", rgba.size, "white"), rgba)
+            im = im.convert("L")
+            im.thumbnail((ANALYSIS_SIDE, ANALYSIS_SIDE), Image.Resampling.BILINEAR, reducing_gap=2.0)
+            self._luminance = np.asarray(im, dtype=np.float32) / 255.0
+        return self._luminance
+
+    def edges(self) -> "np.ndarray":
+        if self._edges is None:
+            import numpy as np
+
+            lum = self.luminance()
+            edges = np.zeros(lum.shape, dtype=bool)
+            edges[:, 1:] |= np.abs(np.diff(lum, axis=1)) > EDGE_THRESHOLD
+            edges[1:, :] |= np.abs(np.diff(lum, axis=0)) > EDGE_THRESHOLD
+            self._edges = edges
+        return self._edges
+
+    def contrast(self) -> float:
+        return float(self.luminance().std())
+
+    def text_density(self) -> float:
+        return float(self.edges().mean())
+
+    def margin_density(self, margin: float) -> tuple[float, str]:
+        """Edge density of the busiest `margin`-wide strip along one side, and which side."""
+        edges = self.edges()
+        h, w = edges.shape
+        mh, mw = max(1, round(h * margin)), max(1, round(w * margin))
+        strips = {
+            "top": edges[:mh],
+            "bottom": edges[h - mh:],
+            "left": edges[:, :mw],
+            "right": edges[:, w - mw:],
+        }
+        side = max(strips, key=lambda k: strips[k].mean())
+        return float(strips[side].mean()), side
+
+    def facts(self) -> dict:
+        out = {
+            "format": self.format,
+            "width": self.width,
+            "height": self.height,
+            "aspect_ratio": round(self.aspect_ratio, 4),
+            "contrast": None,
+            "text_density": None,
+        }
+        if self._luminance is not None:
+            out["contrast"] = round(self.contrast(), 4)
+            out["text_density"] = round(self.text_density(), 4)
+        return out
+
+
+def open_image(fp: IO[bytes]) -> "Image.Image":
+    from PIL import Image, UnidentifiedImageError
+
+    Image.MAX_IMAGE_PIXELS = config.FRUITFUL_CONTROL_IMAGE_MAX_PIXELS
+    try:
+        image = Image.open(fp, formats=ALLOWED_FORMATS)  # header only
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        raise ImageRejected(f"Unsupported or unreadable image (PNG, JPEG or WebP): {exc}") from exc
+    if image.width * image.height > config.FRUITFUL_CONTROL_IMAGE_MAX_PIXELS:
+        image.close()
+        raise ImageRejected(f"Image is too large ({image.width}x{image.height})")
+    return image
+
+
+def _check(analysis: ImageAnalysis, check: str, p: dict) -> list[str] | None:
+    """What violated the rule (quoted in its note), or None when it holds."""
+    if check == "aspect_ratio":
+        ratio = analysis.aspect_ratio
+        if ratio < p.get("min_ratio", 0) or ratio > p.get("max_ratio", float("inf")):
+            return [f"{ratio:.2f} ({analysis.width}x{analysis.height})"]
+    elif check == "min_size":
+        if analysis.width < p.get("min_width", 0) or analysis.height < p.get("min_height", 0):
+            return [f"{analysis.width}x{analysis.height}px"]
+    elif check == "contrast":
+        contrast = analysis.contrast()
+        if contrast < p["min_contrast"]:
+            return [f"contrast {contrast:.2f}"]
+    elif check == "text_density":
+        density = analysis.text_density()
+        if density > p["max_density"]:
+            return [f"density {density:.2f}"]
+    elif check == "safe_zone":
+        density, side = analysis.margin_density(p["margin"])
+        if density > p["max_density"]:
+            return [f"density {density:.2f} in the outer {p['margin']:.0%} at the {side}"]
+    return None
+
+
+def analyze_image(rule_set: CompiledRuleSet, fp: IO[bytes]) -> dict:
+    """Score one image against the image rules of a (client, "design") rule set."""
+    try:
+        with open_image(fp) as image:
+            analysis = ImageAnalysis(image)
+            if any(r.check in _PIXEL_CHECKS for r in rule_set.rules if r.type == "image"):
+                analysis.luminance()  # decode once, up front, so facts are always complete
+            hits = {}
+            for ri, rule in enumerate(rule_set.rules):
+                if rule.type == "image":
+                    found = _check(analysis, rule.check, rule.params)
+                    if found is not None:
+                        hits[ri] = found
+    except OSError as exc:  # truncated/corrupt data only shows up when pixels are decoded
+        raise ImageRejected(f"Unreadable image: {exc}") from exc
+    return {**rule_set.score(None, hits), "image": analysis.facts()}
+
+
+class DesignAnalyzer:
+    def __init__(self, cache_entries: int = config.FRUITFUL_CONTROL_IMAGE_CACHE_ENTRIES):
+        self.cache = ResultCache(cache_entries)
+
+    def evaluate(self, rule_set: CompiledRuleSet, fp: IO[bytes], *, snapshot_version: str | None = None) -> dict:
+        digest, _ = hash_upload(fp)
+        result = self.cache.get(rule_set.version, digest)
+        cached = result is not None
+        if not cached:
+            result = analyze_image(rule_set, fp)
+            self.cache.put(rule_set.version, digest, result)
+        return {
+            **result,
+            "client": rule_set.client,
+            "snapshot_version": snapshot_version,
+            "rules_version": rule_set.version,
+            "rule_sources": list(rule_set.sources),
+            "content_hash": digest,
+            "cached": cached,
+        }
+
+
+design_analyzer = DesignAnalyzer()
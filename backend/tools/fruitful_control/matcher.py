@@ -0,0 +1,129 @@
+# backend/tools/fruitful_control/matcher.py
+"""
+Multi-pattern matchers used by compiled rule sets.
+
+- PhraseMatcher: Aho–Corasick automaton over every phrase of every phrase rule
+  in a rule set. One pass over the text finds all of them, so the cost per pin
+  depends on the text length and the number of hits, not on how many phrases
+  the global + client lists hold. Matching is case-insensitive, treats runs of
+  whitespace as one space, and only accepts whole-word hits ("ad" does not
+  match inside "add").
+- RegexBundle: the structural regexes of a rule set. Plain "forbid" patterns are
+  also OR-ed into one prefilter regex, so the usual clean pin costs one C-level
+  search instead of one per rule; individual patterns only run after a hit.
+"""
+
+import re
+from typing import Iterable, Sequence
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    return _WS.sub(" ", text.casefold()).strip()
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class PhraseMatcher:
+    """Aho–Corasick over normalized phrases; `find(text)` returns indices of the phrases present."""
+
+    __slots__ = ("phrases", "_goto", "_fail", "_out", "_bounded")
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases: tuple[str, ...] = tuple(normalize_text(p) for p in phrases)
+        if any(not p for p in self.phrases):
+            raise ValueError("Rule config error: empty phrase")
+
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[int]] = [[]]
+        for idx, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(idx)
+
+        # Breadth-first failure links; each state also reports its suffixes' phrases.
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+        # (needs boundary before, needs boundary after) per phrase: only edges that are word chars.
+        self._bounded = tuple((_is_word_char(p[0]), _is_word_char(p[-1])) for p in self.phrases)
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def find(self, text: str, *, normalized: bool = False) -> set[int]:
+        text = text if normalized else normalize_text(text)
+        goto, fail, out, phrases, bounded = self._goto, self._fail, self._out, self.phrases, self._bounded
+        found: set[int] = set()
+        last = len(text) - 1
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for idx in out[state]:
+                if idx in found:
+                    continue
+                start = i - len(phrases[idx]) + 1
+                before, after = bounded[idx]
+                if before and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if after and i < last and _is_word_char(text[i + 1]):
+                    continue
+                found.add(idx)
+        return found
+
+
+# Numbered/named backreferences would point at the wrong group once patterns are OR-ed together.
+_BACKREF = re.compile(r"\\[1-9]|\(\?P=")
+
+
+class RegexBundle:
+    """Compiled regexes with an OR-ed prefilter over the `prefilterable` ones."""
+
+    __slots__ = ("patterns", "prefilter", "_prefiltered")
+
+    def __init__(self, patterns: Sequence[tuple[str, int]], prefilterable: Sequence[bool]):
+        self.patterns = tuple(re.compile(p, flags) for p, flags in patterns)
+        members = [
+            i for i, (ok, (p, _)) in enumerate(zip(prefilterable, patterns)) if ok and not _BACKREF.search(p)
+        ]
+        self.prefilter = None
+        parts = []
+        for i in members:
+            pattern, flags = patterns[i]
+            scoped = "".join(f for f, bit in (("i", re.I), ("m", re.M), ("s", re.S)) if flags & bit)
+            parts.append(f"(?{scoped}:{pattern})" if scoped else f"(?:{pattern})")
+        try:
+            self.prefilter = re.compile("|".join(parts)) if parts else None
+        except re.error:  # e.g. two patterns define the same group name; run them one by one
+            members = []
+        self._prefiltered = frozenset(members)
+
+    def prefiltered_clean(self, text: str) -> bool:
+        """True when no prefiltered pattern can match `text` (so those rules can be skipped)."""
+        return self.prefilter is not None and self.prefilter.search(text) is None
+
+    def is_prefiltered(self, index: int) -> bool:
+        return index in self._prefiltered
@@ -0,0 +1,258 @@
+# backend/tools/fruitful_control/repository.py
+"""
+Where rule documents come from, and how workers notice they changed.
+
+Two sources, picked by FRUITFUL_CONTROL_RULES_SOURCE:
+
+- FileRuleSource ("files", default): the JSON under data/, edited via PRs.
+- DbRuleSource ("db"): the append-only fruitful_control_rule_documents table,
+  edited without code through /admin/fruitful-control/rules. Every publish is
+  a new row, so the full history stays auditable; the current document for a
+  (layer, key) is its highest id, and max(id) is the library revision.
+
+Both expose a cheap `revision()` (a stat()/SELECT max(id)) and a full `load()`.
+RuleReloader polls `revision()` in the background and has the engine build a
+new snapshot off the request path when it moves (see engine.RuleEngine); QA
+requests only ever read the snapshot already in memory.
+"""
+
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Protocol
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+import config
+import models
+from db import SessionLocal
+from tools.fruitful_control.rules import (
+    DATA_DIR,
+    TASK_TYPES,
+    RuleLibrary,
+    build_library,
+    document_paths,
+    document_version,
+    load_library,
+    parse_document,
+    read_documents,
+)
+
+if TYPE_CHECKING:
+    from tools.fruitful_control.engine import RuleEngine
+
+logger = logging.getLogger(__name__)
+
+LAYERS = ("global", "task", "client")
+
+
+class RuleSource(Protocol):
+    name: str
+
+    def revision(self) -> str:
+        """Changes whenever load() would return something different (cheap; polled)."""
+
+    def load(self) -> tuple[str, RuleLibrary]:
+        """(revision, library) read consistently together."""
+
+
+class FileRuleSource:
+    name = "files"
+
+    def __init__(self, data_dir: Path = DATA_DIR):
+        self.data_dir = data_dir
+
+    def revision(self) -> str:
+        h = hashlib.sha256()
+        for path in document_paths(self.data_dir):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            h.update(f"{path.name}:{st.st_mtime_ns}:{st.st_size};".encode())
+        return h.hexdigest()[:12]
+
+    def load(self) -> tuple[str, RuleLibrary]:
+        revision = self.revision()
+        return revision, load_library(self.data_dir)
+
+
+class DbRuleSource:
+    name = "db"
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+
+    def revision(self) -> str:
+        db = self.session_factory()
+        try:
+            return f"r{db.scalar(select(func.max(models.FruitfulControlRuleDocument.id))) or 0}"
+        finally:
+            db.close()
+
+    def load(self) -> tuple[str, RuleLibrary]:
+        Doc = models.FruitfulControlRuleDocument
+        db = self.session_factory()
+        try:
+            head = db.scalar(select(func.max(Doc.id))) or 0
+            latest = (
+                select(func.max(Doc.id).label("id"))
+                .where(Doc.id <= head)
+                .group_by(Doc.layer, Doc.key)
+                .subquery()
+            )
+            rows = db.execute(
+                select(Doc.id, Doc.layer, Doc.key, Doc.body).join(latest, Doc.id == latest.c.id)
+            ).all()
+        finally:
+            db.close()
+
+        docs = {(r.layer, r.key): r for r in rows if r.body is not None}
+        if ("global", "global") not in docs:
+            raise ValueError("Rule config error in db: no global rules published")
+        return f"r{head}", build_library(
+            docs[("global", "global")].body,
+            {k: r.body for (layer, k), r in docs.items() if layer == "task"},
+            {k: r.body for (layer, k), r in docs.items() if layer == "client"},
+            where=lambda layer, key: f"db {layer}:{key}#{docs[(layer, key)].id}" if (layer, key) in docs else "db",
+        )
+
+
+def default_source() -> RuleSource:
+    if config.FRUITFUL_CONTROL_RULES_SOURCE == "db":
+        return DbRuleSource()
+    if config.FRUITFUL_CONTROL_RULES_SOURCE != "files":
+        raise RuntimeError("FRUITFUL_CONTROL_RULES_SOURCE must be 'files' or 'db'")
+    return FileRuleSource()
+
+
+# -----------------------------
+# Publishing (DB source)
+# -----------------------------
+
+
+def _check_address(layer: str, key: str) -> None:
+    if layer not in LAYERS:
+        raise ValueError(f"Rule config error in {layer}:{key}: layer must be one of {LAYERS}")
+    if layer == "global" and key != "global":
+        raise ValueError("Rule config error: the global document's key is 'global'")
+    if layer == "task" and key not in TASK_TYPES:
+        raise ValueError(f"Rule config error in task:{key}: task must be one of {TASK_TYPES}")
+
+
+def current_document(db: Session, layer: str, key: str) -> models.FruitfulControlRuleDocument | None:
+    Doc = models.FruitfulControlRuleDocument
+    return db.scalars(
+        select(Doc).where(Doc.layer == layer, Doc.key == key).order_by(Doc.id.desc()).limit(1)
+    ).first()
+
+
+def publish_document(
+        db: Session, layer: str, key: str, body: dict, *, published_by: str | None = None
+) -> tuple[models.FruitfulControlRuleDocument, bool]:
+    """Validate and append a new revision; (row, False) when the content is unchanged."""
+    _check_address(layer, key)
+    parse_document(body, layer=layer, key=key)  # raises "Rule config error ..." before anything is stored
+    version = document_version(body)
+
+    current = current_document(db, layer, key)
+    if current is not None and current.version == version:
+        return current, False
+    row = models.FruitfulControlRuleDocument(
+        layer=layer, key=key, version=version, body=body, published_by=published_by
+    )
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+    return row, True
+
+
+def retire_document(
+        db: Session, layer: str, key: str, *, published_by: str | None = None
+) -> models.FruitfulControlRuleDocument:
+    _check_address(layer, key)
+    if layer == "global":
+        raise ValueError("Rule config error: global rules can be edited but not retired")
+    current = current_document(db, layer, key)
+    if current is None or current.body is None:
+        raise LookupError(f"No published rules for {layer}:{key}")
+    row = models.FruitfulControlRuleDocument(layer=layer, key=key, version=None, body=None, published_by=published_by)
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+    return row
+
+
+def document_history(db: Session, layer: str, key: str, *, limit: int = 50) -> list[models.FruitfulControlRuleDocument]:
+    Doc = models.FruitfulControlRuleDocument
+    return list(
+        db.scalars(select(Doc).where(Doc.layer == layer, Doc.key == key).order_by(Doc.id.desc()).limit(limit))
+    )
+
+
+def import_files(db: Session, data_dir: Path = DATA_DIR, *, published_by: str | None = None) -> list[str]:
+    """Publish every document under data_dir; returns the "layer:key" of those that changed."""
+    global_raw, tasks_raw, clients_raw = read_documents(data_dir)
+    build_library(global_raw, tasks_raw, clients_raw)  # all-or-nothing: validate everything first
+    changed = []
+    docs = [("global", "global", global_raw)]
+    docs += [("task", k, v) for k, v in sorted(tasks_raw.items())]
+    docs += [("client", k, v) for k, v in sorted(clients_raw.items())]
+    for layer, key, body in docs:
+        _, was_changed = publish_document(db, layer, key, body, published_by=published_by)
+        if was_changed:
+            changed.append(f"{layer}:{key}")
+    return changed
+
+
+# -----------------------------
+# Background reload
+# -----------------------------
+
+
+class RuleReloader:
+    """Polls the engine's source revision and swaps in a new snapshot when it moves."""
+
+    def __init__(self, engine: "RuleEngine", *, interval: float = config.FRUITFUL_CONTROL_RULES_POLL_SECONDS):
+        self.engine = engine
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self.reloads = 0
+        self.errors = 0
+
+    async def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._stop = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="fruitful-control-rule-reloader")
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.interval)
+            except TimeoutError:
+                pass
+            if self._stop.is_set():
+                break
+            await self.poll()
+
+    async def poll(self) -> bool:
+        try:
+            changed = await asyncio.to_thread(self.engine.refresh)
+        except Exception:
+            # Keep serving the last good snapshot; a bad publish must not take QA down.
+            self.errors += 1
+            logger.exception("fruitful control: rule reload failed; keeping snapshot %s", self.engine.snapshot_version)
+            return False
+        if changed:
+            self.reloads += 1
+            logger.info("fruitful control: now serving rule snapshot %s", self.engine.snapshot_version)
+        return changed
@@ -0,0 +1,282 @@
+# backend/tools/fruitful_control/rules.py
+"""
+Rule documents for Fruitful Control text QA (spec: docs/tools/fruitful-control).
+
+Three kinds of JSON artifact, kept apart as the spec requires:
+
+    data/global.json             Layer A, applies to every client
+    data/tasks/<task_type>.json  task rules (title / description)
+    data/clients/<client>.json   Layer B, one profile per client
+
+Each has a "rules" list. A rule is one of:
+
+    {"id": "banned-phrases", "type": "phrases", "mode": "forbid", "phrases": [...]}
+    {"id": "cta", "type": "phrases", "mode": "require_any", "phrases": [...]}
+    {"id": "all-caps", "type": "regex", "mode": "forbid", "pattern": "...", "max_matches": 0}
+    {"id": "has-keyword", "type": "regex", "mode": "require", "pattern": "...", "ignore_case": true}
+    {"id": "title-length", "type": "length", "min_chars": 30, "max_chars": 100}
+    {"id": "pin-ratio", "type": "image", "check": "aspect_ratio", "min_ratio": 0.6, "max_ratio": 0.7}
+
+Image rules (design QA, see images.py) take the parameters listed in
+IMAGE_CHECKS for their "check". Every rule also has "severity" (S1/S2/S3/soft),
+optional "deduction" (soft only, 0.2-0.5), "task_types" (default: the title and
+description tasks for text rules, "design" for image rules), "note" ("{match}"
+is replaced with what was found)
+and optional "suggestion". Stable ids are namespaced by layer
+("global:banned-phrases", "task:title:length", "client:acme:no-slang"), so a
+client rule can add to but never replace a global one.
+
+A document's version is a hash of its canonical JSON, so identical content
+always gets the same version whatever the file timestamps say.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Mapping
+
+TASK_TYPES = ("title", "description", "design")
+TEXT_TASK_TYPES = ("title", "description")
+IMAGE_TASK_TYPES = ("design",)
+
+# check -> its parameters (all numeric; see images.py for what each measures).
+IMAGE_CHECKS = {
+    "aspect_ratio": ("min_ratio", "max_ratio"),  # width / height
+    "min_size": ("min_width", "min_height"),  # pixels
+    "contrast": ("min_contrast",),  # RMS luminance contrast, 0..1
+    "text_density": ("max_density",),  # share of the canvas that looks like text/detail, 0..1
+    "safe_zone": ("margin", "max_density"),  # margin as a share of each side; density of the busiest strip
+}
+_REQUIRED_PARAMS = {"contrast": 1, "text_density": 1, "safe_zone": 2}  # others need at least one
+
+# Spec "Rating System": fixed deductions for hard severities, a bounded one for soft.
+SEVERITY_DEDUCTIONS = {"S1": 3.0, "S2": 2.0, "S3": 1.0}
+SOFT_DEDUCTION_DEFAULT = 0.3
+SOFT_DEDUCTION_RANGE = (0.2, 0.5)
+
+_MODES = {
+    "phrases": ("forbid", "require_any"),
+    "regex": ("forbid", "require"),
+    "length": ("bounds",),
+    "image": ("check",),
+}
+_KEY = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    rule_id: str
+    type: str
+    mode: str
+    severity: str
+    deduction: float
+    note: str
+    task_types: frozenset[str]
+    phrases: tuple[str, ...] = ()
+    pattern: str | None = None
+    ignore_case: bool = False
+    max_matches: int = 0
+    min_chars: int | None = None
+    max_chars: int | None = None
+    suggestion: str | None = None
+    check: str | None = None
+    params: Mapping[str, float] | None = None
+
+    @property
+    def hard(self) -> bool:
+        return self.severity != "soft"
+
+
+@dataclass(frozen=True, slots=True)
+class RuleDocument:
+    layer: str  # "global" | "task" | "client"
+    key: str  # "global", the task type, or the client key
+    name: str
+    version: str
+    rules: tuple[Rule, ...]
+
+    @property
+    def source(self) -> str:
+        return f"{self.layer}:{self.key}@{self.version}" if self.layer != "global" else f"global@{self.version}"
+
+
+def _config_error(where: str, msg: str) -> ValueError:
+    return ValueError(f"Rule config error in {where}: {msg}")
+
+
+def parse_rule(raw: Mapping, *, prefix: str, where: str) -> Rule:
+    rule_key = raw.get("id")
+    if not isinstance(rule_key, str) or not _KEY.match(rule_key):
+        raise _config_error(where, f"invalid rule id {rule_key!r}")
+    rule_id = f"{prefix}:{rule_key}"
+    where = f"{where} ({rule_id})"
+
+    type_ = raw.get("type")
+    if type_ not in _MODES:
+        raise _config_error(where, f"unknown type {type_!r}")
+    mode = raw.get("mode", _MODES[type_][0])
+    if mode not in _MODES[type_]:
+        raise _config_error(where, f"mode must be one of {_MODES[type_]}")
+
+    severity = raw.get("severity")
+    if severity in SEVERITY_DEDUCTIONS:
+        if "deduction" in raw:
+            raise _config_error(where, "deduction is fixed for hard severities")
+        deduction = SEVERITY_DEDUCTIONS[severity]
+    elif severity == "soft":
+        deduction = float(raw.get("deduction", SOFT_DEDUCTION_DEFAULT))
+        lo, hi = SOFT_DEDUCTION_RANGE
+        if not lo <= deduction <= hi:
+            raise _config_error(where, f"soft deduction must be within {lo}..{hi}")
+    else:
+        raise _config_error(where, f"severity must be S1, S2, S3 or soft, got {severity!r}")
+
+    allowed = IMAGE_TASK_TYPES if type_ == "image" else TEXT_TASK_TYPES
+    task_types = frozenset(raw.get("task_types") or allowed)
+    if not task_types <= set(allowed):
+        raise _config_error(where, f"task_types must be within {allowed} for {type_} rules")
+
+    fields: dict = {}
+    if type_ == "phrases":
+        phrases = raw.get("phrases")
+        if not phrases or not all(isinstance(p, str) and p.strip() for p in phrases):
+            raise _config_error(where, "phrases must be a non-empty list of strings")
+        fields["phrases"] = tuple(phrases)
+    elif type_ == "regex":
+        pattern = raw.get("pattern")
+        try:
+            re.compile(pattern, re.I if raw.get("ignore_case") else 0)
+        except (re.error, TypeError) as exc:
+            raise _config_error(where, f"bad pattern: {exc}")
+        fields.update(
+            pattern=pattern,
+            ignore_case=bool(raw.get("ignore_case", False)),
+            max_matches=int(raw.get("max_matches", 0)),
+        )
+    elif type_ == "image":
+        check = raw.get("check")
+        if check not in IMAGE_CHECKS:
+            raise _config_error(where, f"check must be one of {sorted(IMAGE_CHECKS)}")
+        params = {}
+        for name in IMAGE_CHECKS[check]:
+            value = raw.get(name)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise _config_error(where, f"{name} must be a non-negative number")
+            params[name] = float(value)
+        if len(params) < _REQUIRED_PARAMS.get(check, 1):
+            joiner = " and " if check in _REQUIRED_PARAMS else " and/or "
+            raise _config_error(where, f"{check} needs {joiner.join(IMAGE_CHECKS[check])}")
+        if check == "safe_zone" and not 0 < params["margin"] < 0.5:
+            raise _config_error(where, "safe_zone margin must be between 0 and 0.5")
+        fields.update(check=check, params=params)
+    else:
+        min_chars, max_chars = raw.get("min_chars"), raw.get("max_chars")
+        if min_chars is None and max_chars is None:
+            raise _config_error(where, "length rules need min_chars and/or max_chars")
+        fields.update(min_chars=min_chars, max_chars=max_chars)
+
+    note = raw.get("note") or f"{rule_key} rule not met"
+    return Rule(
+        rule_id=rule_id,
+        type=type_,
+        mode=mode,
+        severity=severity,
+        deduction=deduction,
+        note=note,
+        task_types=task_types,
+        suggestion=raw.get("suggestion"),
+        **fields,
+    )
+
+
+def document_version(raw: Mapping) -> str:
+    canonical = json.dumps(raw, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:12]
+
+
+def parse_document(raw: Mapping, *, layer: str, key: str, where: str = "") -> RuleDocument:
+    where = where or f"{layer}:{key}"
+    if layer != "global" and not _KEY.match(key):
+        raise _config_error(where, f"invalid {layer} key {key!r}")
+    prefix = "global" if layer == "global" else f"{layer}:{key}"
+    rules = tuple(parse_rule(r, prefix=prefix, where=where) for r in raw.get("rules") or ())
+    ids = [r.rule_id for r in rules]
+    if len(ids) != len(set(ids)):
+        raise _config_error(where, "duplicate rule ids")
+    return RuleDocument(
+        layer=layer,
+        key=key,
+        name=str(raw.get("name") or key),
+        version=document_version(raw),
+        rules=rules,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class RuleLibrary:
+    """Every rule document, as loaded together."""
+
+    global_rules: RuleDocument
+    tasks: Mapping[str, RuleDocument]
+    clients: Mapping[str, RuleDocument]
+
+
+def build_library(
+        global_raw: Mapping,
+        tasks_raw: Mapping[str, Mapping],
+        clients_raw: Mapping[str, Mapping],
+        *,
+        where: Callable[[str, str], str] = lambda layer, key: f"{layer}:{key}",
+) -> RuleLibrary:
+    """Parse raw documents (as stored in files or DB rows) into a RuleLibrary."""
+    unknown = set(tasks_raw) - set(TASK_TYPES)
+    if unknown:
+        raise _config_error(where("task", "*"), f"unknown task types {sorted(unknown)}")
+    return RuleLibrary(
+        global_rules=parse_document(global_raw, layer="global", key="global", where=where("global", "global")),
+        tasks={
+            k: parse_document(tasks_raw[k], layer="task", key=k, where=where("task", k)) for k in sorted(tasks_raw)
+        },
+        clients={
+            k: parse_document(clients_raw[k], layer="client", key=k, where=where("client", k))
+            for k in sorted(clients_raw)
+        },
+    )
+
+
+def document_paths(data_dir: Path = DATA_DIR) -> list[Path]:
+    return [
+        data_dir / "global.json",
+        *sorted((data_dir / "tasks").glob("*.json")),
+        *sorted((data_dir / "clients").glob("*.json")),
+    ]
+
+
+def read_documents(data_dir: Path = DATA_DIR) -> tuple[dict, dict[str, dict], dict[str, dict]]:
+    """(global, {task type: raw}, {client: raw}) as found under data_dir."""
+
+    def read(path: Path) -> dict:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise _config_error(str(path), str(exc))
+
+    return (
+        read(data_dir / "global.json"),
+        {p.stem: read(p) for p in sorted((data_dir / "tasks").glob("*.json"))},
+        {p.stem: read(p) for p in sorted((data_dir / "clients").glob("*.json"))},
+    )
+
+
+def load_library(data_dir: Path = DATA_DIR) -> RuleLibrary:
+    paths = {"global": data_dir / "global.json", "task": data_dir / "tasks", "client": data_dir / "clients"}
+    return build_library(
+        *read_documents(data_dir),
+        where=lambda layer, key: str(paths[layer] if layer == "global" else paths[layer] / f"{key}.json"),
+    )
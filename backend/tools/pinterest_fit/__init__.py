@@ -0,0 +1,10 @@
+"""Pinterest Fit Assessment scoring engine (port of frontend/lib/tools/pinterestFit)."""
+
+from tools.pinterest_fit.engine import (
+    RULES_VERSION,
+    normalize_answers,
+    score_assessment,
+    score_normalized,
+)
+
+__all__ = ["RULES_VERSION", "normalize_answers", "score_assessment", "score_normalized"]
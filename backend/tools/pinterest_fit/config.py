@@ -0,0 +1,103 @@
+# backend/tools/pinterest_fit/config.py
+"""
+Scoring config — port of frontend/lib/tools/pinterestFit/config.ts + option scores
+from questions.ts. Copy (labels, reasons text, CTAs) stays in the frontend.
+"""
+
+from types import MappingProxyType
+
+MAX_SCORE = 25
+
+# (outcome, min_score, max_score), checked in order
+OUTCOME_SCORE_BANDS = (
+    ("strong_fit", 18, 25),
+    ("possible_fit", 10, 17),
+    ("not_right_now", 0, 9),
+)
+
+POSITIVE_REASON_PRIORITY = (
+    "category",
+    "offer",
+    "assets",
+    "website",
+    "support_readiness",
+    "ads_openness",
+    "goal",
+)
+
+BLOCKER_REASON_PRIORITY = (
+    "website",
+    "assets",
+    "offer",
+    "support_readiness",
+    "ads_openness",
+    "category",
+    "goal",
+)
+
+NOT_RIGHT_NOW_FALLBACK_PRIORITY = (
+    "goal",
+    "support_readiness",
+    "ads_openness",
+    "category",
+    "offer",
+    "assets",
+    "website",
+)
+
+ROLE_PRIORITY_ORDER = (
+    "not_priority_yet",
+    "sales_with_ads_support",
+    "warm_audience_support",
+    "discovery_traffic",
+    "selective_test_channel",
+    "organic_first_ads_later",
+    "foundation_first",
+)
+
+# question id -> (stored score field, {answer value: score})
+OPTION_SCORES = MappingProxyType(
+    {
+        "q1": (
+            "q1_category_fit",
+            MappingProxyType(
+                {
+                    "home_decor": 4,
+                    "diy_home_improvement": 4,
+                    "beauty_skincare": 4,
+                    "food_beverage_cpg": 4,
+                    "baby_family_products": 4,
+                    "fashion_accessories": 3,
+                    "gifts_stationery_party": 3,
+                    "jewelry_handmade_goods": 3,
+                    "health_wellness_products": 2,
+                    "other": 1,
+                }
+            ),
+        ),
+        "q2": (
+            "q2_offer_proven",
+            MappingProxyType({"very_proven": 4, "somewhat_proven": 3, "early": 1, "not_proven_yet": 0}),
+        ),
+        "q3": (
+            "q3_assets",
+            MappingProxyType({"strong": 4, "decent": 3, "limited": 1, "weak": 0}),
+        ),
+        "q4": (
+            "q4_website",
+            MappingProxyType({"ready": 4, "mostly_ready": 3, "somewhat_ready": 1, "not_ready": 0}),
+        ),
+        "q5": (
+            "q5_goal_fit",
+            MappingProxyType({"discovery": 3, "traffic": 3, "launches": 3, "retargeting": 3, "sales": 2}),
+        ),
+        "q6": (
+            "q6_support_readiness",
+            MappingProxyType({"ready_now": 3, "open_start_lean": 2, "maybe_later": 1, "just_exploring": 0}),
+        ),
+        "q7": (
+            "q7_ads_openness",
+            MappingProxyType({"very_open": 3, "somewhat_open": 2, "unsure": 1, "not_open": 0}),
+        ),
+    }
+)
@@ -0,0 +1,252 @@
+# backend/tools/pinterest_fit/engine.py
+"""
+Pinterest Fit Assessment scoring — port of frontend/lib/tools/pinterestFit/engine.ts.
+
+Produces the deterministic, copy-free part of the result (score, outcomes,
+reason keys, role, guardrails) so stored leads can be re-scored server-side.
+"""
+
+from typing import Mapping
+
+from tools.pinterest_fit.config import (
+    BLOCKER_REASON_PRIORITY,
+    MAX_SCORE,
+    NOT_RIGHT_NOW_FALLBACK_PRIORITY,
+    OPTION_SCORES,
+    OUTCOME_SCORE_BANDS,
+    POSITIVE_REASON_PRIORITY,
+    ROLE_PRIORITY_ORDER,
+)
+
+# Bump whenever scoring config or rules change; recompute jobs use it to find stale rows.
+RULES_VERSION = "pinterest_fit@2026-04-09"
+
+FOUNDATION_SIGNALS = ("offer", "assets", "website")
+READINESS_INTENT_SIGNALS = ("support_readiness", "ads_openness", "goal")
+
+_SIGNAL_FIELD = {
+    "category": "q1_category_fit",
+    "offer": "q2_offer_proven",
+    "assets": "q3_assets",
+    "website": "q4_website",
+    "goal": "q5_goal_fit",
+    "support_readiness": "q6_support_readiness",
+    "ads_openness": "q7_ads_openness",
+}
+
+_REASON_BY_SCORE = {
+    "category": {4: "reason_category_strong", 3: "reason_category_good", 2: "reason_category_maybe", 1: "reason_category_weak"},
+    "offer": {4: "reason_offer_proven", 3: "reason_offer_some_traction", 1: "reason_offer_early", 0: "reason_offer_unproven"},
+    "assets": {4: "reason_assets_strong", 3: "reason_assets_decent", 1: "reason_assets_limited", 0: "reason_assets_weak"},
+    "website": {4: "reason_site_ready", 3: "reason_site_solid", 1: "reason_site_friction", 0: "reason_site_not_ready"},
+    "support_readiness": {
+        3: "reason_support_ready",
+        2: "reason_support_open",
+        1: "reason_support_cautious",
+        0: "reason_support_not_committed",
+    },
+    "ads_openness": {3: "reason_ads_open", 2: "reason_ads_later", 1: "reason_ads_unsure", 0: "reason_ads_not_open"},
+}
+
+_GOAL_REASON = {
+    "discovery": "reason_goal_discovery",
+    "traffic": "reason_goal_traffic",
+    "launches": "reason_goal_launches",
+    "retargeting": "reason_goal_retargeting",
+    "sales": "reason_goal_sales_caution",
+}
+
+# signal -> (positive threshold, blocker threshold) on the stored score
+_THRESHOLDS = {
+    "category": (3, 2),
+    "offer": (3, 1),
+    "assets": (3, 1),
+    "website": (3, 1),
+    "support_readiness": (2, 1),
+    "ads_openness": (2, 1),
+}
+
+
+def normalize_answers(answers: Mapping[str, str]) -> dict:
+    """Map raw answer values (q1..q7) to stored scores + q5_goal_type. Raises ValueError on unknown values."""
+    normalized: dict = {}
+    for qid, (field, scores) in OPTION_SCORES.items():
+        value = answers.get(qid)
+        if value not in scores:
+            raise ValueError(f'Unknown Pinterest Fit answer value "{value}" for {qid}.')
+        normalized[field] = scores[value]
+    normalized["q5_goal_type"] = answers["q5"]
+    return normalized
+
+
+def _base_outcome(score: int) -> str:
+    for outcome, min_score, max_score in OUTCOME_SCORE_BANDS:
+        if min_score <= score <= max_score:
+            return outcome
+    raise ValueError(f'Pinterest Fit score "{score}" fell outside configured outcome bands.')
+
+
+def _apply_guardrails(n: Mapping, base_outcome: str) -> tuple[str, list[str]]:
+    triggered: list[str] = []
+    final_outcome = base_outcome
+
+    if n["q5_goal_type"] == "sales" and n["q6_support_readiness"] <= 1 and n["q7_ads_openness"] <= 1:
+        triggered.append("guardrail_a")
+        if final_outcome == "strong_fit":
+            final_outcome = "possible_fit"
+
+    if n["q3_assets"] == 0 and n["q4_website"] == 0:
+        triggered.append("guardrail_b")
+        final_outcome = "not_right_now"
+
+    if n["q1_category_fit"] == 1 and n["q2_offer_proven"] <= 1:
+        triggered.append("guardrail_c")
+        final_outcome = "not_right_now"
+
+    return final_outcome, triggered
+
+
+def _evaluate_signals(n: Mapping) -> dict[str, dict]:
+    evaluations = {}
+    for signal in POSITIVE_REASON_PRIORITY:
+        score = n[_SIGNAL_FIELD[signal]]
+        if signal == "goal":
+            reason_key = _GOAL_REASON[n["q5_goal_type"]]
+            is_positive = n["q5_goal_type"] != "sales"
+            is_blocker = not is_positive
+        else:
+            reason_key = _REASON_BY_SCORE[signal].get(score)
+            if reason_key is None:
+                raise ValueError(f'Unsupported Pinterest Fit {signal} score "{score}".')
+            positive_min, blocker_max = _THRESHOLDS[signal]
+            is_positive = score >= positive_min
+            is_blocker = score <= blocker_max
+        evaluations[signal] = {
+            "score": score,
+            "reason_key": reason_key,
+            "is_positive": is_positive,
+            "is_blocker": is_blocker,
+            "is_moderate": not is_positive and not is_blocker,
+        }
+    return evaluations
+
+
+def _highest_scoring(evaluations: Mapping, priority: tuple[str, ...]) -> str:
+    best = priority[0]
+    for signal in priority:
+        if evaluations[signal]["score"] > evaluations[best]["score"]:
+            best = signal
+    return best
+
+
+def _possible_fit_signals(evaluations: Mapping) -> list[str]:
+    selected: list[str] = []
+    positives = [s for s in POSITIVE_REASON_PRIORITY if evaluations[s]["is_positive"]]
+    moderates = [s for s in POSITIVE_REASON_PRIORITY if evaluations[s]["is_moderate"]]
+
+    for signal in (*positives, *moderates, *POSITIVE_REASON_PRIORITY):
+        if len(selected) == 2:
+            break
+        if signal not in selected:
+            selected.append(signal)
+
+    blocker = next(
+        (s for s in BLOCKER_REASON_PRIORITY if evaluations[s]["is_blocker"] and s not in selected),
+        None,
+    )
+    if blocker is None:
+        blocker = next((s for s in BLOCKER_REASON_PRIORITY if s not in selected), None)
+        if blocker is None:
+            raise ValueError("Pinterest Fit possible-fit reason selection could not resolve a third reason.")
+    selected.append(blocker)
+    return selected
+
+
+def _not_right_now_signals(evaluations: Mapping) -> list[str]:
+    selected = [s for s in BLOCKER_REASON_PRIORITY if evaluations[s]["is_blocker"]][:3]
+
+    if len(selected) < 3:
+        fallback_index = {s: i for i, s in enumerate(NOT_RIGHT_NOW_FALLBACK_PRIORITY)}
+        remaining = sorted(
+            (s for s in POSITIVE_REASON_PRIORITY if s not in selected),
+            key=lambda s: (evaluations[s]["score"], fallback_index[s]),
+        )
+        selected.extend(remaining[: 3 - len(selected)])
+
+    if len(selected) != 3:
+        raise ValueError("Pinterest Fit not-right-now reason selection did not resolve exactly three reasons.")
+    return selected
+
+
+def _matches_role(role: str, n: Mapping, final_outcome: str) -> bool:
+    goal = n["q5_goal_type"]
+    if role == "not_priority_yet":
+        return final_outcome == "not_right_now"
+    if role == "sales_with_ads_support":
+        return goal == "sales" and n["q2_offer_proven"] >= 3 and n["q4_website"] >= 3 and n["q7_ads_openness"] >= 2
+    if role == "warm_audience_support":
+        return goal == "retargeting" and final_outcome != "not_right_now"
+    if role == "discovery_traffic":
+        return (
+            n["q1_category_fit"] >= 3
+            and n["q3_assets"] >= 3
+            and n["q4_website"] >= 3
+            and goal in ("discovery", "traffic")
+        )
+    if role == "selective_test_channel":
+        return (
+            n["q1_category_fit"] <= 2
+            and n["q2_offer_proven"] >= 3
+            and n["q3_assets"] >= 3
+            and n["q4_website"] >= 3
+            and goal in ("discovery", "traffic", "launches")
+            and final_outcome != "not_right_now"
+        )
+    if role == "organic_first_ads_later":
+        return (
+            n["q1_category_fit"] >= 3
+            and n["q3_assets"] >= 1
+            and n["q4_website"] >= 1
+            and goal in ("discovery", "traffic", "launches")
+        )
+    if role == "foundation_first":
+        return final_outcome != "not_right_now"
+    raise ValueError(f"Unknown Pinterest Fit role {role!r}")
+
+
+def score_normalized(n: Mapping) -> dict:
+    """Score already-normalized (stored) answers."""
+    score = sum(n[field] for field in _SIGNAL_FIELD.values())
+    base_outcome = _base_outcome(score)
+    final_outcome, triggered = _apply_guardrails(n, base_outcome)
+    evaluations = _evaluate_signals(n)
+
+    if final_outcome == "strong_fit":
+        signals = [
+            "category",
+            _highest_scoring(evaluations, FOUNDATION_SIGNALS),
+            _highest_scoring(evaluations, READINESS_INTENT_SIGNALS),
+        ]
+    elif final_outcome == "possible_fit":
+        signals = _possible_fit_signals(evaluations)
+    else:
+        signals = _not_right_now_signals(evaluations)
+
+    role_key = next((r for r in ROLE_PRIORITY_ORDER if _matches_role(r, n, final_outcome)), None)
+    if role_key is None:
+        raise ValueError("Pinterest Fit role resolution failed to match a role.")
+
+    return {
+        "score": score,
+        "max_score": MAX_SCORE,
+        "base_outcome": base_outcome,
+        "final_outcome": final_outcome,
+        "reason_keys": [evaluations[s]["reason_key"] for s in signals],
+        "role_key": role_key,
+        "triggered_guardrails": triggered,
+    }
+
+
+def score_assessment(answers: Mapping[str, str]) -> dict:
+    """Score raw answers (q1..q7 option values), like scorePinterestFitAssessment()."""
+    return score_normalized(normalize_answers(answers))
@@ -0,0 +1,45 @@
+# backend/tools/pinterest_fit/mailerlite.py
+"""
+MailerLite lead mapping — port of frontend/lib/tools/pinterestFit/mailerLite.ts.
+
+The payload is stored with each field's fallback key. At delivery time the
+MailerLite provider (lead_delivery.py) looks the real key up by field name,
+creating the field when it is missing, and fails the delivery unless MailerLite
+echoes back every field it was sent.
+"""
+
+LEAD_SOURCE = "Pinterest Fit Assessment"
+
+RESULT_LABELS = (
+    "Strong Pinterest Fit",
+    "Possible Pinterest Fit",
+    "Not the Right Fit Right Now",
+)
+
+# lead attribute -> (MailerLite custom field name, fallback key)
+FIELDS = {
+    "result": ("Pinterest Fit Result", "pinterest_fit_result"),
+    "top_reason_1": ("Top Reason 1", "top_reason_1"),
+    "top_reason_2": ("Top Reason 2", "top_reason_2"),
+    "top_reason_3": ("Top Reason 3", "top_reason_3"),
+    "pinterest_role": ("Pinterest Role", "pinterest_role"),
+    "recommended_next_step": ("Recommended Next Step", "recommended_next_step"),
+    "source": ("Lead Source", "lead_source"),
+}
+
+# fallback key -> field name, for the provider's lookup
+FIELD_NAMES = {key: name for name, key in FIELDS.values()}
+
+
+def build_subscriber_payload(email: str, group_id: str, lead: dict) -> dict:
+    """Body for POST /subscribers (upsert). Empty optional fields are left out, like the route did."""
+    fields = {
+        key: str(lead[attr]).strip()
+        for attr, (_, key) in FIELDS.items()
+        if lead.get(attr) and str(lead[attr]).strip()
+    }
+    return {
+        "email": email.strip().lower(),
+        "groups": [group_id],
+        "fields": fields,
+    }
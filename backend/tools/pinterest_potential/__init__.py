@@ -0,0 +1,9 @@
+"""Pinterest Potential calculator engine (port of frontend/lib/tools/pinterestPotential)."""
+
+from tools.pinterest_potential.compute import (
+    RULES_VERSION,
+    compute_results,
+    compute_results_batch,
+)
+
+__all__ = ["RULES_VERSION", "compute_results", "compute_results_batch"]
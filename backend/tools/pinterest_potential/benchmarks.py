@@ -0,0 +1,556 @@
+# backend/tools/pinterest_potential/benchmarks.py
+"""
+Benchmarks (segment + niche) — port of frontend/lib/tools/pinterestPotential/benchmarks.ts.
+
+Source of truth for:
+- demand_base_sessions (range; MACRO, SESSIONS/month)
+- income (range)
+- inferred indices (seasonality + competition) + optional notes/tags
+
+The table is built once at import into frozen rows behind a read-only
+(segment, niche) index, and fails loud on invalid config (same as the TS module).
+See the TS file for the demand model rationale; the numbers here must stay in sync
+(tests/test_pinterest_potential_parity.py guards this).
+"""
+
+import math
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+
+@dataclass(frozen=True, slots=True)
+class Range:
+    low: float
+    high: float
+
+    def as_dict(self) -> dict:
+        return {"low": self.low, "high": self.high}
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkRow:
+    segment: str
+    niche: str
+    demand_base_sessions: Range
+    income: Range
+    seasonality: str
+    competition: str
+    notes: Mapping[str, str]
+    tags: tuple[str, ...]
+
+
+def round_int(n: float) -> int:
+    """Match JS Math.round (ties go towards +infinity, unlike Python's round())."""
+    floor = math.floor(n)
+    return floor + 1 if n - floor >= 0.5 else floor
+
+
+# -----------------------------
+# Global anchors (US/CA)
+# -----------------------------
+
+PINTEREST_USCA_MAU_CEILING = 102_000_000
+PRACTICAL_ACTIVE_USER_FRACTION = 0.003  # 0.3%
+AVG_SESSIONS_PER_PRACTICAL_USER_PER_MONTH = 4
+
+PRACTICAL_USERS_USCA_POOL = round_int(
+    PINTEREST_USCA_MAU_CEILING * PRACTICAL_ACTIVE_USER_FRACTION
+)  # 306,000
+PRACTICAL_SESSIONS_USCA_POOL = round_int(
+    PRACTICAL_USERS_USCA_POOL * AVG_SESSIONS_PER_PRACTICAL_USER_PER_MONTH
+)  # 1,224,000
+
+# -----------------------------
+# Niche penetration (monthly)
+# -----------------------------
+
+NICHE_PENETRATION: Mapping[str, Range] = MappingProxyType(
+    {
+        # Content creator niches
+        "food": Range(0.35, 0.55),
+        "travel": Range(0.15, 0.30),
+        "home_diy": Range(0.25, 0.40),
+        "lifestyle": Range(0.20, 0.35),
+        "finance": Range(0.08, 0.15),
+        "wellness": Range(0.20, 0.35),
+        "parenting": Range(0.15, 0.25),
+        "beauty_fashion": Range(0.25, 0.40),
+        "crafts": Range(0.15, 0.25),
+        # Product seller niches
+        "baby_family": Range(0.12, 0.22),
+        "home_decor": Range(0.25, 0.40),
+        "beauty": Range(0.18, 0.32),
+        "fashion": Range(0.18, 0.32),
+        "food_bev": Range(0.20, 0.35),
+        "digital_crafts": Range(0.12, 0.22),
+        "pets": Range(0.10, 0.18),
+        "travel_gear": Range(0.06, 0.12),
+        # Service provider niches
+        "agency": Range(0.03, 0.08),
+        "coach": Range(0.04, 0.10),
+        "designer": Range(0.06, 0.14),
+        "photo_video": Range(0.06, 0.14),
+        "wellness_practitioner": Range(0.06, 0.12),
+        "real_estate_home": Range(0.08, 0.16),
+        "educator": Range(0.08, 0.18),
+        "events": Range(0.08, 0.18),
+        # Catch-all
+        "other": Range(0.05, 0.12),
+    }
+)
+
+# -----------------------------
+# Segment multipliers
+# -----------------------------
+
+SEGMENT_MULTIPLIER: Mapping[str, Range] = MappingProxyType(
+    {
+        "content_creator": Range(0.8, 1.15),
+        "product_seller": Range(0.55, 0.95),
+        "service_provider": Range(0.2, 0.6),
+    }
+)
+
+
+# -----------------------------
+# Helpers (fail-loud)
+# -----------------------------
+
+
+def _must_finite_non_neg_int(n: float, label: str) -> int:
+    if not math.isfinite(n):
+        raise ValueError(f"Benchmarks config error: {label} must be finite, got {n}")
+    if n < 0:
+        raise ValueError(f"Benchmarks config error: {label} must be >= 0, got {n}")
+    return round_int(n)
+
+
+def demand_base_sessions_for(segment: str, niche: str) -> Range:
+    """
+    Compute demand_base_sessions from the macro session pool,
+    niche penetration and segment multiplier.
+
+    Low = conservative * conservative. High = optimistic * optimistic.
+    """
+    pen = NICHE_PENETRATION[niche]
+    seg = SEGMENT_MULTIPLIER[segment]
+
+    low = PRACTICAL_SESSIONS_USCA_POOL * pen.low * seg.low
+    high = PRACTICAL_SESSIONS_USCA_POOL * pen.high * seg.high
+
+    return Range(
+        low=_must_finite_non_neg_int(low, f"demand_base_sessions_for({segment},{niche}).low"),
+        high=_must_finite_non_neg_int(high, f"demand_base_sessions_for({segment},{niche}).high"),
+    )
+
+
+def _row(
+        segment: str,
+        niche: str,
+        *,
+        income: tuple[int, int],
+        seasonality: str,
+        competition: str,
+        tags: tuple[str, ...],
+        notes: dict[str, str] | None = None,
+) -> BenchmarkRow:
+    return BenchmarkRow(
+        segment=segment,
+        niche=niche,
+        demand_base_sessions=demand_base_sessions_for(segment, niche),
+        income=Range(*income),
+        seasonality=seasonality,
+        competition=competition,
+        notes=MappingProxyType(dict(notes or {})),
+        tags=tags,
+    )
+
+
+# -----------------------------
+# Canonical benchmark table
+# -----------------------------
+
+BENCHMARKS: tuple[BenchmarkRow, ...] = (
+    # -----------------------------
+    # Content creator
+    # -----------------------------
+    _row(
+        "content_creator",
+        "food",
+        income=(55_000, 110_000),
+        seasonality="medium",
+        competition="high",
+        notes={
+            "seasonality": "Spikes around holidays + seasonal recipes—batch content early.",
+            "competition": "Crowded niche—strong SEO angles and fresh visuals win distribution.",
+        },
+        tags=("evergreen", "seasonal", "competitive"),
+    ),
+    _row(
+        "content_creator",
+        "travel",
+        income=(65_000, 120_000),
+        seasonality="high",
+        competition="high",
+        notes={
+            "seasonality": "Planning spikes around holidays and peak travel seasons.",
+            "competition": "High saturation—fresh angles + intent-matched landing pages matter.",
+        },
+        tags=("seasonal", "competitive"),
+    ),
+    _row(
+        "content_creator",
+        "home_diy",
+        income=(60_000, 115_000),
+        seasonality="medium",
+        competition="medium",
+        notes={
+            "seasonality": "Renovation and refresh seasons (spring/fall) tend to lift demand.",
+            "competition": "Moderate competition—clear tutorials and before/after creative help.",
+        },
+        tags=("evergreen",),
+    ),
+    _row(
+        "content_creator",
+        "lifestyle",
+        income=(55_000, 105_000),
+        seasonality="low",
+        competition="high",
+        notes={
+            "seasonality": "Less seasonal overall—consistent posting compounds results.",
+            "competition": "Broad niche—sharp positioning and keyword clusters help you stand out.",
+        },
+        tags=("broad",),
+    ),
+    _row(
+        "content_creator",
+        "finance",
+        income=(70_000, 140_000),
+        seasonality="low",
+        competition="medium",
+        notes={
+            "seasonality": "Peaks around tax season and major life events—plan ahead for those windows.",
+            "competition": "Moderate competition—trust signals and clear steps increase clicks.",
+        },
+        tags=("evergreen", "high-intent"),
+    ),
+    _row(
+        "content_creator",
+        "wellness",
+        income=(55_000, 115_000),
+        seasonality="medium",
+        competition="high",
+        notes={
+            "seasonality": "New-year resets + summer prep tend to lift searches.",
+            "competition": "Crowded space—specific problems + friendly visuals perform best.",
+        },
+        tags=("seasonal", "competitive"),
+    ),
+    _row(
+        "content_creator",
+        "parenting",
+        income=(55_000, 115_000),
+        seasonality="medium",
+        competition="high",
+        notes={
+            "seasonality": "Back-to-school and holidays create predictable planning surges.",
+            "competition": "High competition—practical checklists and “how-to” pins drive clicks.",
+        },
+        tags=("seasonal", "competitive"),
+    ),
+    _row(
+        "content_creator",
+        "beauty_fashion",
+        income=(55_000, 115_000),
+        seasonality="high",
+        competition="high",
+        notes={
+            "seasonality": "Trends + event seasons (weddings/holidays) drive spikes.",
+            "competition": "Highly saturated—trend keywords + clean visuals are key.",
+        },
+        tags=("trend", "seasonal", "competitive"),
+    ),
+    _row(
+        "content_creator",
+        "crafts",
+        income=(50_000, 105_000),
+        seasonality="high",
+        competition="medium",
+        notes={
+            "seasonality": "Holiday projects + seasonal decor drive predictable surges.",
+            "competition": "Moderate—step-by-step visuals and supply lists increase saves/clicks.",
+        },
+        tags=("seasonal", "how-to"),
+    ),
+    _row(
+        "content_creator",
+        "other",
+        income=(50_000, 105_000),
+        seasonality="medium",
+        competition="medium",
+        notes={
+            "seasonality": "Most niches have predictable planning windows—use your editorial calendar.",
+            "competition": "Positioning + SEO clusters matter more than volume alone.",
+        },
+        tags=("other",),
+    ),
+
+    # -----------------------------
+    # Product seller
+    # -----------------------------
+    _row(
+        "product_seller",
+        "baby_family",
+        income=(60_000, 120_000),
+        seasonality="medium",
+        competition="high",
+        notes={
+            "seasonality": "Registries, milestones, and gifting seasons create planning spikes.",
+            "competition": "Crowded category—product education + trust signals improve conversion.",
+        },
+        tags=("gifting", "competitive"),
+    ),
+    _row(
+        "product_seller",
+        "home_decor",
+        income=(60_000, 130_000),
+        seasonality="high",
+        competition="high",
+        notes={
+            "seasonality": "Refresh seasons + holidays drive planning (spring/fall + Q4).",
+            "competition": "High saturation—strong creative variety and landing-page clarity matter.",
+        },
+        tags=("seasonal", "competitive"),
+    ),
+    _row(
+        "product_seller",
+        "beauty",
+        income=(55_000, 125_000),
+        seasonality="high",
+        competition="high",
+        notes={
+            "seasonality": "Event seasons and gifting windows lift demand.",
+            "competition": "Very competitive—benefit-led creatives and reviews help.",
+        },
+        tags=("trend", "competitive"),
+    ),
+    _row(
+        "product_seller",
+        "fashion",
+        income=(55_000, 125_000),
+        seasonality="high",
+        competition="high",
+        notes={
+            "seasonality": "Season changes + events drive spikes—launch early.",
+            "competition": "Highly saturated—trend keywords + strong merchandising matter.",
+        },
+        tags=("seasonal", "competitive"),
+    ),
+    _row(
+        "product_seller",
+        "wellness",
+        income=(55_000, 120_000),
+        seasonality="medium",
+        competition="high",
+        notes={
+            "seasonality": "New-year and summer prep windows lift search.",
+            "competition": "Competitive—clear outcomes + simple landing pages help.",
+        },
+        tags=("seasonal", "competitive"),
+    ),
+    _row(
+        "product_seller",
+        "food_bev",
+        income=(50_000, 110_000),
+        seasonality="high",
+        competition="medium",
+        notes={
+            "seasonality": "Holidays and entertaining seasons drive planning spikes.",
+            "competition": "Moderate—recipes + UGC-style visuals can lift CTR.",
+        },
+        tags=("seasonal",),
+    ),
+    _row(
+        "product_seller",
+        "digital_crafts",
+        income=(50_000, 110_000),
+        seasonality="high",
+        competition="medium",
+        notes={
+            "seasonality": "Holiday projects and planning moments lift demand.",
+            "competition": "Moderate—bundles and clear previews improve conversion.",
+        },
+        tags=("digital", "seasonal"),
+    ),
+    _row(
+        "product_seller",
+        "pets",
+        income=(55_000, 120_000),
+        seasonality="low",
+        competition="medium",
+        notes={
+            "seasonality": "Less seasonal overall—consistent creative testing works well.",
+            "competition": "Moderate—education and problem/solution pins perform strongly.",
+        },
+        tags=("evergreen",),
+    ),
+    _row(
+        "product_seller",
+        "travel_gear",
+        income=(60_000, 130_000),
+        seasonality="high",
+        competition="high",
+        notes={
+            "seasonality": "Peaks around holiday travel and summer—launch early.",
+            "competition": "Competitive—clear differentiation and proof points help.",
+        },
+        tags=("seasonal", "competitive"),
+    ),
+    _row(
+        "product_seller",
+        "other",
+        income=(50_000, 115_000),
+        seasonality="medium",
+        competition="medium",
+        tags=("other",),
+    ),
+
+    # -----------------------------
+    # Service provider
+    # -----------------------------
+    _row(
+        "service_provider",
+        "agency",
+        income=(70_000, 150_000),
+        seasonality="low",
+        competition="high",
+        notes={
+            "seasonality": "Less seasonal—consistency and authority content compound.",
+            "competition": "High competition—proof (case studies) and clear CTA matter.",
+        },
+        tags=("high-intent", "competitive"),
+    ),
+    _row(
+        "service_provider",
+        "coach",
+        income=(65_000, 140_000),
+        seasonality="medium",
+        competition="high",
+        notes={
+            "seasonality": "New-year and “fresh start” moments lift interest.",
+            "competition": "Competitive—specific outcomes and positioning help conversion.",
+        },
+        tags=("authority", "competitive"),
+    ),
+    _row(
+        "service_provider",
+        "designer",
+        income=(65_000, 145_000),
+        seasonality="medium",
+        competition="medium",
+        notes={
+            "seasonality": "Peaks around home refresh seasons and major life events.",
+            "competition": "Moderate—portfolio pins + clear package offers work well.",
+        },
+        tags=("portfolio",),
+    ),
+    _row(
+        "service_provider",
+        "photo_video",
+        income=(60_000, 140_000),
+        seasonality="high",
+        competition="high",
+        notes={
+            "seasonality": "Wedding and event seasons create strong surges—publish early.",
+            "competition": "Competitive—style differentiation + proof points help.",
+        },
+        tags=("seasonal", "competitive"),
+    ),
+    _row(
+        "service_provider",
+        "wellness_practitioner",
+        income=(55_000, 125_000),
+        seasonality="medium",
+        competition="high",
+        tags=("competitive",),
+    ),
+    _row(
+        "service_provider",
+        "finance",
+        income=(70_000, 160_000),
+        seasonality="high",
+        competition="medium",
+        notes={
+            "seasonality": "Tax season and year-end planning can spike interest.",
+        },
+        tags=("high-intent",),
+    ),
+    _row(
+        "service_provider",
+        "real_estate_home",
+        income=(70_000, 160_000),
+        seasonality="high",
+        competition="high",
+        notes={
+            "seasonality": "Spring/summer cycles create predictable surges—plan content early.",
+            "competition": "Competitive—local relevance and clear next step are key.",
+        },
+        tags=("local", "seasonal", "competitive"),
+    ),
+    _row(
+        "service_provider",
+        "educator",
+        income=(60_000, 140_000),
+        seasonality="high",
+        competition="medium",
+        notes={
+            "seasonality": "Back-to-school and new-year planning windows lift demand.",
+        },
+        tags=("seasonal",),
+    ),
+    _row(
+        "service_provider",
+        "events",
+        income=(60_000, 140_000),
+        seasonality="high",
+        competition="high",
+        notes={
+            "seasonality": "Event seasons create strong spikes—publish + run campaigns early.",
+            "competition": "Competitive—visual style + clear packages improve conversion.",
+        },
+        tags=("seasonal", "competitive"),
+    ),
+    _row(
+        "service_provider",
+        "other",
+        income=(55_000, 130_000),
+        seasonality="medium",
+        competition="medium",
+        tags=("other",),
+    ),
+)
+
+# -----------------------------
+# Fast lookup map (fail-loud)
+# -----------------------------
+
+
+def _build_index(rows: tuple[BenchmarkRow, ...]) -> Mapping[tuple[str, str], BenchmarkRow]:
+    index: dict[tuple[str, str], BenchmarkRow] = {}
+    for row in rows:
+        key = (row.segment, row.niche)
+        if key in index:
+            raise ValueError(f"Duplicate benchmark row for {row.segment}:{row.niche}")
+        index[key] = row
+    return MappingProxyType(index)
+
+
+BENCHMARK_MAP = _build_index(BENCHMARKS)
+
+
+def get_benchmark(segment: str, niche: str) -> BenchmarkRow:
+    row = BENCHMARK_MAP.get((segment, niche))
+    if row is None:
+        raise KeyError(f"Missing benchmark row for {segment}:{niche}")
+    return row
@@ -0,0 +1,408 @@
+# backend/tools/pinterest_potential/compute.py
+"""
+Canonical compute engine — port of frontend/lib/tools/pinterestPotential/compute.ts.
+
+Same strict contract as the TS engine (sessions-based demand, goal-driven
+Result 3, no defaults/fallbacks) and the same output shape, so results can be
+compared 1:1 with what the browser computed.
+
+Per-(segment, niche) intermediates (benchmark row, demand ranges, index
+multipliers, insight line) only depend on Q1/Q2, so they are memoized; a
+batch of answers only pays for the cheap per-answer multiplications.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Mapping
+
+from tools.pinterest_potential.benchmarks import Range, get_benchmark, round_int
+from tools.pinterest_potential.insight import build_insight_line
+from tools.pinterest_potential.multipliers import (
+    COURSE_ENROLL_RATE_BY_PRICE,
+    COURSE_PRICE_BUCKETS,
+    GOAL_OUTCOME_MODEL,
+    MULTIPLIERS,
+    PriceBucket,
+)
+from tools.pinterest_potential.spec import make_goal_key, validate_answers
+
+# Bump whenever benchmarks/multipliers/compute change; recompute jobs use it to find stale rows.
+RULES_VERSION = "pinterest_potential@v1.2"
+
+DEMOGRAPHICS_NOTES = (
+    "Context only: this does not predict your buyer income.",
+    "Used to frame US+CA Pinterest audience demographics at a high level.",
+)
+TRAFFIC_NOTE = "Traffic is shown as Result 2 (website sessions). Result 3 shows list growth potential."
+
+
+@dataclass(frozen=True, slots=True)
+class SegmentNicheContext:
+    """Everything compute needs that depends only on (segment, niche)."""
+
+    demand_base_sessions: Range
+    income: Range
+    seasonality: str
+    competition: str
+    seasonality_m: float
+    competition_m: float
+    tags: tuple[str, ...]
+    insight_line: str | None
+
+
+# -----------------------------
+# Helpers (fail-loud + ranges)
+# -----------------------------
+
+
+def _range(low: float, high: float) -> dict:
+    return {"low": round_int(low), "high": round_int(high)}
+
+
+def _apply_range(r: Mapping, m: float) -> dict:
+    return _range(r["low"] * m, r["high"] * m)
+
+
+def _apply_rate(r: Mapping, rate: Range) -> dict:
+    return _range(r["low"] * rate.low, r["high"] * rate.high)
+
+
+def _apply_rate_and_scalar(r: Mapping, rate: Range, scalar: float) -> dict:
+    return _range(r["low"] * rate.low * scalar, r["high"] * rate.high * scalar)
+
+
+def _must_lookup(table: str, key: str) -> float:
+    values = MULTIPLIERS[table]
+    if key not in values:
+        raise ValueError(f"Compute config error: Missing MULTIPLIERS.{table} for key {key!r}")
+    return values[key]
+
+
+def _must_goal_model(goal_key: str) -> Mapping[str, object]:
+    model = GOAL_OUTCOME_MODEL.get(goal_key)
+    if model is None:
+        raise ValueError(f"Compute config error: Missing GOAL_OUTCOME_MODEL entry for key {goal_key!r}")
+    return model
+
+
+# -----------------------------
+# Memoized intermediates
+# -----------------------------
+
+
+@lru_cache(maxsize=None)
+def segment_niche_context(segment: str, niche: str) -> SegmentNicheContext:
+    row = get_benchmark(segment, niche)
+    return SegmentNicheContext(
+        demand_base_sessions=row.demand_base_sessions,
+        income=row.income,
+        seasonality=row.seasonality,
+        competition=row.competition,
+        seasonality_m=_must_lookup("seasonality", row.seasonality),
+        competition_m=_must_lookup("competition", row.competition),
+        tags=row.tags,
+        insight_line=build_insight_line(row),
+    )
+
+
+@lru_cache(maxsize=None)
+def _goal_key(segment: str, goal: str) -> str:
+    key = make_goal_key(segment, goal)
+    # Fail loud if spec/multipliers drift.
+    if key not in MULTIPLIERS["goal_micro_adjust"]:
+        raise ValueError(f"Missing goal micro-adjust for key {key!r}")
+    if key not in GOAL_OUTCOME_MODEL:
+        raise ValueError(f"Missing goal outcome model for key {key!r}")
+    return key
+
+
+def _distribution_capacity_m(answers: Mapping[str, str], ctx: SegmentNicheContext, goal_key: str) -> float:
+    """
+    Q3 (volume) * Q4 (visual strength) * Q8 (growth mode)
+    * inferred indices (seasonality/competition) * goal micro-adjust.
+
+    Multiplication order matches the TS reduce so floats are bit-identical.
+    """
+    m = 1.0
+    m *= _must_lookup("volume_bucket", answers["Q3"])
+    m *= _must_lookup("visual_strength", answers["Q4"])
+    m *= _must_lookup("growth_mode", answers["Q8"])
+    m *= ctx.seasonality_m
+    m *= ctx.competition_m
+    m *= MULTIPLIERS["goal_micro_adjust"][goal_key]
+    return m
+
+
+def _conversion_readiness_m(answers: Mapping[str, str]) -> float:
+    """Q5 (site experience) * Q6 (offer clarity)."""
+    m = 1.0
+    m *= _must_lookup("site_experience", answers["Q5"])
+    m *= _must_lookup("offer_clarity", answers["Q6"])
+    return m
+
+
+# -----------------------------
+# Goal outcome computations (GOAL_OUTCOME_MODEL-only)
+# -----------------------------
+
+
+def _revenue_by_bucket(
+        sessions: Mapping,
+        readiness_m: float,
+        rate_by_bucket: Mapping[str, Range],
+        buckets: tuple[PriceBucket, ...],
+        label: str,
+) -> dict:
+    out = {}
+    for bucket in buckets:
+        rate = rate_by_bucket.get(bucket.id)
+        if rate is None:
+            raise ValueError(f"Compute config error: Missing {label} for key {bucket.id!r}")
+        # Low = low sessions * low rate * readiness * low price (High mirrors with highs).
+        out[bucket.id] = _range(
+            sessions["low"] * rate.low * readiness_m * bucket.low,
+            sessions["high"] * rate.high * readiness_m * bucket.high,
+        )
+    return out
+
+
+def _rate_bundle(kind: str, result_key: str, rate_key: str, model, sessions, readiness_m, assumption_key=None):
+    """Shared shape for "sessions * rate * readiness" outcomes (opt-ins, calls, signups)."""
+    rate = model[rate_key]
+    return (
+        {"kind": kind, result_key: _apply_rate_and_scalar(sessions, rate, readiness_m)},
+        {"kind": kind, assumption_key or rate_key: rate.as_dict(), "conversion_readiness_m": readiness_m},
+    )
+
+
+def _content_creator_outcome(goal_key: str, sessions: dict, readiness_m: float) -> tuple[dict, dict]:
+    model = _must_goal_model(goal_key)
+    kind = model["kind"]
+
+    if kind == "traffic":
+        outcome, assumptions = _rate_bundle(
+            "traffic", "monthly_email_subscribers_est", "optin_rate_from_sessions", model, sessions, readiness_m
+        )
+        outcome["note"] = TRAFFIC_NOTE
+        return outcome, assumptions
+
+    if kind == "email_subscribers":
+        return _rate_bundle(
+            kind, "monthly_email_subscribers_est", "optin_rate_from_sessions", model, sessions, readiness_m
+        )
+
+    if kind == "affiliate_revenue":
+        # Revenue modeled via RPM ($ per 1,000 sessions), lightly nudged by conversion readiness.
+        rpm = model["rpm_usd"]
+        low = (sessions["low"] / 1000) * rpm.low * readiness_m
+        high = (sessions["high"] / 1000) * rpm.high * readiness_m
+        return (
+            {"kind": kind, "monthly_affiliate_revenue_usd_est": _range(low, high)},
+            {"kind": kind, "rpm_usd": rpm.as_dict(), "conversion_readiness_m": readiness_m},
+        )
+
+    if kind == "course_product_sales":
+        share = model["course_intent_share_of_sessions"]
+        intent_sessions = _apply_rate(sessions, share)
+        return (
+            {
+                "kind": kind,
+                "monthly_course_intent_sessions_est": intent_sessions,
+                "revenue_by_course_price_est": _revenue_by_bucket(
+                    intent_sessions,
+                    readiness_m,
+                    COURSE_ENROLL_RATE_BY_PRICE,
+                    COURSE_PRICE_BUCKETS,
+                    "COURSE_ENROLL_RATE_BY_PRICE",
+                ),
+            },
+            {
+                "kind": kind,
+                "course_intent_share_of_sessions": share.as_dict(),
+                "enroll_rate_by_price": {k: r.as_dict() for k, r in COURSE_ENROLL_RATE_BY_PRICE.items()},
+                "course_price_buckets": [b.as_dict() for b in COURSE_PRICE_BUCKETS],
+                "conversion_readiness_m": readiness_m,
+            },
+        )
+
+    raise ValueError(f"Compute contract error: Unexpected model.kind={kind!r} for {goal_key}")
+
+
+def _product_seller_outcome(goal_key: str, sessions: dict, readiness_m: float) -> tuple[dict, dict]:
+    model = _must_goal_model(goal_key)
+    kind = model["kind"]
+
+    if kind == "sales":
+        share = model["purchase_intent_share_of_sessions"]
+        cr_by_aov = model["conversion_rate_by_aov"]
+        buckets = model["aov_buckets"]
+        return (
+            {
+                "kind": kind,
+                "revenue_by_aov_est": _revenue_by_bucket(
+                    _apply_rate(sessions, share), readiness_m, cr_by_aov, buckets, "conversion_rate_by_aov"
+                ),
+            },
+            {
+                "kind": kind,
+                "purchase_intent_share_of_sessions": share.as_dict(),
+                "ecommerce_cr_by_aov": {k: r.as_dict() for k, r in cr_by_aov.items()},
+                "aov_buckets": [b.as_dict() for b in buckets],
+                "conversion_readiness_m": readiness_m,
+            },
+        )
+
+    if kind == "email_subscribers":
+        return _rate_bundle(
+            kind, "monthly_email_subscribers_est", "optin_rate_from_sessions", model, sessions, readiness_m
+        )
+
+    if kind == "retargeting_pool":
+        share = model["retargetable_share_of_sessions"]
+        return (
+            {"kind": kind, "monthly_retargetable_visitors_est": _apply_rate(sessions, share)},
+            {"kind": kind, "retargetable_share_of_sessions": share.as_dict()},
+        )
+
+    if kind == "new_customer_discovery":
+        share = model["new_to_brand_share_of_sessions"]
+        return (
+            {"kind": kind, "monthly_new_to_brand_sessions_est": _apply_rate(sessions, share)},
+            {"kind": kind, "new_to_brand_share_of_sessions": share.as_dict()},
+        )
+
+    raise ValueError(f"Compute contract error: Unexpected model.kind={kind!r} for {goal_key}")
+
+
+def _service_provider_outcome(goal_key: str, sessions: dict, readiness_m: float) -> tuple[dict, dict]:
+    model = _must_goal_model(goal_key)
+    kind = model["kind"]
+
+    if kind == "leads_calls":
+        return _rate_bundle(
+            kind,
+            "monthly_discovery_calls_est",
+            "book_rate_from_sessions",
+            model,
+            sessions,
+            readiness_m,
+            assumption_key="call_book_rate_from_sessions",
+        )
+
+    if kind == "email_subscribers":
+        return _rate_bundle(
+            kind, "monthly_email_subscribers_est", "optin_rate_from_sessions", model, sessions, readiness_m
+        )
+
+    if kind == "webinar_signups":
+        return _rate_bundle(
+            kind,
+            "monthly_webinar_signups_est",
+            "webinar_signup_rate_from_sessions",
+            model,
+            sessions,
+            readiness_m,
+        )
+
+    if kind == "authority_visibility":
+        # Visibility is not a conversion rate; conversion_readiness_m is intentionally NOT applied.
+        reach = model["visibility_reach_per_session"]
+        return (
+            {
+                "kind": kind,
+                "monthly_visibility_reach_est": _range(sessions["low"] * reach.low, sessions["high"] * reach.high),
+            },
+            {"kind": kind, "visibility_reach_per_session": reach.as_dict()},
+        )
+
+    raise ValueError(f"Compute contract error: Unexpected model.kind={kind!r} for {goal_key}")
+
+
+_SEGMENT_OUTCOME = {
+    "content_creator": _content_creator_outcome,
+    "product_seller": _product_seller_outcome,
+    "service_provider": _service_provider_outcome,
+}
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+
+
+def compute_results(answers: Mapping[str, str]) -> dict:
+    """
+    Compute the results bundle for one answer set.
+
+    Returns {"ok": True, "results": {...}} or {"ok": False, "errors": {...}},
+    the same union (and JSON shape) as computeResults() in the TS engine.
+    """
+    errors = validate_answers(answers)
+    if errors:
+        return {"ok": False, "errors": errors}
+
+    segment = answers["Q1"]
+    ctx = segment_niche_context(segment, answers["Q2"])
+    goal_key = _goal_key(segment, answers["Q7"])
+
+    distribution_capacity_m = _distribution_capacity_m(answers, ctx, goal_key)
+    conversion_readiness_m = _conversion_readiness_m(answers)
+
+    # 1) Demand (macro + micro + final) — SESSIONS
+    demand_base_sessions_est = ctx.demand_base_sessions.as_dict()
+    likely_pinterest_sessions_est = _apply_range(demand_base_sessions_est, distribution_capacity_m)
+
+    # 2) Traffic (shared, non-duplicated)
+    traffic = {"website_sessions_est": likely_pinterest_sessions_est}
+    if segment == "product_seller":
+        # Purchase-intent lens is anchored to the explicit SALES goal entry.
+        sales_key = make_goal_key("product_seller", "sales")
+        sales_model = _must_goal_model(sales_key)
+        if sales_model["kind"] != "sales":
+            raise ValueError(
+                f"Compute contract error: Expected sales model for {sales_key}, got {sales_model['kind']!r}"
+            )
+        traffic["purchase_intent_sessions_est"] = _apply_rate(
+            likely_pinterest_sessions_est, sales_model["purchase_intent_share_of_sessions"]
+        )
+
+    # 3) Segment outcomes (goal-driven; Result 3)
+    goal_outcome, assumptions = _SEGMENT_OUTCOME[segment](
+        goal_key, likely_pinterest_sessions_est, conversion_readiness_m
+    )
+
+    return {
+        "ok": True,
+        "results": {
+            "demand": {
+                "demand_base_sessions_est": demand_base_sessions_est,
+                "distribution_capacity_m": distribution_capacity_m,
+                "conversion_readiness_m": conversion_readiness_m,
+                "likely_pinterest_sessions_est": likely_pinterest_sessions_est,
+            },
+            "traffic": traffic,
+            "segment_outcome": {
+                "kind": segment,
+                "goal_key": goal_key,
+                "primary_goal": answers["Q7"],
+                "goal_outcome": goal_outcome,
+                "assumptions": assumptions,
+            },
+            # 4) Demographic context (benchmark-driven)
+            "demographics": {
+                "household_income_usd": ctx.income.as_dict(),
+                "notes": list(DEMOGRAPHICS_NOTES),
+            },
+            "inferred": {
+                "seasonality_index": ctx.seasonality,
+                "competition_index": ctx.competition,
+                "tags": list(ctx.tags),
+            },
+            "insight_line": ctx.insight_line,
+        },
+    }
+
+
+def compute_results_batch(items: list[Mapping[str, str]]) -> list[dict]:
+    """Compute many answer sets; invalid items yield {"ok": False, ...} in place."""
+    return [compute_results(answers) for answers in items]
@@ -0,0 +1,84 @@
+# backend/tools/pinterest_potential/insight.py
+"""
+Insight line generator — port of frontend/lib/tools/pinterestPotential/insight.ts.
+
+Short, planning-advantage framed insight built from the benchmark row's
+inferred indices (and notes, when present).
+"""
+
+import re
+
+from tools.pinterest_potential.benchmarks import BenchmarkRow
+
+MAX_CHARS = 140  # conservative to stay ~1–2 lines on mobile
+
+_SEASONALITY_PHRASE = {
+    "high": "highly seasonal",
+    "medium": "moderately seasonal",
+    "low": "low seasonality",
+}
+_COMPETITION_PHRASE = {
+    "high": "highly competitive",
+    "medium": "moderately competitive",
+    "low": "lower competition",
+}
+_SEASONALITY_ACTION = {
+    "high": "plan content early to catch demand before it peaks",
+    "medium": "publish a bit ahead of predictable mini-peaks",
+    "low": "stay consistent—steady publishing compounds",
+}
+_COMPETITION_ACTION = {
+    "high": "refresh creative angles and tighten keywords to stand out",
+    "medium": "test 2–3 creative angles to find your winners",
+    "low": "lean into clarity—simple visuals and strong CTAs can win quickly",
+}
+
+
+def _clamp_text(s: str, max_chars: int = MAX_CHARS) -> str:
+    t = re.sub(r"\s+", " ", s).strip()
+    if len(t) <= max_chars:
+        return t
+    # Trim to last "nice" breakpoint
+    cut = t[: max_chars - 1]
+    i = max(cut.rfind("."), cut.rfind(";"), cut.rfind(","), cut.rfind(" "))
+    out = (cut[:i] if i > 40 else cut).strip()
+    return f"{out}…"
+
+
+def _primary_action(seasonality: str, competition: str) -> str:
+    # If either index is high, prioritize the "high" action.
+    if competition == "high" and seasonality != "high":
+        return _COMPETITION_ACTION[competition]
+    if seasonality == "high" and competition != "high":
+        return _SEASONALITY_ACTION[seasonality]
+    # Otherwise: prefer seasonality as the planning-oriented action.
+    return _SEASONALITY_ACTION[seasonality]
+
+
+def build_insight_line(row: BenchmarkRow) -> str | None:
+    seasonality = row.seasonality
+    competition = row.competition
+    seasonal_note = row.notes.get("seasonality")
+    comp_note = row.notes.get("competition")
+
+    # Prefer combined note when both are high (but cap length).
+    if seasonality == "high" and competition == "high":
+        a = seasonal_note or "Predictable planning spikes."
+        b = comp_note or "Competitive—creative variety and SEO matter."
+        return _clamp_text(f"Insight: {a} {b}")
+
+    # Otherwise: describe both indices, but give only ONE action (keeps it short).
+    if seasonality == "high":
+        note = seasonal_note
+    elif competition == "high":
+        note = comp_note
+    else:
+        note = None
+
+    if note:
+        return _clamp_text(f"Insight: {note}")
+
+    s = _SEASONALITY_PHRASE[seasonality]
+    c = _COMPETITION_PHRASE[competition]
+    action = _primary_action(seasonality, competition)
+    return _clamp_text(f"Insight: {s} and {c}—{action}.")
@@ -0,0 +1,266 @@
+# backend/tools/pinterest_potential/multipliers.py
+"""
+Multipliers + modeling assumptions — port of
+frontend/lib/tools/pinterestPotential/multipliers.ts.
+
+- MULTIPLIERS: MICRO execution multipliers (Q3–Q8) + light index friction.
+- GOAL_OUTCOME_MODEL: goal-driven outcome assumptions keyed by GoalKey.
+
+Everything is built once at import into read-only mappings and validated
+(fail loud; no defaults). Values must stay in sync with the TS module.
+"""
+
+import math
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from tools.pinterest_potential.benchmarks import Range
+from tools.pinterest_potential.spec import PRIMARY_GOAL_OPTIONS, SEGMENTS, make_goal_key
+
+
+@dataclass(frozen=True, slots=True)
+class PriceBucket:
+    id: str
+    label: str
+    low: float
+    high: float
+
+    def as_dict(self) -> dict:
+        return {"id": self.id, "label": self.label, "low": self.low, "high": self.high}
+
+
+def _frozen(d: dict) -> Mapping:
+    return MappingProxyType(d)
+
+
+MULTIPLIERS: Mapping[str, Mapping[str, float]] = _frozen(
+    {
+        # Q3 — Output volume (inventory)
+        "volume_bucket": _frozen(
+            {"0-2": 0.82, "3-5": 0.93, "6-10": 1.0, "11-20": 1.1, "20+": 1.18}
+        ),
+        # Q4 — Visual library strength
+        "visual_strength": _frozen(
+            {"limited": 0.85, "decent": 0.95, "strong": 1.07, "very_strong": 1.15}
+        ),
+        # Q5 — Website experience
+        "site_experience": _frozen({"a": 0.8, "b": 0.92, "c": 1.05, "d": 1.12}),
+        # Q6 — Offer clarity
+        "offer_clarity": _frozen({"no": 0.9, "somewhat": 0.97, "yes": 1.06}),
+        # Q8 — Growth mode (ads vs organic)
+        "growth_mode": _frozen({"organic": 1.0, "later": 1.03, "ads": 1.15}),
+        # Inferred indices (light friction)
+        "seasonality": _frozen({"low": 1.02, "medium": 1.0, "high": 0.96}),
+        "competition": _frozen({"low": 1.03, "medium": 1.0, "high": 0.95}),
+        # Goal micro-adjust (explicit, neutral)
+        "goal_micro_adjust": _frozen(
+            {
+                # content_creator
+                "content_creator:traffic": 1.0,
+                "content_creator:email_subscribers": 1.0,
+                "content_creator:affiliate_revenue": 1.0,
+                "content_creator:course_product_sales": 1.0,
+                # product_seller
+                "product_seller:new_customer_discovery": 1.0,
+                "product_seller:sales": 1.0,
+                "product_seller:email_subscribers": 1.0,
+                "product_seller:retargeting_pool": 1.0,
+                # service_provider
+                "service_provider:authority_visibility": 1.0,
+                "service_provider:leads_calls": 1.0,
+                "service_provider:email_subscribers": 1.0,
+                "service_provider:webinar_signups": 1.0,
+            }
+        ),
+    }
+)
+
+# -----------------------------
+# Modeling assumptions (sessions -> purchases/leads)
+# -----------------------------
+
+AOV_BUCKETS: tuple[PriceBucket, ...] = (
+    PriceBucket("lt_50", "<$50", 20, 49),
+    PriceBucket("50_100", "$50–$100", 50, 100),
+    PriceBucket("100_250", "$100–$250", 100, 250),
+    PriceBucket("250_plus", "$250+", 250, 400),  # display cap; raise if needed
+)
+
+ECOM_CONVERSION_RATE_BY_AOV: Mapping[str, Range] = _frozen(
+    {
+        "lt_50": Range(0.015, 0.035),
+        "50_100": Range(0.012, 0.03),
+        "100_250": Range(0.008, 0.022),
+        "250_plus": Range(0.004, 0.015),
+    }
+)
+
+PURCHASE_INTENT_SHARE_OF_SESSIONS = Range(0.25, 0.55)
+
+DISCOVERY_CALL_BOOK_RATE_FROM_SESSIONS = Range(0.005, 0.02)  # 0.5%–2.0%
+
+COURSE_PRICE_BUCKETS: tuple[PriceBucket, ...] = (
+    PriceBucket("lt_50", "<$50", 10, 49),
+    PriceBucket("50_200", "$50–$200", 50, 200),
+    PriceBucket("200_1000", "$200–$1,000", 200, 1000),
+    PriceBucket("1000_plus", "$1,000+", 1000, 2500),  # display cap; raise if needed
+)
+
+COURSE_ENROLL_RATE_BY_PRICE: Mapping[str, Range] = _frozen(
+    {
+        "lt_50": Range(0.003, 0.012),
+        "50_200": Range(0.002, 0.008),
+        "200_1000": Range(0.001, 0.005),
+        "1000_plus": Range(0.0005, 0.003),
+    }
+)
+
+# -----------------------------
+# Goal outcome model (ALL segments; exhaustive; keyed by GoalKey)
+# -----------------------------
+
+GOAL_OUTCOME_MODEL: Mapping[str, Mapping[str, object]] = _frozen(
+    {
+        # content_creator
+        "content_creator:traffic": _frozen(
+            {
+                "kind": "traffic",
+                # Special case: Result 3 still outputs email subscribers (not blank).
+                "optin_rate_from_sessions": Range(0.005, 0.02),
+            }
+        ),
+        "content_creator:email_subscribers": _frozen(
+            {"kind": "email_subscribers", "optin_rate_from_sessions": Range(0.01, 0.05)}
+        ),
+        "content_creator:affiliate_revenue": _frozen(
+            {"kind": "affiliate_revenue", "rpm_usd": Range(3, 18)}
+        ),
+        "content_creator:course_product_sales": _frozen(
+            {"kind": "course_product_sales", "course_intent_share_of_sessions": Range(0.1, 0.35)}
+        ),
+        # product_seller
+        "product_seller:sales": _frozen(
+            {
+                "kind": "sales",
+                "purchase_intent_share_of_sessions": PURCHASE_INTENT_SHARE_OF_SESSIONS,
+                "conversion_rate_by_aov": ECOM_CONVERSION_RATE_BY_AOV,
+                "aov_buckets": AOV_BUCKETS,
+            }
+        ),
+        "product_seller:email_subscribers": _frozen(
+            {"kind": "email_subscribers", "optin_rate_from_sessions": Range(0.01, 0.04)}
+        ),
+        "product_seller:retargeting_pool": _frozen(
+            {"kind": "retargeting_pool", "retargetable_share_of_sessions": Range(0.15, 0.45)}
+        ),
+        "product_seller:new_customer_discovery": _frozen(
+            {"kind": "new_customer_discovery", "new_to_brand_share_of_sessions": Range(0.4, 0.8)}
+        ),
+        # service_provider
+        "service_provider:leads_calls": _frozen(
+            {"kind": "leads_calls", "book_rate_from_sessions": DISCOVERY_CALL_BOOK_RATE_FROM_SESSIONS}
+        ),
+        "service_provider:email_subscribers": _frozen(
+            {"kind": "email_subscribers", "optin_rate_from_sessions": Range(0.01, 0.05)}
+        ),
+        "service_provider:webinar_signups": _frozen(
+            {"kind": "webinar_signups", "webinar_signup_rate_from_sessions": Range(0.004, 0.02)}
+        ),
+        "service_provider:authority_visibility": _frozen(
+            {
+                "kind": "authority_visibility",
+                # Non-0..1 scalar: reach-per-session can exceed 1.
+                "visibility_reach_per_session": Range(1.2, 3.5),
+            }
+        ),
+    }
+)
+
+# Fields that must be 0..1 rates, per model kind (validated below).
+_RATE_FIELDS = {
+    "traffic": ("optin_rate_from_sessions",),
+    "email_subscribers": ("optin_rate_from_sessions",),
+    "affiliate_revenue": (),
+    "course_product_sales": ("course_intent_share_of_sessions",),
+    "sales": ("purchase_intent_share_of_sessions",),
+    "retargeting_pool": ("retargetable_share_of_sessions",),
+    "new_customer_discovery": ("new_to_brand_share_of_sessions",),
+    "leads_calls": ("book_rate_from_sessions",),
+    "webinar_signups": ("webinar_signup_rate_from_sessions",),
+    "authority_visibility": (),
+}
+
+
+# -----------------------------
+# Module-load validation (fail loud)
+# -----------------------------
+
+
+def _assert_finite(label: str, n: float) -> None:
+    if not math.isfinite(n):
+        raise ValueError(f"Multipliers config error: {label} must be finite, got {n}")
+
+
+def _assert_range(label: str, r: Range) -> None:
+    _assert_finite(f"{label}.low", r.low)
+    _assert_finite(f"{label}.high", r.high)
+    if r.low > r.high:
+        raise ValueError(
+            f"Multipliers config error: {label} must satisfy low ≤ high, got low={r.low}, high={r.high}"
+        )
+
+
+def _assert_range01(label: str, r: Range) -> None:
+    _assert_range(label, r)
+    if r.low < 0 or r.high > 1:
+        raise ValueError(
+            f"Multipliers config error: {label} must satisfy 0 ≤ low ≤ high ≤ 1, "
+            f"got low={r.low}, high={r.high}"
+        )
+
+
+def _validate() -> None:
+    for table, values in MULTIPLIERS.items():
+        for k, v in values.items():
+            _assert_finite(f"{table}.{k}", v)
+
+    for b in AOV_BUCKETS:
+        _assert_range(f"AOV_BUCKETS.{b.id}", Range(b.low, b.high))
+    for k, r in ECOM_CONVERSION_RATE_BY_AOV.items():
+        _assert_range01(f"ECOM_CONVERSION_RATE_BY_AOV.{k}", r)
+    for b in COURSE_PRICE_BUCKETS:
+        _assert_range(f"COURSE_PRICE_BUCKETS.{b.id}", Range(b.low, b.high))
+    for k, r in COURSE_ENROLL_RATE_BY_PRICE.items():
+        _assert_range01(f"COURSE_ENROLL_RATE_BY_PRICE.{k}", r)
+
+    # Strict exhaustiveness: ALL spec goal keys exist in BOTH surfaces, nothing extra.
+    expected = {make_goal_key(seg, goal) for seg in SEGMENTS for goal in PRIMARY_GOAL_OPTIONS[seg]}
+    for label, keys in (
+            ("GOAL_OUTCOME_MODEL", set(GOAL_OUTCOME_MODEL)),
+            ("goal_micro_adjust", set(MULTIPLIERS["goal_micro_adjust"])),
+    ):
+        if keys - expected:
+            raise ValueError(f"Multipliers config error: {label} has unexpected keys: {sorted(keys - expected)}")
+        if expected - keys:
+            raise ValueError(f"Multipliers config error: {label} missing required keys: {sorted(expected - keys)}")
+
+    for goal_key, model in GOAL_OUTCOME_MODEL.items():
+        kind = model["kind"]
+        if kind not in _RATE_FIELDS:
+            raise ValueError(f"Multipliers config error: unknown kind {kind!r} for {goal_key}")
+        for field in _RATE_FIELDS[kind]:
+            _assert_range01(f"GOAL_OUTCOME_MODEL.{goal_key}.{field}", model[field])
+        if kind == "affiliate_revenue":
+            _assert_range(f"GOAL_OUTCOME_MODEL.{goal_key}.rpm_usd", model["rpm_usd"])
+        if kind == "authority_visibility":
+            reach = model["visibility_reach_per_session"]
+            _assert_range(f"GOAL_OUTCOME_MODEL.{goal_key}.visibility_reach_per_session", reach)
+            if reach.low < 0:
+                raise ValueError(
+                    f"Multipliers config error: GOAL_OUTCOME_MODEL.{goal_key}.visibility_reach_per_session "
+                    f"must satisfy low ≥ 0, got low={reach.low}"
+                )
+
+
+_validate()
@@ -0,0 +1,142 @@
+# backend/tools/pinterest_potential/spec.py
+"""
+Pinterest Potential Calculator — answer schema + validation.
+
+Port of frontend/lib/tools/pinterestPotential/pinterestPotentialSpec.ts.
+Only the parts compute needs live here (option sets, GoalKey helper, validation);
+question copy stays in the frontend.
+"""
+
+from types import MappingProxyType
+from typing import Mapping
+
+SEGMENTS: tuple[str, ...] = ("content_creator", "product_seller", "service_provider")
+
+VOLUME_BUCKETS: tuple[str, ...] = ("0-2", "3-5", "6-10", "11-20", "20+")
+VISUAL_STRENGTHS: tuple[str, ...] = ("limited", "decent", "strong", "very_strong")
+SITE_EXPERIENCES: tuple[str, ...] = ("a", "b", "c", "d")
+OFFER_CLARITIES: tuple[str, ...] = ("no", "somewhat", "yes")
+GROWTH_MODES: tuple[str, ...] = ("organic", "later", "ads")
+
+QUESTION_ORDER: tuple[str, ...] = ("Q1", "Q2", "Q3", "Q4", "Q5", "Q6", "Q7", "Q8")
+
+# Q2 (segment-specific, canonical order)
+NICHE_OPTIONS: Mapping[str, tuple[str, ...]] = MappingProxyType(
+    {
+        "content_creator": (
+            "food",
+            "travel",
+            "home_diy",
+            "lifestyle",
+            "finance",
+            "wellness",
+            "parenting",
+            "beauty_fashion",
+            "crafts",
+            "other",
+        ),
+        "product_seller": (
+            "baby_family",
+            "home_decor",
+            "beauty",
+            "fashion",
+            "wellness",
+            "food_bev",
+            "digital_crafts",
+            "pets",
+            "travel_gear",
+            "other",
+        ),
+        "service_provider": (
+            "agency",
+            "coach",
+            "designer",
+            "photo_video",
+            "wellness_practitioner",
+            "finance",
+            "real_estate_home",
+            "educator",
+            "events",
+            "other",
+        ),
+    }
+)
+
+# Q7 (segment-specific, canonical order)
+PRIMARY_GOAL_OPTIONS: Mapping[str, tuple[str, ...]] = MappingProxyType(
+    {
+        "content_creator": (
+            "traffic",
+            "email_subscribers",
+            "affiliate_revenue",
+            "course_product_sales",
+        ),
+        "product_seller": (
+            "sales",
+            "email_subscribers",
+            "retargeting_pool",
+            "new_customer_discovery",
+        ),
+        "service_provider": (
+            "leads_calls",
+            "email_subscribers",
+            "webinar_signups",
+            "authority_visibility",
+        ),
+    }
+)
+
+_REQUIRED = "This question is required."
+_INVALID = "Invalid selection."
+_SEGMENT_FIRST = "Select your business type first."
+
+
+def make_goal_key(segment: str, goal: str) -> str:
+    """Build a GoalKey ("segment:goal"). Raises on invalid combinations (fail loud)."""
+    if goal not in PRIMARY_GOAL_OPTIONS.get(segment, ()):
+        raise ValueError(f"Spec contract error: invalid goal for {segment}: {goal}")
+    return f"{segment}:{goal}"
+
+
+def validate_answers(answers: Mapping[str, object]) -> dict[str, str]:
+    """
+    Full-form validation (mirrors validateAnswers in the TS spec).
+
+    Returns a dict of question id -> error message; empty means valid.
+    """
+    errors: dict[str, str] = {}
+
+    def check(qid: str, allowed: tuple[str, ...]) -> None:
+        value = answers.get(qid)
+        if not value:
+            errors[qid] = _REQUIRED
+        elif value not in allowed:
+            errors[qid] = _INVALID
+
+    check("Q1", SEGMENTS)
+    segment = answers.get("Q1")
+
+    # Q2 depends on Q1
+    if not answers.get("Q2"):
+        errors["Q2"] = _REQUIRED
+    elif not segment:
+        errors["Q2"] = _SEGMENT_FIRST
+    elif answers["Q2"] not in NICHE_OPTIONS.get(segment, ()):
+        errors["Q2"] = _INVALID
+
+    check("Q3", VOLUME_BUCKETS)
+    check("Q4", VISUAL_STRENGTHS)
+    check("Q5", SITE_EXPERIENCES)
+    check("Q6", OFFER_CLARITIES)
+
+    # Q7 depends on Q1
+    if not answers.get("Q7"):
+        errors["Q7"] = _REQUIRED
+    elif not segment:
+        errors["Q7"] = _SEGMENT_FIRST
+    elif answers["Q7"] not in PRIMARY_GOAL_OPTIONS.get(segment, ()):
+        errors["Q7"] = _INVALID
+
+    check("Q8", GROWTH_MODES)
+
+    return errors
@@ -0,0 +1,320 @@
+# backend/upload_spool.py
+"""
+Resumable chunked uploads, spooled to local disk.
+
+Large exports don't fit through proxy body limits in one request and
+shouldn't restart from zero after a network blip, so a client can instead:
+
+1. open a session (POST .../upload-sessions) and get its id and chunk size;
+2. PUT numbered chunks, each with the sha256 of its bytes; a chunk whose
+   bytes don't match is rejected and simply sent again. Chunks may arrive in
+   any order and be re-sent; GET on the session lists what has arrived, so an
+   interrupted client resumes with the missing ones;
+3. finalize with the chunk count (and optionally the whole file's sha256).
+   The chunks are then read back in order as one stream (never assembled
+   into one file) to hash the content and, unless it is a repeat, to feed
+   the ingestion job.
+
+Layout: UPLOAD_SPOOL_DIR/<session id>/ holds meta.json plus one
+"<n>.<sha256>.part" file per chunk, written to a temp name and renamed, so a
+half-written chunk is never visible. Sessions live on disk rather than in one
+process, so every API worker on the host can take any request of a session;
+running several hosts needs the spool dir on shared storage.
+
+Expiry: a session nobody has touched for UPLOAD_SESSION_TTL_SECONDS is
+deleted by the sweeper (started from main.lifespan). A finalized session is
+kept for its ingestion job, which discards it once done; the sweeper removes
+any left behind after UPLOAD_FINALIZED_TTL_SECONDS. One that merely repeated
+an earlier upload keeps only its meta (`repeat_of`) until then.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import secrets
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO
+
+import config
+
+logger = logging.getLogger(__name__)
+
+SESSION_ID_PATTERN = r"^[0-9a-f]{32}$"
+_SESSION_ID = re.compile(SESSION_ID_PATTERN)
+_CHUNK_FILE = re.compile(r"^(\d{6})\.([0-9a-f]{64})\.part$")
+_META = "meta.json"
+_READ_CHUNK = 1024 * 1024
+
+
+class UploadSessionNotFound(LookupError):
+    """Unknown, expired, or someone else's session."""
+
+
+class ChunkRejected(ValueError):
+    """A chunk that can't be stored (bad number, size, or checksum)."""
+
+
+class _ChunkReader(io.RawIOBase):
+    """The chunk files of a session read back to back as one binary stream."""
+
+    def __init__(self, paths: list[Path]):
+        self._paths = iter(paths)
+        self._fp: IO[bytes] | None = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while True:
+            if self._fp is None:
+                path = next(self._paths, None)
+                if path is None:
+                    return 0
+                self._fp = open(path, "rb")
+            n = self._fp.readinto(buffer)
+            if n:
+                return n
+            self._fp.close()
+            self._fp = None
+
+    def close(self) -> None:
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+        super().close()
+
+
+class UploadSpool:
+    def __init__(
+            self,
+            root: Path | str = config.UPLOAD_SPOOL_DIR,
+            *,
+            chunk_size: int = config.UPLOAD_CHUNK_SIZE,
+            max_chunk_bytes: int = config.UPLOAD_CHUNK_MAX_BYTES,
+            max_chunks: int = config.UPLOAD_MAX_CHUNKS,
+            session_ttl: float = config.UPLOAD_SESSION_TTL_SECONDS,
+            finalized_ttl: float = config.UPLOAD_FINALIZED_TTL_SECONDS,
+            sweep_interval: float = config.UPLOAD_SWEEP_INTERVAL_SECONDS,
+    ):
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_chunks = max_chunks
+        self.session_ttl = session_ttl
+        self.finalized_ttl = finalized_ttl
+        self.sweep_interval = sweep_interval
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+
+    # -----------------------------
+    # Sessions
+    # -----------------------------
+
+    def _dir(self, session_id: str) -> Path:
+        if not _SESSION_ID.match(session_id):
+            raise UploadSessionNotFound("Upload session not found")
+        return self.root / session_id
+
+    def create(self, *, account_name: str, filename: str | None, owner: str | None) -> dict:
+        session_id = secrets.token_hex(16)
+        path = self.root / session_id
+        path.mkdir(parents=True)
+        meta = {
+            "session_id": session_id,
+            "account_name": account_name,
+            "filename": filename,
+            "owner": owner,
+            "created_at": time.time(),
+            "finalized": False,
+        }
+        self._write_meta(path, meta)
+        return self.describe(session_id, owner=owner)
+
+    def _write_meta(self, path: Path, meta: dict) -> None:
+        tmp = path / f".{_META}.{secrets.token_hex(4)}"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, path / _META)
+
+    def meta(self, session_id: str, *, owner: str | None) -> dict:
+        path = self._dir(session_id)
+        try:
+            meta = json.loads((path / _META).read_text())
+        except FileNotFoundError:
+            raise UploadSessionNotFound("Upload session not found (it may have expired)") from None
+        if meta["owner"] != owner:
+            raise UploadSessionNotFound("Upload session not found")
+        return meta
+
+    def _chunks(self, path: Path) -> dict[int, tuple[str, Path]]:
+        """n -> (sha256, path) of the chunks stored so far."""
+        chunks = {}
+        for entry in path.iterdir():
+            m = _CHUNK_FILE.match(entry.name)
+            if m:
+                chunks[int(m.group(1))] = (m.group(2), entry)
+        return chunks
+
+    def describe(self, session_id: str, *, owner: str | None) -> dict:
+        meta = self.meta(session_id, owner=owner)
+        path = self._dir(session_id)
+        chunks = self._chunks(path)
+        return {
+            "session_id": session_id,
+            "account_name": meta["account_name"],
+            "filename": meta["filename"],
+            "finalized": meta["finalized"],
+            "chunk_size": self.chunk_size,
+            "max_chunk_bytes": self.max_chunk_bytes,
+            "expires_at": datetime.fromtimestamp(path.stat().st_mtime + self.session_ttl, timezone.utc),
+            "chunks": [
+                {"n": n, "size": p.stat().st_size, "sha256": digest}
+                for n, (digest, p) in sorted(chunks.items())
+            ],
+        }
+
+    def put_chunk(self, session_id: str, n: int, data: bytes, sha256: str, *, owner: str | None) -> dict:
+        meta = self.meta(session_id, owner=owner)
+        if meta["finalized"]:
+            raise ChunkRejected("Upload session is already finalized")
+        if not 0 <= n < self.max_chunks:
+            raise ChunkRejected(f"Chunk number must be between 0 and {self.max_chunks - 1}")
+        if len(data) > self.max_chunk_bytes:
+            raise ChunkRejected(f"Chunk is larger than {self.max_chunk_bytes} bytes")
+        actual = hashlib.sha256(data).hexdigest()
+        if actual != sha256.lower():
+            raise ChunkRejected(f"Checksum mismatch for chunk {n}: got {actual}")
+
+        path = self._dir(session_id)
+        tmp = path / f".{n:06d}.{secrets.token_hex(4)}.tmp"
+        with open(tmp, "wb") as fp:
+            fp.write(data)
+            fp.flush()
+            os.fsync(fp.fileno())
+        final = path / f"{n:06d}.{actual}.part"
+        os.replace(tmp, final)
+        for entry in path.glob(f"{n:06d}.*.part"):  # a re-sent chunk replaces the old one
+            if entry != final:
+                entry.unlink(missing_ok=True)
+        os.utime(path)  # activity keeps the session alive
+        return {"n": n, "size": len(data), "sha256": actual}
+
+    def chunk_paths(self, session_id: str, chunk_count: int, *, owner: str | None) -> tuple[dict, list[Path]]:
+        """(meta, paths of chunks 0..chunk_count-1); raises ChunkRejected unless exactly those are stored."""
+        meta = self.meta(session_id, owner=owner)
+        chunks = self._chunks(self._dir(session_id))
+        if chunk_count < 1:
+            raise ChunkRejected("An upload needs at least one chunk")
+        missing = [n for n in range(chunk_count) if n not in chunks]
+        if missing:
+            raise ChunkRejected(f"Missing chunks: {missing[:20]}")
+        extra = sorted(n for n in chunks if n >= chunk_count)
+        if extra:
+            raise ChunkRejected(f"Chunks beyond the declared count: {extra[:20]}")
+        return meta, [chunks[n][1] for n in range(chunk_count)]
+
+    def mark_finalized(self, session_id: str, *, owner: str | None) -> bool:
+        """No more chunks; the session now waits for its ingestion job. False if it already was."""
+        meta = self.meta(session_id, owner=owner)
+        if meta["finalized"]:
+            return False
+        meta["finalized"] = True
+        meta["finalized_at"] = time.time()
+        self._write_meta(self._dir(session_id), meta)
+        return True
+
+    def mark_repeat(self, session_id: str, upload_id: int, *, owner: str | None) -> None:
+        """
+        The finalized session repeated upload `upload_id`, so nothing will ingest
+        it: drop its chunks but keep the meta, noting the upload, so a retried
+        completion gets the same answer. The sweeper removes it like any other
+        finalized session.
+        """
+        meta = self.meta(session_id, owner=owner)
+        path = self._dir(session_id)
+        for entry in path.iterdir():
+            if _CHUNK_FILE.match(entry.name):
+                entry.unlink(missing_ok=True)
+        meta["repeat_of"] = upload_id
+        self._write_meta(path, meta)
+
+    def open_stream(self, session_id: str, paths: list[Path] | None = None) -> IO[bytes]:
+        """The upload's chunks in order as one buffered binary stream."""
+        if paths is None:
+            path = self._dir(session_id)
+            if not path.exists():
+                raise FileNotFoundError(f"Upload session {session_id} is gone")
+            chunks = self._chunks(path)
+            paths = [chunks[n][1] for n in sorted(chunks)]
+        return io.BufferedReader(_ChunkReader(paths), buffer_size=_READ_CHUNK)
+
+    def discard(self, session_id: str) -> None:
+        shutil.rmtree(self._dir(session_id), ignore_errors=True)
+
+    # -----------------------------
+    # Expiry
+    # -----------------------------
+
+    def sweep(self, now: float | None = None) -> int:
+        """Delete expired sessions; returns how many."""
+        now = time.time() if now is None else now
+        removed = 0
+        try:
+            entries = list(self.root.iterdir())
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            if not _SESSION_ID.match(entry.name):
+                continue
+            try:
+                meta = json.loads((entry / _META).read_text())
+                expired = (
+                    now - meta["finalized_at"] > self.finalized_ttl
+                    if meta.get("finalized")
+                    else now - entry.stat().st_mtime > self.session_ttl
+                )
+            except (FileNotFoundError, ValueError, KeyError):
+                # No readable meta: being created right now, or debris. Judge by age alone.
+                try:
+                    expired = now - entry.stat().st_mtime > self.session_ttl
+                except FileNotFoundError:
+                    continue
+            if expired:
+                shutil.rmtree(entry, ignore_errors=True)
+                removed += 1
+        return removed
+
+    async def start(self) -> None:
+        if self._task is None and self.sweep_interval > 0:
+            self._stop = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="upload-spool-sweeper")
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                removed = await asyncio.to_thread(self.sweep)
+            except Exception:
+                logger.exception("upload spool: sweep failed")
+            else:
+                if removed:
+                    logger.info("upload spool: removed %d expired upload session(s)", removed)
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.sweep_interval)
+            except TimeoutError:
+                pass
+
+
+# One per process; all of them share the directory. The sweeper is started by main.lifespan.
+upload_spool = UploadSpool()
@@ -148,4 +148,35 @@ describe("middleware auth policy", () => {
         expect(nextMock).toHaveBeenCalledTimes(1);
         expect(redirectMock).not.toHaveBeenCalled();
     });
+
+    test("session is reused within max-age, then revalidated with its ETag", async () => {
+        const fetchMock = (globalThis as unknown as { fetch: jest.Mock }).fetch;
+        const sessionHeaders = (cacheControl: string) =>
+            new Map([
+                ["etag", '"abc"'],
+                ["cache-control", cacheControl],
+            ]);
+        fetchMock.mockResolvedValueOnce({
+            ok: true,
+            status: 200,
+            headers: sessionHeaders("public, max-age=0, s-maxage=0"),
+            json: async () => ({ is_admin: true, groups: [] }),
+        });
+        fetchMock.mockResolvedValueOnce({
+            ok: false,
+            status: 304,
+            headers: sessionHeaders("public, max-age=30, s-maxage=30"),
+        });
+
+        const req = () => makeReq({ pathname: "/admin/dashboard", cookie: "cached-tok" });
+        await middleware(req());
+        await middleware(req()); // stale: revalidated, 304
+        await middleware(req()); // fresh: no request
+
+        expect(fetchMock).toHaveBeenCalledTimes(2);
+        const revalidation = fetchMock.mock.calls[1][1] as { headers: Record<string, string> };
+        expect(revalidation.headers["If-None-Match"]).toBe('"abc"');
+        expect(nextMock).toHaveBeenCalledTimes(3);
+        expect(redirectMock).not.toHaveBeenCalled();
+    });
 });
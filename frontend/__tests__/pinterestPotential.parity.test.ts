@@ -0,0 +1,91 @@
+import fs from "fs";
+import path from "path";
+
+import { computeResults } from "@/lib/tools/pinterestPotential/compute";
+import {
+    getNicheOptions,
+    getPrimaryGoalOptions,
+    type Answers,
+    type GrowthMode,
+    type OfferClarity,
+    type Segment,
+    type SiteExperience,
+    type VisualStrength,
+    type VolumeBucket,
+} from "@/lib/tools/pinterestPotential/pinterestPotentialSpec";
+
+/**
+ * TS ↔ Python parity for the Pinterest Potential engine.
+ *
+ * The fixture is shared with backend/tests/test_pinterest_potential_parity.py, which runs the
+ * same answer sets through backend/tools/pinterest_potential. This test keeps the fixture honest
+ * against the TS engine; regenerate it after changing benchmarks/multipliers/compute with:
+ *
+ *   UPDATE_PARITY_FIXTURE=1 npx jest pinterestPotential.parity
+ */
+const FIXTURE_PATH = path.join(__dirname, "../../backend/tests/fixtures/pinterest_potential_parity.json");
+
+const SEGMENTS: Segment[] = ["content_creator", "product_seller", "service_provider"];
+const VOLUMES: VolumeBucket[] = ["0-2", "3-5", "6-10", "11-20", "20+"];
+const VISUALS: VisualStrength[] = ["limited", "decent", "strong", "very_strong"];
+const SITES: SiteExperience[] = ["a", "b", "c", "d"];
+const OFFERS: OfferClarity[] = ["no", "somewhat", "yes"];
+const GROWTH: GrowthMode[] = ["organic", "later", "ads"];
+
+function buildCases(): Answers[] {
+    const cases: Answers[] = [];
+    let i = 0;
+
+    // Every (segment, niche, goal) once, rotating Q3–Q6/Q8 so each option is exercised.
+    for (const segment of SEGMENTS) {
+        for (const niche of getNicheOptions(segment)) {
+            for (const goal of getPrimaryGoalOptions(segment)) {
+                cases.push({
+                    Q1: segment,
+                    Q2: niche.id,
+                    Q3: VOLUMES[i % VOLUMES.length],
+                    Q4: VISUALS[(i * 3) % VISUALS.length],
+                    Q5: SITES[(i * 7 + 1) % SITES.length],
+                    Q6: OFFERS[i % OFFERS.length],
+                    Q7: goal.id,
+                    Q8: GROWTH[(i * 5 + 2) % GROWTH.length],
+                });
+                i += 1;
+            }
+        }
+    }
+
+    // Validation failures must match too.
+    cases.push({});
+    cases.push({ Q1: "content_creator" });
+    cases.push({ ...cases[0], Q2: "baby_family" });
+    cases.push({ ...cases[0], Q7: "leads_calls" });
+
+    return cases;
+}
+
+function serialize(cases: Array<{ answers: Answers; expected: unknown }>): string {
+    // One case per line keeps diffs reviewable when config changes.
+    const lines = cases.map((c) => `  ${JSON.stringify(c)}`);
+    return `{"cases": [\n${lines.join(",\n")}\n]}\n`;
+}
+
+describe("Pinterest Potential — TS/Python parity fixture", () => {
+    const cases = buildCases().map((answers) => ({
+        answers,
+        // Round-trip through JSON so undefined fields are dropped exactly like the API would.
+        expected: JSON.parse(JSON.stringify(computeResults(answers))),
+    }));
+
+    if (process.env.UPDATE_PARITY_FIXTURE === "1") {
+        it("writes the parity fixture", () => {
+            fs.writeFileSync(FIXTURE_PATH, serialize(cases));
+        });
+        return;
+    }
+
+    it("matches the committed fixture (regenerate with UPDATE_PARITY_FIXTURE=1)", () => {
+        const fixture = JSON.parse(fs.readFileSync(FIXTURE_PATH, "utf-8"));
+        expect(fixture.cases).toEqual(cases);
+    });
+});
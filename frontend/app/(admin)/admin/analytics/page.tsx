@@ -2,7 +2,7 @@
 "use client";
 
 import React, { useMemo, useState, useEffect } from "react";
-import { getErrorMessage, safeJson, parseUploadResponse } from "@/lib/utils/http";
+import { getErrorMessage, safeJson, parseJobResponse, parseUploadResponse, type JobResponse } from "@/lib/utils/http";
 
 type Account = { account_name: string };
 
@@ -26,6 +26,23 @@ function fmtMonth(isoDate: string) {
     return d.toLocaleDateString(undefined, { year: "numeric", month: "short" });
 }
 
+// Files above this go through a resumable upload session instead of one request.
+const CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024;
+
+// CSV exports shrink 5-10x under gzip; the API stores them compressed and
+// decompresses while parsing. Already-compressed files go as they are.
+async function gzipForUpload(f: File): Promise<File> {
+    if (typeof CompressionStream === "undefined" || /\.(gz|gzip|zst|zstd)$/i.test(f.name)) return f;
+    const compressed = await new Response(f.stream().pipeThrough(new CompressionStream("gzip"))).blob();
+    // Same lastModified as the original, so a resumed chunked upload finds its session.
+    return new File([compressed], `${f.name}.gz`, { type: "application/gzip", lastModified: f.lastModified });
+}
+
+async function sha256Hex(bytes: ArrayBuffer): Promise<string> {
+    const digest = await crypto.subtle.digest("SHA-256", bytes);
+    return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, "0")).join("");
+}
+
 export default function AdminAnalyticsPage() {
     const [accountName, setAccountName] = useState("");
     const [accounts, setAccounts] = useState<string[]>([])
@@ -97,6 +114,88 @@ export default function AdminAnalyticsPage() {
         setRows((data?.rows as MonthlyRow[]) ?? []);
     }
 
+    // Uploads are ingested by a background job; poll it until it finishes.
+    async function waitForJob(jobId: number): Promise<JobResponse> {
+        for (;;) {
+            const res = await fetch(`/api/admin/jobs/${jobId}`, { cache: "no-store" });
+            const job = parseJobResponse(await safeJson(res));
+            if (!res.ok) {
+                throw new Error(job.detail ?? "Failed to check upload status");
+            }
+            if (job.status === "succeeded" || job.status === "failed") {
+                return job;
+            }
+            if (job.progressTotal) {
+                setMessage(`Processing... ${job.progressDone ?? 0} / ${job.progressTotal} rows`);
+            } else if (job.progressDone) {
+                setMessage(`Processing... ${job.progressDone} rows`);
+            } else {
+                setMessage("Processing...");
+            }
+            await new Promise((resolve) => setTimeout(resolve, 1000));
+        }
+    }
+
+    // Big exports go up in checksummed chunks through an upload session, so a
+    // dropped connection only costs the chunk in flight. The session id is kept
+    // per file in localStorage: choosing the same file again resumes it.
+    async function uploadInChunks(name: string, f: File): Promise<{ ok: boolean; raw: unknown }> {
+        const resumeKey = `pinterest-upload:${name}:${f.name}:${f.size}:${f.lastModified}`;
+        let session: { session_id: string; chunk_size: number; chunks: { n: number; sha256: string }[] } | null = null;
+
+        const saved = window.localStorage.getItem(resumeKey);
+        if (saved) {
+            const res = await fetch(`/api/admin/pinterest-stats/upload-sessions/${saved}`, { cache: "no-store" });
+            const data = await safeJson(res);
+            if (res.ok && !(data as { finalized?: boolean }).finalized) session = data as typeof session;
+        }
+        if (!session) {
+            const res = await fetch("/api/admin/pinterest-stats/upload-sessions", {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify({ account_name: name, filename: f.name }),
+            });
+            const data = await safeJson(res);
+            if (!res.ok) return { ok: false, raw: data };
+            session = data as typeof session;
+            window.localStorage.setItem(resumeKey, session!.session_id);
+        }
+
+        const { session_id: sessionId, chunk_size: chunkSize } = session!;
+        const count = Math.max(1, Math.ceil(f.size / chunkSize));
+        const stored = new Map(session!.chunks.map((c) => [c.n, c.sha256]));
+
+        for (let n = 0; n < count; n++) {
+            const bytes = await f.slice(n * chunkSize, (n + 1) * chunkSize).arrayBuffer();
+            const sha256 = await sha256Hex(bytes);
+            if (stored.get(n) === sha256) continue; // already there from an earlier attempt
+
+            setMessage(`Uploading... ${Math.round((n / count) * 100)}%`);
+            for (let attempt = 1; ; attempt++) {
+                const res = await fetch(`/api/admin/pinterest-stats/upload-sessions/${sessionId}/chunks/${n}`, {
+                    method: "PUT",
+                    headers: { "Content-Type": "application/octet-stream", "X-Chunk-Sha256": sha256 },
+                    body: bytes,
+                }).catch(() => null);
+                if (res?.ok) break;
+                if (res && res.status < 500 && res.status !== 408 && res.status !== 429) {
+                    return { ok: false, raw: await safeJson(res) };
+                }
+                if (attempt >= 5) throw new Error("Upload interrupted; choose the file again to resume.");
+                await new Promise((resolve) => setTimeout(resolve, 1000 * attempt));
+            }
+        }
+
+        const res = await fetch(`/api/admin/pinterest-stats/upload-sessions/${sessionId}/complete`, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ chunks: count }),
+        });
+        const raw = await safeJson(res);
+        if (res.ok) window.localStorage.removeItem(resumeKey);
+        return { ok: res.ok, raw };
+    }
+
     async function onUpload(e: React.FormEvent) {
         e.preventDefault();
         setMessage(null);
@@ -113,26 +212,49 @@ export default function AdminAnalyticsPage() {
 
         setBusy(true);
         try {
-            const form = new FormData();
-            form.set("account_name", name);
-            form.set("file", file, file.name);
-
-            const res = await fetch("/api/admin/pinterest-stats/upload", {
-                method: "POST",
-                body: form,
-            });
+            const upload = await gzipForUpload(file);
+            let ok: boolean;
+            let raw: unknown;
+            if (upload.size > CHUNKED_UPLOAD_THRESHOLD) {
+                ({ ok, raw } = await uploadInChunks(name, upload));
+            } else {
+                const form = new FormData();
+                form.set("account_name", name);
+                form.set("file", upload, upload.name);
+
+                const res = await fetch("/api/admin/pinterest-stats/upload", {
+                    method: "POST",
+                    body: form,
+                });
+                ok = res.ok;
+                raw = await safeJson(res);
+            }
 
-            const raw = await safeJson(res);
             const data = parseUploadResponse(raw);
 
-            if (!res.ok) {
+            if (!ok) {
                 setMessage(`❌ ${data.detail ?? "Upload failed"}`);
                 return; // skip the success path
             }
 
-            const inserted = data?.inserted ?? 0;
-            const updated = data?.updated ?? 0;
-            setMessage(`✅ Uploaded. Inserted: ${inserted}, Updated: ${updated}`);
+            if (data.jobId === undefined) {
+                setMessage("❌ Upload failed");
+                return;
+            }
+
+            const job = await waitForJob(data.jobId);
+            if (job.status === "failed") {
+                setMessage(`❌ ${job.error ?? "Upload failed"}`);
+                return;
+            }
+
+            const inserted = job.inserted ?? 0;
+            const updated = job.updated ?? 0;
+            if (data.duplicate) {
+                setMessage(`✅ This file was already uploaded; nothing changed. (Inserted: ${inserted}, Updated: ${updated})`);
+            } else {
+                setMessage(`✅ Uploaded. Inserted: ${inserted}, Updated: ${updated}`);
+            }
 
             await loadMonthly(name);
         } catch (err: unknown) {
@@ -180,7 +302,7 @@ export default function AdminAnalyticsPage() {
                             <span className="text-sm text-[var(--foreground)]">CSV file</span>
                             <input
                                 type="file"
-                                accept=".csv,text/csv"
+                                accept=".csv,.csv.gz,.csv.zst,text/csv,application/gzip"
                                 onChange={(e) => setFile(e.target.files?.[0] ?? null)}
                                 className="w-full rounded-xl border border-[var(--border)] bg-[var(--background)] px-3 py-2 text-sm text-[var(--foreground)]"
                             />
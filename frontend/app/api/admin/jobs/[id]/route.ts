@@ -0,0 +1,50 @@
+// frontend/app/api/admin/jobs/[id]/route.ts
+import { NextResponse } from "next/server";
+import { cookies } from "next/headers";
+import { getApiOrigin } from "@/lib/auth";
+
+const API_BASE_URL = getApiOrigin();
+
+const COOKIE_NAME = "fruitful_access_token";
+
+export async function GET(
+    _req: Request,
+    { params }: { params: Promise<{ id: string }> },
+) {
+    const { id } = await params;
+
+    if (!/^\d+$/.test(id)) {
+        return NextResponse.json(
+            { success: false, detail: "Invalid job id" },
+            { status: 400 },
+        );
+    }
+
+    const cookieStore = await cookies();
+    const token = cookieStore.get(COOKIE_NAME)?.value;
+
+    if (!token) {
+        return NextResponse.json(
+            { success: false, detail: "Not authenticated" },
+            { status: 401 },
+        );
+    }
+
+    const resp = await fetch(`${API_BASE_URL}/admin/jobs/${id}`, {
+        headers: {
+            Authorization: `Bearer ${token}`,
+        },
+        cache: "no-store",
+    });
+
+    const payload = await resp.json().catch(() => null);
+
+    if (!resp.ok) {
+        return NextResponse.json(
+            { success: false, detail: payload?.detail ?? "Request failed" },
+            { status: resp.status },
+        );
+    }
+
+    return NextResponse.json({ success: true, ...payload });
+}
@@ -0,0 +1,68 @@
+// frontend/app/api/admin/pinterest-stats/upload-sessions/[id]/chunks/[n]/route.ts
+import { NextResponse } from "next/server";
+import { cookies } from "next/headers";
+import { getApiOrigin } from "@/lib/auth";
+
+const API_BASE_URL = getApiOrigin();
+
+const COOKIE_NAME = "fruitful_access_token";
+
+export async function PUT(
+    req: Request,
+    { params }: { params: Promise<{ id: string; n: string }> },
+) {
+    const { id, n } = await params;
+
+    if (!/^[0-9a-f]{32}$/.test(id) || !/^\d+$/.test(n)) {
+        return NextResponse.json(
+            { success: false, detail: "Invalid upload session or chunk number" },
+            { status: 400 },
+        );
+    }
+
+    const checksum = req.headers.get("x-chunk-sha256");
+    if (!checksum) {
+        return NextResponse.json(
+            { success: false, detail: "X-Chunk-Sha256 header is required" },
+            { status: 400 },
+        );
+    }
+
+    const cookieStore = await cookies();
+    const token = cookieStore.get(COOKIE_NAME)?.value;
+
+    if (!token) {
+        return NextResponse.json(
+            { success: false, detail: "Not authenticated" },
+            { status: 401 },
+        );
+    }
+
+    // Chunks are a few MB, so buffering one here is fine (and keeps fetch away from streamed bodies).
+    const body = await req.arrayBuffer();
+
+    const resp = await fetch(
+        `${API_BASE_URL}/admin/pinterest-stats/upload-sessions/${id}/chunks/${n}`,
+        {
+            method: "PUT",
+            headers: {
+                Authorization: `Bearer ${token}`,
+                "Content-Type": "application/octet-stream",
+                "X-Chunk-Sha256": checksum,
+            },
+            body,
+            cache: "no-store",
+        },
+    );
+
+    const payload = await resp.json().catch(() => null);
+
+    if (!resp.ok) {
+        return NextResponse.json(
+            { success: false, detail: payload?.detail ?? "Chunk upload failed" },
+            { status: resp.status },
+        );
+    }
+
+    return NextResponse.json({ success: true, ...payload });
+}
@@ -0,0 +1,64 @@
+// frontend/app/api/admin/pinterest-stats/upload-sessions/[id]/complete/route.ts
+import { NextResponse } from "next/server";
+import { cookies } from "next/headers";
+import { getApiOrigin } from "@/lib/auth";
+
+const API_BASE_URL = getApiOrigin();
+
+const COOKIE_NAME = "fruitful_access_token";
+
+export async function POST(
+    req: Request,
+    { params }: { params: Promise<{ id: string }> },
+) {
+    const { id } = await params;
+
+    if (!/^[0-9a-f]{32}$/.test(id)) {
+        return NextResponse.json(
+            { success: false, detail: "Invalid upload session id" },
+            { status: 400 },
+        );
+    }
+
+    const cookieStore = await cookies();
+    const token = cookieStore.get(COOKIE_NAME)?.value;
+
+    if (!token) {
+        return NextResponse.json(
+            { success: false, detail: "Not authenticated" },
+            { status: 401 },
+        );
+    }
+
+    const body = await req.json().catch(() => null);
+    if (!body || typeof body.chunks !== "number") {
+        return NextResponse.json(
+            { success: false, detail: "chunks is required" },
+            { status: 400 },
+        );
+    }
+
+    const resp = await fetch(
+        `${API_BASE_URL}/admin/pinterest-stats/upload-sessions/${id}/complete`,
+        {
+            method: "POST",
+            headers: {
+                Authorization: `Bearer ${token}`,
+                "Content-Type": "application/json",
+            },
+            body: JSON.stringify({ chunks: body.chunks, sha256: body.sha256 ?? null }),
+            cache: "no-store",
+        },
+    );
+
+    const payload = await resp.json().catch(() => null);
+
+    if (!resp.ok) {
+        return NextResponse.json(
+            { success: false, detail: payload?.detail ?? "Upload failed" },
+            { status: resp.status },
+        );
+    }
+
+    return NextResponse.json({ success: true, ...payload }, { status: resp.status });
+}
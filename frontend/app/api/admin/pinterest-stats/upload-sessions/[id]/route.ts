@@ -0,0 +1,50 @@
+// frontend/app/api/admin/pinterest-stats/upload-sessions/[id]/route.ts
+import { NextResponse } from "next/server";
+import { cookies } from "next/headers";
+import { getApiOrigin } from "@/lib/auth";
+
+const API_BASE_URL = getApiOrigin();
+
+const COOKIE_NAME = "fruitful_access_token";
+
+export async function GET(
+    _req: Request,
+    { params }: { params: Promise<{ id: string }> },
+) {
+    const { id } = await params;
+
+    if (!/^[0-9a-f]{32}$/.test(id)) {
+        return NextResponse.json(
+            { success: false, detail: "Invalid upload session id" },
+            { status: 400 },
+        );
+    }
+
+    const cookieStore = await cookies();
+    const token = cookieStore.get(COOKIE_NAME)?.value;
+
+    if (!token) {
+        return NextResponse.json(
+            { success: false, detail: "Not authenticated" },
+            { status: 401 },
+        );
+    }
+
+    const resp = await fetch(`${API_BASE_URL}/admin/pinterest-stats/upload-sessions/${id}`, {
+        headers: {
+            Authorization: `Bearer ${token}`,
+        },
+        cache: "no-store",
+    });
+
+    const payload = await resp.json().catch(() => null);
+
+    if (!resp.ok) {
+        return NextResponse.json(
+            { success: false, detail: payload?.detail ?? "Request failed" },
+            { status: resp.status },
+        );
+    }
+
+    return NextResponse.json({ success: true, ...payload });
+}
@@ -0,0 +1,54 @@
+// frontend/app/api/admin/pinterest-stats/upload-sessions/route.ts
+import { NextResponse } from "next/server";
+import { cookies } from "next/headers";
+import { getApiOrigin } from "@/lib/auth";
+
+const API_BASE_URL = getApiOrigin();
+
+const COOKIE_NAME = "fruitful_access_token";
+
+export async function POST(req: Request) {
+    const cookieStore = await cookies();
+    const token = cookieStore.get(COOKIE_NAME)?.value;
+
+    if (!token) {
+        return NextResponse.json(
+            { success: false, detail: "Not authenticated" },
+            { status: 401 },
+        );
+    }
+
+    const body = await req.json().catch(() => null);
+    const accountName = body?.account_name;
+
+    if (typeof accountName !== "string" || !accountName.trim()) {
+        return NextResponse.json(
+            { success: false, detail: "account_name is required" },
+            { status: 400 },
+        );
+    }
+
+    const resp = await fetch(`${API_BASE_URL}/admin/pinterest-stats/upload-sessions`, {
+        method: "POST",
+        headers: {
+            Authorization: `Bearer ${token}`,
+            "Content-Type": "application/json",
+        },
+        body: JSON.stringify({
+            account_name: accountName.trim(),
+            filename: typeof body?.filename === "string" ? body.filename : null,
+        }),
+        cache: "no-store",
+    });
+
+    const payload = await resp.json().catch(() => null);
+
+    if (!resp.ok) {
+        return NextResponse.json(
+            { success: false, detail: payload?.detail ?? "Could not start upload" },
+            { status: resp.status },
+        );
+    }
+
+    return NextResponse.json({ success: true, ...payload }, { status: resp.status });
+}
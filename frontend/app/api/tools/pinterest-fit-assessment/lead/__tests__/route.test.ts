@@ -37,13 +37,16 @@ jest.mock("next/server", () => ({
 }));
 
 type RouteResponse = { status: number; json: () => Promise<unknown> };
-type PostReq = { json: () => Promise<unknown> };
+type PostReq = { json: () => Promise<unknown>; headers?: { get: (name: string) => string | null } };
 
 let POST: (req: PostReq) => Promise<RouteResponse>;
 
+function headers(values: Record<string, string>) {
+    return { get: (name: string) => values[name.toLowerCase()] ?? null };
+}
+
 describe("/api/tools/pinterest-fit-assessment/lead route", () => {
-    const originalApiKey = process.env.MAILERLITE_API_KEY;
-    const originalGroupId = process.env.MAILERLITE_PINTEREST_FIT_GROUP_ID;
+    const originalApiBaseUrl = process.env.API_BASE_URL;
     const originalFetch = global.fetch;
 
     beforeAll(async () => {
@@ -54,319 +57,63 @@ describe("/api/tools/pinterest-fit-assessment/lead route", () => {
     });
 
     beforeEach(() => {
-        process.env.MAILERLITE_API_KEY = "test-mailerlite-token";
-        process.env.MAILERLITE_PINTEREST_FIT_GROUP_ID = "group-123";
-        global.fetch = jest.fn(async (input: RequestInfo | URL, init?: RequestInit) => {
-            const url = String(input);
-            const method = init?.method ?? "GET";
-
-            if (url.endsWith("/fields?limit=100")) {
-                return {
-                    ok: true,
-                    json: async () => ({
-                        data: [
-                            { name: "Pinterest Fit Result", key: "pinterest_fit_result", type: "text" },
-                            { name: "Lead Source", key: "lead_source", type: "text" },
-                        ],
-                    }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers") && method === "POST") {
-                return {
-                    ok: true,
-                    json: async () => ({ data: { id: "subscriber-123" } }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers/subscriber-123") && method === "PUT") {
-                return {
-                    ok: true,
-                    json: async () => ({
-                        data: {
-                            id: "subscriber-123",
-                            fields: {
-                                pinterest_fit_result: "Strong Pinterest Fit",
-                                lead_source: "Pinterest Fit Assessment",
-                            },
-                        },
-                    }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers/subscriber-123/groups/group-123") && method === "POST") {
-                return {
-                    ok: true,
-                    json: async () => ({ data: { id: "subscriber-123" } }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers/subscriber-123") && method === "GET") {
-                return {
-                    ok: true,
-                    json: async () => ({
-                        data: {
-                            id: "subscriber-123",
-                            fields: {
-                                pinterest_fit_result: "Strong Pinterest Fit",
-                                lead_source: "Pinterest Fit Assessment",
-                            },
-                        },
-                    }),
-                } as Response;
-            }
-
-            throw new Error(`Unexpected fetch: ${method} ${url}`);
+        process.env.API_BASE_URL = "https://api.example.com/";
+        global.fetch = jest.fn(async () => {
+            return {
+                ok: true,
+                status: 202,
+                json: async () => ({ ok: true, lead_id: 42 }),
+            } as Response;
         });
     });
 
     afterEach(() => {
         global.fetch = originalFetch;
-        process.env.MAILERLITE_API_KEY = originalApiKey;
-        process.env.MAILERLITE_PINTEREST_FIT_GROUP_ID = originalGroupId;
+        process.env.API_BASE_URL = originalApiBaseUrl;
     });
 
-    it("adds the subscriber to MailerLite with email, result, source, and group", async () => {
+    it("queues the lead with the backend instead of calling MailerLite inline", async () => {
         const res = await POST({
             json: async () => ({
                 email: " Founder@Example.com ",
                 result: "Strong Pinterest Fit",
                 source: "Pinterest Fit Assessment",
             }),
+            headers: headers({
+                "x-pinterest-fit-top-reason-1": encodeURIComponent("Visual product"),
+                "x-pinterest-fit-role": encodeURIComponent("Discovery engine"),
+                "idempotency-key": "retry-1",
+            }),
         });
 
         expect(res.status).toBe(200);
         expect(await res.json()).toEqual({ ok: true });
 
         const fetchMock = global.fetch as jest.Mock;
-        const subscriberCall = fetchMock.mock.calls.find(([url, init]) => {
-            return String(url).endsWith("/subscribers") && init?.method === "POST";
-        });
-
-        expect(subscriberCall).toBeDefined();
-        expect(JSON.parse(subscriberCall?.[1]?.body as string)).toEqual({
+        expect(fetchMock).toHaveBeenCalledTimes(1);
+        const [url, init] = fetchMock.mock.calls[0];
+        expect(url).toBe("https://api.example.com/tools/pinterest-fit-assessment/lead");
+        expect(init.method).toBe("POST");
+        expect(init.headers["Idempotency-Key"]).toBe("retry-1");
+        expect(JSON.parse(init.body as string)).toEqual({
             email: "founder@example.com",
-            groups: ["group-123"],
-            fields: {
-                pinterest_fit_result: "Strong Pinterest Fit",
-                lead_source: "Pinterest Fit Assessment",
-            },
-        });
-
-        const assignGroupCall = fetchMock.mock.calls.find(([url, init]) => {
-            return String(url).endsWith("/subscribers/subscriber-123/groups/group-123") && init?.method === "POST";
-        });
-
-        expect(assignGroupCall).toBeDefined();
-
-        const updateFieldsCall = fetchMock.mock.calls.find(([url, init]) => {
-            return String(url).endsWith("/subscribers/subscriber-123") && init?.method === "PUT";
-        });
-
-        expect(updateFieldsCall).toBeDefined();
-        expect(JSON.parse(updateFieldsCall?.[1]?.body as string)).toEqual({
-            fields: {
-                pinterest_fit_result: "Strong Pinterest Fit",
-                lead_source: "Pinterest Fit Assessment",
-            },
-        });
-    });
-
-    it("looks up the subscriber before assigning the group when MailerLite omits the id from subscribe", async () => {
-        global.fetch = jest.fn(async (input: RequestInfo | URL, init?: RequestInit) => {
-            const url = String(input);
-            const method = init?.method ?? "GET";
-
-            if (url.endsWith("/fields?limit=100")) {
-                return {
-                    ok: true,
-                    json: async () => ({
-                        data: [
-                            { name: "Pinterest Fit Result", key: "pinterest_fit_result", type: "text" },
-                            { name: "Lead Source", key: "lead_source", type: "text" },
-                        ],
-                    }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers") && method === "POST") {
-                return {
-                    ok: true,
-                    json: async () => ({ data: {} }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers/founder%40example.com") && method === "GET") {
-                return {
-                    ok: true,
-                    json: async () => ({ data: { id: "subscriber-lookup-123" } }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers/subscriber-lookup-123/groups/group-123") && method === "POST") {
-                return {
-                    ok: true,
-                    json: async () => ({ data: { id: "subscriber-lookup-123" } }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers/subscriber-lookup-123") && method === "PUT") {
-                return {
-                    ok: true,
-                    json: async () => ({ data: { id: "subscriber-lookup-123" } }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers/subscriber-lookup-123") && method === "GET") {
-                return {
-                    ok: true,
-                    json: async () => ({
-                        data: {
-                            id: "subscriber-lookup-123",
-                            fields: {
-                                pinterest_fit_result: "Strong Pinterest Fit",
-                                lead_source: "Pinterest Fit Assessment",
-                            },
-                        },
-                    }),
-                } as Response;
-            }
-
-            throw new Error(`Unexpected fetch: ${method} ${url}`);
-        });
-
-        const res = await POST({
-            json: async () => ({
-                email: "Founder@Example.com",
-                result: "Strong Pinterest Fit",
-                source: "Pinterest Fit Assessment",
-            }),
-        });
-
-        expect(res.status).toBe(200);
-
-        const fetchMock = global.fetch as jest.Mock;
-        expect(
-            fetchMock.mock.calls.some(([url, init]) => {
-                return String(url).endsWith("/subscribers/subscriber-lookup-123/groups/group-123") && init?.method === "POST";
-            }),
-        ).toBe(true);
-    });
-
-    it("keeps the email gate locked when group assignment fails", async () => {
-        global.fetch = jest.fn(async (input: RequestInfo | URL, init?: RequestInit) => {
-            const url = String(input);
-            const method = init?.method ?? "GET";
-
-            if (url.endsWith("/fields?limit=100")) {
-                return {
-                    ok: true,
-                    json: async () => ({
-                        data: [
-                            { name: "Pinterest Fit Result", key: "pinterest_fit_result", type: "text" },
-                            { name: "Lead Source", key: "lead_source", type: "text" },
-                        ],
-                    }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers") && method === "POST") {
-                return {
-                    ok: true,
-                    json: async () => ({ data: { id: "subscriber-123" } }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers/subscriber-123/groups/group-123") && method === "POST") {
-                return {
-                    ok: false,
-                    json: async () => ({ message: "Group assignment failed" }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers/subscriber-123") && method === "PUT") {
-                return {
-                    ok: true,
-                    json: async () => ({ data: { id: "subscriber-123" } }),
-                } as Response;
-            }
-
-            throw new Error(`Unexpected fetch: ${method} ${url}`);
-        });
-
-        const res = await POST({
-            json: async () => ({
-                email: "founder@example.com",
-                result: "Strong Pinterest Fit",
-                source: "Pinterest Fit Assessment",
-            }),
+            result: "Strong Pinterest Fit",
+            source: "Pinterest Fit Assessment",
+            topReason1: "Visual product",
+            topReason2: null,
+            topReason3: null,
+            pinterestRole: "Discovery engine",
+            recommendedNextStep: null,
         });
-
-        expect(res.status).toBe(502);
-        expect(await res.json()).toEqual({ error: "Email capture failed" });
     });
 
-    it("keeps the email gate locked when MailerLite does not save the result field", async () => {
-        global.fetch = jest.fn(async (input: RequestInfo | URL, init?: RequestInit) => {
-            const url = String(input);
-            const method = init?.method ?? "GET";
-
-            if (url.endsWith("/fields?limit=100")) {
-                return {
-                    ok: true,
-                    json: async () => ({
-                        data: [
-                            { name: "Pinterest Fit Result", key: "pinterest_fit_result", type: "text" },
-                            { name: "Lead Source", key: "lead_source", type: "text" },
-                        ],
-                    }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers") && method === "POST") {
-                return {
-                    ok: true,
-                    json: async () => ({ data: { id: "subscriber-123" } }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers/subscriber-123") && method === "PUT") {
-                return {
-                    ok: true,
-                    json: async () => ({ data: { id: "subscriber-123" } }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers/subscriber-123/groups/group-123") && method === "POST") {
-                return {
-                    ok: true,
-                    json: async () => ({ data: { id: "subscriber-123" } }),
-                } as Response;
-            }
-
-            if (url.endsWith("/subscribers/subscriber-123") && method === "GET") {
-                return {
-                    ok: true,
-                    json: async () => ({
-                        data: {
-                            id: "subscriber-123",
-                            fields: {
-                                pinterest_fit_result: null,
-                                lead_source: "Pinterest Fit Assessment",
-                            },
-                        },
-                    }),
-                } as Response;
-            }
-
-            throw new Error(`Unexpected fetch: ${method} ${url}`);
-        });
+    it("keeps the email gate locked when the backend cannot store the lead", async () => {
+        global.fetch = jest.fn(async () => ({ ok: false, status: 500, json: async () => ({}) }) as Response);
 
         const res = await POST({
             json: async () => ({
                 email: "founder@example.com",
                 result: "Strong Pinterest Fit",
-                source: "Pinterest Fit Assessment",
             }),
         });
 
@@ -384,10 +131,11 @@ describe("/api/tools/pinterest-fit-assessment/lead route", () => {
 
         expect(res.status).toBe(400);
         expect(await res.json()).toEqual({ error: "Invalid payload" });
+        expect(global.fetch as jest.Mock).not.toHaveBeenCalled();
     });
 
-    it("returns a configuration error when the API token is missing", async () => {
-        delete process.env.MAILERLITE_API_KEY;
+    it("returns a configuration error when the API origin is missing", async () => {
+        delete process.env.API_BASE_URL;
 
         const res = await POST({
             json: async () => ({
@@ -15,17 +15,44 @@ export async function safeJson(res: Response): Promise<unknown> {
 }
 
 export type UploadResponse = {
+    jobId?: number;
+    duplicate?: boolean;
+    detail?: string;
+}
+
+export function parseUploadResponse(x: unknown): UploadResponse {
+    if (typeof x !== "object" || x === null) return {};
+    const obj = x as Record<string, unknown>;
+    return {
+        jobId: typeof obj.job_id === "number" ? obj.job_id: undefined,
+        duplicate: obj.duplicate === true,
+        detail: typeof obj.detail === "string" ? obj.detail: undefined,
+    };
+}
+
+export type JobResponse = {
+    status?: "queued" | "running" | "succeeded" | "failed";
+    progressDone?: number;
+    progressTotal?: number;
     inserted?: number;
     updated?: number;
+    error?: string;
     detail?: string;
 }
 
-export function parseUploadResponse(x: unknown): UploadResponse {
+export function parseJobResponse(x: unknown): JobResponse {
     if (typeof x !== "object" || x === null) return {};
     const obj = x as Record<string, unknown>;
+    const progress = (typeof obj.progress === "object" && obj.progress !== null ? obj.progress : {}) as Record<string, unknown>;
+    const result = (typeof obj.result === "object" && obj.result !== null ? obj.result : {}) as Record<string, unknown>;
+    const status = obj.status;
     return {
-        inserted: typeof obj.inserted === "number" ? obj.inserted: undefined,
-        updated: typeof obj.updated === "number" ? obj.updated: undefined,
+        status: status === "queued" || status === "running" || status === "succeeded" || status === "failed" ? status : undefined,
+        progressDone: typeof progress.done === "number" ? progress.done: undefined,
+        progressTotal: typeof progress.total === "number" ? progress.total: undefined,
+        inserted: typeof result.inserted === "number" ? result.inserted: undefined,
+        updated: typeof result.updated === "number" ? result.updated: undefined,
+        error: typeof obj.error === "string" ? obj.error: undefined,
         detail: typeof obj.detail === "string" ? obj.detail: undefined,
     };
 }
\ No newline at end of file
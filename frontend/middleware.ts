@@ -13,7 +13,9 @@ const PROTECTED_PATHS = ["/admin", "/contractor"] as const;
 
 type Role = "admin" | "contractor" | "general";
 
+// Minimal signed principal from GET /auth/session (also sent as X-Principal-* headers).
 type MeResponse = {
+    is_active?: boolean;
     is_admin: boolean;
     groups: string[];
 };
@@ -83,23 +85,66 @@ function redirectToLogin(req: NextRequest, reason: FlashReason) {
     return res;
 }
 
+// /auth/session answers per token with an ETag and a short max-age. Within max-age the
+// principal is reused without a request; after that it is revalidated with If-None-Match
+// (a 304 costs the backend a cache lookup and carries no body). Per instance, bounded.
+type CachedSession = { me: MeResponse | null; etag: string | null; freshUntil: number };
+
+const SESSION_CACHE_MAX_ENTRIES = 1000;
+const sessionCache = new Map<string, CachedSession>();
+
+function maxAgeSeconds(cacheControl: string | null | undefined) {
+    const match = /(?:^|,)\s*max-age=(\d+)/i.exec(cacheControl ?? "");
+    return match ? Number(match[1]) : 0;
+}
+
+function rememberSession(token: string, me: MeResponse | null, resp: Response, previousEtag: string | null = null) {
+    const etag = resp.headers?.get("etag") ?? previousEtag;
+    const maxAge = maxAgeSeconds(resp.headers?.get("cache-control"));
+    sessionCache.delete(token);
+    if (!etag && maxAge <= 0) return;
+
+    sessionCache.set(token, { me, etag, freshUntil: Date.now() + maxAge * 1000 });
+    // Map keeps insertion order: the first key is the least recently stored.
+    if (sessionCache.size > SESSION_CACHE_MAX_ENTRIES) {
+        sessionCache.delete(sessionCache.keys().next().value as string);
+    }
+}
+
 async function fetchMe(token: string): Promise<MeResponse | null> {
+    const cached = sessionCache.get(token);
+    if (cached && cached.freshUntil > Date.now()) return cached.me;
+
     try {
-        const url = new URL("/auth/me", API_BASE_URL);
+        const url = new URL("/auth/session", API_BASE_URL);
         const resp = await fetch(url, {
-            headers: { Authorization: `Bearer ${token}` },
-            // middleware runtime: keep it no-store
+            headers: {
+                Authorization: `Bearer ${token}`,
+                ...(cached?.etag ? { "If-None-Match": cached.etag } : {}),
+            },
+            // middleware runtime: sessionCache does the caching, not the fetch cache
             cache: "no-store",
         });
 
-        if (!resp.ok) return null;
-        const me = (await resp.json()) as MeResponse;
+        if (resp.status === 304 && cached) {
+            rememberSession(token, cached.me, resp, cached.etag);
+            return cached.me;
+        }
+
+        if (!resp.ok) {
+            sessionCache.delete(token);
+            return null;
+        }
+        const body = (await resp.json()) as MeResponse;
+
+        // deactivated accounts are treated like an invalid session; defensive shape checks
+        const me =
+            body.is_active === false
+                ? null
+                : { is_admin: body.is_admin, groups: Array.isArray(body.groups) ? body.groups : [] };
 
-        // defensive shape checks
-        return {
-            is_admin: me.is_admin,
-            groups: Array.isArray(me.groups) ? me.groups : [],
-        };
+        rememberSession(token, me, resp);
+        return me;
     } catch {
         return null;
     }
@@ -127,7 +172,7 @@ export async function middleware(req: NextRequest) {
         return redirectToLogin(req, "auth_required");
     }
 
-    // ---- PROTECTED ROUTES: role check via backend /auth/me
+    // ---- PROTECTED ROUTES: role check via backend /auth/session
     const me = await fetchMe(token);
 
     // invalid/expired token → clear cookie + login